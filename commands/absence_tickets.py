@@ -16,6 +16,8 @@ from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, List, Optional
 import asyncio
 
+from core.scheduler import scheduler
+
 class AbsenceTicketModal(discord.ui.Modal, title="🎫 Créer Ticket d'Absence"):
     def __init__(self, bot, channel_config):
         super().__init__()
@@ -515,9 +517,12 @@ class AbsenceTicketSystem(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.setup_database.start()
-        self.check_expired_absences.start()
+        # Vérification horaire des absences expirées (job persisté du planificateur)
+        scheduler.every("absence_expiry", 3600, self.check_expired_absences)
+    
+    def cog_unload(self):
+        scheduler.unregister("absence_expiry")
     
-    @tasks.loop(hours=1)
     async def check_expired_absences(self):
         """Vérifie les absences expirées toutes les heures"""
         try:
@@ -5,18 +5,57 @@ Développé par XeRoX - Arsenal Bot V4.5.0
 """
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 import sqlite3
 import json
 import datetime
-from typing import Optional, Dict, List, Any
+from dataclasses import dataclass, field
+from typing import Optional, Dict, List, Any, FrozenSet
 import asyncio
+from utils.guild_config_cache import GuildConfigCache
+from utils.log_sink import BatchedLogSink
+from modules.sqlite_database import database_manager
+
+# Événements abandonnés en premier en cas de surcharge
+LOW_PRIORITY_EVENTS = frozenset({"message_edit", "member_update"})
+RETENTION_DAYS = 90  # Durée de conservation des événements
+PRUNE_BATCH = 5000  # Lignes supprimées par transaction lors de la purge
+
+@dataclass(frozen=True)
+class LogGuildConfig:
+    """Configuration des logs d'un serveur, déjà parsée"""
+    guild_id: int
+    log_channel_id: Optional[int] = None
+    enabled_events: Optional[FrozenSet[str]] = None  # None = tous les événements
+    options: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.log_channel_id)
+
+    def wants(self, event_type: str) -> bool:
+        """L'événement doit-il être journalisé pour ce serveur ?"""
+        return self.enabled_events is None or event_type in self.enabled_events
 
 class AdvancedLoggingSystem(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.logs_db = "advanced_logs.db"
+        self.config_cache = GuildConfigCache(self._load_log_config)
         self.init_databases()
+        self.event_sink = BatchedLogSink(
+            database_manager.pool(self.logs_db),
+            """
+                INSERT INTO event_logs (guild_id, event_type, user_id, target_id, channel_id, event_data, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            name="event_logs"
+        )
+        self.retention_task.start()
+
+    async def cog_unload(self):
+        self.retention_task.cancel()
+        await self.event_sink.close()
 
     def init_databases(self):
         """Initialise les bases de données de logs"""
@@ -46,6 +85,11 @@ class AdvancedLoggingSystem(commands.Cog):
                 )
             """)
             
+            # Index pour /logs et /audit (filtrage par serveur et par période)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_event_logs_guild_time ON event_logs (guild_id, timestamp)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_event_logs_guild_user_time ON event_logs (guild_id, user_id, timestamp)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_event_logs_time ON event_logs (timestamp)")
+
             # Audit trail complet
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS audit_trail (
@@ -65,7 +109,8 @@ class AdvancedLoggingSystem(commands.Cog):
     @app_commands.describe(
         action="Action à effectuer",
         type_log="Type de log à consulter",
-        utilisateur="Utilisateur spécifique"
+        utilisateur="Utilisateur spécifique",
+        salon="Salon des logs (action Configurer)"
     )
     @app_commands.choices(action=[
         app_commands.Choice(name="📊 Voir logs", value="view"),
@@ -79,7 +124,8 @@ class AdvancedLoggingSystem(commands.Cog):
         interaction: discord.Interaction,
         action: str,
         type_log: Optional[str] = None,
-        utilisateur: Optional[discord.Member] = None
+        utilisateur: Optional[discord.Member] = None,
+        salon: Optional[discord.TextChannel] = None
     ):
         if not interaction.user.guild_permissions.view_audit_log:
             await interaction.response.send_message(
@@ -91,7 +137,7 @@ class AdvancedLoggingSystem(commands.Cog):
         if action == "view":
             await self.view_logs(interaction, type_log, utilisateur)
         elif action == "config":
-            await self.configure_logs(interaction)
+            await self.configure_logs(interaction, salon)
         elif action == "search":
             await self.search_logs(interaction, type_log)
         elif action == "stats":
@@ -107,6 +153,9 @@ class AdvancedLoggingSystem(commands.Cog):
             timestamp=datetime.datetime.now(datetime.timezone.utc)
         )
         
+        # Les événements encore en file doivent apparaître
+        await self.event_sink.flush()
+        
         # Récupération des logs récents
         with sqlite3.connect(self.logs_db) as conn:
             if user:
@@ -153,7 +202,7 @@ class AdvancedLoggingSystem(commands.Cog):
         with sqlite3.connect(self.logs_db) as conn:
             today_count = conn.execute("""
                 SELECT COUNT(*) FROM event_logs 
-                WHERE guild_id = ? AND DATE(timestamp) = DATE('now')
+                WHERE guild_id = ? AND timestamp >= DATE('now')
             """, (interaction.guild.id,)).fetchone()[0]
             
             week_count = conn.execute("""
@@ -198,7 +247,7 @@ class AdvancedLoggingSystem(commands.Cog):
         
         # Configuration période
         if periode == "today":
-            date_filter = "DATE(timestamp) = DATE('now')"
+            date_filter = "timestamp >= DATE('now')"
             period_name = "Aujourd'hui"
         elif periode == "week":
             date_filter = "timestamp > datetime('now', '-7 days')"
@@ -208,6 +257,7 @@ class AdvancedLoggingSystem(commands.Cog):
             period_name = "Ce mois"
         
         # Analyse des événements par type
+        await self.event_sink.flush()
         with sqlite3.connect(self.logs_db) as conn:
             event_stats = conn.execute(f"""
                 SELECT event_type, COUNT(*) as count 
@@ -278,7 +328,7 @@ class AdvancedLoggingSystem(commands.Cog):
         
         await interaction.followup.send(embed=embed)
 
-    async def configure_logs(self, interaction: discord.Interaction):
+    async def configure_logs(self, interaction: discord.Interaction, salon: Optional[discord.TextChannel] = None):
         """Configuration du système de logs"""
         if not interaction.user.guild_permissions.manage_guild:
             await interaction.response.send_message(
@@ -286,6 +336,16 @@ class AdvancedLoggingSystem(commands.Cog):
             )
             return
         
+        if salon is not None:
+            # Nouveau salon : événements et options actuels conservés
+            current = self.config_cache.get(interaction.guild.id)
+            self.set_log_config(
+                interaction.guild.id,
+                salon.id,
+                sorted(current.enabled_events) if current.enabled_events is not None else None,
+                current.options
+            )
+        
         embed = discord.Embed(
             title="⚙️ Configuration Logs Arsenal",
             description="Système de logs avancé avec surveillance temps réel",
@@ -323,36 +383,142 @@ class AdvancedLoggingSystem(commands.Cog):
         
         embed.add_field(
             name="💡 Configuration",
-            value="Utilisez `/logs config` avec un salon pour configurer les logs",
+            value="Utilisez `/logs action:Configurer salon:#salon` pour choisir le salon des logs",
             inline=False
         )
         
         await interaction.response.send_message(embed=embed)
 
-    def get_log_config(self, guild_id: int) -> Dict:
-        """Récupère la configuration des logs"""
+    def _load_log_config(self, guild_id: int) -> LogGuildConfig:
+        """Lit et parse la configuration des logs (appelé par le cache)"""
         with sqlite3.connect(self.logs_db) as conn:
             result = conn.execute(
-                "SELECT config_json, log_channel_id FROM log_config WHERE guild_id = ?",
+                "SELECT config_json, log_channel_id, enabled_events FROM log_config WHERE guild_id = ?",
                 (guild_id,)
             ).fetchone()
             
-            if result:
-                config = json.loads(result[0]) if result[0] else {}
-                config["log_channel_id"] = result[1]
-                config["enabled"] = bool(result[1])
-                return config
+            if not result:
+                return LogGuildConfig(guild_id=guild_id)
             
-            return {"enabled": False}
+            options = json.loads(result[0]) if result[0] else {}
+            enabled_events = frozenset(json.loads(result[2])) if result[2] else None
+            return LogGuildConfig(guild_id, result[1], enabled_events, options)
 
-    async def log_event(self, guild_id: int, event_type: str, user_id: int = None, 
-                       target_id: int = None, channel_id: int = None, event_data: str = ""):
-        """Enregistre un événement dans les logs"""
+    def get_log_config(self, guild_id: int) -> Dict:
+        """Récupère la configuration des logs"""
+        cached = self.config_cache.get(guild_id)
+        config = dict(cached.options)
+        config["log_channel_id"] = cached.log_channel_id
+        config["enabled"] = cached.enabled
+        return config
+
+    def set_log_config(self, guild_id: int, log_channel_id: Optional[int],
+                       enabled_events: Optional[List[str]] = None, options: Optional[Dict] = None):
+        """Enregistre la configuration des logs et invalide le cache du serveur"""
         with sqlite3.connect(self.logs_db) as conn:
             conn.execute("""
-                INSERT INTO event_logs (guild_id, event_type, user_id, target_id, channel_id, event_data)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (guild_id, event_type, user_id, target_id, channel_id, event_data))
+                INSERT OR REPLACE INTO log_config (guild_id, log_channel_id, enabled_events, config_json)
+                VALUES (?, ?, ?, ?)
+            """, (
+                guild_id,
+                log_channel_id,
+                json.dumps(enabled_events) if enabled_events is not None else None,
+                json.dumps(options or {})
+            ))
+        self.config_cache.invalidate(guild_id)
+
+    async def log_event(self, guild_id: int, event_type: str, user_id: int = None, 
+                       target_id: int = None, channel_id: int = None, event_data: str = ""):
+        """Enregistre un événement dans les logs (écrit par lots)"""
+        if not self.config_cache.get(guild_id).wants(event_type):
+            return
+        
+        # Même format que CURRENT_TIMESTAMP, mais à l'heure de l'événement
+        timestamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        row = (guild_id, event_type, user_id, target_id, channel_id, event_data, timestamp)
+        
+        if event_type in LOW_PRIORITY_EVENTS:
+            self.event_sink.offer(row, low_priority=True)
+        else:
+            await self.event_sink.put(row)
+
+    def prune_old_logs(self, retention_days: int = RETENTION_DAYS) -> int:
+        """Supprime les événements plus vieux que la rétention, jour par jour
+        
+        Chaque journée expirée est supprimée par tranches de PRUNE_BATCH lignes
+        (une transaction courte par tranche) pour ne pas bloquer l'écriture.
+        """
+        cutoff = (datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=retention_days)).strftime("%Y-%m-%d")
+        deleted = 0
+        
+        while True:
+            # Journée la plus ancienne encore présente (index sur timestamp)
+            with database_manager.connect(self.logs_db) as conn:
+                oldest = conn.execute("SELECT MIN(timestamp) FROM event_logs").fetchone()[0]
+            
+            if not oldest or oldest >= cutoff:
+                return deleted
+            
+            day_start = oldest[:10]
+            next_day = datetime.datetime.strptime(day_start, "%Y-%m-%d") + datetime.timedelta(days=1)
+            day_end = min(next_day.strftime("%Y-%m-%d"), cutoff)
+            
+            while True:
+                with database_manager.connect(self.logs_db) as conn:
+                    removed = conn.execute("""
+                        DELETE FROM event_logs WHERE id IN (
+                            SELECT id FROM event_logs
+                            WHERE timestamp >= ? AND timestamp < ?
+                            LIMIT ?
+                        )
+                    """, (day_start, day_end, PRUNE_BATCH)).rowcount
+                deleted += removed
+                if removed < PRUNE_BATCH:
+                    break
+
+    @tasks.loop(hours=6)
+    async def retention_task(self):
+        """Purge périodique des événements expirés"""
+        try:
+            deleted = await asyncio.get_running_loop().run_in_executor(None, self.prune_old_logs)
+            if deleted:
+                print(f"🗑️ [LOGS] {deleted} événements expirés supprimés")
+        except Exception as e:
+            print(f"❌ [LOGS] Erreur purge des logs: {e}")
+
+    @retention_task.before_loop
+    async def before_retention_task(self):
+        await self.bot.wait_until_ready()
+
+    async def cleanup_logs(self, interaction: discord.Interaction):
+        """Purge manuelle des logs expirés + état du tampon d'écriture"""
+        if not interaction.user.guild_permissions.manage_guild:
+            await interaction.response.send_message(
+                "❌ Permissions insuffisantes!", ephemeral=True
+            )
+            return
+        
+        await interaction.response.defer(ephemeral=True)
+        await self.event_sink.flush()
+        deleted = await asyncio.get_running_loop().run_in_executor(None, self.prune_old_logs)
+        stats = self.event_sink.stats
+        
+        embed = discord.Embed(
+            title="🗑️ Nettoyage des Logs",
+            description=f"**{deleted}** événements de plus de {RETENTION_DAYS} jours supprimés",
+            color=discord.Color.green()
+        )
+        embed.add_field(
+            name="📥 Tampon d'écriture",
+            value=(
+                f"Écrits: {stats['written']} ({stats['batches']} lots)\n"
+                f"En file: {self.event_sink.pending}\n"
+                f"Abandonnés (faible priorité): {stats['dropped_low_priority']}\n"
+                f"Abandonnés (file pleine): {stats['dropped_overflow']}"
+            ),
+            inline=False
+        )
+        await interaction.followup.send(embed=embed, ephemeral=True)
 
     # Listeners pour capturer les événements
     @commands.Cog.listener()
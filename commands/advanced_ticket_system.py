@@ -8,6 +8,8 @@ from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Any
 import os
 
+from core.scheduler import scheduler
+
 class TicketCategorySelect(discord.ui.Select):
     """Select pour choisir la catégorie de ticket"""
     def __init__(self, categories: Dict[str, Dict]):
@@ -245,7 +247,11 @@ class AdvancedTicketSystem(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.setup_database.start()
-        self.check_ticket_reminders.start()
+        # Rappels des tickets sans réponse toutes les 6 heures (job persisté du planificateur)
+        scheduler.every("ticket_reminders", 6 * 3600, self.check_ticket_reminders)
+    
+    def cog_unload(self):
+        scheduler.unregister("ticket_reminders")
     
     @tasks.loop(count=1)
     async def setup_database(self):
@@ -305,7 +311,6 @@ class AdvancedTicketSystem(commands.Cog):
     async def before_setup_database(self):
         await self.bot.wait_until_ready()
     
-    @tasks.loop(hours=6)
     async def check_ticket_reminders(self):
         """Vérifie les tickets nécessitant des rappels"""
         try:
@@ -14,18 +14,22 @@ Version: 2.0.0
 """
 
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord import app_commands
 import json
 import asyncio
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Any, Union
-import sqlite3
+from modules.sqlite_database import database_manager
+from core.scheduler import scheduler
 import logging
 import re
 
 logger = logging.getLogger(__name__)
 
+# Type des jobs du planificateur central (une échéance par annonce programmée)
+ANNOUNCEMENT_JOB = "announcement"
+
 # =============================================================================
 # BASE DE DONNÉES ANNONCES
 # =============================================================================
@@ -41,7 +45,7 @@ class AnnouncementsDB:
     
     def init_database(self):
         """Initialise la base de données"""
-        with sqlite3.connect(self.db_path) as conn:
+        with database_manager.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
             # Table des templates d'annonces
@@ -156,7 +160,7 @@ class AnnouncementsDB:
     
     def create_template(self, guild_id: int, template_data: Dict[str, Any]) -> Optional[int]:
         """Crée un nouveau template d'annonce"""
-        with sqlite3.connect(self.db_path) as conn:
+        with database_manager.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
             try:
@@ -196,7 +200,7 @@ class AnnouncementsDB:
     
     def get_templates(self, guild_id: int) -> List[Dict[str, Any]]:
         """Récupère tous les templates d'un serveur"""
-        with sqlite3.connect(self.db_path) as conn:
+        with database_manager.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -219,7 +223,7 @@ class AnnouncementsDB:
     
     def schedule_announcement(self, guild_id: int, announcement_data: Dict[str, Any], created_by: int) -> Optional[int]:
         """Programme une nouvelle annonce"""
-        with sqlite3.connect(self.db_path) as conn:
+        with database_manager.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
             try:
@@ -243,15 +247,65 @@ class AnnouncementsDB:
                 
                 scheduled_id = cursor.lastrowid
                 conn.commit()
+                self.schedule_job(scheduled_id, announcement_data['scheduled_time'])
                 return scheduled_id
-                
+            
             except Exception as e:
                 logger.error(f"Erreur programmation annonce: {e}")
                 return None
     
+    def schedule_job(self, announcement_id: int, scheduled_time: str):
+        """Planifie l'envoi de l'annonce à son heure exacte (planificateur central)"""
+        try:
+            scheduler.schedule(
+                ANNOUNCEMENT_JOB, scheduled_time, {"announcement_id": announcement_id},
+                key=f"{ANNOUNCEMENT_JOB}:{announcement_id}"
+            )
+        except Exception as e:
+            logger.error(f"Erreur planification annonce {announcement_id}: {e}")
+    
+    def schedule_unsent_announcements(self) -> int:
+        """Planifie les annonces non envoyées qui n'ont pas encore de job (démarrage)"""
+        with database_manager.connect(self.db_path) as conn:
+            rows = conn.execute('''
+                SELECT id, scheduled_time FROM scheduled_announcements
+                WHERE is_sent = FALSE AND is_active = TRUE
+            ''').fetchall()
+        
+        scheduled = 0
+        for announcement_id, scheduled_time in rows:
+            if not scheduler.get(f"{ANNOUNCEMENT_JOB}:{announcement_id}"):
+                self.schedule_job(announcement_id, scheduled_time)
+                scheduled += 1
+        return scheduled
+    
+    def get_announcement(self, announcement_id: int) -> Optional[Dict[str, Any]]:
+        """Récupère une annonce programmée encore à envoyer"""
+        with database_manager.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT * FROM scheduled_announcements 
+                WHERE id = ? AND is_sent = FALSE AND is_active = TRUE
+            ''', (announcement_id,))
+            
+            row = cursor.fetchone()
+            if not row:
+                return None
+            return self._parse_announcement(dict(zip([desc[0] for desc in cursor.description], row)))
+    
+    @staticmethod
+    def _parse_announcement(announcement: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse les colonnes JSON d'une annonce programmée"""
+        announcement['target_channels'] = json.loads(announcement['target_channels'])
+        announcement['mentions'] = json.loads(announcement['mentions']) if announcement['mentions'] else {}
+        announcement['embed_data'] = json.loads(announcement['embed_data']) if announcement['embed_data'] else {}
+        announcement['repeat_settings'] = json.loads(announcement['repeat_settings']) if announcement['repeat_settings'] else {}
+        return announcement
+    
     def get_pending_announcements(self) -> List[Dict[str, Any]]:
         """Récupère les annonces en attente d'envoi"""
-        with sqlite3.connect(self.db_path) as conn:
+        with database_manager.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -265,19 +319,13 @@ class AnnouncementsDB:
             columns = [desc[0] for desc in cursor.description]
             
             for row in cursor.fetchall():
-                announcement = dict(zip(columns, row))
-                # Parser les JSON
-                announcement['target_channels'] = json.loads(announcement['target_channels'])
-                announcement['mentions'] = json.loads(announcement['mentions']) if announcement['mentions'] else {}
-                announcement['embed_data'] = json.loads(announcement['embed_data']) if announcement['embed_data'] else {}
-                announcement['repeat_settings'] = json.loads(announcement['repeat_settings']) if announcement['repeat_settings'] else {}
-                announcements.append(announcement)
+                announcements.append(self._parse_announcement(dict(zip(columns, row))))
             
             return announcements
     
     def mark_announcement_sent(self, announcement_id: int, message_ids: List[int], channels_sent: List[int]) -> bool:
         """Marque une annonce comme envoyée"""
-        with sqlite3.connect(self.db_path) as conn:
+        with database_manager.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
             try:
@@ -324,7 +372,7 @@ class AnnouncementsDB:
     
     def get_guild_config(self, guild_id: int) -> Optional[Dict[str, Any]]:
         """Récupère la configuration d'annonces d'un serveur"""
-        with sqlite3.connect(self.db_path) as conn:
+        with database_manager.connect(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM announcement_config WHERE guild_id = ?', (guild_id,))
             
@@ -341,7 +389,7 @@ class AnnouncementsDB:
     
     def save_guild_config(self, guild_id: int, config: Dict[str, Any]) -> bool:
         """Sauvegarde la configuration d'annonces"""
-        with sqlite3.connect(self.db_path) as conn:
+        with database_manager.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
             try:
@@ -373,7 +421,7 @@ class AnnouncementsDB:
     
     def get_guild_stats(self, guild_id: int) -> Optional[Dict[str, Any]]:
         """Récupère les statistiques d'annonces d'un serveur"""
-        with sqlite3.connect(self.db_path) as conn:
+        with database_manager.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
             cursor.execute('SELECT * FROM announcement_stats WHERE guild_id = ?', (guild_id,))
@@ -386,7 +434,7 @@ class AnnouncementsDB:
     
     def _update_guild_stats(self, guild_id: int):
         """Met à jour les statistiques d'un serveur"""
-        with sqlite3.connect(self.db_path) as conn:
+        with database_manager.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
             try:
@@ -1177,11 +1225,12 @@ class AnnouncementsSystem(commands.Cog):
         self.db = AnnouncementsDB()
         self.manager = AnnouncementManager(bot, self.db)
         
-        # Démarrer la tâche d'envoi des annonces programmées
-        self.send_scheduled_announcements.start()
+        # Envoi des annonces programmées à leur échéance (planificateur central)
+        scheduler.register(ANNOUNCEMENT_JOB, self.send_scheduled_announcement)
+        self.db.schedule_unsent_announcements()
     
     def cog_unload(self):
-        self.send_scheduled_announcements.cancel()
+        scheduler.unregister(ANNOUNCEMENT_JOB)
     
     @app_commands.command(name="announcements", description="📢 Système de gestion des annonces")
     @app_commands.describe(action="Action à effectuer")
@@ -1269,29 +1318,16 @@ Créez votre première annonce maintenant !
         view = AnnouncementsSetupView(interaction.guild_id, self.db)
         await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
     
-    @tasks.loop(minutes=1)
-    async def send_scheduled_announcements(self):
-        """Tâche d'envoi des annonces programmées"""
-        try:
-            pending_announcements = self.db.get_pending_announcements()
-            
-            for announcement in pending_announcements:
-                success = await self.manager.send_announcement(announcement)
-                
-                if success:
-                    logger.info(f"Annonce {announcement['id']} envoyée avec succès")
-                else:
-                    logger.warning(f"Échec envoi annonce {announcement['id']}")
-                
-                # Petit délai entre les envois
-                await asyncio.sleep(1)
-                
-        except Exception as e:
-            logger.error(f"Erreur tâche annonces programmées: {e}")
-    
-    @send_scheduled_announcements.before_loop
-    async def before_send_scheduled_announcements(self):
-        await self.bot.wait_until_ready()
+    async def send_scheduled_announcement(self, job):
+        """Job du planificateur : envoie une annonce programmée arrivée à échéance"""
+        announcement = self.db.get_announcement(job.payload["announcement_id"])
+        if not announcement:
+            return  # Déjà envoyée ou désactivée
+        
+        if not await self.manager.send_announcement(announcement):
+            # Le planificateur retente avec un délai croissant
+            raise RuntimeError(f"Échec envoi annonce {announcement['id']}")
+        logger.info(f"Annonce {announcement['id']} envoyée avec succès")
 
 
 async def setup(bot):
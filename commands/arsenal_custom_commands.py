@@ -6,7 +6,7 @@ Par xerox3elite - Arsenal V4.5.1 ULTIMATE
 
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 import asyncio
 import aiosqlite
 import json
@@ -14,6 +14,19 @@ import re
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any
 
+from utils.command_template import CommandTemplate
+
+# Variables des réponses : calculées seulement si le template les utilise
+TEMPLATE_VARIABLES = {
+    'user': lambda interaction: interaction.user.display_name,
+    'mention': lambda interaction: interaction.user.mention,
+    'server': lambda interaction: interaction.guild.name,
+    'channel': lambda interaction: interaction.channel.name,
+    'date': lambda interaction: datetime.now().strftime('%d/%m/%Y'),
+    'time': lambda interaction: datetime.now().strftime('%H:%M:%S'),
+    'member_count': lambda interaction: str(interaction.guild.member_count),
+}
+
 class CustomCommandModal(discord.ui.Modal):
     """Modal pour créer une commande personnalisée"""
     
@@ -270,11 +283,21 @@ class CustomCommandView(discord.ui.View):
 class ArsenalCustomCommands(commands.Cog):
     """Système de commandes personnalisées ultra-avancé"""
     
+    USAGE_FLUSH_INTERVAL = 30  # secondes
+    
     def __init__(self, bot):
         self.bot = bot
         self.setup_database.start()
-        # Cache des commandes par guilde
+        # Cache des commandes par guilde : {guild_id: {nom: commande + template compilé}}
         self.guild_commands_cache = {}
+        # Utilisations pas encore écrites : {(guild_id, nom): nombre}
+        self.pending_usage = {}
+        self.flush_usage.start()
+    
+    async def cog_unload(self):
+        """Écrit les compteurs d'usage en attente avant le déchargement"""
+        self.flush_usage.cancel()
+        await self.write_pending_usage()
     
     @tasks.loop(count=1)
     async def setup_database(self):
@@ -405,7 +428,7 @@ class ArsenalCustomCommands(commands.Cog):
                         'description': row[1],
                         'response': row[2],
                         'permissions': json.loads(row[3]) if row[3] else [],
-                        'usage_count': row[4],
+                        'usage_count': row[4] + self.pending_usage.get((guild_id, row[0]), 0),
                         'created_at': row[5]
                     })
                 
@@ -418,7 +441,10 @@ class ArsenalCustomCommands(commands.Cog):
         """Recharge les commandes d'une guilde dans le cache"""
         try:
             commands = await self.get_guild_commands(guild_id)
-            self.guild_commands_cache[guild_id] = commands
+            known = tuple(TEMPLATE_VARIABLES)
+            for cmd in commands:
+                cmd['template'] = CommandTemplate(cmd['response'], known)
+            self.guild_commands_cache[guild_id] = {cmd['name']: cmd for cmd in commands}
             print(f"🔄 [CUSTOM] {len(commands)} commandes rechargées pour guilde {guild_id}")
         except Exception as e:
             print(f"❌ [CUSTOM] Erreur reload: {e}")
@@ -432,8 +458,7 @@ class ArsenalCustomCommands(commands.Cog):
             if guild_id not in self.guild_commands_cache:
                 await self.reload_guild_commands(guild_id)
             
-            commands = self.guild_commands_cache.get(guild_id, [])
-            cmd_data = next((cmd for cmd in commands if cmd['name'] == command_name), None)
+            cmd_data = self.guild_commands_cache.get(guild_id, {}).get(command_name)
             
             if not cmd_data:
                 return False
@@ -455,21 +480,8 @@ class ArsenalCustomCommands(commands.Cog):
                     )
                     return True
             
-            # Traiter les variables dans la réponse
-            response = cmd_data['response']
-            
-            variables = {
-                '{user}': interaction.user.display_name,
-                '{mention}': interaction.user.mention,
-                '{server}': interaction.guild.name,
-                '{channel}': interaction.channel.name,
-                '{date}': datetime.now().strftime('%d/%m/%Y'),
-                '{time}': datetime.now().strftime('%H:%M:%S'),
-                '{member_count}': str(interaction.guild.member_count)
-            }
-            
-            for var, value in variables.items():
-                response = response.replace(var, value)
+            # Traiter les variables dans la réponse (template compilé au chargement)
+            response = cmd_data['template'].render(TEMPLATE_VARIABLES, interaction)
             
             # Envoyer la réponse
             if len(response) <= 2000:
@@ -484,7 +496,7 @@ class ArsenalCustomCommands(commands.Cog):
                 await interaction.response.send_message(embed=embed)
             
             # Incrémenter compteur d'usage
-            await self.increment_usage(guild_id, command_name)
+            self.increment_usage(guild_id, command_name)
             
             return True
             
@@ -492,18 +504,34 @@ class ArsenalCustomCommands(commands.Cog):
             print(f"❌ [CUSTOM] Erreur execution: {e}")
             return False
 
-    async def increment_usage(self, guild_id: int, command_name: str):
-        """Incrémente le compteur d'usage d'une commande"""
+    def increment_usage(self, guild_id: int, command_name: str):
+        """Incrémente le compteur d'usage d'une commande (écrit par flush_usage)"""
+        key = (guild_id, command_name)
+        self.pending_usage[key] = self.pending_usage.get(key, 0) + 1
+    
+    async def write_pending_usage(self):
+        """Écrit tous les compteurs en attente en une transaction"""
+        if not self.pending_usage:
+            return
+        batch, self.pending_usage = self.pending_usage, {}
         try:
             async with aiosqlite.connect("data/custom_commands.db") as db:
-                await db.execute("""
+                await db.executemany("""
                     UPDATE custom_commands 
-                    SET usage_count = usage_count + 1 
+                    SET usage_count = usage_count + ? 
                     WHERE guild_id = ? AND command_name = ?
-                """, (guild_id, command_name))
+                """, [(count, guild_id, name) for (guild_id, name), count in batch.items()])
                 await db.commit()
         except Exception as e:
+            # Les compteurs repartent avec le lot suivant
+            for key, count in batch.items():
+                self.pending_usage[key] = self.pending_usage.get(key, 0) + count
             print(f"❌ [CUSTOM] Erreur usage: {e}")
+    
+    @tasks.loop(seconds=USAGE_FLUSH_INTERVAL)
+    async def flush_usage(self):
+        """Écrit périodiquement les compteurs d'usage"""
+        await self.write_pending_usage()
 
     # Commandes slash
     custom_group = app_commands.Group(name="custom", description="🛠️ Gestion des commandes personnalisées")
@@ -205,7 +205,7 @@ class ArsenalDiagnostic(commands.Cog):
             ".env",
             "main.py",
             "requirements.txt",
-            "bot_status.json",
+            "data/automod_config.json",
             "hunt_royal_cache.json"
         ]
         
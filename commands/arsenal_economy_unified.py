@@ -13,7 +13,9 @@ Gestion complète des ArsenalCoins avec :
 import discord
 from discord.ext import commands
 from discord import app_commands
-import sqlite3
+from modules.sqlite_database import database_manager
+from manager.economy_ledger import MINT, SHOP, EconomyLedger, TransferResult
+from utils.rank_index import RankIndex
 import json
 import os
 import asyncio
@@ -25,7 +27,6 @@ import time
 import discord
 from discord.ext import commands
 from discord import app_commands
-import sqlite3
 import datetime
 import random
 from typing import Optional
@@ -41,6 +42,7 @@ class ArsenalEconomyUnified(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db_path = "data/arsenal_economy_unified.db"
+        self._ranking = None  # RankIndex des soldes > 0, construit au premier classement
         self.init_database()
     
     def init_database(self):
@@ -49,7 +51,7 @@ class ArsenalEconomyUnified(commands.Cog):
         import os
         os.makedirs('data', exist_ok=True)
         
-        conn = sqlite3.connect(self.db_path)
+        conn = database_manager.connect(self.db_path)
         cursor = conn.cursor()
         
         print("[Economy Unified] Initialisation de la base de données...")
@@ -85,13 +87,47 @@ class ArsenalEconomyUnified(commands.Cog):
             )
         ''')
         
+        # Index couvrant du classement
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_arsenal_users_balance
+            ON arsenal_users (balance DESC, discord_id)
+        ''')
+        
         conn.commit()
         conn.close()
+        
+        # Grand livre: source de vérité des soldes, arsenal_users.balance en est le miroir
+        self.ledger = EconomyLedger.open(self.db_path)
+        imported = self.ledger.import_legacy("data/economie.json", self.db_path)
+        if imported:
+            self.sync_balances()
+            print(f"🏦 {imported} solde(s) repris dans le grand livre")
         print("✅ Base de données Arsenal Economy unifiée initialisée")
     
+    def sync_balances(self):
+        """Recopie les soldes du grand livre dans arsenal_users"""
+        def _sync(conn):
+            conn.execute('''
+                UPDATE arsenal_users
+                SET balance = (SELECT balance FROM ledger_accounts WHERE account = discord_id)
+                WHERE discord_id IN (SELECT account FROM ledger_accounts)
+            ''')
+        self.ledger.pool.run_sync(_sync)
+        self._ranking = None
+    
+    @property
+    def ranking(self) -> RankIndex:
+        """Classement des soldes, tenu à jour à chaque transaction"""
+        if self._ranking is None:
+            rows = self.ledger.pool.run_sync(lambda conn: conn.execute(
+                'SELECT discord_id, balance FROM arsenal_users WHERE balance > 0'
+            ).fetchall())
+            self._ranking = RankIndex(rows, min_score=1)
+        return self._ranking
+    
     def get_user_data(self, user_id: str) -> dict:
         """Récupère les données utilisateur"""
-        conn = sqlite3.connect(self.db_path)
+        conn = database_manager.connect(self.db_path)
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -122,14 +158,16 @@ class ArsenalEconomyUnified(commands.Cog):
     
     def create_user(self, user_id: str, username: str = None) -> dict:
         """Crée un nouvel utilisateur"""
-        conn = sqlite3.connect(self.db_path)
+        conn = database_manager.connect(self.db_path)
         cursor = conn.cursor()
         
+        # Un solde repris (economie.json) existe peut-être déjà dans le grand livre
+        balance = self.ledger.balance(user_id)
         cursor.execute('''
             INSERT OR REPLACE INTO arsenal_users 
             (discord_id, username, balance, total_earned, total_spent, level, xp, daily_streak)
-            VALUES (?, ?, 0, 0, 0, 1, 0, 0)
-        ''', (user_id, username))
+            VALUES (?, ?, ?, 0, 0, 1, 0, 0)
+        ''', (user_id, username, balance))
         
         conn.commit()
         conn.close()
@@ -138,7 +176,7 @@ class ArsenalEconomyUnified(commands.Cog):
         return {
             "discord_id": user_id,
             "username": username,
-            "balance": 0,
+            "balance": balance,
             "total_earned": 0,
             "total_spent": 0,
             "level": 1,
@@ -166,77 +204,93 @@ class ArsenalEconomyUnified(commands.Cog):
         except Exception as e:
             return {"status": "error", "message": str(e)}
     
-    def update_user_balance(self, user_id: str, amount: int, transaction_type: str, description: str = "") -> int:
-        """Met à jour le solde utilisateur et enregistre la transaction"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def post_transaction(self, user_id: str, amount: int, transaction_type: str, description: str = "",
+                         idempotency_key: str = None, counterparty: str = None, apply=None) -> TransferResult:
+        """Écrit un mouvement dans le grand livre et met à jour arsenal_users dans la même transaction
         
+        Lève InsufficientFunds si le débit rendrait le solde négatif. Avec une clé
+        d'idempotence déjà utilisée, rien n'est réécrit (result.replayed).
+        """
         # S'assurer que l'utilisateur existe
-        user_data = self.get_user_data(user_id)
-        
-        # Calculer nouveau solde
-        new_balance = user_data["balance"] + amount
-        new_total_earned = user_data["total_earned"] + (amount if amount > 0 else 0)
-        new_total_spent = user_data["total_spent"] + (abs(amount) if amount < 0 else 0)
-        
-        # Mettre à jour utilisateur
-        cursor.execute('''
-            UPDATE arsenal_users 
-            SET balance = ?, total_earned = ?, total_spent = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE discord_id = ?
-        ''', (new_balance, new_total_earned, new_total_spent, user_id))
-        
-        # Enregistrer transaction
-        cursor.execute('''
-            INSERT INTO arsenal_transactions (user_id, amount, type, description)
-            VALUES (?, ?, ?, ?)
-        ''', (user_id, amount, transaction_type, description))
-        
-        conn.commit()
-        conn.close()
+        self.get_user_data(user_id)
+        
+        def mirror(conn):
+            conn.execute('''
+                UPDATE arsenal_users 
+                SET balance = (SELECT balance FROM ledger_accounts WHERE account = ?),
+                    total_earned = total_earned + ?, total_spent = total_spent + ?, updated_at = CURRENT_TIMESTAMP
+                WHERE discord_id = ?
+            ''', (user_id, max(amount, 0), max(-amount, 0), user_id))
+            conn.execute('''
+                INSERT INTO arsenal_transactions (user_id, amount, type, description)
+                VALUES (?, ?, ?, ?)
+            ''', (user_id, amount, transaction_type, description))
+            if apply is not None:
+                apply(conn)
+        
+        if amount >= 0:
+            result = self.ledger.transfer(counterparty or MINT, user_id, amount, transaction_type,
+                                          description, idempotency_key, mirror)
+        else:
+            result = self.ledger.transfer(user_id, counterparty or MINT, -amount, transaction_type,
+                                          description, idempotency_key, mirror)
+        if self._ranking is not None:
+            self._ranking.update(user_id, result.balances[user_id])
+        return result
+    
+    def update_user_balance(self, user_id: str, amount: int, transaction_type: str, description: str = "") -> int:
+        """Met à jour le solde utilisateur et enregistre la transaction"""
+        if amount == 0:
+            return self.get_user_data(user_id)["balance"]
+        new_balance = self.post_transaction(user_id, amount, transaction_type, description).balances[user_id]
         
         print(f"✅ Balance mise à jour: {user_id} = {new_balance} AC ({amount:+} via {transaction_type})")
         return new_balance
     
+    def purchase(self, user_id: str, item_name: str, price: int, idempotency_key: str) -> TransferResult:
+        """Débite un achat vers le compte boutique (rejouable sans double débit)"""
+        return self.post_transaction(user_id, -price, "shop", f"Achat: {item_name}",
+                                     idempotency_key=idempotency_key, counterparty=SHOP)
+    
     def get_user_rank(self, user_id: str) -> int:
         """Récupère le rang de l'utilisateur"""
-        conn = sqlite3.connect(self.db_path)
+        rank = self.ranking.rank(user_id)
+        return rank if rank is not None else len(self.ranking) + 1
+    
+    def get_leaderboard_page(self, offset: int, limit: int) -> list:
+        """Page du classement : [(discord_id, username, balance, level)]"""
+        page = self.ranking.page(offset, limit)
+        if not page:
+            return []
+        
+        conn = database_manager.connect(self.db_path)
         cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT COUNT(*) + 1 FROM arsenal_users 
-            WHERE balance > (SELECT balance FROM arsenal_users WHERE discord_id = ?)
-        ''', (user_id,))
+        cursor.execute(f'''
+            SELECT discord_id, username, level FROM arsenal_users
+            WHERE discord_id IN ({", ".join("?" * len(page))})
+        ''', [discord_id for discord_id, _ in page])
         
-        rank = cursor.fetchone()[0]
+        details = {row[0]: row[1:] for row in cursor.fetchall()}
         conn.close()
-        return rank
+        
+        rows = []
+        for discord_id, balance in page:
+            username, level = details.get(discord_id, (None, 1))
+            rows.append((discord_id, username, balance, level))
+        return rows
     
     def get_leaderboard(self, limit: int = 10) -> list:
         """Récupère le leaderboard"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT discord_id, username, balance, level 
-            FROM arsenal_users 
-            WHERE balance > 0 
-            ORDER BY balance DESC 
-            LIMIT ?
-        ''', (limit,))
-        
-        leaderboard = cursor.fetchall()
-        conn.close()
-        
         return [
             {
-                "discord_id": row[0],
-                "username": row[1] or f"User#{row[0][-4:]}",
-                "balance": row[2],
-                "level": row[3],
+                "discord_id": discord_id,
+                "username": username or f"User#{discord_id[-4:]}",
+                "balance": balance,
+                "level": level,
                 "rank": idx + 1
             }
-            for idx, row in enumerate(leaderboard)
+            for idx, (discord_id, username, balance, level) in enumerate(self.get_leaderboard_page(0, limit))
         ]
     
     # ==================== COMMANDES DISCORD ====================
@@ -295,7 +349,7 @@ class ArsenalEconomyUnified(commands.Cog):
         
         # Mettre à jour le nom d'utilisateur si nécessaire
         if not user_data["username"] or user_data["username"] != target_user.display_name:
-            conn = sqlite3.connect(self.db_path)
+            conn = database_manager.connect(self.db_path)
             cursor = conn.cursor()
             cursor.execute('UPDATE arsenal_users SET username = ? WHERE discord_id = ?', 
                          (target_user.display_name, str(target_user.id)))
@@ -570,22 +624,24 @@ class ArsenalEconomyUnified(commands.Cog):
             gems_bonus = random.randint(1, 5)
             bonus_items.append(f"💎 +{gems_bonus} Arsenal Gems")
         
-        # Mettre à jour solde
-        new_balance = self.update_user_balance(user_id, final_reward, "Quantum Daily", f"Daily Reward x{total_multiplier:.2f}")
-        
-        # Mettre à jour streak et date
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        # Solde, streak et date dans la même transaction ; la clé empêche un double daily
         new_streak = current_streak + 1
-        cursor.execute('''
-            UPDATE arsenal_users 
-            SET daily_streak = ?, last_daily = ?, username = ?
-            WHERE discord_id = ?
-        ''', (new_streak, today.strftime("%Y-%m-%d"), interaction.user.display_name, user_id))
         
-        conn.commit()
-        conn.close()
+        def update_streak(conn):
+            conn.execute('''
+                UPDATE arsenal_users 
+                SET daily_streak = ?, last_daily = ?, username = ?
+                WHERE discord_id = ?
+            ''', (new_streak, today.strftime("%Y-%m-%d"), interaction.user.display_name, user_id))
+        
+        result = self.post_transaction(
+            user_id, final_reward, "Quantum Daily", f"Daily Reward x{total_multiplier:.2f}",
+            idempotency_key=f"daily:{user_id}:{today.isoformat()}", apply=update_streak
+        )
+        if result.replayed:
+            await handler.safe_edit(interaction, content="⏰ Daily déjà réclamé aujourd'hui !")
+            return
+        new_balance = result.balances[user_id]
         
         # === EMBED RÉVOLUTIONNAIRE DE RÉCOMPENSE ===
         embed = discord.Embed(
@@ -671,24 +727,9 @@ class ArsenalEconomyUnified(commands.Cog):
         limit = 10
         offset = (page - 1) * limit
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Récupérer les données avec pagination
-        cursor.execute('''
-            SELECT discord_id, username, balance, level 
-            FROM arsenal_users 
-            WHERE balance > 0 
-            ORDER BY balance DESC 
-            LIMIT ? OFFSET ?
-        ''', (limit, offset))
-        
-        leaderboard_data = cursor.fetchall()
-        
-        # Compter le total d'utilisateurs avec solde > 0
-        cursor.execute('SELECT COUNT(*) FROM arsenal_users WHERE balance > 0')
-        total_users = cursor.fetchone()[0]
-        conn.close()
+        # Page et total depuis l'index de classement
+        leaderboard_data = self.get_leaderboard_page(offset, limit)
+        total_users = len(self.ranking)
         
         if not leaderboard_data:
             embed = discord.Embed(
@@ -740,7 +781,7 @@ class ArsenalEconomyUnified(commands.Cog):
     
     def get_economy_stats(self) -> dict:
         """API pour le WebPanel - Statistiques économiques"""
-        conn = sqlite3.connect(self.db_path)
+        conn = database_manager.connect(self.db_path)
         cursor = conn.cursor()
         
         # Total coins en circulation
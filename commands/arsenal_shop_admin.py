@@ -11,6 +11,8 @@ import json
 import os
 from typing import Optional
 
+from manager.economy_ledger import InsufficientFunds
+
 class ArsenalShopAdmin(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -85,6 +87,47 @@ class ArsenalShopAdmin(commands.Cog):
         elif action == "reset":
             await self.reset_shop(interaction, shop_config, guild_id)
 
+    @app_commands.command(name="buy", description="🛒 Acheter un article de la boutique en ArsenalCoins")
+    @app_commands.describe(item_id="ID de l'article (voir /shop_admin action:list)")
+    async def buy(self, interaction: discord.Interaction, item_id: str):
+        """Achat d'un article : débit idempotent via le grand livre de l'économie"""
+        economy = self.bot.get_cog("ArsenalEconomyUnified")
+        shop_config = self.load_shop_config()
+        items = shop_config.get("servers", {}).get(str(interaction.guild_id), {}).get("items", {})
+        item = items.get(item_id) or shop_config.get("global_items", {}).get(item_id)
+
+        if economy is None or item is None:
+            embed = discord.Embed(
+                title="❌ Article Introuvable",
+                description=f"L'article `{item_id}` n'existe pas dans ce shop.",
+                color=0xff6b6b
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        try:
+            # La clé suit l'interaction : un renvoi de la même commande ne débite qu'une fois
+            result = economy.purchase(str(interaction.user.id), item["name"], int(item["price"]),
+                                      idempotency_key=f"shop:{interaction.id}")
+        except InsufficientFunds as e:
+            embed = discord.Embed(
+                title="❌ Solde Insuffisant",
+                description=f"Il vous faut **{e.amount:,} AC**, vous avez **{e.balance:,} AC**.",
+                color=0xff6b6b
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        embed = discord.Embed(
+            title="✅ Achat Effectué",
+            description=f"Vous avez acheté **{item['name']}** !",
+            color=0x00ff88,
+            timestamp=discord.utils.utcnow()
+        )
+        embed.add_field(name="💰 Prix", value=f"{int(item['price']):,} AC", inline=True)
+        embed.add_field(name="💎 Nouveau Solde", value=f"{result.balances[str(interaction.user.id)]:,} AC", inline=True)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
     async def show_shop_items(self, interaction: discord.Interaction, shop_config, guild_id: str):
         """Affiche les articles du shop"""
         embed = discord.Embed(
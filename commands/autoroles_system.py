@@ -14,13 +14,14 @@ Version: 2.0.0
 """
 
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord import app_commands
 import json
 import asyncio
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Any, Union
-import sqlite3
+from modules.sqlite_database import database_manager
+from core.scheduler import scheduler
 import logging
 
 logger = logging.getLogger(__name__)
@@ -38,7 +39,7 @@ class AutoRolesDB:
     
     def init_database(self):
         """Initialise la base de données"""
-        with sqlite3.connect(self.db_path) as conn:
+        with database_manager.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
             # Table des règles d'auto-rôles
@@ -105,7 +106,7 @@ class AutoRolesDB:
     
     def get_guild_config(self, guild_id: int) -> Optional[Dict[str, Any]]:
         """Récupère la configuration d'auto-rôles d'un serveur"""
-        with sqlite3.connect(self.db_path) as conn:
+        with database_manager.connect(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT * FROM autorole_config WHERE guild_id = ?
@@ -126,7 +127,7 @@ class AutoRolesDB:
     
     def save_guild_config(self, guild_id: int, config: Dict[str, Any]) -> bool:
         """Sauvegarde la configuration d'auto-rôles"""
-        with sqlite3.connect(self.db_path) as conn:
+        with database_manager.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
             try:
@@ -153,7 +154,7 @@ class AutoRolesDB:
     
     def create_autorole_rule(self, guild_id: int, rule_data: Dict[str, Any]) -> Optional[int]:
         """Crée une nouvelle règle d'auto-rôle"""
-        with sqlite3.connect(self.db_path) as conn:
+        with database_manager.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
             try:
@@ -189,7 +190,7 @@ class AutoRolesDB:
     
     def get_autorole_rules(self, guild_id: int, active_only: bool = True) -> List[Dict[str, Any]]:
         """Récupère toutes les règles d'auto-rôles d'un serveur"""
-        with sqlite3.connect(self.db_path) as conn:
+        with database_manager.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
             query = '''
@@ -219,7 +220,7 @@ class AutoRolesDB:
     
     def assign_role(self, guild_id: int, user_id: int, role_id: int, rule_id: int, reason: str = None, expires_at: datetime = None) -> bool:
         """Enregistre une attribution d'auto-rôle"""
-        with sqlite3.connect(self.db_path) as conn:
+        with database_manager.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
             try:
@@ -247,7 +248,7 @@ class AutoRolesDB:
     
     def get_user_autoroles(self, guild_id: int, user_id: int) -> List[Dict[str, Any]]:
         """Récupère tous les auto-rôles d'un utilisateur"""
-        with sqlite3.connect(self.db_path) as conn:
+        with database_manager.connect(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT a.*, r.rule_name, r.rule_type
@@ -267,7 +268,7 @@ class AutoRolesDB:
     
     def get_expired_roles(self) -> List[Dict[str, Any]]:
         """Récupère tous les rôles expirés à retirer"""
-        with sqlite3.connect(self.db_path) as conn:
+        with database_manager.connect(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT * FROM autorole_assignments 
@@ -284,7 +285,7 @@ class AutoRolesDB:
     
     def remove_assignment(self, assignment_id: int) -> bool:
         """Supprime une attribution d'auto-rôle"""
-        with sqlite3.connect(self.db_path) as conn:
+        with database_manager.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
             try:
@@ -872,11 +873,11 @@ class AutoRolesSystem(commands.Cog):
         self.db = AutoRolesDB()
         self.manager = AutoRoleManager(bot, self.db)
         
-        # Démarrer la tâche de nettoyage des rôles expirés
-        self.cleanup_expired_roles.start()
+        # Nettoyage des rôles expirés toutes les 30 minutes (job persisté du planificateur)
+        scheduler.every("autoroles_cleanup", 30 * 60, self.cleanup_expired_roles)
     
     def cog_unload(self):
-        self.cleanup_expired_roles.cancel()
+        scheduler.unregister("autoroles_cleanup")
     
     @app_commands.command(name="autoroles", description="🎭 Configuration des rôles automatiques")
     @app_commands.describe(action="Action à effectuer")
@@ -956,7 +957,6 @@ Configurez chaque aspect selon vos besoins !
         except Exception as e:
             logger.error(f"Erreur traitement arrivée membre {member}: {e}")
     
-    @tasks.loop(minutes=30)
     async def cleanup_expired_roles(self):
         """Tâche de nettoyage des rôles expirés"""
         try:
@@ -982,10 +982,6 @@ Configurez chaque aspect selon vos besoins !
                 
         except Exception as e:
             logger.error(f"Erreur nettoyage rôles expirés: {e}")
-    
-    @cleanup_expired_roles.before_loop
-    async def before_cleanup_expired_roles(self):
-        await self.bot.wait_until_ready()
 
 
 async def setup(bot):
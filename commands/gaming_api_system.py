@@ -23,6 +23,7 @@ import random
 
 # 🔒 Arsenal Protection Middleware
 from commands.arsenal_protection_middleware import require_registration
+from utils.game_data import GameDataService
 
 class GamingAPISystem(commands.Cog):
     """Système Gaming & API pour Arsenal V4"""
@@ -33,6 +34,8 @@ class GamingAPISystem(commands.Cog):
         self.mods_data_file = "data/minecraft_mods.json"
         self.gaming_stats_file = "data/gaming_stats.json"
         self.init_gaming_data()
+        # Fichiers chargés une fois et indexés, relus quand ils changent
+        self.game_data = GameDataService(self.hunters_data_file, self.mods_data_file)
 
     def init_gaming_data(self):
         """Initialise les données gaming"""
@@ -162,23 +165,14 @@ class GamingAPISystem(commands.Cog):
         """Affiche les informations d'un chasseur Hunt Royal"""
         
         try:
-            with open(self.hunters_data_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            catalog = self.game_data.hunters()
             
-            hunters = data.get("hunters", {})
+            # Recherche case-insensitive (index des noms)
+            found = catalog.find(name)
             
-            # Recherche case-insensitive
-            hunter_info = None
-            actual_name = None
-            for hunter_name, info in hunters.items():
-                if hunter_name.lower() == name.lower():
-                    hunter_info = info
-                    actual_name = hunter_name
-                    break
-            
-            if not hunter_info:
-                # Suggestions similaires
-                suggestions = [h for h in hunters.keys() if name.lower() in h.lower()]
+            if not found:
+                # Suggestions similaires (index de trigrammes)
+                suggestions = catalog.names.suggest(name)
                 if suggestions:
                     suggest_text = "\n".join([f"• {s}" for s in suggestions[:5]])
                     await interaction.response.send_message(
@@ -189,6 +183,8 @@ class GamingAPISystem(commands.Cog):
                     await interaction.response.send_message(f"❌ Chasseur `{name}` introuvable.", ephemeral=True)
                 return
             
+            actual_name, hunter_info = found
+            
             # Création embed
             embed = discord.Embed(
                 title=f"🏹 {actual_name}",
@@ -239,6 +235,11 @@ class GamingAPISystem(commands.Cog):
             
         except Exception as e:
             await interaction.response.send_message(f"❌ Erreur lors de la récupération des données: {e}", ephemeral=True)
+    
+    @hunter_info.autocomplete('name')
+    async def hunter_name_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        """Autocomplétion des noms de chasseurs depuis l'index en mémoire"""
+        return [app_commands.Choice(name=name, value=name) for name in self.game_data.hunters().names.complete(current)]
 
     @app_commands.command(name="hunters_list", description="🏹 Liste de tous les chasseurs disponibles")
     @require_registration("basic")  # Accessible à tous les membres enregistrés
@@ -246,10 +247,8 @@ class GamingAPISystem(commands.Cog):
         """Affiche la liste complète des chasseurs avec menu dropdown"""
         
         try:
-            with open(self.hunters_data_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            hunters = data.get("hunters", {})
+            catalog = self.game_data.hunters()
+            hunters = catalog.hunters
             
             if not hunters:
                 await interaction.response.send_message("❌ Aucun chasseur dans la base de données.", ephemeral=True)
@@ -265,7 +264,7 @@ class GamingAPISystem(commands.Cog):
             
             embed.add_field(
                 name="📊 Statistiques",
-                value=f"**Total chasseurs:** {len(hunters)}\n**Avec Awakening:** {sum(1 for h in hunters.values() if h.get('awa') == 'oui')}\n**Styles uniques:** {len(set(h.get('style', 'Unknown') for h in hunters.values()))}",
+                value=f"**Total chasseurs:** {len(hunters)}\n**Avec Awakening:** {catalog.awakening_count}\n**Styles uniques:** {catalog.style_count}",
                 inline=False
             )
             
@@ -282,8 +281,8 @@ class GamingAPISystem(commands.Cog):
         """Explore les mods Minecraft par catégorie"""
         
         try:
-            with open(self.mods_data_file, 'r', encoding='utf-8') as f:
-                mods_data = json.load(f)
+            catalog = self.game_data.mods()
+            mods_data = catalog.categories
             
             if not category:
                 # Liste des catégories disponibles
@@ -312,13 +311,12 @@ class GamingAPISystem(commands.Cog):
                 return
             
             # Afficher les mods de la catégorie
-            if category.lower() not in mods_data:
+            mods = catalog.category(category)
+            if mods is None:
                 available = ", ".join(mods_data.keys())
                 await interaction.response.send_message(f"❌ Catégorie inconnue.\n**Disponibles:** {available}", ephemeral=True)
                 return
             
-            mods = mods_data[category.lower()]
-            
             embed = discord.Embed(
                 title=f"🟦 Mods {category.title()}",
                 description=f"{len(mods)} mods disponibles dans cette catégorie",
@@ -337,10 +335,15 @@ class GamingAPISystem(commands.Cog):
                 embed.set_footer(text=f"Affichage des 10 premiers mods sur {len(mods)} total")
             
             await interaction.response.send_message(embed=embed)
-            
+        
         except Exception as e:
             await interaction.response.send_message(f"❌ Erreur: {e}", ephemeral=True)
-
+    
+    @minecraft_mods.autocomplete('category')
+    async def mod_category_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        """Autocomplétion des catégories de mods"""
+        return [app_commands.Choice(name=name, value=name) for name in self.game_data.mods().names.complete(current)]
+    
     @app_commands.command(name="fortnite_stats", description="🚀 Statistiques Fortnite d'un joueur")
     @require_registration("basic")  # Accessible à tous les membres enregistrés
     @app_commands.describe(username="Nom d'utilisateur Fortnite")
@@ -8,32 +8,100 @@
 import discord
 from discord import app_commands
 from discord.ext import commands, tasks
-import sqlite3
+from modules.sqlite_database import database_manager
 import asyncio
 import json
 import math
 import random
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Tuple
+from typing import Optional, Dict, List, Tuple, FrozenSet
 import aiofiles
 import os
+import glob
+import time
+from utils.guild_config_cache import GuildConfigCache
+from utils.rank_index import RankIndex
+from core.metrics import metrics
+
+DEFAULT_LEVEL_UP_MESSAGE = "🎉 {user} vient d'atteindre le niveau **{level}** ! 🎯"
+
+@dataclass(frozen=True)
+class LevelGuildConfig:
+    """Configuration de niveaux d'un serveur, déjà parsée (JSON -> frozenset/dict)"""
+    guild_id: str
+    enabled: bool = True
+    xp_per_message: int = 15
+    xp_per_voice_minute: int = 5
+    xp_cooldown: int = 60
+    level_up_channel: Optional[str] = None
+    level_up_message: str = DEFAULT_LEVEL_UP_MESSAGE
+    no_xp_channels: FrozenSet[str] = frozenset()
+    no_xp_roles: FrozenSet[str] = frozenset()
+    bonus_channels: Dict[str, float] = field(default_factory=dict)
+    bonus_roles: Dict[str, float] = field(default_factory=dict)
+    prestige_enabled: bool = True
+    prestige_level: int = 100
+    
+    @staticmethod
+    def _load_json(raw, default):
+        if not raw:
+            return default
+        try:
+            return json.loads(raw)
+        except (TypeError, ValueError):
+            return default
+    
+    @classmethod
+    def from_row(cls, row: Dict) -> "LevelGuildConfig":
+        """Construit la config typée depuis une ligne de level_config"""
+        return cls(
+            guild_id=str(row['guild_id']),
+            enabled=bool(row.get('enabled', True)),
+            xp_per_message=int(row.get('xp_per_message') or 15),
+            xp_per_voice_minute=int(row.get('xp_per_voice_minute') or 5),
+            xp_cooldown=int(row['xp_cooldown'] if row.get('xp_cooldown') is not None else 60),
+            level_up_channel=row.get('level_up_channel') or None,
+            level_up_message=row.get('level_up_message') or DEFAULT_LEVEL_UP_MESSAGE,
+            no_xp_channels=frozenset(str(c) for c in cls._load_json(row.get('no_xp_channels'), [])),
+            no_xp_roles=frozenset(str(r) for r in cls._load_json(row.get('no_xp_roles'), [])),
+            bonus_channels={str(k): float(v) for k, v in cls._load_json(row.get('bonus_channels'), {}).items()},
+            bonus_roles={str(k): float(v) for k, v in cls._load_json(row.get('bonus_roles'), {}).items()},
+            prestige_enabled=bool(row.get('prestige_enabled', True)),
+            prestige_level=int(row.get('prestige_level') or 100)
+        )
+    
+    def is_excluded(self, channel_id, role_ids) -> bool:
+        """Canal ou rôle exclu du gain d'XP"""
+        if str(channel_id) in self.no_xp_channels:
+            return True
+        return not self.no_xp_roles.isdisjoint(role_ids)
+    
+    def multiplier_for(self, channel_id, role_ids) -> float:
+        """Multiplicateur cumulé des bonus de canal et de rôles"""
+        multiplier = self.bonus_channels.get(str(channel_id), 1.0)
+        if self.bonus_roles:
+            for role_id in role_ids:
+                multiplier *= self.bonus_roles.get(role_id, 1.0)
+        return multiplier
 
 class LevelDB:
     """Gestionnaire de base de données pour le système de niveaux"""
     
     def __init__(self):
         self.db_path = "arsenal_levels.db"
+        self.config_cache = GuildConfigCache(lambda guild_id: LevelGuildConfig.from_row(self.get_guild_config(str(guild_id))))
         self.init_database()
-    
+
     def init_database(self):
         """Initialise toutes les tables de la base de données"""
-        conn = sqlite3.connect(self.db_path)
+        conn = database_manager.connect(self.db_path)
         cursor = conn.cursor()
         
-        # Table principale des utilisateurs
+        # Table principale des utilisateurs (un état par membre et par serveur)
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS user_levels (
-                user_id TEXT PRIMARY KEY,
+                user_id TEXT NOT NULL,
                 guild_id TEXT NOT NULL,
                 xp INTEGER DEFAULT 0,
                 level INTEGER DEFAULT 0,
@@ -45,9 +113,11 @@ class LevelDB:
                 boost_multiplier REAL DEFAULT 1.0,
                 boost_expires TEXT,
                 created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (guild_id, user_id)
             )
         ''')
+        self.migrate_user_levels_key(cursor)
         
         # Table des configurations de guild
         cursor.execute('''
@@ -109,12 +179,43 @@ class LevelDB:
             )
         ''')
         
+        # Dernier lot du journal XP appliqué (reprise après crash)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS xp_journal_state (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                last_batch INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        
+        # Index couvrant du classement (chargement de l'index en mémoire par serveur)
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_user_levels_rank
+            ON user_levels (guild_id, total_xp DESC, user_id)
+        ''')
+        
         conn.commit()
         conn.close()
     
+    def migrate_user_levels_key(self, cursor):
+        """Anciennes bases : clé primaire sur user_id seul, un membre ne gagnait de l'XP que sur un serveur"""
+        key = [column[1] for column in sorted(cursor.execute('PRAGMA table_info(user_levels)').fetchall(), key=lambda column: column[5]) if column[5]]
+        if key != ['user_id']:
+            return
+        
+        cursor.execute('SELECT sql FROM sqlite_master WHERE type = ? AND name = ?', ('table', 'user_levels'))
+        create_sql = cursor.fetchone()[0]
+        create_sql = create_sql.replace('user_id TEXT PRIMARY KEY', 'user_id TEXT NOT NULL', 1)
+        create_sql = create_sql.rstrip().rstrip(')').rstrip() + ',\n                PRIMARY KEY (guild_id, user_id)\n            )'
+        
+        cursor.execute('ALTER TABLE user_levels RENAME TO user_levels_old')
+        cursor.execute(create_sql)
+        cursor.execute('INSERT INTO user_levels SELECT * FROM user_levels_old')
+        cursor.execute('DROP TABLE user_levels_old')
+        print("[LEVELS] Table user_levels migrée vers la clé (guild_id, user_id)")
+    
     def get_user_level(self, user_id: str, guild_id: str) -> Dict:
         """Récupère les données de niveau d'un utilisateur"""
-        conn = sqlite3.connect(self.db_path)
+        conn = database_manager.connect(self.db_path)
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -132,7 +233,7 @@ class LevelDB:
     
     def create_user(self, user_id: str, guild_id: str) -> Dict:
         """Crée un nouvel utilisateur dans la base"""
-        conn = sqlite3.connect(self.db_path)
+        conn = database_manager.connect(self.db_path)
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -159,7 +260,7 @@ class LevelDB:
     
     def add_xp(self, user_id: str, guild_id: str, xp_amount: int, source: str = "message") -> Tuple[bool, int, int]:
         """Ajoute de l'XP et retourne (level_up, old_level, new_level)"""
-        conn = sqlite3.connect(self.db_path)
+        conn = database_manager.connect(self.db_path)
         cursor = conn.cursor()
         
         # Récupère les données actuelles
@@ -209,7 +310,7 @@ class LevelDB:
     
     def get_leaderboard(self, guild_id: str, limit: int = 10) -> List[Dict]:
         """Récupère le classement des utilisateurs"""
-        conn = sqlite3.connect(self.db_path)
+        conn = database_manager.connect(self.db_path)
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -233,7 +334,7 @@ class LevelDB:
     
     def get_guild_config(self, guild_id: str) -> Dict:
         """Récupère la configuration du serveur"""
-        conn = sqlite3.connect(self.db_path)
+        conn = database_manager.connect(self.db_path)
         cursor = conn.cursor()
         
         cursor.execute('SELECT * FROM level_config WHERE guild_id = ?', (guild_id,))
@@ -255,7 +356,7 @@ class LevelDB:
                 'xp_per_voice_minute': 5,
                 'xp_cooldown': 60,
                 'level_up_channel': None,
-                'level_up_message': "🎉 {user} vient d'atteindre le niveau **{level}** ! 🎯",
+                'level_up_message': DEFAULT_LEVEL_UP_MESSAGE,
                 'no_xp_channels': "[]",
                 'no_xp_roles': "[]",
                 'bonus_channels': "{}",
@@ -266,6 +367,14 @@ class LevelDB:
         
         conn.close()
         return config
+    
+    def get_cached_config(self, guild_id: str) -> LevelGuildConfig:
+        """Configuration typée du serveur, servie depuis le cache"""
+        return self.config_cache.get(guild_id)
+    
+    def invalidate_config(self, guild_id: Optional[str] = None):
+        """À appeler après chaque écriture dans level_config"""
+        self.config_cache.invalidate(guild_id)
 
 class LevelReward:
     """Gestionnaire des récompenses de niveau"""
@@ -275,7 +384,7 @@ class LevelReward:
     
     def add_reward(self, guild_id: str, level: int, reward_type: str, reward_data: Dict):
         """Ajoute une récompense de niveau"""
-        conn = sqlite3.connect(self.db.db_path)
+        conn = database_manager.connect(self.db.db_path)
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -288,7 +397,7 @@ class LevelReward:
     
     def get_rewards(self, guild_id: str, level: int) -> List[Dict]:
         """Récupère les récompenses pour un niveau donné"""
-        conn = sqlite3.connect(self.db.db_path)
+        conn = database_manager.connect(self.db.db_path)
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -328,6 +437,280 @@ class LevelReward:
             except Exception as e:
                 print(f"Erreur application récompense: {e}")
 
+class XPLedger:
+    """Tampon d'XP en mémoire (write-behind) avec journal de reprise
+    
+    Les gains sont agrégés par (guild, user) et la montée de niveau est
+    détectée sur l'état en cache. `flush()` écrit tout le lot en une seule
+    transaction. Chaque gain passe d'abord par le journal : un lot non
+    validé en base est rejoué au redémarrage.
+    """
+    
+    FLUSH_INTERVAL = 5  # secondes
+    IDLE_EVICTION = 900  # secondes sans activité avant d'oublier un état
+    
+    UPSERT_QUERY = '''
+        INSERT INTO user_levels (user_id, guild_id, xp, level, messages, voice_minutes,
+                                 total_xp, prestige, last_xp_gain, created_at, updated_at)
+        VALUES (?, ?, ?, xp_level(?), ?, ?, ?, 0, ?, ?, ?)
+        ON CONFLICT(guild_id, user_id) DO UPDATE SET
+            xp = xp + excluded.xp,
+            level = xp_level(xp + excluded.xp),
+            messages = messages + excluded.messages,
+            voice_minutes = voice_minutes + excluded.voice_minutes,
+            total_xp = total_xp + excluded.total_xp,
+            last_xp_gain = excluded.last_xp_gain,
+            updated_at = excluded.updated_at
+    '''
+    
+    def __init__(self, db: LevelDB):
+        self.db = db
+        self.pool = database_manager.pool(db.db_path)
+        self.journal_path = f"{db.db_path}.xpjournal"
+        self.states = {}     # (guild_id, user_id): état courant (base + gains en attente)
+        self.pending = {}    # (guild_id, user_id): [xp, messages, voice_minutes, last_xp_gain]
+        self.inflight = {}   # lot en cours d'écriture
+        self.inflight_batch = 0  # numéro de ce lot (comparé à xp_journal_state.last_batch)
+        self.last_seen = {}  # (guild_id, user_id): time.monotonic()
+        self.ranks = {}      # guild_id: RankIndex des total_xp, chargé au premier classement
+        self._flush_lock = asyncio.Lock()
+        self.batch_id = self._recover() + 1
+        self._journal = open(self.journal_path, 'a', encoding='utf-8', buffering=1)
+        metrics.gauge("arsenal_queue_depth", lambda: len(self.pending) + len(self.inflight), "Éléments en attente d'écriture", queue="xp_ledger")
+    
+    @staticmethod
+    def _load_rows(conn, guild_id: str, user_ids: List[str]) -> Tuple[int, Dict[str, Dict]]:
+        """Lignes des membres et dernier lot appliqué, lus dans la même transaction"""
+        conn.execute('BEGIN')
+        row = conn.execute('SELECT last_batch FROM xp_journal_state WHERE id = 1').fetchone()
+        cursor = conn.execute(
+            f'SELECT * FROM user_levels WHERE guild_id = ? AND user_id IN ({",".join("?" * len(user_ids))})',
+            (guild_id, *user_ids)
+        )
+        columns = [desc[0] for desc in cursor.description]
+        rows = {}
+        for values in cursor.fetchall():
+            data = dict(zip(columns, values))
+            rows[data['user_id']] = data
+        return (row[0] if row else 0), rows
+    
+    def _build_state(self, key: Tuple[str, str], row: Optional[Dict], applied_batch: int) -> Dict:
+        """État courant : ligne en base + gains pas encore contenus dans cette ligne"""
+        guild_id, user_id = key
+        state = dict(row) if row else {
+            'user_id': user_id, 'guild_id': guild_id, 'xp': 0, 'level': 0, 'messages': 0,
+            'voice_minutes': 0, 'total_xp': 0, 'prestige': 0, 'boost_multiplier': 1.0, 'boost_expires': None
+        }
+        # Le lot en vol est déjà dans la ligne si sa transaction a été validée avant la lecture
+        batches = [self.pending] if applied_batch >= self.inflight_batch else [self.inflight, self.pending]
+        for batch in batches:
+            delta = batch.get(key)
+            if delta:
+                state['xp'] += delta[0]
+                state['total_xp'] += delta[0]
+                state['messages'] += delta[1]
+                state['voice_minutes'] += delta[2]
+        state['level'] = self.db.calculate_level(state['xp'])
+        boost_expires = state.get('boost_expires')
+        state['boost_until'] = datetime.fromisoformat(boost_expires) if boost_expires else None
+        return state
+    
+    def get_state(self, user_id: str, guild_id: str) -> Dict:
+        """État de niveau d'un membre, chargé une seule fois depuis la base"""
+        key = (guild_id, user_id)
+        self.last_seen[key] = time.monotonic()
+        state = self.states.get(key)
+        if state is None:
+            applied_batch, rows = self.pool.run_sync(self._load_rows, guild_id, [user_id])
+            state = self.states[key] = self._build_state(key, rows.get(user_id), applied_batch)
+        return state
+    
+    def invalidate(self, guild_id: str, user_id: Optional[str] = None):
+        """Oublie l'état en cache (rechargé au prochain accès) sans perdre les gains en attente"""
+        if user_id is not None:
+            self.states.pop((guild_id, user_id), None)
+            return
+        for key in [key for key in self.states if key[0] == guild_id]:
+            del self.states[key]
+    
+    def add_xp(self, user_id: str, guild_id: str, xp_amount: int, source: str = "message") -> Tuple[bool, int, int]:
+        """Ajoute de l'XP en mémoire et retourne (level_up, old_level, new_level)"""
+        state = self.get_state(user_id, guild_id)
+        now = datetime.now().isoformat()
+        
+        old_level = state['level']
+        state['xp'] += xp_amount
+        state['total_xp'] += xp_amount
+        state['level'] = self.db.calculate_level(state['xp'])
+        
+        delta = self.pending.get((guild_id, user_id))
+        if delta is None:
+            delta = self.pending[(guild_id, user_id)] = [0, 0, 0, now]
+        delta[0] += xp_amount
+        if source == "message":
+            delta[1] += 1
+            state['messages'] += 1
+        else:  # voice
+            delta[2] += 1
+            state['voice_minutes'] += 1
+        delta[3] = now
+        
+        self._journal.write(json.dumps([self.batch_id, guild_id, user_id, xp_amount, source, now]) + "\n")
+        
+        ranking = self.ranks.get(guild_id)
+        if ranking is not None:
+            ranking.update(user_id, state['total_xp'])
+        
+        return state['level'] > old_level, old_level, state['level']
+    
+    async def ranking(self, guild_id: str) -> RankIndex:
+        """Classement du serveur, construit une fois puis tenu à jour par add_xp"""
+        ranking = self.ranks.get(guild_id)
+        if ranking is None:
+            rows = await self.pool.run(lambda conn: conn.execute(
+                'SELECT user_id, total_xp FROM user_levels WHERE guild_id = ?', (guild_id,)
+            ).fetchall())
+            ranking = self.ranks.get(guild_id)
+            if ranking is None:
+                ranking = RankIndex(rows)
+                # Les gains pas encore écrits en base sont dans l'état en cache
+                for (state_guild, user_id), state in self.states.items():
+                    if state_guild == guild_id:
+                        ranking.update(user_id, state['total_xp'])
+                self.ranks[guild_id] = ranking
+        return ranking
+    
+    async def leaderboard_page(self, guild_id: str, offset: int, limit: int) -> List[Dict]:
+        """Page du classement : [{user_id, level, total_xp, rank}]"""
+        ranking = await self.ranking(guild_id)
+        entries = ranking.page(offset, limit)
+        
+        # Membres hors cache : une seule lecture groupée, hors de la boucle.
+        # Le verrou empêche un lot d'être validé pendant la lecture puis retiré de inflight.
+        levels = {}
+        missing = [user_id for user_id, _ in entries if (guild_id, user_id) not in self.states]
+        if missing:
+            async with self._flush_lock:
+                applied_batch, rows = await self.pool.run(self._load_rows, guild_id, missing)
+                for user_id in missing:
+                    key = (guild_id, user_id)
+                    state = self.states.get(key) or self._build_state(key, rows.get(user_id), applied_batch)
+                    levels[user_id] = state['level']
+        
+        page = []
+        for position, (user_id, total_xp) in enumerate(entries, start=offset + 1):
+            level = levels[user_id] if user_id in levels else self.states[(guild_id, user_id)]['level']
+            page.append({'user_id': user_id, 'level': level, 'total_xp': total_xp, 'rank': position})
+        return page
+    
+    def _write_batch(self, conn, batch: Dict, batch_id: int):
+        """Écrit un lot agrégé (thread du pool, une seule transaction)"""
+        conn.create_function("xp_level", 1, self.db.calculate_level, deterministic=True)
+        now = datetime.now().isoformat()
+        conn.executemany(self.UPSERT_QUERY, [
+            (user_id, guild_id, xp, xp, messages, voice_minutes, xp, last_gain, now, now)
+            for (guild_id, user_id), (xp, messages, voice_minutes, last_gain) in batch.items()
+        ])
+        conn.execute('''
+            INSERT INTO xp_journal_state (id, last_batch) VALUES (1, ?)
+            ON CONFLICT(id) DO UPDATE SET last_batch = excluded.last_batch
+        ''', (batch_id,))
+    
+    def _journal_files(self) -> List[Tuple[int, str]]:
+        """Journaux tournés (`<journal>.<lot>`) triés par lot"""
+        files = []
+        for path in glob.glob(f"{glob.escape(self.journal_path)}.*"):
+            suffix = path.rsplit('.', 1)[1]
+            if suffix.isdigit():
+                files.append((int(suffix), path))
+        return sorted(files)
+    
+    def _recover(self) -> int:
+        """Rejoue les lots journalisés non validés en base et retourne le dernier lot"""
+        conn = database_manager.connect(self.db.db_path)
+        row = conn.execute('SELECT last_batch FROM xp_journal_state WHERE id = 1').fetchone()
+        conn.close()
+        last_batch = row[0] if row else 0
+        
+        paths = [path for _, path in self._journal_files()]
+        if os.path.exists(self.journal_path):
+            paths.append(self.journal_path)
+        
+        batch, max_batch = {}, last_batch
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry_batch, guild_id, user_id, xp, source, when = json.loads(line)
+                    except ValueError:
+                        continue  # ligne tronquée par le crash
+                    max_batch = max(max_batch, entry_batch)
+                    if entry_batch <= last_batch:
+                        continue
+                    delta = batch.setdefault((guild_id, user_id), [0, 0, 0, when])
+                    delta[0] += xp
+                    delta[1 if source == "message" else 2] += 1
+                    delta[3] = when
+        
+        if max_batch > last_batch:
+            self.pool.run_sync(self._write_batch, batch, max_batch)
+            print(f"[LEVELS] Journal XP rejoué: {len(batch)} membre(s)")
+        for path in paths:
+            os.remove(path)
+        return max_batch
+    
+    async def flush(self):
+        """Écrit les gains en attente en une seule transaction"""
+        async with self._flush_lock:
+            if not self.pending:
+                return
+            
+            batch, self.pending = self.pending, {}
+            batch_id = self.batch_id
+            self.batch_id += 1
+            self.inflight, self.inflight_batch = batch, batch_id
+            
+            # Rotation du journal : le lot en cours d'écriture garde son fichier
+            self._journal.close()
+            os.replace(self.journal_path, f"{self.journal_path}.{batch_id}")
+            self._journal = open(self.journal_path, 'a', encoding='utf-8', buffering=1)
+            
+            try:
+                await self.pool.run(self._write_batch, batch, batch_id)
+            except Exception as e:
+                # Le lot repart avec le suivant, son journal reste sur disque
+                for key, (xp, messages, voice_minutes, last_gain) in batch.items():
+                    delta = self.pending.setdefault(key, [0, 0, 0, last_gain])
+                    delta[0] += xp
+                    delta[1] += messages
+                    delta[2] += voice_minutes
+                print(f"[LEVELS] Erreur écriture lot XP {batch_id}: {e}")
+                return
+            finally:
+                self.inflight = {}
+            
+            for file_batch, path in self._journal_files():
+                if file_batch <= batch_id:
+                    os.remove(path)
+            
+            self._evict_idle()
+    
+    def _evict_idle(self):
+        """Oublie les membres inactifs pour borner la mémoire"""
+        limit = time.monotonic() - self.IDLE_EVICTION
+        for key in [key for key, seen in self.last_seen.items() if seen < limit]:
+            if key not in self.pending:
+                del self.last_seen[key]
+                self.states.pop(key, None)
+    
+    async def close(self):
+        """Vide le tampon et ferme le journal (déchargement du cog)"""
+        await self.flush()
+        async with self._flush_lock:
+            self._journal.close()
+            if not self.pending and os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+
 class LevelManager:
     """Gestionnaire principal du système de niveaux"""
     
@@ -335,13 +718,15 @@ class LevelManager:
         self.bot = bot
         self.db = LevelDB()
         self.rewards = LevelReward(self.db)
+        self.ledger = XPLedger(self.db)
         self.xp_cooldowns = {}  # user_id: timestamp
     
-    def can_gain_xp(self, user_id: str, guild_id: str) -> bool:
+    def can_gain_xp(self, user_id: str, guild_id: str, config: Optional[LevelGuildConfig] = None) -> bool:
         """Vérifie si l'utilisateur peut gagner de l'XP"""
-        config = self.db.get_guild_config(guild_id)
-        cooldown = config.get('xp_cooldown', 60)
-        
+        if config is None:
+            config = self.db.get_cached_config(guild_id)
+        cooldown = config.xp_cooldown
+
         key = f"{user_id}_{guild_id}"
         now = datetime.now().timestamp()
         
@@ -361,71 +746,53 @@ class LevelManager:
         user_id = str(message.author.id)
         
         # Vérifie la configuration
-        config = self.db.get_guild_config(guild_id)
-        if not config.get('enabled', True):
-            return
-        
-        # Vérifie le cooldown
-        if not self.can_gain_xp(user_id, guild_id):
+        config = self.db.get_cached_config(guild_id)
+        if not config.enabled:
             return
         
         # Vérifie les canaux/rôles exclus
-        no_xp_channels = json.loads(config.get('no_xp_channels', '[]'))
-        if str(message.channel.id) in no_xp_channels:
+        user_role_ids = [str(role.id) for role in message.author.roles]
+        if config.is_excluded(message.channel.id, user_role_ids):
             return
         
-        no_xp_roles = json.loads(config.get('no_xp_roles', '[]'))
-        user_role_ids = [str(role.id) for role in message.author.roles]
-        if any(role_id in no_xp_roles for role_id in user_role_ids):
+        # Vérifie le cooldown
+        if not self.can_gain_xp(user_id, guild_id, config):
             return
         
         # Calcule l'XP à donner
-        base_xp = config.get('xp_per_message', 15)
+        base_xp = config.xp_per_message
         xp_amount = random.randint(base_xp - 5, base_xp + 10)
         
         # Applique les bonus
         xp_amount = await self.apply_bonuses(message.author, message.channel, xp_amount, config)
         
-        # Ajoute l'XP
-        level_up, old_level, new_level = self.db.add_xp(user_id, guild_id, xp_amount)
-        
+        # Ajoute l'XP (tampon mémoire, écrit en base par lots)
+        level_up, old_level, new_level = self.ledger.add_xp(user_id, guild_id, xp_amount)
+
         if level_up:
             await self.handle_level_up(message.guild, message.author, old_level, new_level, message.channel)
     
-    async def apply_bonuses(self, user: discord.Member, channel: discord.TextChannel, base_xp: int, config: Dict) -> int:
+    async def apply_bonuses(self, user: discord.Member, channel: discord.TextChannel, base_xp: int, config: LevelGuildConfig) -> int:
         """Applique les bonus d'XP"""
-        multiplier = 1.0
-        
-        # Bonus de canal
-        bonus_channels = json.loads(config.get('bonus_channels', '{}'))
-        if str(channel.id) in bonus_channels:
-            multiplier *= bonus_channels[str(channel.id)]
-        
-        # Bonus de rôle
-        bonus_roles = json.loads(config.get('bonus_roles', '{}'))
-        for role in user.roles:
-            if str(role.id) in bonus_roles:
-                multiplier *= bonus_roles[str(role.id)]
-        
+        # Bonus de canal et de rôle
+        multiplier = config.multiplier_for(channel.id, (str(role.id) for role in user.roles))
+
         # Bonus personnel de l'utilisateur
-        user_data = self.db.get_user_level(str(user.id), str(user.guild.id))
-        if user_data.get('boost_expires'):
-            boost_expires = datetime.fromisoformat(user_data['boost_expires'])
-            if datetime.now() < boost_expires:
-                multiplier *= user_data.get('boost_multiplier', 1.0)
+        user_data = self.ledger.get_state(str(user.id), str(user.guild.id))
+        if user_data['boost_until'] and datetime.now() < user_data['boost_until']:
+            multiplier *= user_data.get('boost_multiplier', 1.0)
         
         return int(base_xp * multiplier)
     
     async def handle_level_up(self, guild: discord.Guild, user: discord.Member, old_level: int, new_level: int, channel: discord.TextChannel):
         """Gère les montées de niveau"""
-        config = self.db.get_guild_config(str(guild.id))
+        config = self.db.get_cached_config(str(guild.id))
         
         # Message de niveau
-        level_up_message = config.get('level_up_message', "🎉 {user} vient d'atteindre le niveau **{level}** ! 🎯")
-        formatted_message = level_up_message.format(user=user.mention, level=new_level, old_level=old_level)
+        formatted_message = config.level_up_message.format(user=user.mention, level=new_level, old_level=old_level)
         
         # Canal de niveau
-        level_up_channel_id = config.get('level_up_channel')
+        level_up_channel_id = config.level_up_channel
         if level_up_channel_id:
             level_channel = guild.get_channel(int(level_up_channel_id))
             if level_channel:
@@ -443,7 +810,7 @@ class LevelManager:
         
         # Calcule l'XP pour le prochain niveau
         next_level_xp = self.db.xp_for_level(new_level + 1)
-        current_xp = self.db.get_user_level(str(user.id), str(guild.id))['xp']
+        current_xp = self.ledger.get_state(str(user.id), str(guild.id))['xp']
         remaining_xp = next_level_xp - current_xp
         embed.add_field(name="XP jusqu'au prochain niveau", value=f"**{remaining_xp:,}**", inline=True)
         
@@ -512,7 +879,7 @@ class GeneralConfigModal(discord.ui.Modal):
         self.add_item(self.level_up_message)
     
     async def on_submit(self, interaction: discord.Interaction):
-        conn = sqlite3.connect(self.db.db_path)
+        conn = database_manager.connect(self.db.db_path)
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -529,7 +896,8 @@ class GeneralConfigModal(discord.ui.Modal):
         
         conn.commit()
         conn.close()
-        
+        self.db.invalidate_config(self.guild_id)
+
         embed = discord.Embed(
             title="✅ Configuration Mise à Jour",
             description="Les paramètres généraux ont été sauvegardés !",
@@ -573,7 +941,7 @@ class RewardsConfigModal(discord.ui.Modal):
             # Ajoute la récompense
             reward_data = {"role_id": role_id, "role_name": role.name}
             
-            conn = sqlite3.connect(self.db.db_path)
+            conn = database_manager.connect(self.db.db_path)
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO level_rewards (guild_id, level, reward_type, reward_data)
@@ -626,7 +994,7 @@ class ExclusionsConfigModal(discord.ui.Modal):
         channel_ids = [id.strip() for id in self.no_xp_channels.value.split(',') if id.strip()]
         role_ids = [id.strip() for id in self.no_xp_roles.value.split(',') if id.strip()]
         
-        conn = sqlite3.connect(self.db.db_path)
+        conn = database_manager.connect(self.db.db_path)
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -642,7 +1010,8 @@ class ExclusionsConfigModal(discord.ui.Modal):
         
         conn.commit()
         conn.close()
-        
+        self.db.invalidate_config(self.guild_id)
+
         embed = discord.Embed(
             title="✅ Exclusions Mises à Jour",
             description="Les canaux et rôles exclus ont été sauvegardés !",
@@ -688,7 +1057,7 @@ class BonusConfigModal(discord.ui.Modal):
             bonus_channels = json.loads(config.get('bonus_channels', '{}'))
             bonus_channels[channel_id] = multiplier
             
-            conn = sqlite3.connect(self.db.db_path)
+            conn = database_manager.connect(self.db.db_path)
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -703,7 +1072,8 @@ class BonusConfigModal(discord.ui.Modal):
             
             conn.commit()
             conn.close()
-            
+            self.db.invalidate_config(self.guild_id)
+
             embed = discord.Embed(
                 title="✅ Bonus Ajouté",
                 description=f"Le canal **{channel.name}** aura un multiplicateur de **x{multiplier}** !",
@@ -723,10 +1093,13 @@ class LevelSystem(commands.Cog):
         self.manager = LevelManager(bot)
         self.voice_tracking = {}  # user_id: join_time
         self.voice_xp_task.start()
+        self.xp_flush_task.start()
     
-    def cog_unload(self):
+    async def cog_unload(self):
         self.voice_xp_task.cancel()
-    
+        self.xp_flush_task.cancel()
+        await self.manager.ledger.close()
+
     @commands.Cog.listener()
     async def on_message(self, message):
         """Listener pour les messages"""
@@ -755,11 +1128,10 @@ class LevelSystem(commands.Cog):
                 
                 if minutes > 0:
                     # Donne de l'XP vocal
-                    config = self.manager.db.get_guild_config(str(member.guild.id))
-                    xp_per_minute = config.get('xp_per_voice_minute', 5)
-                    total_xp = minutes * xp_per_minute
-                    
-                    level_up, old_level, new_level = self.manager.db.add_xp(
+                    config = self.manager.db.get_cached_config(str(member.guild.id))
+                    total_xp = minutes * config.xp_per_voice_minute
+
+                    level_up, old_level, new_level = self.manager.ledger.add_xp(
                         str(member.id), str(member.guild.id), total_xp, "voice"
                     )
                     
@@ -783,11 +1155,11 @@ class LevelSystem(commands.Cog):
                 for guild in self.bot.guilds:
                     member = guild.get_member(int(user_id))
                     if member and member.voice and member.voice.channel:
-                        config = self.manager.db.get_guild_config(str(guild.id))
-                        if config.get('enabled', True):
-                            xp_amount = config.get('xp_per_voice_minute', 5)
-                            
-                            level_up, old_level, new_level = self.manager.db.add_xp(
+                        config = self.manager.db.get_cached_config(str(guild.id))
+                        if config.enabled:
+                            xp_amount = config.xp_per_voice_minute
+
+                            level_up, old_level, new_level = self.manager.ledger.add_xp(
                                 user_id, str(guild.id), xp_amount, "voice"
                             )
                             
@@ -798,6 +1170,11 @@ class LevelSystem(commands.Cog):
             except Exception as e:
                 print(f"Erreur XP vocal: {e}")
     
+    @tasks.loop(seconds=XPLedger.FLUSH_INTERVAL)
+    async def xp_flush_task(self):
+        """Écrit le tampon d'XP en base"""
+        await self.manager.ledger.flush()
+
     @app_commands.command(name="level", description="🎯 Affiche votre niveau ou celui d'un utilisateur")
     async def level(self, interaction: discord.Interaction, user: Optional[discord.Member] = None):
         target = user or interaction.user
@@ -806,8 +1183,8 @@ class LevelSystem(commands.Cog):
             await interaction.response.send_message("❌ Les bots n'ont pas de niveau !", ephemeral=True)
             return
         
-        user_data = self.manager.db.get_user_level(str(target.id), str(interaction.guild.id))
-        
+        user_data = self.manager.ledger.get_state(str(target.id), str(interaction.guild.id))
+
         # Calcule les informations de niveau
         current_level = user_data['level']
         current_xp = user_data['xp']
@@ -819,8 +1196,9 @@ class LevelSystem(commands.Cog):
         progress = ((current_xp - current_level_xp) / (next_level_xp - current_level_xp)) * 100
         
         # Calcule le rang
-        leaderboard = self.manager.db.get_leaderboard(str(interaction.guild.id), 1000)
-        rank = next((i+1 for i, user in enumerate(leaderboard) if user['user_id'] == str(target.id)), "N/A")
+        ranking = await self.manager.ledger.ranking(str(interaction.guild.id))
+        ranking.update(str(target.id), total_xp)
+        rank = ranking.rank(str(target.id))
         
         # Crée l'embed
         embed = discord.Embed(
@@ -857,15 +1235,12 @@ class LevelSystem(commands.Cog):
         limit = 10
         offset = (page - 1) * limit
         
-        leaderboard = self.manager.db.get_leaderboard(str(interaction.guild.id), offset + limit)
+        page_data = await self.manager.ledger.leaderboard_page(str(interaction.guild.id), offset, limit)
         
-        if not leaderboard:
+        if not page_data:
             await interaction.response.send_message("❌ Aucune donnée de niveau trouvée !", ephemeral=True)
             return
         
-        # Filtre pour la page
-        page_data = leaderboard[offset:offset + limit]
-        
         embed = discord.Embed(
             title=f"🏆 Classement des Niveaux - Page {page}",
             color=0xffd700
@@ -891,7 +1266,7 @@ class LevelSystem(commands.Cog):
         embed.description = description
         
         # Navigation
-        view = LeaderboardView(self.manager.db, interaction.guild.id, page)
+        view = LeaderboardView(self.manager.ledger, str(interaction.guild.id), page)
         
         await interaction.response.send_message(embed=embed, view=view)
     
@@ -912,17 +1287,18 @@ class LevelSystem(commands.Cog):
         guild_id = str(interaction.guild.id)
         
         if action == "toggle":
-            config = self.manager.db.get_guild_config(guild_id)
-            new_status = not config.get('enabled', True)
+            config = self.manager.db.get_cached_config(guild_id)
+            new_status = not config.enabled
             
-            conn = sqlite3.connect(self.manager.db.db_path)
+            conn = database_manager.connect(self.manager.db.db_path)
             cursor = conn.cursor()
             cursor.execute('''
                 UPDATE level_config SET enabled = ?, updated_at = ? WHERE guild_id = ?
             ''', (new_status, datetime.now().isoformat(), guild_id))
             conn.commit()
             conn.close()
-            
+            self.manager.db.invalidate_config(guild_id)
+
             status_text = "activé" if new_status else "désactivé"
             embed = discord.Embed(
                 title=f"✅ Système {status_text}",
@@ -954,7 +1330,7 @@ class LevelSystem(commands.Cog):
             await interaction.response.send_message("❌ Le montant doit être positif !", ephemeral=True)
             return
         
-        level_up, old_level, new_level = self.manager.db.add_xp(
+        level_up, old_level, new_level = self.manager.ledger.add_xp(
             str(user.id), str(interaction.guild.id), amount
         )
         
@@ -994,7 +1370,7 @@ class LevelSystem(commands.Cog):
         expires_at = datetime.now() + timedelta(minutes=duration_minutes)
         
         # Met à jour la base
-        conn = sqlite3.connect(self.manager.db.db_path)
+        conn = database_manager.connect(self.manager.db.db_path)
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -1012,6 +1388,7 @@ class LevelSystem(commands.Cog):
         
         conn.commit()
         conn.close()
+        self.manager.ledger.invalidate(str(interaction.guild.id), str(user.id))
         
         embed = discord.Embed(
             title="⚡ Boost XP Accordé",
@@ -1025,9 +1402,9 @@ class LevelSystem(commands.Cog):
 class LeaderboardView(discord.ui.View):
     """Interface de navigation du leaderboard"""
     
-    def __init__(self, db: LevelDB, guild_id: str, current_page: int = 1):
+    def __init__(self, ledger: XPLedger, guild_id: str, current_page: int = 1):
         super().__init__(timeout=300)
-        self.db = db
+        self.ledger = ledger
         self.guild_id = guild_id
         self.current_page = current_page
     
@@ -1054,8 +1431,7 @@ class LeaderboardView(discord.ui.View):
         limit = 10
         offset = (self.current_page - 1) * limit
         
-        leaderboard = self.db.get_leaderboard(self.guild_id, offset + limit)
-        page_data = leaderboard[offset:offset + limit]
+        page_data = await self.ledger.leaderboard_page(self.guild_id, offset, limit)
         
         if not page_data:
             return None
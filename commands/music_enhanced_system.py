@@ -17,9 +17,10 @@ import json
 import os
 import random
 from typing import Optional, List, Dict
-import yt_dlp
 from collections import deque
 import time
+from utils.media_resolver import TrackResolver
+from core.metrics import metrics
 
 class EnhancedMusicSystem(commands.Cog):
     """Système musical avancé pour Arsenal V4"""
@@ -48,12 +49,28 @@ class EnhancedMusicSystem(commands.Cog):
             'noplaylist': False,
         }
         
+        # Extraction yt-dlp hors de la boucle (pool borné + cache des flux)
+        self.resolver = TrackResolver(self.ytdl_options, max_workers=2)
+        metrics.gauge(
+            "arsenal_queue_depth", lambda: sum(len(queue) for queue in self.music_queues.values()),
+            "Éléments en attente d'écriture", queue="music_tracks"
+        )
+        
         # FFmpeg configuré pour Arsenal
         self.ffmpeg_options = {
             'options': '-vn -reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5',
             'before_options': '-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5'
         }
 
+    async def cog_unload(self):
+        self.resolver.close()
+    
+    def prefetch_next(self, guild_id: int):
+        """Résout en avance la prochaine piste de la queue"""
+        queue = self.music_queues.get(guild_id)
+        if queue:
+            self.resolver.prefetch(queue[0])
+    
     def load_music_memory(self):
         """Charge la mémoire musicale"""
         if os.path.exists(self.memory_file):
@@ -154,72 +171,56 @@ class EnhancedMusicSystem(commands.Cog):
         guild_id = interaction.guild.id
         
         try:
-            with yt_dlp.YoutubeDL(self.ytdl_options) as ydl:
-                # Extraction des informations
-                info = ydl.extract_info(query, download=False)
+            # Extraction des informations (thread du pool, playlists à plat)
+            tracks = await self.resolver.search(query, limit=50)  # Limite à 50 pistes
+            
+            if not tracks:
+                await interaction.followup.send("❌ Aucun résultat trouvé")
+                return
+            
+            if guild_id not in self.music_queues:
+                self.music_queues[guild_id] = deque()
+            
+            for track_info in tracks:
+                track_info['requested_by'] = interaction.user.display_name
+                self.music_queues[guild_id].append(track_info)
+            
+            if len(tracks) > 1:
+                # Playlist
+                await interaction.followup.send(f"🎵 Ajout de {len(tracks)} pistes à la queue...")
+            else:
+                # Piste unique
+                track_info = tracks[0]
+                embed = discord.Embed(
+                    title="🎵 Piste Ajoutée",
+                    description=f"**{track_info['title']}**",
+                    color=discord.Color.green()
+                )
                 
-                if 'entries' in info:
-                    # Playlist
-                    entries = info['entries'][:50]  # Limite à 50 pistes
-                    await interaction.followup.send(f"🎵 Ajout de {len(entries)} pistes à la queue...")
-                    
-                    for entry in entries:
-                        if entry:
-                            track_info = {
-                                'title': entry.get('title', 'Titre inconnu'),
-                                'url': entry.get('url'),
-                                'duration': entry.get('duration', 0),
-                                'thumbnail': entry.get('thumbnail'),
-                                'requested_by': interaction.user.display_name
-                            }
-                            
-                            if guild_id not in self.music_queues:
-                                self.music_queues[guild_id] = deque()
-                            
-                            self.music_queues[guild_id].append(track_info)
-                else:
-                    # Piste unique
-                    track_info = {
-                        'title': info.get('title', 'Titre inconnu'),
-                        'url': info.get('url'),
-                        'duration': info.get('duration', 0),
-                        'thumbnail': info.get('thumbnail'),
-                        'requested_by': interaction.user.display_name
-                    }
-                    
-                    if guild_id not in self.music_queues:
-                        self.music_queues[guild_id] = deque()
-                    
-                    self.music_queues[guild_id].append(track_info)
-                    
-                    embed = discord.Embed(
-                        title="🎵 Piste Ajoutée",
-                        description=f"**{track_info['title']}**",
-                        color=discord.Color.green()
-                    )
-                    
-                    if track_info['thumbnail']:
-                        embed.set_thumbnail(url=track_info['thumbnail'])
-                    
+                if track_info['thumbnail']:
+                    embed.set_thumbnail(url=track_info['thumbnail'])
+                
+                embed.add_field(
+                    name="📋 Queue",
+                    value=f"Position: {len(self.music_queues[guild_id])}",
+                    inline=True
+                )
+                
+                if track_info['duration']:
+                    mins, secs = divmod(track_info['duration'], 60)
                     embed.add_field(
-                        name="📋 Queue",
-                        value=f"Position: {len(self.music_queues[guild_id])}",
+                        name="⏱️ Durée",
+                        value=f"{mins}:{secs:02d}",
                         inline=True
                     )
-                    
-                    if track_info['duration']:
-                        mins, secs = divmod(track_info['duration'], 60)
-                        embed.add_field(
-                            name="⏱️ Durée",
-                            value=f"{mins}:{secs:02d}",
-                            inline=True
-                        )
-                    
-                    await interaction.followup.send(embed=embed)
                 
-                # Démarrer la lecture si rien ne joue
-                if not vc.is_playing():
-                    await self.play_next(guild_id)
+                await interaction.followup.send(embed=embed)
+            
+            # Démarrer la lecture si rien ne joue
+            if not vc.is_playing():
+                await self.play_next(guild_id)
+            else:
+                self.prefetch_next(guild_id)
                     
         except Exception as e:
             await interaction.followup.send(f"❌ Erreur lors de l'extraction: {str(e)[:100]}...")
@@ -237,9 +238,17 @@ class EnhancedMusicSystem(commands.Cog):
             return
         
         track = self.music_queues[guild_id].popleft()
-        self.current_tracks[guild_id] = track
         
         try:
+            # URL du flux résolue juste avant la lecture (souvent déjà préchargée)
+            await self.resolver.resolve(track)
+            
+            if vc.is_playing():
+                # Une autre lecture a démarré pendant la résolution
+                self.music_queues[guild_id].appendleft(track)
+                return
+            
+            self.current_tracks[guild_id] = track
             source = FFmpegPCMAudio(track['url'], **self.ffmpeg_options)
             volume = self.get_guild_volume(guild_id)
             audio = PCMVolumeTransformer(source, volume=volume)
@@ -248,11 +257,14 @@ class EnhancedMusicSystem(commands.Cog):
                 if error:
                     print(f"Erreur lecture: {error}")
                 else:
-                    # Auto-next
-                    asyncio.create_task(self.play_next(guild_id))
+                    # Auto-next (callback appelé depuis le thread audio)
+                    asyncio.run_coroutine_threadsafe(self.play_next(guild_id), self.bot.loop)
             
             vc.play(audio, after=after_playing)
             
+            # Précharger la piste suivante pendant la lecture
+            self.prefetch_next(guild_id)
+            
             # Message de lecture
             guild = self.bot.get_guild(guild_id)
             if guild:
@@ -303,47 +315,36 @@ class EnhancedMusicSystem(commands.Cog):
             return
         
         try:
-            playlist_opts = self.ytdl_options.copy()
-            playlist_opts['extract_flat'] = True
+            # Résolution à plat : les flux seront résolus piste par piste à la lecture
+            # Limiter à 100 pistes pour éviter les abus
+            entries = await self.resolver.search(url, limit=100)
             
-            with yt_dlp.YoutubeDL(playlist_opts) as ydl:
-                playlist_info = ydl.extract_info(url, download=False)
-                entries = playlist_info.get('entries', [])
-                
-                if not entries:
-                    await interaction.followup.send("❌ Playlist vide ou introuvable")
-                    return
-                
-                # Limiter à 100 pistes pour éviter les abus
-                entries = entries[:100]
-                
-                embed = discord.Embed(
-                    title="🎵 Playlist Ajoutée",
-                    description=f"**{playlist_info.get('title', 'Playlist')}**\n{len(entries)} pistes ajoutées à la queue",
-                    color=discord.Color.green()
-                )
-                
-                await interaction.followup.send(embed=embed)
-                
-                # Ajouter toutes les pistes à la queue
-                guild_id = interaction.guild.id
-                if guild_id not in self.music_queues:
-                    self.music_queues[guild_id] = deque()
-                
-                for entry in entries:
-                    if entry:
-                        track_info = {
-                            'title': entry.get('title', 'Titre inconnu'),
-                            'url': f"https://www.youtube.com/watch?v={entry['id']}",
-                            'duration': entry.get('duration', 0),
-                            'thumbnail': entry.get('thumbnail'),
-                            'requested_by': interaction.user.display_name
-                        }
-                        self.music_queues[guild_id].append(track_info)
-                
-                # Commencer la lecture si rien ne joue
-                if not vc.is_playing():
-                    await self.play_next(guild_id)
+            if not entries:
+                await interaction.followup.send("❌ Playlist vide ou introuvable")
+                return
+            
+            embed = discord.Embed(
+                title="🎵 Playlist Ajoutée",
+                description=f"**{entries[0].get('playlist') or 'Playlist'}**\n{len(entries)} pistes ajoutées à la queue",
+                color=discord.Color.green()
+            )
+            
+            await interaction.followup.send(embed=embed)
+            
+            # Ajouter toutes les pistes à la queue
+            guild_id = interaction.guild.id
+            if guild_id not in self.music_queues:
+                self.music_queues[guild_id] = deque()
+            
+            for track_info in entries:
+                track_info['requested_by'] = interaction.user.display_name
+                self.music_queues[guild_id].append(track_info)
+            
+            # Commencer la lecture si rien ne joue
+            if not vc.is_playing():
+                await self.play_next(guild_id)
+            else:
+                self.prefetch_next(guild_id)
                     
         except Exception as e:
             await interaction.followup.send(f"❌ Erreur playlist: {str(e)[:100]}...")
@@ -9,9 +9,8 @@ Système avancé de notifications pour Arsenal V4:
 """
 
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord import app_commands
-import aiohttp
 import json
 import asyncio
 from datetime import datetime, timedelta
@@ -20,6 +19,20 @@ from typing import Optional, Dict, List, Union
 import sqlite3
 import uuid
 
+from core.scheduler import scheduler
+from modules.sqlite_database import database_manager
+from utils.log_sink import BatchedLogSink
+from utils.webhook_dispatcher import WebhookDispatcher
+
+# Type des jobs du planificateur central (une échéance par message programmé)
+NOTIFICATION_JOB = "notification"
+
+WEBHOOK_LOG_INSERT = '''
+    INSERT INTO webhook_logs 
+    (webhook_name, event_type, guild_id, payload, status, timestamp)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
 class NotificationSystem(commands.Cog):
     """Système de notifications avancé pour Arsenal V4"""
     
@@ -30,7 +43,38 @@ class NotificationSystem(commands.Cog):
         self.active_notifications = {}
         self.init_database()
         self.load_webhooks_config()
-        self.notification_checker.start()
+        # Une session partagée pour tous les webhooks, journal écrit par lots
+        self.webhooks = WebhookDispatcher(name="webhooks")
+        self.webhook_log = BatchedLogSink(database_manager.pool(self.db_path), WEBHOOK_LOG_INSERT, name="webhook_logs")
+        scheduler.register(NOTIFICATION_JOB, self.notification_due)
+        self.schedule_active_notifications()
+    
+    async def cog_unload(self):
+        scheduler.unregister(NOTIFICATION_JOB)
+        await self.webhooks.close()
+        await self.webhook_log.close()
+    
+    def schedule_notification(self, notification_id: str, send_time: str):
+        """Planifie l'envoi d'un message programmé à son heure exacte"""
+        scheduler.schedule(
+            NOTIFICATION_JOB, send_time, {"notification_id": notification_id},
+            key=f"{NOTIFICATION_JOB}:{notification_id}"
+        )
+    
+    def schedule_active_notifications(self):
+        """Planifie les messages actifs qui n'ont pas encore de job (démarrage)"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            rows = conn.execute(
+                "SELECT id, send_time FROM scheduled_notifications WHERE is_active = 1"
+            ).fetchall()
+            conn.close()
+            
+            for notification_id, send_time in rows:
+                if not scheduler.get(f"{NOTIFICATION_JOB}:{notification_id}"):
+                    self.schedule_notification(notification_id, send_time)
+        except Exception as e:
+            print(f"Erreur planification notifications: {e}")
 
     def init_database(self):
         """Initialise la base de données des notifications"""
@@ -280,6 +324,7 @@ class NotificationSystem(commands.Cog):
         
         conn.commit()
         conn.close()
+        self.schedule_notification(notification_id, send_time.isoformat())
         
         embed = discord.Embed(
             title="⏰ Message Programmé",
@@ -306,35 +351,30 @@ class NotificationSystem(commands.Cog):
         
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
-    @tasks.loop(minutes=1)
-    async def notification_checker(self):
-        """Vérifie les notifications programmées"""
+    async def notification_due(self, job):
+        """Job du planificateur : envoie un message programmé arrivé à échéance"""
+        conn = sqlite3.connect(self.db_path)
         try:
-            conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
-            
-            now = datetime.now().isoformat()
             cursor.execute('''
                 SELECT * FROM scheduled_notifications 
-                WHERE send_time <= ? AND is_active = 1
-            ''', (now,))
+                WHERE id = ? AND is_active = 1
+            ''', (job.payload["notification_id"],))
             
-            notifications = cursor.fetchall()
+            notif = cursor.fetchone()
+            if not notif:
+                return
             
-            for notif in notifications:
-                await self.send_scheduled_notification(notif)
-                
-                # Marquer comme envoyée
-                cursor.execute('''
-                    UPDATE scheduled_notifications 
-                    SET is_active = 0 WHERE id = ?
-                ''', (notif[0],))
+            await self.send_scheduled_notification(notif)
             
+            # Marquer comme envoyée
+            cursor.execute('''
+                UPDATE scheduled_notifications 
+                SET is_active = 0 WHERE id = ?
+            ''', (notif[0],))
             conn.commit()
+        finally:
             conn.close()
-            
-        except Exception as e:
-            print(f"Erreur notification checker: {e}")
 
     async def send_scheduled_notification(self, notification_data):
         """Envoie une notification programmée"""
@@ -361,11 +401,24 @@ class NotificationSystem(commands.Cog):
         except Exception as e:
             print(f"Erreur envoi notification: {e}")
 
-    async def send_webhook_notification(self, guild_id: int, event_type: str, data: Dict):
-        """Envoie une notification via webhook"""
+    async def send_webhook_notification(self, guild_id: int, event_type: str, data: Dict) -> List[asyncio.Future]:
+        """Envoie une notification via webhook
+        
+        Les envois partent en parallèle (un futur par webhook, résolu avec le statut) :
+        l'appelant n'attend pas la réponse de Discord
+        """
+        futures = []
+        webhook_name = None
         try:
             guild_webhooks = self.config["webhooks"].get(str(guild_id), {})
             
+            embed_data = {
+                "title": data.get("title", "Arsenal V4 Notification"),
+                "description": data.get("description", ""),
+                "color": 0x00FF00,
+                "timestamp": datetime.now().isoformat()
+            }
+            
             for webhook_name, webhook_data in guild_webhooks.items():
                 if not webhook_data.get("active", True):
                     continue
@@ -373,58 +426,31 @@ class NotificationSystem(commands.Cog):
                 if event_type not in webhook_data.get("events", []):
                     continue
                 
-                webhook_url = webhook_data["url"]
-                
-                embed_data = {
-                    "title": data.get("title", "Arsenal V4 Notification"),
-                    "description": data.get("description", ""),
-                    "color": 0x00FF00,
-                    "timestamp": datetime.now().isoformat()
-                }
-                
-                payload = {
-                    "username": "Arsenal V4",
-                    "embeds": [embed_data]
-                }
-                
-                async with aiohttp.ClientSession() as session:
-                    await session.post(webhook_url, json=payload)
-                
-                # Log webhook
-                self.log_webhook_activity(webhook_name, event_type, guild_id, payload, "success")
-                
+                future = self.webhooks.send(webhook_data["url"], embed_data, event=event_type)
+                future.add_done_callback(
+                    lambda done, name=webhook_name: self.log_webhook_activity(
+                        name, event_type, guild_id, {"username": "Arsenal V4", "embeds": [embed_data]},
+                        done.result() if not done.cancelled() else "error: cancelled"
+                    )
+                )
+                futures.append(future)
+        
         except Exception as e:
             print(f"Erreur webhook: {e}")
             self.log_webhook_activity(webhook_name, event_type, guild_id, {}, f"error: {e}")
-
+        
+        return futures
+    
     def log_webhook_activity(self, webhook_name: str, event_type: str, guild_id: int, payload: Dict, status: str):
-        """Log l'activité des webhooks"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO webhook_logs 
-                (webhook_name, event_type, guild_id, payload, status, timestamp)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                webhook_name,
-                event_type, 
-                guild_id,
-                json.dumps(payload),
-                status,
-                datetime.now().isoformat()
-            ))
-            
-            conn.commit()
-            conn.close()
-            
-        except Exception as e:
-            print(f"Erreur log webhook: {e}")
-
-    @notification_checker.before_loop
-    async def before_notification_checker(self):
-        await self.bot.wait_until_ready()
+        """Log l'activité des webhooks (écrit par lots)"""
+        self.webhook_log.offer((
+            webhook_name,
+            event_type, 
+            guild_id,
+            json.dumps(payload),
+            status,
+            datetime.now().isoformat()
+        ))
 
 async def setup(bot):
     await bot.add_cog(NotificationSystem(bot))
@@ -0,0 +1,89 @@
+"""
+⏱️ Arsenal V4 - Commande /perf
+Active le profilage des handlers, affiche les plus coûteux et les blocages
+de la boucle asyncio, exporte le rapport complet en JSON
+"""
+import os
+import discord
+from discord.ext import commands
+from core.profiler import profiler
+from core.logger import log
+
+CREATOR_ID = int(os.getenv("CREATOR_ID", 431359112039890945))
+
+
+class PerfProfiler(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def _is_allowed(self, user) -> bool:
+        return user.id == CREATOR_ID or await self.bot.is_owner(user)
+
+    @discord.app_commands.command(name="perf", description="⏱️ Profilage des handlers (créateur)")
+    @discord.app_commands.describe(action="Action à effectuer")
+    @discord.app_commands.choices(action=[
+        discord.app_commands.Choice(name="📊 Rapport", value="report"),
+        discord.app_commands.Choice(name="▶️ Activer", value="on"),
+        discord.app_commands.Choice(name="⏹️ Désactiver", value="off"),
+        discord.app_commands.Choice(name="💾 Exporter (JSON)", value="export"),
+        discord.app_commands.Choice(name="🧹 Réinitialiser", value="reset")
+    ])
+    async def perf(self, interaction: discord.Interaction, action: str = "report"):
+        """Profilage opt-in : latence par cog/handler et blocages de la boucle"""
+        if not await self._is_allowed(interaction.user):
+            await interaction.response.send_message("🚫 Accès refusé. Commande réservée au créateur.", ephemeral=True)
+            return
+
+        if action == "on":
+            profiler.enable()
+            wrapped = profiler.instrument_commands(self.bot.tree)
+            log.info(f"⏱️ [PERF] Profilage activé ({wrapped} commandes instrumentées)")
+            await interaction.response.send_message(
+                f"▶️ Profilage activé (seuil de blocage: {profiler.block_threshold * 1000:.0f} ms)", ephemeral=True
+            )
+        elif action == "off":
+            profiler.disable()
+            await interaction.response.send_message("⏹️ Profilage désactivé (mesures conservées)", ephemeral=True)
+        elif action == "reset":
+            profiler.reset()
+            await interaction.response.send_message("🧹 Mesures de profilage effacées", ephemeral=True)
+        elif action == "export":
+            path = profiler.export()
+            await interaction.response.send_message(f"💾 Rapport exporté: `{path}`", file=discord.File(path), ephemeral=True)
+        else:
+            await interaction.response.send_message(embed=self._report_embed(), ephemeral=True)
+
+    def _report_embed(self) -> discord.Embed:
+        report = profiler.report(limit=10)
+        embed = discord.Embed(
+            title="⏱️ Profilage des handlers",
+            description=f"{'🟢 Actif' if report['enabled'] else '🔴 Inactif'} • seuil de blocage {report['block_threshold_ms']} ms",
+            color=0x00ff88 if report["enabled"] else 0x888888
+        )
+
+        if report["handlers"]:
+            lines = [
+                f"`{h['cog']}.{h['handler']}` {h['count']}× • p95 {h['p95'] * 1000:.0f} ms • max {h['max'] * 1000:.0f} ms • Σ {h['sum']:.2f}s"
+                for h in report["handlers"]
+            ]
+            embed.add_field(name="🔥 Handlers les plus coûteux", value="\n".join(lines)[:1024], inline=False)
+        else:
+            embed.add_field(name="🔥 Handlers", value="Aucune mesure (activez avec `/perf action:on`)", inline=False)
+
+        if report["cogs"]:
+            lines = [f"**{cog}**: {total:.2f}s" for cog, total in list(report["cogs"].items())[:8]]
+            embed.add_field(name="🧩 Temps cumulé par cog", value="\n".join(lines)[:1024], inline=False)
+
+        if report["blocks"]:
+            lines = []
+            for block in report["blocks"][:5]:
+                where = block["stack"][-1].strip().splitlines()[0] if block["stack"] else "?"
+                lines.append(f"`{block['handler']}` {block['duration_ms']:.0f} ms\n└ {where[:120]}")
+            embed.add_field(name=f"🧱 Blocages de la boucle ({len(report['blocks'])})", value="\n".join(lines)[:1024], inline=False)
+
+        embed.set_footer(text="Pile complète : /perf action:export")
+        return embed
+
+
+async def setup(bot):
+    await bot.add_cog(PerfProfiler(bot))
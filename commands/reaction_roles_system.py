@@ -20,11 +20,88 @@ import json
 import asyncio
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any, Union, Tuple
-import sqlite3
+from modules.sqlite_database import database_manager
 import logging
+from utils.rate_tracker import SlidingWindowCounter
+from utils.log_sink import BatchedLogSink
 
 logger = logging.getLogger(__name__)
 
+
+def _parse_panel(panel: Dict[str, Any]) -> Dict[str, Any]:
+    """Décode les colonnes JSON d'une ligne reaction_panels"""
+    panel['exclude_roles'] = json.loads(panel['exclude_roles']) if panel['exclude_roles'] else []
+    panel['embed_data'] = json.loads(panel['embed_data']) if panel['embed_data'] else {}
+    return panel
+
+
+# =============================================================================
+# INDEX EN MÉMOIRE DES PANELS
+# =============================================================================
+
+class ReactionPanelIndex:
+    """Panels indexés par ID de message, avec leur table emoji -> rôle
+    
+    Chargé une fois au démarrage puis rafraîchi panel par panel à chaque
+    écriture (création, nouveau message, ajout de rôle). Une réaction sur un
+    message qui n'est pas un panel est écartée par une simple recherche.
+    """
+    
+    def __init__(self):
+        self.panels: Dict[int, Dict[str, Any]] = {}             # message_id: panel
+        self.roles: Dict[int, Dict[str, Dict[str, Any]]] = {}   # panel_id: {emoji: mapping}
+        self._messages: Dict[int, int] = {}                      # panel_id: message_id
+    
+    def __contains__(self, message_id: int) -> bool:
+        return message_id in self.panels
+    
+    def __len__(self) -> int:
+        return len(self.panels)
+    
+    def load(self, conn):
+        """(Re)charge tous les panels et leurs rôles actifs"""
+        self.panels.clear()
+        self.roles.clear()
+        self._messages.clear()
+        cursor = conn.execute('SELECT * FROM reaction_panels WHERE message_id != 0')
+        columns = [desc[0] for desc in cursor.description]
+        for row in cursor.fetchall():
+            self._set_panel(_parse_panel(dict(zip(columns, row))))
+        cursor = conn.execute('SELECT * FROM reaction_role_mappings WHERE is_active = TRUE ORDER BY position ASC')
+        columns = [desc[0] for desc in cursor.description]
+        for row in cursor.fetchall():
+            mapping = dict(zip(columns, row))
+            self.roles.setdefault(mapping['panel_id'], {})[mapping['emoji']] = mapping
+    
+    def refresh(self, conn, panel_id: int):
+        """Recharge un seul panel après une modification"""
+        old_message = self._messages.pop(panel_id, None)
+        if old_message is not None:
+            self.panels.pop(old_message, None)
+        cursor = conn.execute('SELECT * FROM reaction_panels WHERE id = ?', (panel_id,))
+        row = cursor.fetchone()
+        panel = dict(zip([desc[0] for desc in cursor.description], row)) if row else None
+        if panel and panel['message_id']:
+            self._set_panel(_parse_panel(panel))
+        cursor = conn.execute('''
+            SELECT * FROM reaction_role_mappings WHERE panel_id = ? AND is_active = TRUE ORDER BY position ASC
+        ''', (panel_id,))
+        columns = [desc[0] for desc in cursor.description]
+        self.roles[panel_id] = {mapping['emoji']: mapping for mapping in (dict(zip(columns, r)) for r in cursor.fetchall())}
+    
+    def _set_panel(self, panel: Dict[str, Any]):
+        self.panels[panel['message_id']] = panel
+        self._messages[panel['id']] = panel['message_id']
+    
+    def panel_for_message(self, message_id: int) -> Optional[Dict[str, Any]]:
+        return self.panels.get(message_id)
+    
+    def role_for(self, panel_id: int, emoji: str) -> Optional[Dict[str, Any]]:
+        return self.roles.get(panel_id, {}).get(emoji)
+    
+    def panel_role_ids(self, panel_id: int) -> List[int]:
+        return [mapping['role_id'] for mapping in self.roles.get(panel_id, {}).values()]
+
 # =============================================================================
 # BASE DE DONNÉES REACTION ROLES
 # =============================================================================
@@ -32,13 +109,32 @@ logger = logging.getLogger(__name__)
 class ReactionRolesDB:
     """Gestionnaire de base de données pour les rôles par réaction"""
     
+    # Le journal est appliqué par trigger puis vidé : ordre conservé, une transaction par lot
+    EVENT_INSERT = '''
+        INSERT INTO reaction_role_events (guild_id, user_id, panel_id, role_id, emoji, action)
+        VALUES (?, ?, ?, ?, ?, ?)
+    '''
+    
     def __init__(self, db_path: str = "arsenal_reaction_roles.db"):
         self.db_path = db_path
         self.init_database()
+        self.index = ReactionPanelIndex()
+        self.reload_index()
+        self.events = BatchedLogSink(database_manager.pool(db_path), self.EVENT_INSERT, name="reaction_roles")
+    
+    def reload_index(self):
+        """Recharge l'index en mémoire des panels"""
+        with database_manager.connect(self.db_path) as conn:
+            self.index.load(conn)
+    
+    def refresh_panel(self, panel_id: int):
+        """Répercute la modification d'un panel dans l'index"""
+        with database_manager.connect(self.db_path) as conn:
+            self.index.refresh(conn, panel_id)
     
     def init_database(self):
         """Initialise la base de données"""
-        with sqlite3.connect(self.db_path) as conn:
+        with database_manager.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
             # Table des panels de rôles par réaction
@@ -115,11 +211,62 @@ class ReactionRolesDB:
                 )
             ''')
             
+            # Journal des attributions, écrit par lots (ReactionRolesDB.events) ;
+            # chaque ligne est supprimée par son trigger une fois appliquée
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS reaction_role_events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    guild_id INTEGER NOT NULL,
+                    user_id INTEGER NOT NULL,
+                    panel_id INTEGER NOT NULL,
+                    role_id INTEGER NOT NULL,
+                    emoji TEXT NULL, -- Renseigné quand la réaction compte dans les stats
+                    action TEXT NOT NULL, -- 'add', 'remove'
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_reaction_role_users_role
+                ON reaction_role_users (panel_id, role_id, user_id)
+            ''')
+            # Anciennes versions des triggers (sans purge) et lignes déjà appliquées
+            cursor.execute("DROP TRIGGER IF EXISTS reaction_role_events_add")
+            cursor.execute("DROP TRIGGER IF EXISTS reaction_role_events_remove")
+            cursor.execute("DELETE FROM reaction_role_events")
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS reaction_role_events_add
+                AFTER INSERT ON reaction_role_events WHEN NEW.action = 'add'
+                BEGIN
+                    INSERT INTO reaction_role_users (guild_id, user_id, panel_id, role_id)
+                    VALUES (NEW.guild_id, NEW.user_id, NEW.panel_id, NEW.role_id);
+                    UPDATE reaction_panel_stats
+                    SET total_reactions = total_reactions + 1,
+                        unique_users = (
+                            SELECT COUNT(DISTINCT user_id) FROM reaction_role_users
+                            WHERE panel_id = NEW.panel_id AND role_id = NEW.role_id
+                        ),
+                        last_used = NEW.created_at
+                    WHERE NEW.emoji IS NOT NULL
+                      AND panel_id = NEW.panel_id AND emoji = NEW.emoji AND role_id = NEW.role_id;
+                    DELETE FROM reaction_role_events WHERE id = NEW.id;
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS reaction_role_events_remove
+                AFTER INSERT ON reaction_role_events WHEN NEW.action = 'remove'
+                BEGIN
+                    DELETE FROM reaction_role_users
+                    WHERE guild_id = NEW.guild_id AND user_id = NEW.user_id
+                      AND panel_id = NEW.panel_id AND role_id = NEW.role_id;
+                    DELETE FROM reaction_role_events WHERE id = NEW.id;
+                END
+            ''')
+            
             conn.commit()
     
     def create_panel(self, guild_id: int, channel_id: int, panel_data: Dict[str, Any]) -> Optional[int]:
         """Crée un nouveau panel de rôles par réaction"""
-        with sqlite3.connect(self.db_path) as conn:
+        with database_manager.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
             try:
@@ -141,6 +288,7 @@ class ReactionRolesDB:
                 
                 panel_id = cursor.lastrowid
                 conn.commit()
+                self.index.refresh(conn, panel_id)
                 return panel_id
                 
             except Exception as e:
@@ -149,7 +297,7 @@ class ReactionRolesDB:
     
     def update_panel_message_id(self, panel_id: int, message_id: int) -> bool:
         """Met à jour l'ID du message d'un panel"""
-        with sqlite3.connect(self.db_path) as conn:
+        with database_manager.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
             try:
@@ -160,6 +308,7 @@ class ReactionRolesDB:
                 ''', (message_id, panel_id))
                 
                 conn.commit()
+                self.index.refresh(conn, panel_id)
                 return cursor.rowcount > 0
                 
             except Exception as e:
@@ -168,7 +317,7 @@ class ReactionRolesDB:
     
     def add_role_to_panel(self, panel_id: int, emoji: str, role_id: int, role_name: str, description: str = None) -> bool:
         """Ajoute un rôle à un panel"""
-        with sqlite3.connect(self.db_path) as conn:
+        with database_manager.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
             try:
@@ -189,6 +338,7 @@ class ReactionRolesDB:
                 ''', (panel_id, emoji, role_id))
                 
                 conn.commit()
+                self.index.refresh(conn, panel_id)
                 return True
                 
             except Exception as e:
@@ -197,7 +347,7 @@ class ReactionRolesDB:
     
     def get_panel(self, panel_id: int) -> Optional[Dict[str, Any]]:
         """Récupère un panel par son ID"""
-        with sqlite3.connect(self.db_path) as conn:
+        with database_manager.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
             cursor.execute('SELECT * FROM reaction_panels WHERE id = ?', (panel_id,))
@@ -205,36 +355,16 @@ class ReactionRolesDB:
             
             if row:
                 columns = [desc[0] for desc in cursor.description]
-                panel = dict(zip(columns, row))
-                
-                # Parser les JSON
-                panel['exclude_roles'] = json.loads(panel['exclude_roles']) if panel['exclude_roles'] else []
-                panel['embed_data'] = json.loads(panel['embed_data']) if panel['embed_data'] else {}
-                
-                return panel
+                return _parse_panel(dict(zip(columns, row)))
             return None
     
     def get_panel_by_message(self, message_id: int) -> Optional[Dict[str, Any]]:
-        """Récupère un panel par l'ID de son message"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute('SELECT * FROM reaction_panels WHERE message_id = ?', (message_id,))
-            row = cursor.fetchone()
-            
-            if row:
-                columns = [desc[0] for desc in cursor.description]
-                panel = dict(zip(columns, row))
-                
-                panel['exclude_roles'] = json.loads(panel['exclude_roles']) if panel['exclude_roles'] else []
-                panel['embed_data'] = json.loads(panel['embed_data']) if panel['embed_data'] else {}
-                
-                return panel
-            return None
+        """Récupère un panel par l'ID de son message (index en mémoire)"""
+        return self.index.panel_for_message(message_id)
     
     def get_panel_roles(self, panel_id: int) -> List[Dict[str, Any]]:
         """Récupère tous les rôles d'un panel"""
-        with sqlite3.connect(self.db_path) as conn:
+        with database_manager.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -255,7 +385,7 @@ class ReactionRolesDB:
     
     def get_guild_panels(self, guild_id: int) -> List[Dict[str, Any]]:
         """Récupère tous les panels d'un serveur"""
-        with sqlite3.connect(self.db_path) as conn:
+        with database_manager.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -271,92 +401,32 @@ class ReactionRolesDB:
             columns = [desc[0] for desc in cursor.description]
             
             for row in cursor.fetchall():
-                panel = dict(zip(columns, row))
-                panel['exclude_roles'] = json.loads(panel['exclude_roles']) if panel['exclude_roles'] else []
-                panel['embed_data'] = json.loads(panel['embed_data']) if panel['embed_data'] else {}
-                panels.append(panel)
+                panels.append(_parse_panel(dict(zip(columns, row))))
             
             return panels
     
     def get_role_by_reaction(self, panel_id: int, emoji: str) -> Optional[Dict[str, Any]]:
-        """Récupère un rôle par son emoji dans un panel"""
-        with sqlite3.connect(self.db_path) as conn:
+        """Récupère un rôle par son emoji dans un panel (index en mémoire)"""
+        return self.index.role_for(panel_id, emoji)
+    
+    def get_reaction_cooldown(self, guild_id: int) -> int:
+        """Récupère le cooldown de réaction d'un serveur (en secondes)"""
+        with database_manager.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
-            cursor.execute('''
-                SELECT * FROM reaction_role_mappings 
-                WHERE panel_id = ? AND emoji = ? AND is_active = TRUE
-            ''', (panel_id, emoji))
-            
+            cursor.execute('SELECT reaction_cooldown FROM reaction_config WHERE guild_id = ?', (guild_id,))
             row = cursor.fetchone()
             
-            if row:
-                columns = [desc[0] for desc in cursor.description]
-                return dict(zip(columns, row))
-            return None
-    
-    def log_role_assignment(self, guild_id: int, user_id: int, panel_id: int, role_id: int) -> bool:
-        """Enregistre l'attribution d'un rôle par réaction"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            try:
-                cursor.execute('''
-                    INSERT INTO reaction_role_users (guild_id, user_id, panel_id, role_id)
-                    VALUES (?, ?, ?, ?)
-                ''', (guild_id, user_id, panel_id, role_id))
-                
-                conn.commit()
-                return True
-                
-            except Exception as e:
-                logger.error(f"Erreur log assignment: {e}")
-                return False
+            return (row[0] or 0) if row else 0
     
-    def remove_role_assignment(self, guild_id: int, user_id: int, panel_id: int, role_id: int) -> bool:
-        """Supprime l'enregistrement d'un rôle par réaction"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            try:
-                cursor.execute('''
-                    DELETE FROM reaction_role_users 
-                    WHERE guild_id = ? AND user_id = ? AND panel_id = ? AND role_id = ?
-                ''', (guild_id, user_id, panel_id, role_id))
-                
-                conn.commit()
-                return cursor.rowcount > 0
-                
-            except Exception as e:
-                logger.error(f"Erreur suppression assignment: {e}")
-                return False
+    async def log_role_assignment(self, guild_id: int, user_id: int, panel_id: int, role_id: int,
+                                  emoji: Optional[str] = None):
+        """Journalise l'attribution d'un rôle (écrite par lots, stats mises à jour si emoji)"""
+        await self.events.put((guild_id, user_id, panel_id, role_id, emoji, 'add'))
     
-    def update_reaction_stats(self, panel_id: int, emoji: str, role_id: int):
-        """Met à jour les statistiques d'une réaction"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            try:
-                # Compter les utilisateurs uniques pour cette réaction
-                cursor.execute('''
-                    SELECT COUNT(DISTINCT user_id) FROM reaction_role_users 
-                    WHERE panel_id = ? AND role_id = ?
-                ''', (panel_id, role_id))
-                
-                unique_users = cursor.fetchone()[0] or 0
-                
-                cursor.execute('''
-                    UPDATE reaction_panel_stats 
-                    SET total_reactions = total_reactions + 1,
-                        unique_users = ?,
-                        last_used = CURRENT_TIMESTAMP
-                    WHERE panel_id = ? AND emoji = ? AND role_id = ?
-                ''', (unique_users, panel_id, emoji, role_id))
-                
-                conn.commit()
-                
-            except Exception as e:
-                logger.error(f"Erreur mise à jour stats: {e}")
+    async def remove_role_assignment(self, guild_id: int, user_id: int, panel_id: int, role_id: int):
+        """Journalise le retrait d'un rôle (écrit par lots, dans l'ordre des attributions)"""
+        await self.events.put((guild_id, user_id, panel_id, role_id, None, 'remove'))
 
 
 # =============================================================================
@@ -369,11 +439,13 @@ class ReactionRoleManager:
     def __init__(self, bot, db: ReactionRolesDB):
         self.bot = bot
         self.db = db
-        self.cooldowns = {}  # Cooldowns des utilisateurs
-    
+        self.cooldowns = SlidingWindowCounter(window=1, max_events=1, idle_ttl=3600)  # Cooldowns des utilisateurs
+        self.cooldown_settings = {}  # guild_id: cooldown en secondes
+
     async def handle_reaction_add(self, payload: discord.RawReactionActionEvent):
         """Gère l'ajout d'une réaction"""
-        if payload.user_id == self.bot.user.id:
+        # Réaction hors panel : écartée sans accès à la base
+        if payload.message_id not in self.db.index or payload.user_id == self.bot.user.id:
             return
         
         # Récupérer le panel
@@ -410,7 +482,7 @@ class ReactionRoleManager:
     
     async def handle_reaction_remove(self, payload: discord.RawReactionActionEvent):
         """Gère la suppression d'une réaction"""
-        if payload.user_id == self.bot.user.id:
+        if payload.message_id not in self.db.index or payload.user_id == self.bot.user.id:
             return
         
         panel = self.db.get_panel_by_message(payload.message_id)
@@ -435,7 +507,7 @@ class ReactionRoleManager:
         if role in member.roles:
             try:
                 await member.remove_roles(role, reason=f"Réaction retirée - Panel: {panel['panel_name']}")
-                self.db.remove_role_assignment(guild.id, member.id, panel['id'], role.id)
+                await self.db.remove_role_assignment(guild.id, member.id, panel['id'], role.id)
                 
                 # Notifier l'utilisateur si activé
                 await self._notify_user_role_change(member, role, "removed", panel['panel_name'])
@@ -447,9 +519,15 @@ class ReactionRoleManager:
     
     async def _check_cooldown(self, user_id: int, guild_id: int) -> bool:
         """Vérifie le cooldown d'un utilisateur"""
-        # TODO: Implémenter le système de cooldown
-        return True
-    
+        cooldown = self.cooldown_settings.get(guild_id)
+        if cooldown is None:
+            cooldown = self.cooldown_settings[guild_id] = self.db.get_reaction_cooldown(guild_id)
+        
+        if cooldown <= 0:
+            return True
+        
+        return self.cooldowns.allow((guild_id, user_id), window=cooldown)
+
     async def _check_user_permissions(self, member: discord.Member, panel: Dict[str, Any]) -> bool:
         """Vérifie si un utilisateur peut utiliser le panel"""
         # Vérifier le rôle requis
@@ -497,8 +575,7 @@ class ReactionRoleManager:
         
         try:
             await member.add_roles(role, reason=f"Rôle par réaction - Panel: {panel['panel_name']}")
-            self.db.log_role_assignment(member.guild.id, member.id, panel['id'], role.id)
-            self.db.update_reaction_stats(panel['id'], role_mapping['emoji'], role.id)
+            await self.db.log_role_assignment(member.guild.id, member.id, panel['id'], role.id, role_mapping['emoji'])
             
             await self._notify_user_role_change(member, role, "added", panel['panel_name'])
             
@@ -509,12 +586,11 @@ class ReactionRoleManager:
     
     async def _handle_unique_role(self, member: discord.Member, role: discord.Role, panel: Dict[str, Any]):
         """Gère l'attribution en mode unique (un seul rôle du panel)"""
-        panel_roles = self.db.get_panel_roles(panel['id'])
         roles_to_remove = []
         
         # Identifier les rôles du panel que l'utilisateur possède
-        for panel_role in panel_roles:
-            existing_role = member.guild.get_role(panel_role['role_id'])
+        for role_id in self.db.index.panel_role_ids(panel['id']):
+            existing_role = member.guild.get_role(role_id)
             if existing_role and existing_role in member.roles and existing_role != role:
                 roles_to_remove.append(existing_role)
         
@@ -523,12 +599,12 @@ class ReactionRoleManager:
             if roles_to_remove:
                 await member.remove_roles(*roles_to_remove, reason=f"Mode unique - Panel: {panel['panel_name']}")
                 for old_role in roles_to_remove:
-                    self.db.remove_role_assignment(member.guild.id, member.id, panel['id'], old_role.id)
+                    await self.db.remove_role_assignment(member.guild.id, member.id, panel['id'], old_role.id)
             
             # Ajouter le nouveau rôle s'il ne l'a pas déjà
             if role not in member.roles:
                 await member.add_roles(role, reason=f"Rôle unique - Panel: {panel['panel_name']}")
-                self.db.log_role_assignment(member.guild.id, member.id, panel['id'], role.id)
+                await self.db.log_role_assignment(member.guild.id, member.id, panel['id'], role.id)
             
             await self._notify_user_role_change(member, role, "selected", panel['panel_name'])
             
@@ -545,14 +621,13 @@ class ReactionRoleManager:
             if role in member.roles:
                 # Retirer le rôle
                 await member.remove_roles(role, reason=f"Toggle OFF - Panel: {panel['panel_name']}")
-                self.db.remove_role_assignment(member.guild.id, member.id, panel['id'], role.id)
+                await self.db.remove_role_assignment(member.guild.id, member.id, panel['id'], role.id)
                 
                 await self._notify_user_role_change(member, role, "removed", panel['panel_name'])
             else:
                 # Ajouter le rôle
                 await member.add_roles(role, reason=f"Toggle ON - Panel: {panel['panel_name']}")
-                self.db.log_role_assignment(member.guild.id, member.id, panel['id'], role.id)
-                self.db.update_reaction_stats(panel['id'], role_mapping['emoji'], role.id)
+                await self.db.log_role_assignment(member.guild.id, member.id, panel['id'], role.id, role_mapping['emoji'])
                 
                 await self._notify_user_role_change(member, role, "added", panel['panel_name'])
                 
@@ -566,11 +641,10 @@ class ReactionRoleManager:
     
     async def _get_user_panel_roles(self, member: discord.Member, panel_id: int) -> List[discord.Role]:
         """Récupère tous les rôles d'un panel que possède l'utilisateur"""
-        panel_roles = self.db.get_panel_roles(panel_id)
         user_roles = []
         
-        for panel_role in panel_roles:
-            role = member.guild.get_role(panel_role['role_id'])
+        for role_id in self.db.index.panel_role_ids(panel_id):
+            role = member.guild.get_role(role_id)
             if role and role in member.roles:
                 user_roles.append(role)
         
@@ -1143,6 +1217,10 @@ class ReactionRolesSystem(commands.Cog):
         self.db = ReactionRolesDB()
         self.manager = ReactionRoleManager(bot, self.db)
     
+    async def cog_unload(self):
+        """Écrit le journal des attributions encore en file"""
+        await self.db.events.close()
+    
     @app_commands.command(name="reactionroles", description="🎭 Configuration des rôles par réaction")
     @app_commands.describe(action="Action à effectuer")
     @app_commands.choices(action=[
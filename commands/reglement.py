@@ -7,7 +7,7 @@ Développé par XeRoX - Arsenal Bot V4.5.2
 """
 
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord import app_commands
 import aiosqlite
 import json
@@ -16,6 +16,14 @@ from datetime import datetime, timedelta, timezone
 import os
 from typing import Optional, Dict, List
 import logging
+import time
+
+from core.scheduler import scheduler
+
+# Type du job du planificateur central : un scan par serveur, à la prochaine
+# échéance d'un membre non validé
+KICK_SCAN_JOB = "reglement_kick_scan"
+KICK_RETRY_DELAY = 60  # secondes avant de retenter un kick échoué
 
 class ReglementSystem(commands.Cog):
     """Système de règlement complet style DraftBot"""
@@ -55,10 +63,12 @@ class ReglementSystem(commands.Cog):
         
         asyncio.create_task(self.setup_database())
         
-        # Démarrer les tâches
-        if not hasattr(self, '_tasks_started'):
-            self.auto_kick_checker.start()
-            self._tasks_started = True
+        # Kicks programmés à la prochaine échéance de chaque serveur (planificateur central)
+        scheduler.register(KICK_SCAN_JOB, self.auto_kick_due)
+        asyncio.create_task(self.schedule_pending_kicks())
+    
+    def cog_unload(self):
+        scheduler.unregister(KICK_SCAN_JOB)
     
     async def setup_database(self):
         """Base de données complète"""
@@ -115,38 +125,81 @@ class ReglementSystem(commands.Cog):
         except Exception as e:
             logging.error(f"Erreur setup database: {e}")
     
-    @tasks.loop(minutes=1)
-    async def auto_kick_checker(self):
-        """Vérification auto-kick toutes les minutes"""
+    # Auto-kick
+    @staticmethod
+    def scan_key(guild_id: int) -> str:
+        return f"{KICK_SCAN_JOB}:{guild_id}"
+    
+    def schedule_scan(self, guild_id: int, due: float):
+        """Avance le scan du serveur à `due` (une échéance plus proche déjà prévue est gardée)"""
+        job = scheduler.get(self.scan_key(guild_id))
+        if job is not None and job.due_at <= due:
+            return
+        scheduler.schedule(KICK_SCAN_JOB, due, {"guild_id": guild_id}, key=self.scan_key(guild_id))
+    
+    def schedule_kick(self, member: discord.Member, config: Dict):
+        """Le serveur sera scanné à la fin du délai d'acceptation du membre"""
+        joined_at = member.joined_at or datetime.now(timezone.utc)
+        self.schedule_scan(member.guild.id, (joined_at + timedelta(seconds=config.get("kick_delay", 300))).timestamp())
+    
+    async def schedule_pending_kicks(self):
+        """Au démarrage : un scan par serveur actif (membres arrivés pendant l'arrêt du bot)"""
+        await self.bot.wait_until_ready()
         try:
             async with aiosqlite.connect(self.db_path) as db:
                 async with db.execute("SELECT guild_id, config FROM server_config") as cursor:
-                    async for row in cursor:
-                        guild_id, config_str = row
-                        config = json.loads(config_str)
-                        
-                        if not config.get("enabled") or not config.get("auto_kick"):
-                            continue
-                        
-                        guild = self.bot.get_guild(guild_id)
-                        if not guild:
-                            continue
-                        
-                        cutoff_time = datetime.now(timezone.utc) - timedelta(seconds=config.get("kick_delay", 300))
-                        
-                        for member in guild.members:
-                            if member.bot or await self.is_user_accepted(guild_id, member.id):
-                                continue
-                            
-                            if member.joined_at and member.joined_at < cutoff_time:
-                                try:
-                                    await member.kick(reason="Non acceptation du règlement")
-                                    await self.log_action(guild_id, member.id, "auto_kick", "Délai dépassé")
-                                except:
-                                    pass
-                                    
+                    configs = [(guild_id, json.loads(config_str)) async for guild_id, config_str in cursor]
+            
+            for guild_id, config in configs:
+                if self.bot.get_guild(guild_id) and config.get("enabled") and config.get("auto_kick"):
+                    self.schedule_scan(guild_id, time.time())
+        
         except Exception as e:
-            logging.error(f"Erreur auto_kick_checker: {e}")
+            logging.error(f"Erreur schedule_pending_kicks: {e}")
+    
+    async def auto_kick_due(self, job):
+        """Job du planificateur : kick des membres hors délai, puis prochaine échéance du serveur"""
+        guild_id = job.payload["guild_id"]
+        config = await self.get_config(guild_id)
+        guild = self.bot.get_guild(guild_id)
+        if not guild or not config.get("enabled") or not config.get("auto_kick"):
+            return
+        
+        accepted = await self.accepted_users(guild_id)
+        delay = timedelta(seconds=config.get("kick_delay", 300))
+        now = datetime.now(timezone.utc)
+        failed = False
+        for member in list(guild.members):
+            if member.bot or member.id in accepted or not member.joined_at or member.joined_at + delay > now:
+                continue
+            # Acceptation possible depuis la lecture de la liste
+            if await self.is_user_accepted(guild_id, member.id):
+                continue
+            try:
+                await member.kick(reason="Non acceptation du règlement")
+                await self.log_action(guild_id, member.id, "auto_kick", "Délai dépassé")
+            except Exception as e:
+                failed = True
+                logging.error(f"Erreur auto-kick {member.id} sur {guild_id}: {e}")
+        
+        # Prochain membre à atteindre son délai (liste relue après les kicks)
+        now = datetime.now(timezone.utc)
+        deadlines = [
+            member.joined_at + delay for member in guild.members
+            if not member.bot and member.id not in accepted and member.joined_at and member.joined_at + delay > now
+        ]
+        if failed:
+            # Kicks échoués : nouveau scan dans une minute, comme l'ancienne boucle
+            deadlines.append(now + timedelta(seconds=KICK_RETRY_DELAY))
+        return min(deadlines).timestamp() if deadlines else None
+    
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        if member.bot:
+            return
+        config = await self.get_config(member.guild.id)
+        if config.get("enabled") and config.get("auto_kick"):
+            self.schedule_kick(member, config)
     
     # Méthodes utilitaires
     async def get_config(self, guild_id: int) -> Dict:
@@ -171,6 +224,14 @@ class ReglementSystem(commands.Cog):
         except Exception as e:
             logging.error(f"Erreur save_config: {e}")
     
+    async def accepted_users(self, guild_id: int) -> set:
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                async with db.execute("SELECT user_id FROM user_accepts WHERE guild_id = ?", (guild_id,)) as cursor:
+                    return {user_id async for (user_id,) in cursor}
+        except:
+            return set()
+    
     async def is_user_accepted(self, guild_id: int, user_id: int) -> bool:
         try:
             async with aiosqlite.connect(self.db_path) as db:
@@ -187,7 +248,7 @@ class ReglementSystem(commands.Cog):
                     VALUES (?, ?, ?, ?)
                 """, (guild_id, user_id, username, datetime.now().isoformat()))
                 await db.commit()
-                return True
+            return True
         except:
             return False
     
@@ -293,6 +354,8 @@ class ReglementSystem(commands.Cog):
             config["rules"] = config["templates"][template].copy()
         
         await self.save_config(interaction.guild.id, config)
+        # Membres déjà présents : pris en compte tout de suite, sans attendre un redémarrage
+        self.schedule_scan(interaction.guild.id, time.time())
         
         # Embed de confirmation ultra-détaillé
         level_names = {"low": "🟢 Faible", "medium": "🟡 Standard", "high": "🟠 Strict", "extreme": "🔴 Maximum"}
@@ -0,0 +1,292 @@
+"""
+🧠 Arsenal V4 - Cache et régulation des appels AI
+- cache des réponses adressé par contenu (hash du prompt complet), TTL et
+  borne LRU en mémoire, niveau SQLite optionnel
+- requêtes identiques en cours partagées (un seul appel au provider)
+- budget de tokens par serveur et nombre d'appels simultanés borné
+- provider local déterministe (réponse complète ou en streaming) pour les
+  tests et le développement sans clé
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+from core.metrics import metrics
+from modules.sqlite_database import database_manager
+
+Result = Dict[str, Any]
+
+
+def prompt_key(provider: str, model: str, system_prompt: Optional[str], message: str,
+               max_tokens: int, temperature: float) -> str:
+    """Empreinte SHA-256 de tout ce qui détermine la réponse"""
+    material = json.dumps(
+        [provider, model, system_prompt or "", message, max_tokens, round(temperature, 3)],
+        ensure_ascii=False, separators=(",", ":")
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimation grossière (~4 caractères par token) quand le provider ne compte pas"""
+    return (len(text) + 3) // 4
+
+
+class BudgetExceeded(Exception):
+    """Le serveur a consommé son budget de tokens sur la fenêtre en cours"""
+
+
+class ResponseCache:
+    """Réponses AI : LRU en mémoire avec TTL, puis SQLite si `disk_path` est fourni"""
+
+    def __init__(self, max_entries: int = 1000, ttl: float = 3600, disk_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_path = disk_path
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()  # clé: (expiration, résultat)
+        self._pool = None
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def _db(self):
+        if self._pool is None:
+            if os.path.dirname(self.disk_path):
+                os.makedirs(os.path.dirname(self.disk_path), exist_ok=True)
+            pool = database_manager.pool(self.disk_path)
+            pool.run_sync(lambda conn: conn.execute("""
+                CREATE TABLE IF NOT EXISTS ai_responses (
+                    key TEXT PRIMARY KEY,
+                    result TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """))
+            self._pool = pool
+        return self._pool
+
+    def _remember(self, key: str, expires_at: float, result: Result):
+        self._memory[key] = (expires_at, result)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[Result]:
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                self._memory.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[1]
+            del self._memory[key]
+
+        if self.disk_path:
+            row = await self._db().fetchone(
+                "SELECT result, expires_at FROM ai_responses WHERE key = ? AND expires_at > ?", (key, now)
+            )
+            if row is not None:
+                result = json.loads(row[0])
+                self._remember(key, row[1], result)
+                self.stats["disk_hits"] += 1
+                return result
+
+        self.stats["misses"] += 1
+        return None
+
+    async def put(self, key: str, result: Result, ttl: Optional[float] = None):
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        self._remember(key, expires_at, result)
+        if self.disk_path:
+            await self._db().execute(
+                "INSERT OR REPLACE INTO ai_responses (key, result, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(result, ensure_ascii=False), expires_at)
+            )
+
+    async def purge_expired(self) -> int:
+        """Supprime les entrées expirées (mémoire et disque)"""
+        now = time.time()
+        expired = [key for key, (expires_at, _) in self._memory.items() if expires_at <= now]
+        for key in expired:
+            del self._memory[key]
+        if self.disk_path:
+            expired_rows = await self._db().execute("DELETE FROM ai_responses WHERE expires_at <= ?", (now,))
+            return len(expired) + (expired_rows or 0)
+        return len(expired)
+
+
+class TokenBudget:
+    """Tokens consommés par serveur sur une fenêtre fixe (0 = illimité)"""
+
+    def __init__(self, limit: int = 0, window: float = 86400):
+        self.limit = limit
+        self.window = window
+        self._usage: Dict[Any, list] = {}  # guild_id: [début de fenêtre, tokens]
+
+    def _entry(self, guild_id) -> list:
+        now = time.time()
+        entry = self._usage.get(guild_id)
+        if entry is None or now - entry[0] >= self.window:
+            entry = self._usage[guild_id] = [now, 0]
+        return entry
+
+    def remaining(self, guild_id) -> Optional[int]:
+        if not self.limit or guild_id is None:
+            return None
+        return max(0, self.limit - self._entry(guild_id)[1])
+
+    def check(self, guild_id):
+        if self.remaining(guild_id) == 0:
+            raise BudgetExceeded(f"Budget de {self.limit} tokens épuisé pour ce serveur")
+
+    def charge(self, guild_id, tokens: int):
+        if self.limit and guild_id is not None:
+            self._entry(guild_id)[1] += tokens or 0
+
+
+class AIRequestBroker:
+    """Passage obligé des appels AI : cache, partage des requêtes en cours, budget, concurrence"""
+
+    def __init__(self, cache: Optional[ResponseCache] = None, budget: Optional[TokenBudget] = None,
+                 max_concurrency: int = 4):
+        self.cache = cache or ResponseCache()
+        self.budget = budget or TokenBudget()
+        self.max_concurrency = max_concurrency
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"calls": 0, "coalesced": 0}
+        metrics.gauge("arsenal_ai_inflight", lambda: len(self._inflight), "Requêtes AI en cours")
+
+    @property
+    def slots(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        return self._slots
+
+    async def run(self, key: str, call: Callable[[], Awaitable[Result]], guild_id=None, cache: bool = True) -> Result:
+        """Résultat de `call()` pour la clé `key`, en évitant les appels redondants"""
+        if cache:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                metrics.inc("arsenal_ai_requests_total", help_text="Requêtes AI par origine", source="cache")
+                return {**cached, "cached": True}
+
+        # Chaque appelant passe le contrôle, même s'il rejoint la requête d'un autre serveur
+        self.budget.check(guild_id)
+        if cache:
+            pending = self._inflight.get(key)
+            if pending is not None:
+                self.stats["coalesced"] += 1
+                metrics.inc("arsenal_ai_requests_total", help_text="Requêtes AI par origine", source="coalesced")
+                return {**(await asyncio.shield(pending)), "cached": True}
+
+        future = asyncio.get_running_loop().create_future()
+        if cache:
+            self._inflight[key] = future
+        try:
+            async with self.slots:
+                self.stats["calls"] += 1
+                metrics.inc("arsenal_ai_requests_total", help_text="Requêtes AI par origine", source="provider")
+                result = await call()
+            self.budget.charge(guild_id, result.get("tokens_used", 0))
+            if cache and result.get("success"):
+                await self.cache.put(key, result)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # marquée lue : sans requête partagée personne ne l'attend
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    async def stream(self, key: str, open_stream: Callable[[], AsyncIterator[str]], guild_id=None,
+                     cache: bool = True, prompt_tokens: int = 0, **info) -> AsyncIterator[str]:
+        """Fragments de réponse au fil de l'eau ; la réponse complète est mise en cache
+
+        Un résultat déjà en cache est rendu en un seul fragment. Un flux
+        interrompu par l'appelant n'est ni mis en cache ni facturé. La place
+        de concurrence n'est prise que pendant chaque lecture du provider :
+        un appelant qui abandonne le flux ne la garde pas.
+        """
+        if cache:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                metrics.inc("arsenal_ai_requests_total", help_text="Requêtes AI par origine", source="cache")
+                yield cached["response"]
+                return
+
+        self.budget.check(guild_id)
+        parts = []
+        self.stats["calls"] += 1
+        metrics.inc("arsenal_ai_requests_total", help_text="Requêtes AI par origine", source="stream")
+        upstream = open_stream()
+        try:
+            while True:
+                async with self.slots:
+                    try:
+                        chunk = await upstream.__anext__()
+                    except StopAsyncIteration:
+                        break
+                parts.append(chunk)
+                yield chunk
+        finally:
+            if hasattr(upstream, "aclose"):
+                await upstream.aclose()
+
+        response = "".join(parts)
+        completion_tokens = estimate_tokens(response)
+        self.budget.charge(guild_id, prompt_tokens + completion_tokens)
+        if cache and response:
+            await self.cache.put(key, {
+                **info,
+                "success": True,
+                "response": response,
+                "tokens_used": prompt_tokens + completion_tokens,
+                "tokens_prompt": prompt_tokens,
+                "tokens_completion": completion_tokens,
+            })
+
+
+class StubProvider:
+    """Provider local déterministe : même forme de résultat que `_chat_openai` / `_chat_gemini`
+
+    `latency` est le délai de la réponse complète, ou entre deux fragments en streaming
+    """
+
+    def __init__(self, latency: float = 0.0, reply: Optional[Callable[[str], str]] = None):
+        self.latency = latency
+        self.reply = reply or (lambda message: f"[stub] {message}")
+        self.calls = 0
+
+    async def __call__(self, message: str, system_prompt: Optional[str], max_tokens: int, temperature: float) -> Result:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        response = self.reply(message)[:max_tokens * 4]
+        prompt_tokens = len(((system_prompt or "") + message).split())
+        completion_tokens = len(response.split())
+        return {
+            "success": True,
+            "response": response,
+            "provider": "stub",
+            "model": "stub",
+            "tokens_used": prompt_tokens + completion_tokens,
+            "tokens_prompt": prompt_tokens,
+            "tokens_completion": completion_tokens,
+        }
+
+    async def stream(self, message: str, system_prompt: Optional[str], max_tokens: int,
+                     temperature: float) -> AsyncIterator[str]:
+        """Même réponse que `__call__`, mot par mot"""
+        self.calls += 1
+        for index, word in enumerate(self.reply(message)[:max_tokens * 4].split(" ")):
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            yield word if index == 0 else f" {word}"
@@ -0,0 +1,136 @@
+"""
+✍️ Arsenal V4 - Réponses AI en streaming
+- pont entre les itérateurs synchrones des SDK (OpenAI, Gemini) et asyncio
+- édition progressive d'un message Discord, limitée en fréquence : le
+  premier fragment s'affiche tout de suite, les suivants au plus une fois
+  par intervalle, la version complète à la fin
+"""
+
+import asyncio
+import logging
+import threading
+from typing import AsyncIterator, Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_LIMIT = 2000  # caractères par message Discord
+EDIT_INTERVAL = 1.0   # secondes entre deux éditions (limite d'édition Discord)
+CURSOR = " ▌"
+
+
+class _Failure:
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+async def iterate_in_thread(factory: Callable[[], Iterable[str]]) -> AsyncIterator[str]:
+    """Parcourt `factory()` dans un thread et rend ses éléments dans la boucle asyncio"""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+    stop = threading.Event()
+
+    def push(item):
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            stop.set()  # boucle fermée : plus personne ne lit
+
+    def produce():
+        try:
+            for item in factory():
+                if stop.is_set():
+                    break
+                push(item)
+        except BaseException as e:
+            push(_Failure(e))
+        finally:
+            push(done)
+
+    loop.run_in_executor(None, produce)
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+
+
+def clip(text: str, limit: int = MESSAGE_LIMIT) -> str:
+    """Texte ramené à `limit` caractères (fin remplacée par …)"""
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+class ThrottledEditor:
+    """Édite un message au plus une fois par `interval` avec le dernier texte connu"""
+
+    def __init__(self, message, interval: float = EDIT_INTERVAL, limit: int = MESSAGE_LIMIT, cursor: str = CURSOR):
+        self.message = message
+        self.interval = interval
+        self.limit = limit
+        self.cursor = cursor
+        self.text = ""
+        self.shown: Optional[str] = None
+        self.edits = 0
+        self._changed = asyncio.Event()
+        self._worker: Optional[asyncio.Task] = None
+
+    def update(self, text: str):
+        """Nouveau texte partiel ; l'édition suit dès que l'intervalle le permet"""
+        self.text = text
+        self._changed.set()
+        if self._worker is None:
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def _edit(self, content: str):
+        if content == self.shown:
+            return
+        try:
+            await self.message.edit(content=content)
+            self.shown = content
+            self.edits += 1
+        except Exception as e:
+            logger.warning(f"Édition du message en streaming échouée: {e}")
+
+    async def _run(self):
+        while True:
+            await self._changed.wait()
+            self._changed.clear()
+            await self._edit(clip(self.text, self.limit - len(self.cursor)) + self.cursor)
+            await asyncio.sleep(self.interval)
+
+    async def finish(self, text: Optional[str] = None):
+        """Arrête les éditions intermédiaires et affiche le texte final (sans curseur)"""
+        if text is not None:
+            self.text = text
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        await self._edit(clip(self.text, self.limit) or "…")
+
+
+async def stream_to_message(message, chunks: AsyncIterator[str], interval: float = EDIT_INTERVAL,
+                            limit: int = MESSAGE_LIMIT) -> str:
+    """Affiche `chunks` dans `message` au fil de l'eau et retourne le texte complet"""
+    editor = ThrottledEditor(message, interval, limit)
+    text = ""
+    try:
+        async for chunk in chunks:
+            text += chunk
+            editor.update(text)
+    finally:
+        # Fermé tout de suite (annulation, erreur d'édition) plutôt qu'au ramasse-miettes
+        if hasattr(chunks, "aclose"):
+            await chunks.aclose()
+        await editor.finish(text)
+    return text
@@ -2,8 +2,12 @@
 
 import os
 import asyncio
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, AsyncIterator
 from config import ArsenalConfig
+from core.ai_cache import (
+    AIRequestBroker, BudgetExceeded, ResponseCache, StubProvider, TokenBudget, estimate_tokens, prompt_key
+)
+from core.ai_stream import iterate_in_thread
 
 # ==================== IMPORTS CONDITIONNELS ====================
 
@@ -28,6 +32,19 @@ class AIUltimate:
         self.config = ArsenalConfig.AI_CONFIG
         self.openai_client = None
         self.gemini_model = None
+        # Provider local sans clé API (développement / tests)
+        self.stub_provider = StubProvider() if self.config.get('stub_provider') else None
+        
+        # Cache des réponses, requêtes partagées, budget par serveur, appels simultanés
+        self.broker = AIRequestBroker(
+            ResponseCache(
+                max_entries=self.config.get('cache_max_entries', 1000),
+                ttl=self.config.get('cache_ttl', 3600),
+                disk_path=self.config.get('cache_db')
+            ),
+            TokenBudget(self.config.get('guild_token_budget', 0), self.config.get('budget_window', 86400)),
+            max_concurrency=self.config.get('max_concurrent_requests', 4)
+        )
         
         # Initialiser les clients disponibles
         self._init_openai()
@@ -67,6 +84,8 @@ class AIUltimate:
             return 'gemini'
         elif self.openai_available:
             return 'openai'
+        elif self.stub_provider is not None:
+            return 'stub'
         else:
             return 'none'
     
@@ -83,26 +102,46 @@ class AIUltimate:
     @property
     def is_available(self) -> bool:
         """Vérifier si au moins un provider AI est disponible"""
-        return self.openai_available or self.gemini_available
+        return self.openai_available or self.gemini_available or self.stub_provider is not None
+    
+    def _backend(self, provider: str):
+        """(nom, fonction de chat) du provider demandé, ou du premier disponible"""
+        backends = [
+            ('gemini', self._chat_gemini if self.gemini_available else None),
+            ('openai', self._chat_openai if self.openai_available else None),
+            ('stub', self.stub_provider),
+        ]
+        for name, backend in backends:
+            if name == provider and backend is not None:
+                return name, backend
+        # Fallback vers l'autre provider
+        for name, backend in backends:
+            if backend is not None:
+                return name, backend
+        return None, None
     
     async def chat(self, 
                    message: str, 
                    provider: Optional[str] = None,
                    system_prompt: Optional[str] = None,
                    max_tokens: Optional[int] = None,
-                   temperature: Optional[float] = None) -> Dict[str, Any]:
+                   temperature: Optional[float] = None,
+                   guild_id: Optional[int] = None,
+                   use_cache: bool = True) -> Dict[str, Any]:
         """
         Chat unifié avec le provider spécifié ou par défaut
         
         Args:
             message: Message utilisateur
-            provider: 'openai', 'gemini' ou None (défaut)
+            provider: 'openai', 'gemini', 'stub' ou None (défaut)
             system_prompt: Instructions système (optionnel)
             max_tokens: Limite de tokens (optionnel)
             temperature: Créativité 0-1 (optionnel)
+            guild_id: Serveur facturé sur le budget de tokens (optionnel)
+            use_cache: Réutiliser une réponse identique récente (défaut)
         
         Returns:
-            Dict avec 'response', 'provider', 'tokens_used', etc.
+            Dict avec 'response', 'provider', 'tokens_used', 'cached', etc.
         """
         
         # Déterminer le provider à utiliser
@@ -120,23 +159,31 @@ class AIUltimate:
         max_tokens = max_tokens or self.config.get('max_tokens', 2000)
         temperature = temperature or self.config.get('temperature', 0.7)
         
+        name, backend = self._backend(provider)
+        if backend is None:
+            return {
+                'success': False,
+                'error': f'Provider {provider} non disponible',
+                'provider': provider
+            }
+        
+        model = self.config.get(f'{name}_model', name)
+        key = prompt_key(name, model, system_prompt, message, max_tokens, temperature)
+        
         try:
-            if provider == 'gemini' and self.gemini_available:
-                return await self._chat_gemini(message, system_prompt, max_tokens, temperature)
-            elif provider == 'openai' and self.openai_available:
-                return await self._chat_openai(message, system_prompt, max_tokens, temperature)
-            else:
-                # Fallback vers l'autre provider
-                if self.gemini_available:
-                    return await self._chat_gemini(message, system_prompt, max_tokens, temperature)
-                elif self.openai_available:
-                    return await self._chat_openai(message, system_prompt, max_tokens, temperature)
-                else:
-                    return {
-                        'success': False,
-                        'error': f'Provider {provider} non disponible',
-                        'provider': provider
-                    }
+            return await self.broker.run(
+                key,
+                lambda: backend(message, system_prompt, max_tokens, temperature),
+                guild_id=guild_id,
+                cache=use_cache
+            )
+        
+        except BudgetExceeded as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'provider': name
+            }
         
         except Exception as e:
             return {
@@ -201,6 +248,91 @@ class AIUltimate:
             'tokens_completion': response.usage_metadata.candidates_token_count if hasattr(response, 'usage_metadata') else 0
         }
     
+    async def chat_stream(self,
+                          message: str,
+                          provider: Optional[str] = None,
+                          system_prompt: Optional[str] = None,
+                          max_tokens: Optional[int] = None,
+                          temperature: Optional[float] = None,
+                          guild_id: Optional[int] = None,
+                          use_cache: bool = True) -> AsyncIterator[str]:
+        """
+        Chat en streaming : génère les fragments de la réponse au fil de l'eau
+        
+        Mêmes paramètres que `chat`. Lève RuntimeError si aucun provider n'est
+        disponible et BudgetExceeded si le budget du serveur est épuisé.
+        """
+        if provider is None:
+            provider = self.default_provider
+        
+        max_tokens = max_tokens or self.config.get('max_tokens', 2000)
+        temperature = temperature or self.config.get('temperature', 0.7)
+        
+        backends = {
+            'gemini': self._stream_gemini if self.gemini_available else None,
+            'openai': self._stream_openai if self.openai_available else None,
+            'stub': self.stub_provider.stream if self.stub_provider is not None else None,
+        }
+        name, _ = self._backend(provider)
+        backend = backends.get(name)
+        if backend is None:
+            raise RuntimeError(f'Provider {provider} non disponible')
+        
+        model = self.config.get(f'{name}_model', name)
+        key = prompt_key(name, model, system_prompt, message, max_tokens, temperature)
+        
+        async for chunk in self.broker.stream(
+            key,
+            lambda: backend(message, system_prompt, max_tokens, temperature),
+            guild_id=guild_id,
+            cache=use_cache,
+            prompt_tokens=estimate_tokens((system_prompt or '') + message),
+            provider=name,
+            model=model
+        ):
+            yield chunk
+    
+    def _stream_openai(self, message: str, system_prompt: str, max_tokens: int, temperature: float) -> AsyncIterator[str]:
+        """Streaming OpenAI (itérateur du SDK parcouru dans un thread)"""
+        
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": message})
+        
+        def chunks():
+            stream = self.openai_client.chat.completions.create(
+                model=self.config.get('openai_model', 'gpt-3.5-turbo'),
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                stream=True
+            )
+            for event in stream:
+                if event.choices and event.choices[0].delta.content:
+                    yield event.choices[0].delta.content
+        
+        return iterate_in_thread(chunks)
+    
+    def _stream_gemini(self, message: str, system_prompt: str, max_tokens: int, temperature: float) -> AsyncIterator[str]:
+        """Streaming Gemini (itérateur du SDK parcouru dans un thread)"""
+        
+        full_prompt = message
+        if system_prompt:
+            full_prompt = f"{system_prompt}\n\n{message}"
+        
+        generation_config = genai.types.GenerationConfig(
+            max_output_tokens=max_tokens,
+            temperature=temperature
+        )
+        
+        def chunks():
+            for chunk in self.gemini_model.generate_content(full_prompt, generation_config=generation_config, stream=True):
+                if chunk.parts:
+                    yield chunk.text
+        
+        return iterate_in_thread(chunks)
+    
     async def analyze_image(self, image_url: str, prompt: str = "Décris cette image") -> Dict[str, Any]:
         """Analyser une image (Gemini uniquement pour l'instant)"""
         
@@ -247,21 +379,25 @@ class AIUltimate:
                 'model': self.config.get('gemini_model', 'gemini-pro') if self.gemini_available else None
             },
             'default_provider': self.default_provider,
-            'enabled': self.is_available
+            'enabled': self.is_available,
+            'cache': {**self.broker.cache.stats, 'entries': len(self.broker.cache), **self.broker.stats}
         }
     
-    async def translate_text(self, text: str, target_language: str = 'fr', provider: str = None) -> Dict[str, Any]:
-        """Traduire du texte"""
+    async def translate_text(self, text: str, target_language: str = 'fr', provider: str = None,
+                             guild_id: Optional[int] = None) -> Dict[str, Any]:
+        """Traduire du texte (traductions identiques servies par le cache)"""
         
         system_prompt = f"Tu es un traducteur expert. Traduis le texte suivant en {target_language}. Réponds uniquement avec la traduction, sans explication."
         
         return await self.chat(
             message=f"Traduis ce texte: {text}",
             provider=provider,
-            system_prompt=system_prompt
+            system_prompt=system_prompt,
+            guild_id=guild_id
         )
     
-    async def generate_code(self, description: str, language: str = 'python', provider: str = None) -> Dict[str, Any]:
+    async def generate_code(self, description: str, language: str = 'python', provider: str = None,
+                            guild_id: Optional[int] = None) -> Dict[str, Any]:
         """Générer du code"""
         
         system_prompt = f"Tu es un expert en programmation {language}. Génère du code propre, commenté et fonctionnel."
@@ -269,7 +405,8 @@ class AIUltimate:
         return await self.chat(
             message=f"Génère du code {language} pour: {description}",
             provider=provider,
-            system_prompt=system_prompt
+            system_prompt=system_prompt,
+            guild_id=guild_id
         )
 
 # ==================== INSTANCE GLOBALE ====================
@@ -279,14 +416,14 @@ ai_ultimate = AIUltimate()
 
 # ==================== FONCTIONS UTILITAIRES ====================
 
-async def quick_chat(message: str, provider: str = None) -> str:
-    """Chat rapide qui retourne directement la réponse"""
-    result = await ai_ultimate.chat(message, provider)
+async def quick_chat(message: str, provider: str = None, guild_id: Optional[int] = None) -> str:
+    """Chat rapide qui retourne directement la réponse (`guild_id` : serveur facturé)"""
+    result = await ai_ultimate.chat(message, provider, guild_id=guild_id)
     return result.get('response', 'Erreur AI') if result.get('success') else f"Erreur: {result.get('error', 'Inconnue')}"
 
-async def quick_translate(text: str, target: str = 'fr') -> str:
-    """Traduction rapide"""
-    result = await ai_ultimate.translate_text(text, target)
+async def quick_translate(text: str, target: str = 'fr', guild_id: Optional[int] = None) -> str:
+    """Traduction rapide (`guild_id` : serveur facturé)"""
+    result = await ai_ultimate.translate_text(text, target, guild_id=guild_id)
     return result.get('response', text) if result.get('success') else text
 
 # ==================== TESTS ====================
@@ -0,0 +1,302 @@
+"""
+🚀 Arsenal Bot - Chargement des cogs depuis le manifeste
+Ordre des dépendances, imports et init de schéma en parallèle, cogs différés
+chargés après la connexion, rapport de temps de démarrage par cog
+"""
+import asyncio
+import datetime
+import importlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from core.logger import log
+
+DEFAULT_REPORT_PATH = "data/startup_report.json"
+
+
+@dataclass(frozen=True)
+class CogSpec:
+    """Une entrée du manifeste (core/cog_manifest.py)"""
+    name: str                          # Clé du manifeste (nom de la classe)
+    target: str                        # "module:Classe"
+    description: str = ""
+    requires: Tuple[str, ...] = ()     # Chargé après ces cogs, ignoré si l'un d'eux échoue
+    after: Tuple[str, ...] = ()        # Chargé après ces cogs (ordre seulement)
+    threaded: bool = False             # Import + __init__ dans un thread (init SQLite synchrone)
+    deferred: bool = False             # Chargé en arrière-plan pendant la connexion
+    schema: Optional[str] = None       # "module:fonction" d'init de schéma (sync ou async)
+    skip_if_command: Optional[str] = None  # Ignoré si cette commande slash existe déjà
+    enabled: bool = True
+
+    @property
+    def dependencies(self) -> Tuple[str, ...]:
+        return self.requires + tuple(name for name in self.after if name not in self.requires)
+
+
+@dataclass
+class CogTiming:
+    name: str
+    target: str
+    wave: int
+    deferred: bool
+    mode: str = "loop"
+    status: str = "pending"
+    error: Optional[str] = None
+    schema_s: float = 0.0
+    import_s: float = 0.0
+    init_s: float = 0.0
+    add_s: float = 0.0
+
+    @property
+    def total_s(self) -> float:
+        return self.schema_s + self.import_s + self.init_s + self.add_s
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "target": self.target,
+            "wave": self.wave,
+            "deferred": self.deferred,
+            "mode": self.mode,
+            "status": self.status,
+            "error": self.error,
+            "schema_ms": round(self.schema_s * 1000, 1),
+            "import_ms": round(self.import_s * 1000, 1),
+            "init_ms": round(self.init_s * 1000, 1),
+            "add_ms": round(self.add_s * 1000, 1),
+            "total_ms": round(self.total_s * 1000, 1),
+        }
+
+
+def _resolve(target: str):
+    module_name, _, attr = target.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def resolve_waves(specs: Sequence[CogSpec], loaded: Sequence[str] = ()) -> List[List[CogSpec]]:
+    """Regroupe les cogs par vague : une vague ne dépend que des précédentes
+
+    L'ordre du manifeste est conservé dans chaque vague. Les dépendances déjà
+    chargées (`loaded`) sont considérées comme satisfaites.
+    """
+    by_name = {spec.name: spec for spec in specs}
+    depth: Dict[str, int] = {}
+
+    def visit(spec: CogSpec, path: Tuple[str, ...]) -> int:
+        if spec.name in depth:
+            return depth[spec.name]
+        if spec.name in path:
+            raise ValueError(f"Dépendance circulaire: {' -> '.join(path + (spec.name,))}")
+        level = 0
+        for dep in spec.dependencies:
+            if dep in by_name:
+                level = max(level, visit(by_name[dep], path + (spec.name,)) + 1)
+            elif dep not in loaded:
+                raise ValueError(f"{spec.name} dépend de {dep}, absent du manifeste")
+        depth[spec.name] = level
+        return level
+
+    waves: List[List[CogSpec]] = []
+    for spec in specs:
+        level = visit(spec, ())
+        while len(waves) <= level:
+            waves.append([])
+        waves[level].append(spec)
+    return waves
+
+
+class CogLoader:
+    """Charge les cogs du manifeste et mesure le coût de chacun"""
+
+    def __init__(self, bot, manifest: Sequence[CogSpec], report_path: str = DEFAULT_REPORT_PATH,
+                 max_workers: Optional[int] = None):
+        self.bot = bot
+        self.specs = [spec for spec in manifest if spec.enabled]
+        self.disabled = [spec.name for spec in manifest if not spec.enabled]
+        self.report_path = report_path
+        self.timings: Dict[str, CogTiming] = {}
+        self.cogs: Dict[str, object] = {}
+
+        names = [spec.name for spec in self.specs]
+        duplicates = {name for name in names if names.count(name) > 1}
+        if duplicates:
+            raise ValueError(f"Cogs déclarés plusieurs fois: {', '.join(sorted(duplicates))}")
+        eager = [spec for spec in self.specs if not spec.deferred]
+        deferred_names = {spec.name for spec in self.specs if spec.deferred}
+        for spec in eager:
+            late = deferred_names.intersection(spec.dependencies)
+            if late:
+                raise ValueError(f"{spec.name} ne peut pas dépendre d'un cog différé: {', '.join(sorted(late))}")
+        # Dépendre d'un cog désactivé : `after` sans effet, `requires` => cog ignoré au chargement
+        self.eager_waves = resolve_waves(eager, loaded=self.disabled)
+        self.deferred_waves = resolve_waves([spec for spec in self.specs if spec.deferred],
+                                            loaded=[s.name for s in eager] + self.disabled)
+
+        workers = max_workers or int(os.environ.get("ARSENAL_STARTUP_WORKERS", 4))
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="arsenal-boot")
+        self._lock: Optional[asyncio.Lock] = None
+        self._deferred_task: Optional[asyncio.Task] = None
+        self._started = 0.0
+        self.eager_seconds = 0.0
+        self.total_seconds = 0.0
+
+    # ==================== DÉMARRAGE ====================
+
+    async def load_all(self):
+        """Charge les cogs non différés puis lance le chargement des autres en arrière-plan"""
+        self._lock = asyncio.Lock()
+        self._started = time.perf_counter()
+        async with self._lock:
+            for index, wave in enumerate(self.eager_waves):
+                await self._load_wave(wave, index)
+        self.eager_seconds = time.perf_counter() - self._started
+        loaded = sum(1 for timing in self.timings.values() if timing.status == "loaded")
+        log.info(f"🚀 [BOOT] {loaded}/{len(self.timings)} cogs chargés en {self.eager_seconds:.2f}s")
+        self._deferred_task = asyncio.create_task(self._load_deferred())
+
+    async def wait_deferred(self):
+        """Attend la fin du chargement différé (avant la synchronisation des commandes)"""
+        if self._deferred_task is not None:
+            await asyncio.shield(self._deferred_task)
+
+    async def ensure_loaded(self, name: str):
+        """Charge immédiatement un cog (et ses dépendances) s'il ne l'est pas encore"""
+        if name in self.timings:
+            return self.cogs.get(name)
+        by_name = {spec.name: spec for spec in self.specs}
+        if name not in by_name:
+            raise KeyError(name)
+        async with self._lock:
+            chain, stack = [], [by_name[name]]
+            while stack:
+                spec = stack.pop()
+                if spec.name in self.timings or spec in chain:
+                    continue
+                chain.append(spec)
+                stack.extend(by_name[dep] for dep in spec.dependencies if dep in by_name)
+            for index, wave in enumerate(resolve_waves(chain, loaded=list(self.timings))):
+                await self._load_wave(wave, index)
+        return self.cogs.get(name)
+
+    async def _load_deferred(self):
+        try:
+            async with self._lock:
+                for index, wave in enumerate(self.deferred_waves, start=len(self.eager_waves)):
+                    await self._load_wave([spec for spec in wave if spec.name not in self.timings], index)
+        finally:
+            self.total_seconds = time.perf_counter() - self._started
+            self._executor.shutdown(wait=False)
+            self.write_report()
+
+    # ==================== CHARGEMENT ====================
+
+    async def _load_wave(self, wave: List[CogSpec], index: int):
+        """Prépare la vague en parallèle puis ajoute les cogs dans l'ordre du manifeste"""
+        prepared = await asyncio.gather(*(self._prepare(spec, index) for spec in wave))
+        for spec, cog in zip(wave, prepared):
+            timing = self.timings[spec.name]
+            if cog is None:
+                continue
+            start = time.perf_counter()
+            try:
+                await self.bot.add_cog(cog)
+                timing.status = "loaded"
+                self.cogs[spec.name] = cog
+                log.info(f"[OK] {spec.description or spec.name}")
+            except Exception as e:
+                timing.status, timing.error = "failed", f"{type(e).__name__}: {e}"
+                log.error(f"[ERROR] Erreur chargement {spec.name}: {e}")
+            timing.add_s = time.perf_counter() - start
+
+    async def _prepare(self, spec: CogSpec, wave: int):
+        """Schéma, import et instanciation d'un cog ; None si échec"""
+        timing = self.timings[spec.name] = CogTiming(spec.name, spec.target, wave, spec.deferred)
+        missing = [dep for dep in spec.requires if self.timings.get(dep) is None or self.timings[dep].status != "loaded"]
+        if missing:
+            timing.status, timing.error = "skipped", f"dépendances non chargées: {', '.join(missing)}"
+            log.warning(f"[SKIP] {spec.name}: {timing.error}")
+            return None
+        tree = getattr(self.bot, "tree", None)
+        if spec.skip_if_command and tree is not None and tree.get_command(spec.skip_if_command):
+            timing.status, timing.error = "skipped", f"commande /{spec.skip_if_command} déjà enregistrée"
+            log.info(f"[INFO] {spec.name} ignoré : {timing.error} - évité duplication")
+            return None
+
+        step = "schema"
+        try:
+            if spec.schema:
+                start = time.perf_counter()
+                result = await self._call(spec, timing, _resolve, spec.schema)
+                result = await self._call(spec, timing, result)
+                if asyncio.iscoroutine(result):
+                    await result
+                timing.schema_s = time.perf_counter() - start
+
+            step = "import"
+            start = time.perf_counter()
+            cog_class = await self._call(spec, timing, _resolve, spec.target)
+            timing.import_s = time.perf_counter() - start
+
+            step = "init"
+            start = time.perf_counter()
+            cog = await self._call(spec, timing, cog_class, self.bot)
+            timing.init_s = time.perf_counter() - start
+            return cog
+        except Exception as e:
+            timing.status, timing.error = "failed", f"{step}: {type(e).__name__}: {e}"
+            log.error(f"[ERROR] Erreur chargement {spec.name} ({step}): {e}")
+            return None
+
+    async def _call(self, spec: CogSpec, timing: CogTiming, func, *args):
+        """Exécute dans le pool si le cog le permet, sinon ici
+
+        Pas de nouvel essai sur la boucle si l'appel échoue dans le thread : un
+        __init__ interrompu a pu laisser des effets de bord (fichiers ouverts,
+        gauges enregistrées) qu'une seconde instance dupliquerait.
+        """
+        if spec.threaded:
+            try:
+                result = await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+            except RuntimeError as e:
+                # Ex: tasks.loop.start() ou asyncio.create_task() dans __init__
+                raise RuntimeError(f"{e} (le cog a besoin de la boucle asyncio : retirer threaded=True)") from e
+            timing.mode = "thread"
+            return result
+        return func(*args)
+
+    # ==================== RAPPORT ====================
+
+    def report(self) -> Dict:
+        timings = sorted(self.timings.values(), key=lambda t: (t.wave, t.deferred))
+        return {
+            "generated_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "eager_seconds": round(self.eager_seconds, 3),
+            "total_seconds": round(self.total_seconds, 3),
+            "loaded": sum(1 for t in timings if t.status == "loaded"),
+            "failed": [t.name for t in timings if t.status == "failed"],
+            "skipped": [t.name for t in timings if t.status == "skipped"],
+            "disabled": list(self.disabled),
+            "cogs": [t.to_dict() for t in timings],
+        }
+
+    def write_report(self):
+        """Écrit le rapport de démarrage et logge les cogs les plus lents"""
+        report = self.report()
+        try:
+            os.makedirs(os.path.dirname(self.report_path) or ".", exist_ok=True)
+            with open(self.report_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+        except OSError as e:
+            log.warning(f"[BOOT] Rapport de démarrage non écrit: {e}")
+
+        slowest = sorted(self.timings.values(), key=lambda t: t.total_s, reverse=True)[:5]
+        details = ", ".join(f"{t.name} {t.total_s * 1000:.0f}ms" for t in slowest)
+        log.info(
+            f"⏱️ [BOOT] Démarrage complet en {self.total_seconds:.2f}s "
+            f"({report['loaded']} chargés, {len(report['failed'])} échecs, {len(report['skipped'])} ignorés) "
+            f"- plus lents: {details}"
+        )
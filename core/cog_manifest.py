@@ -0,0 +1,149 @@
+"""
+📋 Arsenal Bot - Manifeste des cogs
+Liste déclarative chargée par core/cog_loader.py au démarrage (setup_hook)
+
+- requires : chargé après ces cogs, ignoré si l'un d'eux n'a pas pu être chargé
+- after    : chargé après ces cogs (le cog les cherche avec bot.get_cog)
+- threaded : import + __init__ hors de la boucle (création de schéma SQLite synchrone) ;
+             uniquement si __init__ ne démarre ni tasks.loop ni tâche asyncio
+- deferred : cog peu utilisé, chargé en arrière-plan pendant la connexion
+- schema   : fonction d'initialisation de base exécutée avant l'instanciation
+- skip_if_command : ignoré si cette commande slash est déjà enregistrée
+- enabled  : False = déclaré mais jamais chargé
+
+Le rapport de chaque démarrage est écrit dans data/startup_report.json
+"""
+from core.cog_loader import CogSpec
+
+COG_MANIFEST = [
+    # 🔥 Systèmes prioritaires - Enregistrement et Protection
+    CogSpec("ArsenalRegistrationSystem", "commands.arsenal_registration_system:ArsenalRegistrationSystem",
+            "🔥 [PRIORITÉ] Arsenal Registration System - Système central!"),
+    CogSpec("ArsenalProtectionSystem", "commands.arsenal_protection_middleware:ArsenalProtectionSystem",
+            "🛡️ [PRIORITÉ] Arsenal Protection System - Middleware actif!", requires=("ArsenalRegistrationSystem",)),
+    CogSpec("ArsenalUtilitiesBasic", "commands.arsenal_utilities_basic:ArsenalUtilitiesBasic",
+            "🔧 Arsenal Utilities Basic - Commandes essentielles (ping, uptime, serverinfo)!"),
+    CogSpec("ReloaderCommands", "core.module_reloader:ReloaderCommands",
+            "⚡ Système de rechargement de modules"),
+
+    # 🏹 Hunt Royal et Suggestions
+    CogSpec("HuntRoyalCommands", "modules.hunt_royal_system:HuntRoyalCommands", "Module Hunt Royal"),
+    CogSpec("SuggestionsCommands", "modules.suggestions_system:SuggestionsCommands", "Module Suggestions"),
+    CogSpec("HuntRoyalIntegrationSystem", "commands.hunt_royal_integration:HuntRoyalIntegrationSystem",
+            "Module Hunt Royal Integration"),
+    CogSpec("HuntRoyalProfilesSystem", "commands.hunt_royal_profiles:HuntRoyalProfilesSystem",
+            "👤 Hunt Royal Profiles System - Profils joueurs!"),
+
+    # ⚙️ Configuration et gestion serveur
+    CogSpec("ServerManagementSystem", "commands.server_management_system:ServerManagementSystem",
+            "🏛️ Server Management System - Gestion serveur complète!", threaded=True),
+    CogSpec("ArsenalConfigModular", "commands.config_modular:ArsenalConfigModular",
+            "🔧 Arsenal Config System V2.0 Modulaire - Navigation par boutons parfaite!"),
+    CogSpec("ArsenalConfigRevolution", "commands.config_revolution:ArsenalConfigRevolution",
+            "🚀 Arsenal Config Revolution - Configuration révolutionnaire V2.0!"),
+
+    # 🎉 Communauté, musique, économie
+    CogSpec("SocialFunSystem", "commands.social_fun_system:SocialFunSystem",
+            "🎉 Social Fun System - Interactions sociales!", threaded=True),
+    CogSpec("EnhancedMusicSystem", "commands.music_enhanced_system:EnhancedMusicSystem",
+            "🎵 Enhanced Music System - Musique avancée!", threaded=True),
+    CogSpec("ArsenalEconomyUnified", "commands.arsenal_economy_unified:ArsenalEconomyUnified",
+            "💰 Arsenal Economy UNIFIÉ", threaded=True),
+    CogSpec("ArsenalShopAdmin", "commands.arsenal_shop_admin:ArsenalShopAdmin",
+            "🛒 Arsenal Shop Admin", requires=("ArsenalEconomyUnified",), threaded=True),
+    CogSpec("ArsenalUpdateNotifier", "commands.arsenal_update_notifier:ArsenalUpdateNotifier",
+            "📣 Arsenal Update Notifier"),
+
+    # 🛡️ Modération, signalements, outils
+    CogSpec("ArsenalCommandGroupsFinalFixed", "commands.arsenal_automod_v5_fixed:ArsenalCommandGroupsFinalFixed",
+            "🛡️ Arsenal AutoMod V5.0.1 CORRIGÉ - Exactement 489 mots chargé!", skip_if_command="automod"),
+    CogSpec("ArsenalBugReporter", "commands.arsenal_bug_reporter:ArsenalBugReporter",
+            "🐛 Arsenal Bug Reporter - Système de signalement chargé!"),
+    CogSpec("PerfProfiler", "commands.perf_profiler:PerfProfiler",
+            "⏱️ Perf Profiler - /perf prêt!"),
+
+    # 💤 Peu utilisés : chargés pendant la connexion au gateway
+    CogSpec("WebPanelCommands", "commands.webpanel_integration:WebPanelCommands",
+            "Module WebPanel Integration Commands", deferred=True),
+    CogSpec("AdvancedBotFeatures", "commands.advanced_features:AdvancedBotFeatures",
+            "Module Advanced Bot Features", deferred=True),
+    CogSpec("GamingAPISystem", "commands.gaming_api_system:GamingAPISystem",
+            "🎮 Gaming API System - API jeux intégrée!", threaded=True, deferred=True),
+    CogSpec("ArsenalTestSuite", "commands.arsenal_test_suite:ArsenalTestSuite",
+            "🧪 Arsenal Test Suite - Tests automatiques chargé!", after=("ArsenalCommandGroupsFinalFixed",), deferred=True),
+
+    # ⛔ Désactivés : jamais chargés par l'ancien setup_hook (bloc except inatteignable).
+    # Les activer ensemble dépasse la limite de 100 commandes slash globales et crée des
+    # doublons (/ticket, /uptime) : à réactiver un par un.
+    CogSpec("HuntRoyalSystem", "commands.hunt_royal_system:HuntRoyalSystem",
+            "🏹 Hunt Royal System V2.0 - Système principal avec calculateurs!", enabled=False),
+    CogSpec("ArsenalConfigUltimate", "commands.arsenal_config_ultimate:ArsenalConfigUltimate",
+            "🔥 Arsenal Config Ultimate - Configuration la plus avancée Discord!", after=("AdvancedTicketSystem",),
+            enabled=False),
+    CogSpec("LevelSystem", "commands.level_system:LevelSystem",
+            "📈 Level System - Niveaux et expérience!", enabled=False),
+    CogSpec("CommunityCommands", "commands.community:CommunityCommands",
+            "👥 Community System - Commandes communautaires avancées!", threaded=True, enabled=False),
+    CogSpec("NotificationSystem", "commands.notifications_system:NotificationSystem",
+            "🔔 Notifications System - Notifications avancées!", enabled=False),
+    CogSpec("ArsenalCustomCommands", "commands.arsenal_custom_commands:ArsenalCustomCommands",
+            "🛠️ Arsenal Custom Commands - Système de commandes personnalisées 15/serveur!", enabled=False),
+    CogSpec("ReactionRolesSystem", "commands.reaction_roles_system:ReactionRolesSystem",
+            "🎭 Reaction Roles System - Rôles par réaction!", enabled=False),
+    CogSpec("AutoRolesSystem", "commands.autoroles_system:AutoRolesSystem",
+            "🎪 AutoRoles System - Attribution automatique!", enabled=False),
+    CogSpec("AnnouncementsSystem", "commands.announcements_system:AnnouncementsSystem",
+            "📢 Announcements System - Système d'annonces avancé!", enabled=False),
+    CogSpec("CommunicationSystem", "commands.communication_system:CommunicationSystem",
+            "📢 Communication System - Say & Traduction IA chargés!", enabled=False),
+    CogSpec("SanctionsSystem", "commands.sanctions_system:SanctionsSystem",
+            "⚖️ Sanctions System - Casier permanent & Modération avancée!", enabled=False),
+    CogSpec("ProtectionCog", "commands.command_protection:ProtectionCog",
+            "🛡️ Command Protection System - Évite les conflits de commandes!", enabled=False),
+    CogSpec("AdvancedLoggingSystem", "commands.advanced_logs:AdvancedLoggingSystem",
+            "📊 Advanced Logs System - Logs intelligents!", enabled=False),
+    CogSpec("ReglementSystem", "commands.reglement:ReglementSystem",
+            "📜 Règlement Intelligent - Interface ultra-complète avec toutes les fonctionnalités !", enabled=False),
+    CogSpec("AdvancedTicketSystem", "commands.advanced_ticket_system:AdvancedTicketSystem",
+            "🎫 Advanced Ticket System - Système de tickets révolutionnaire avec catégories !", enabled=False),
+    CogSpec("AbsenceTicketSystem", "commands.absence_tickets:AbsenceTicketSystem",
+            "🎫 Absence Ticket System - Tickets d'absence avec auto-expiry!",
+            schema="commands.absence_config:setup_absence_config_db", enabled=False),
+    CogSpec("ArsenalVoiceManager", "commands.arsenal_voice_manager:ArsenalVoiceManager",
+            "🎤 Arsenal Voice Manager - Gestion vocale avancée!", enabled=False),
+    CogSpec("HubVocal", "commands.hub_vocal:HubVocal",
+            "🎤 Hub Vocal - Système complet de salons temporaires avec contrôle !", enabled=False),
+    CogSpec("NPBSystem", "commands.npb_system:NPBSystem",
+            "🎮 NPB System - Interface graphique complète sans erreurs !", enabled=False),
+    CogSpec("ArsenalProfileUltimate2000", "commands.arsenal_profile_ultimate_2000:ArsenalProfileUltimate2000",
+            "🔥 Arsenal Profile Ultimate 2000% - STREAMING + 2000% personnalisation!", enabled=False),
+    CogSpec("DiscordBadges", "core.discord_badges:DiscordBadges",
+            "🏆 Discord Badges System - Badges natifs Discord activés!", enabled=False),
+    CogSpec("ArsenalContextMenus", "commands.arsenal_context_menus:ArsenalContextMenus",
+            "🖱️ Arsenal Context Menus - Menus contextuels natifs Discord!", enabled=False),
+    CogSpec("KeepAliveSystem", "commands.keepalive_system:KeepAliveSystem",
+            "💚 KeepAlive System - Maintien du bot actif!", enabled=False),
+    CogSpec("HelpSystemV2", "commands.help_system_v2:HelpSystemV2",
+            "📚 Help System V2 - Interface moderne chargée!", enabled=False),
+    CogSpec("InvcmdSystem", "commands.invcmd_system:InvcmdSystem",
+            "🖥️ InvCmd System - Terminal de monitoring!", enabled=False),
+    CogSpec("CreatorTools", "commands.creator_tools:CreatorTools",
+            "🛠️ Creator Tools - Outils développeur!", enabled=False),
+    CogSpec("BotMigrationSystem", "commands.bot_migration_system:BotMigrationSystem",
+            "🚀 Bot Migration System - Récupération de configs d'autres bots!", deferred=True, enabled=False),
+    CogSpec("MigrationHelp", "commands.migration_help:MigrationHelp",
+            "📚 Migration Help System - Guide interactif de migration!", deferred=True, enabled=False),
+    CogSpec("ArsenalBotFeatures", "commands.arsenal_features:ArsenalBotFeatures",
+            "🌟 Arsenal Features System - Toutes les fonctionnalités Discord natives!", deferred=True, enabled=False),
+    CogSpec("ArsenalDiagnostic", "commands.arsenal_diagnostic:ArsenalDiagnostic",
+            "🔧 Arsenal Diagnostic System - Vérification complète activée!",
+            after=("DiscordBadges", "ArsenalProfileUltimate2000"), deferred=True, enabled=False),
+    CogSpec("DiscordIntegrationForcer", "commands.discord_integration_forcer:DiscordIntegrationForcer",
+            "💎 Discord Integration Forcer - TOUTES les prises en charge forcées!", deferred=True, enabled=False),
+    CogSpec("CompleteCommandsSystem", "commands.complete_commands_system:CompleteCommandsSystem",
+            "📋 Complete Commands System - Liste complète des commandes!", deferred=True, enabled=False),
+    CogSpec("ArsenalBugReport", "commands.arsenal_bugreport_system:ArsenalBugReport",
+            "🐛 Arsenal Bug Report System - Rapports de bugs avancés!", deferred=True, enabled=False),
+    CogSpec("ArsenalProfileUpdater", "commands.arsenal_profile_updater:ArsenalProfileUpdater",
+            "🔄 Arsenal Profile Updater - Profils Discord auto-optimisés!", deferred=True, enabled=False),
+]
@@ -0,0 +1,209 @@
+"""
+Arsenal Bot - Métriques internes
+Compteurs, histogrammes et jauges en mémoire, exportés en texte Prometheus et en JSON
+"""
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+# Bornes (secondes) adaptées aux handlers Discord et aux requêtes SQLite
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    body = ",".join(
+        '{}="{}"'.format(k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in pairs
+    )
+    return "{" + body + "}"
+
+
+class Histogram:
+    """Histogramme cumulatif à bornes fixes (compatible Prometheus)"""
+
+    __slots__ = ("buckets", "counts", "count", "sum", "max")
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Estimation d'un quantile (borne supérieure du bucket concerné)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self) -> Dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "avg": round(self.sum / self.count, 6) if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": round(self.max, 6),
+        }
+
+
+class MetricsRegistry:
+    """Registre de métriques du processus (un seul partagé : `metrics`)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}  # nom: (type, description)
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, Callable[[], float]]] = {}
+        self.started_at = time.time()
+
+    def _declare(self, name: str, kind: str, help_text: str):
+        if name not in self._help:
+            self._help[name] = (kind, help_text)
+
+    # ==================== ENREGISTREMENT ====================
+
+    def inc(self, name: str, value: float = 1, help_text: str = "", **labels):
+        """Incrémente un compteur"""
+        key = _label_key(labels)
+        with self._lock:
+            self._declare(name, "counter", help_text)
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, help_text: str = "", buckets: Iterable[float] = DEFAULT_BUCKETS, **labels):
+        """Ajoute une mesure (en secondes) à un histogramme"""
+        key = _label_key(labels)
+        with self._lock:
+            self._declare(name, "histogram", help_text)
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def gauge(self, name: str, func: Callable[[], float], help_text: str = "", kind: str = "gauge", **labels):
+        """Déclare une valeur lue au moment de l'export (profondeur de file, latence...)
+
+        `kind="counter"` pour exposer un compteur tenu ailleurs (ex: nombre de requêtes).
+        """
+        with self._lock:
+            self._declare(name, kind, help_text)
+            self._gauges.setdefault(name, {})[_label_key(labels)] = func
+
+    def remove_gauge(self, name: str, **labels):
+        with self._lock:
+            self._gauges.get(name, {}).pop(_label_key(labels), None)
+
+    def time(self, name: str, help_text: str = "", **labels) -> "_Timer":
+        """Context manager qui mesure la durée d'un bloc"""
+        return _Timer(self, name, help_text, labels)
+
+    # ==================== EXPORT ====================
+
+    def _gauge_values(self) -> Dict[str, Dict[LabelKey, float]]:
+        with self._lock:
+            gauges = {name: dict(series) for name, series in self._gauges.items()}
+        values = {}
+        for name, series in gauges.items():
+            for key, func in series.items():
+                try:
+                    value = func()
+                except Exception:
+                    continue
+                if value is not None:
+                    values.setdefault(name, {})[key] = float(value)
+        return values
+
+    def render_prometheus(self) -> str:
+        """Format d'exposition texte de Prometheus (version 0.0.4)"""
+        lines = []
+        gauges = self._gauge_values()
+        with self._lock:
+            for name, (kind, help_text) in sorted(self._help.items()):
+                if help_text:
+                    lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                if kind in ("counter", "gauge"):
+                    values = dict(self._counters.get(name, {}))
+                    values.update(gauges.get(name, {}))
+                    for key, value in values.items():
+                        lines.append(f"{name}{_format_labels(key)} {value:g}")
+                else:
+                    for key, histogram in self._histograms.get(name, {}).items():
+                        cumulative = 0
+                        for bound, count in zip(histogram.buckets, histogram.counts):
+                            cumulative += count
+                            lines.append(f"{name}_bucket{_format_labels(key, ('le', f'{bound:g}'))} {cumulative}")
+                        lines.append(f"{name}_bucket{_format_labels(key, ('le', '+Inf'))} {histogram.count}")
+                        lines.append(f"{name}_sum{_format_labels(key)} {histogram.sum:.6f}")
+                        lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict:
+        """Vue JSON : {nom: [{labels, valeur | résumé d'histogramme}]}"""
+        gauges = self._gauge_values()
+        result = {}
+        with self._lock:
+            for name, series in self._counters.items():
+                result[name] = [{"labels": dict(key), "value": value} for key, value in series.items()]
+            for name, series in self._histograms.items():
+                result[name] = [dict(labels=dict(key), **histogram.snapshot()) for key, histogram in series.items()]
+        for name, series in gauges.items():
+            result.setdefault(name, []).extend({"labels": dict(key), "value": value} for key, value in series.items())
+        return result
+
+    def histograms(self, name: str) -> Dict[LabelKey, Histogram]:
+        with self._lock:
+            return dict(self._histograms.get(name, {}))
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+class _Timer:
+    __slots__ = ("registry", "name", "help_text", "labels", "start")
+
+    def __init__(self, registry: MetricsRegistry, name: str, help_text: str, labels: Dict):
+        self.registry = registry
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.observe(self.name, time.perf_counter() - self.start, self.help_text, **self.labels)
+
+
+# Registre partagé par tout le bot
+metrics = MetricsRegistry()
@@ -0,0 +1,174 @@
+"""
+Arsenal Bot - Serveur de santé et de métriques
+Serveur aiohttp dans le processus du bot (remplace bot_status.json + le thread Flask)
+
+Routes :
+    /              présentation du bot
+    /health        health check (Render / Docker)
+    /status        état du bot (ancien contenu de bot_status.json)
+    /metrics       format texte Prometheus
+    /metrics.json  mêmes métriques en JSON
+"""
+import asyncio
+import datetime
+import os
+import time
+from aiohttp import web
+from discord.ext import tasks
+from core.metrics import metrics
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LAG_PROBE_INTERVAL = 0.5  # secondes entre deux mesures de latence de la boucle
+
+
+class MetricsServer:
+    def __init__(self, bot, host: str = "0.0.0.0", port: int = None):
+        self.bot = bot
+        self.host = host
+        self.port = port if port is not None else int(os.environ.get("PORT", 10000))
+        self.runner = None
+        self.loop_lag = 0.0
+        self._lag_task = None
+        self._task_loops = set()
+
+        self.app = web.Application()
+        self.app.router.add_get("/", self.index)
+        self.app.router.add_get("/health", self.health)
+        self.app.router.add_get("/status", self.status)
+        self.app.router.add_get("/metrics", self.metrics_text)
+        self.app.router.add_get("/metrics.json", self.metrics_json)
+
+        metrics.gauge("arsenal_gateway_latency_seconds", self._gateway_latency, "Latence du heartbeat Discord")
+        metrics.gauge("arsenal_guilds", lambda: len(self.bot.guilds), "Serveurs connectés")
+        metrics.gauge("arsenal_cogs_loaded", lambda: len(self.bot.cogs), "Cogs chargés")
+        metrics.gauge("arsenal_event_loop_lag_seconds", lambda: self.loop_lag, "Dernier retard mesuré de la boucle asyncio")
+        metrics.gauge("arsenal_uptime_seconds", lambda: time.time() - metrics.started_at, "Durée de fonctionnement")
+        metrics.gauge("arsenal_asyncio_tasks", lambda: len(asyncio.all_tasks()), "Tâches asyncio en cours")
+
+    # ==================== CYCLE DE VIE ====================
+
+    async def start(self):
+        self.runner = web.AppRunner(self.app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, self.host, self.port)
+        await site.start()
+        self._lag_task = asyncio.create_task(self._probe_loop_lag())
+
+    async def stop(self):
+        if self._lag_task:
+            self._lag_task.cancel()
+            self._lag_task = None
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
+
+    async def _probe_loop_lag(self):
+        """Mesure le retard de réveil de la boucle (signe de code bloquant)"""
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(LAG_PROBE_INTERVAL)
+            self.loop_lag = max(0.0, loop.time() - start - LAG_PROBE_INTERVAL)
+            metrics.observe("arsenal_event_loop_lag_samples_seconds", self.loop_lag, "Retards de la boucle asyncio")
+
+    # ==================== COLLECTE ====================
+
+    def _gateway_latency(self):
+        latency = self.bot.latency
+        if latency is None or latency != latency or latency == float("inf"):
+            return None
+        return latency
+
+    def _refresh_task_loops(self):
+        """Expose le retard des tasks.loop des cogs (itération en retard sur l'horaire prévu)"""
+        current = set()
+        for cog_name, cog in list(self.bot.cogs.items()):
+            for task_name, attr in vars(type(cog)).items():
+                if not isinstance(attr, tasks.Loop):
+                    continue
+                loop = getattr(cog, task_name)
+                current.add((cog_name, task_name))
+                if (cog_name, task_name) not in self._task_loops:
+                    metrics.gauge(
+                        "arsenal_task_loop_lag_seconds", self._task_lag_reader(loop),
+                        "Retard des boucles tasks.loop sur leur prochaine itération prévue",
+                        cog=cog_name, task=task_name
+                    )
+        for cog_name, task_name in self._task_loops - current:
+            metrics.remove_gauge("arsenal_task_loop_lag_seconds", cog=cog_name, task=task_name)
+        self._task_loops = current
+
+    @staticmethod
+    def _task_lag_reader(loop):
+        def read():
+            if not loop.is_running() or loop.next_iteration is None:
+                return None
+            overdue = datetime.datetime.now(datetime.timezone.utc) - loop.next_iteration
+            return max(0.0, overdue.total_seconds())
+        return read
+
+    def bot_status(self) -> dict:
+        """État du bot (mêmes champs que l'ancien bot_status.json)"""
+        bot = self.bot
+        if not (bot.user and bot.is_ready()):
+            return {
+                "online": False,
+                "uptime": "0h 0m",
+                "latency": 0,
+                "servers_connected": 0,
+                "users_total": 0,
+                "last_update": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "bot_name": "Arsenal Bot",
+                "commands_loaded": 0
+            }
+
+        uptime_seconds = (datetime.datetime.now(datetime.timezone.utc) - bot.startup_time).total_seconds()
+        hours = int(uptime_seconds // 3600)
+        minutes = int((uptime_seconds % 3600) // 60)
+        return {
+            "online": True,
+            "uptime": f"{hours}h {minutes}m",
+            "latency": round(bot.latency * 1000) if self._gateway_latency() is not None else 0,
+            "servers_connected": len(bot.guilds),
+            "users_total": sum(guild.member_count for guild in bot.guilds if guild.member_count),
+            "last_update": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "bot_name": str(bot.user),
+            "commands_loaded": len(bot.cogs)
+        }
+
+    # ==================== ROUTES ====================
+
+    async def index(self, request):
+        return web.json_response({
+            "bot": "Arsenal V4.5.0",
+            "status": "online" if self.bot.is_ready() else "starting",
+            "description": "Bot Discord Arsenal avec 150+ commandes",
+            "endpoints": ["/health", "/status", "/metrics", "/metrics.json"],
+            "timestamp": datetime.datetime.now().isoformat(),
+            "version": "4.5.0"
+        })
+
+    async def health(self, request):
+        """200 tant que le processus répond ; `degraded` si la boucle est saturée"""
+        status = "healthy" if self.loop_lag < 1.0 else "degraded"
+        return web.json_response({
+            "status": status,
+            "ready": self.bot.is_ready(),
+            "event_loop_lag_ms": round(self.loop_lag * 1000, 1),
+            "timestamp": datetime.datetime.now().isoformat(),
+            "service": "Arsenal Bot Discord"
+        })
+
+    async def status(self, request):
+        return web.json_response(self.bot_status())
+
+    async def metrics_text(self, request):
+        self._refresh_task_loops()
+        return web.Response(body=metrics.render_prometheus().encode("utf-8"), headers={"Content-Type": PROMETHEUS_CONTENT_TYPE})
+
+    async def metrics_json(self, request):
+        self._refresh_task_loops()
+        return web.json_response({
+            "status": self.bot_status(),
+            "metrics": metrics.snapshot()
+        })
@@ -0,0 +1,220 @@
+"""
+Arsenal Bot - Profilage des handlers (opt-in)
+Latence par cog et par handler (listeners + commandes slash) et détection des
+blocages de la boucle asyncio avec un échantillon de pile
+
+Activation : variable d'environnement ARSENAL_PROFILING=1 ou `/perf action:on`
+"""
+import asyncio
+import datetime
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from core.metrics import metrics, Histogram
+
+HANDLER_METRIC = "arsenal_handler_seconds"
+BLOCKED_METRIC = "arsenal_loop_blocked_total"
+DEFAULT_BLOCK_THRESHOLD = 0.1  # secondes sans que la boucle reprenne la main
+MAX_BLOCK_SAMPLES = 50
+STACK_DEPTH = 12
+
+
+class BlockSample:
+    """Un blocage de la boucle : handler en cours, durée et pile échantillonnée"""
+
+    __slots__ = ("handler", "started_at", "duration", "stack")
+
+    def __init__(self, handler: str, stack: List[str]):
+        self.handler = handler
+        self.started_at = datetime.datetime.now(datetime.timezone.utc)
+        self.duration = 0.0
+        self.stack = stack
+
+    def to_dict(self) -> Dict:
+        return {
+            "handler": self.handler,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration * 1000, 1),
+            "stack": self.stack,
+        }
+
+
+class HandlerProfiler:
+    """Instrumente les handlers du bot quand le profilage est activé"""
+
+    def __init__(self, block_threshold: float = DEFAULT_BLOCK_THRESHOLD):
+        self.block_threshold = block_threshold
+        self.enabled = False
+        self.blocks = deque(maxlen=MAX_BLOCK_SAMPLES)
+        self._handlers: Dict[Tuple[str, str, str], Histogram] = {}  # (type, cog, handler): durées
+        self._running = weakref.WeakKeyDictionary()  # tâche asyncio: "cog.handler"
+        self._loop = None
+        self._loop_thread_id = None
+        self._last_tick = time.monotonic()
+        self._pending_block: Optional[BlockSample] = None
+        self._heartbeat_task = None
+        self._watchdog = None
+        self._stop = threading.Event()
+        self.enabled_at = None
+
+    # ==================== ACTIVATION ====================
+
+    def enable(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """Active le profilage (à appeler depuis la boucle du bot)"""
+        if self.enabled:
+            return
+        self._loop = loop or asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._stop.clear()
+        self._heartbeat_task = self._loop.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="arsenal-profiler", daemon=True)
+        self._watchdog.start()
+        self.enabled = True
+        self.enabled_at = datetime.datetime.now(datetime.timezone.utc)
+
+    def disable(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        self._stop.set()
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+
+    def reset(self):
+        self._handlers.clear()
+        self.blocks.clear()
+
+    # ==================== MESURE DES HANDLERS ====================
+
+    @contextmanager
+    def track(self, kind: str, cog: str, handler: str):
+        """Mesure un handler et l'associe à la tâche courante (pour les blocages)"""
+        if not self.enabled:
+            yield
+            return
+
+        label = f"{cog}.{handler}"
+        task = asyncio.current_task()
+        if task is not None:
+            self._running[task] = label
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            key = (kind, cog, handler)
+            histogram = self._handlers.get(key)
+            if histogram is None:
+                histogram = self._handlers[key] = Histogram()
+            histogram.observe(elapsed)
+            metrics.observe(HANDLER_METRIC, elapsed, "Durée des handlers (profilage)", type=kind, cog=cog, handler=handler)
+            if task is not None:
+                self._running.pop(task, None)
+
+    def instrument_commands(self, tree) -> int:
+        """Enveloppe le callback de chaque commande slash / menu contextuel (idempotent)"""
+        wrapped = 0
+        for command in tree.walk_commands():
+            wrapped += self._wrap_command(command)
+        for menu in getattr(tree, "_context_menus", {}).values():
+            wrapped += self._wrap_command(menu)
+        return wrapped
+
+    def _wrap_command(self, command) -> int:
+        callback = getattr(command, "_callback", None)
+        if callback is None or getattr(callback, "__arsenal_profiled__", False):
+            return 0
+
+        binding = getattr(command, "binding", None)
+        cog = binding.qualified_name if binding is not None else getattr(callback, "__module__", "app").split(".")[-1]
+        name = getattr(command, "qualified_name", command.name)
+        profiler = self
+
+        async def profiled(*args, **kwargs):
+            with profiler.track("command", cog, name):
+                return await callback(*args, **kwargs)
+
+        profiled.__arsenal_profiled__ = True
+        profiled.__wrapped__ = callback
+        command._callback = profiled
+        return 1
+
+    # ==================== DÉTECTION DES BLOCAGES ====================
+
+    async def _heartbeat(self):
+        """Battement de la boucle ; clôt l'échantillon quand la boucle reprend"""
+        interval = self.block_threshold / 4
+        while True:
+            now = time.monotonic()
+            gap = now - self._last_tick
+            self._last_tick = now
+            sample = self._pending_block
+            if sample is not None:
+                sample.duration = gap
+                self._pending_block = None
+            await asyncio.sleep(interval)
+
+    def _watch(self):
+        """Thread de surveillance : échantillonne la pile si la boucle ne bat plus"""
+        interval = self.block_threshold / 4
+        while not self._stop.wait(interval):
+            if self._pending_block is not None:
+                continue
+            stalled = time.monotonic() - self._last_tick
+            if stalled < self.block_threshold + interval:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = traceback.format_stack(frame, limit=STACK_DEPTH) if frame is not None else []
+            task = asyncio.current_task(self._loop) if self._loop else None
+            handler = self._running.get(task, "inconnu") if task is not None else "hors tâche"
+
+            sample = BlockSample(handler, [line.rstrip() for line in stack])
+            self._pending_block = sample
+            self.blocks.append(sample)
+            cog, _, name = handler.partition(".")
+            metrics.inc(BLOCKED_METRIC, help_text="Blocages de la boucle asyncio détectés", cog=cog, handler=name or cog)
+
+    # ==================== RAPPORT ====================
+
+    def report(self, limit: int = 15) -> Dict:
+        """Handlers les plus coûteux (temps cumulé) et derniers blocages"""
+        handlers = []
+        for (kind, cog, handler), histogram in self._handlers.items():
+            handlers.append(dict(type=kind, cog=cog, handler=handler, **histogram.snapshot()))
+        handlers.sort(key=lambda entry: entry["sum"], reverse=True)
+
+        per_cog: Dict[str, float] = {}
+        for entry in handlers:
+            per_cog[entry["cog"]] = per_cog.get(entry["cog"], 0.0) + entry["sum"]
+
+        return {
+            "enabled": self.enabled,
+            "enabled_at": self.enabled_at.isoformat() if self.enabled_at else None,
+            "block_threshold_ms": round(self.block_threshold * 1000),
+            "cogs": dict(sorted(per_cog.items(), key=lambda item: item[1], reverse=True)),
+            "handlers": handlers[:limit],
+            "blocks": [sample.to_dict() for sample in reversed(self.blocks)],
+        }
+
+    def export(self, directory: str = "data/perf") -> str:
+        """Écrit le rapport complet dans un fichier JSON et retourne son chemin"""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"perf_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(limit=len(self._handlers)), f, indent=2, ensure_ascii=False)
+        return path
+
+
+# Profileur partagé (désactivé par défaut)
+profiler = HandlerProfiler(float(os.environ.get("ARSENAL_BLOCK_THRESHOLD", DEFAULT_BLOCK_THRESHOLD)))
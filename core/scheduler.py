@@ -0,0 +1,337 @@
+"""
+Arsenal Bot - Planificateur central des tâches différées
+Remplace les boucles tasks.loop qui scannaient leurs tables toutes les minutes :
+chaque job a une échéance, le planificateur dort exactement jusqu'à la prochaine
+
+- tas binaire (échéance, ordre, id) en mémoire, suppression paresseuse
+- jobs persistés dans SQLite (index sur l'échéance) : rechargés au redémarrage
+- un handler par type de job (`register`), jobs récurrents (`every`)
+- un job dont le type n'a pas encore de handler (cog pas chargé) est mis de côté
+  jusqu'au `register` correspondant
+- nombre de jobs exécutés en même temps borné : les jobs en retard (redémarrage)
+  passent par vagues au lieu de tous démarrer d'un coup
+"""
+import asyncio
+import datetime
+import heapq
+import itertools
+import json
+import os
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from core.logger import log
+from core.metrics import metrics
+from modules.sqlite_database import database_manager
+
+DEFAULT_DB_PATH = "data/scheduler.db"
+MAX_ATTEMPTS = 5
+MAX_RETRY_DELAY = 3600
+MAX_RUNNING = 16
+
+Handler = Callable[["Job"], Awaitable[Optional[float]]]
+DueTime = Union[float, int, datetime.datetime, str]
+
+
+def due_time(value: DueTime) -> float:
+    """Échéance en timestamp : nombre, datetime ou chaîne ISO (naïf = heure locale)"""
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value)
+    if isinstance(value, datetime.datetime):
+        return value.timestamp()
+    return float(value)
+
+
+class Job:
+    """Un job planifié (ligne de la table scheduled_jobs)"""
+
+    __slots__ = ("id", "key", "kind", "due_at", "interval", "payload", "attempts")
+
+    def __init__(self, job_id: int, key: str, kind: str, due_at: float, interval: Optional[float] = None,
+                 payload: Any = None, attempts: int = 0):
+        self.id = job_id
+        self.key = key
+        self.kind = kind
+        self.due_at = due_at
+        self.interval = interval
+        self.payload = payload
+        self.attempts = attempts
+
+    def to_dict(self) -> Dict:
+        return {
+            "key": self.key,
+            "kind": self.kind,
+            "due_at": datetime.datetime.fromtimestamp(self.due_at, datetime.timezone.utc).isoformat(),
+            "interval": self.interval,
+            "attempts": self.attempts,
+        }
+
+
+class JobScheduler:
+    """Planificateur unique du bot : un seul réveil par échéance"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, max_running: int = MAX_RUNNING):
+        self.db_path = db_path
+        self.max_running = max_running
+        self._pool = None
+        self._jobs: Dict[int, Job] = {}
+        self._keys: Dict[str, int] = {}
+        self._heap: List[tuple] = []
+        self._seq = itertools.count()
+        self._handlers: Dict[str, Handler] = {}
+        self._parked: Dict[str, List[int]] = {}  # type sans handler: ids en attente
+        self._running: Dict[int, asyncio.Task] = {}
+        self._runner: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.wakeups = 0
+        metrics.gauge("arsenal_scheduler_jobs", lambda: len(self._jobs), "Jobs planifiés en attente")
+
+    # ==================== PERSISTANCE ====================
+
+    def _db(self):
+        """Pool SQLite du planificateur ; crée la table et charge les jobs au premier appel"""
+        if self._pool is None:
+            if os.path.dirname(self.db_path):
+                os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            pool = database_manager.pool(self.db_path)
+            rows = pool.run_sync(self._load)
+            self._pool = pool
+            for row in rows:
+                job_id, key, kind, due_at, interval, payload, attempts = row
+                self._add(Job(job_id, key, kind, due_at, interval, json.loads(payload) if payload else None, attempts))
+        return self._pool
+
+    @staticmethod
+    def _load(conn):
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS scheduled_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                key TEXT NOT NULL UNIQUE,
+                kind TEXT NOT NULL,
+                due_at REAL NOT NULL,
+                interval REAL,
+                payload TEXT,
+                attempts INTEGER DEFAULT 0,
+                last_error TEXT
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_scheduled_jobs_due ON scheduled_jobs(due_at)")
+        return conn.execute(
+            "SELECT id, key, kind, due_at, interval, payload, attempts FROM scheduled_jobs ORDER BY due_at"
+        ).fetchall()
+
+    def _add(self, job: Job):
+        self._jobs[job.id] = job
+        self._keys[job.key] = job.id
+        self._push(job)
+
+    def _push(self, job: Job):
+        """Ajoute l'échéance au tas et réveille le planificateur si elle passe en tête"""
+        earliest = self._heap[0][0] if self._heap else None
+        heapq.heappush(self._heap, (job.due_at, next(self._seq), job.id))
+        if self._wakeup is not None and (earliest is None or job.due_at < earliest):
+            self._wakeup.set()
+
+    def _forget(self, job: Job):
+        self._jobs.pop(job.id, None)
+        if self._keys.get(job.key) == job.id:
+            del self._keys[job.key]
+
+    # ==================== API ====================
+
+    def register(self, kind: str, handler: Handler):
+        """Handler `async handler(job) -> Optional[échéance]` d'un type de job
+
+        Une échéance retournée replanifie le job ; sinon il est supprimé
+        (ou replanifié après `interval` pour un job récurrent).
+        """
+        self._db()
+        self._handlers[kind] = handler
+        for job_id in self._parked.pop(kind, []):
+            job = self._jobs.get(job_id)
+            if job:
+                self._push(job)
+
+    def unregister(self, kind: str):
+        """Retire le handler (déchargement du cog) : ses jobs restent persistés"""
+        self._handlers.pop(kind, None)
+
+    def schedule(self, kind: str, due: DueTime, payload: Any = None, key: Optional[str] = None,
+                 interval: Optional[float] = None) -> str:
+        """Planifie (ou replanifie, même `key`) un job ; retourne sa clé"""
+        pool = self._db()
+        key = key or f"{kind}:{uuid.uuid4().hex}"
+        due_at = due_time(due)
+        payload_json = json.dumps(payload) if payload is not None else None
+
+        def upsert(conn):
+            conn.execute("""
+                INSERT INTO scheduled_jobs (key, kind, due_at, interval, payload, attempts, last_error)
+                VALUES (?, ?, ?, ?, ?, 0, NULL)
+                ON CONFLICT(key) DO UPDATE SET
+                    kind = excluded.kind, due_at = excluded.due_at, interval = excluded.interval,
+                    payload = excluded.payload, attempts = 0, last_error = NULL
+            """, (key, kind, due_at, interval, payload_json))
+            return conn.execute("SELECT id FROM scheduled_jobs WHERE key = ?", (key,)).fetchone()[0]
+
+        job_id = pool.run_sync(upsert)
+        job = self._jobs.get(job_id)
+        if job is None:
+            self._add(Job(job_id, key, kind, due_at, interval, payload))
+        else:
+            job.kind, job.due_at, job.interval, job.payload, job.attempts = kind, due_at, interval, payload, 0
+            if job_id not in self._running:
+                self._push(job)  # l'ancienne entrée du tas est ignorée à la sortie
+        return key
+
+    def cancel(self, key: str) -> bool:
+        """Annule un job ; retourne False s'il n'existait pas"""
+        job_id = self._keys.get(key)
+        if job_id is None:
+            return False
+        self._forget(self._jobs[job_id])
+        self._db().run_sync(lambda conn: conn.execute("DELETE FROM scheduled_jobs WHERE id = ?", (job_id,)))
+        return True
+
+    def get(self, key: str) -> Optional[Job]:
+        job_id = self._keys.get(key)
+        return self._jobs.get(job_id) if job_id is not None else None
+
+    def every(self, key: str, interval: float, handler: Callable[[], Awaitable[Any]], first_run: Optional[DueTime] = None):
+        """Job récurrent persisté : l'échéance survit aux redémarrages (pas de rattrapage multiple)"""
+        async def run(job: Job):
+            await handler()
+
+        self.register(key, run)
+        job = self.get(key)
+        if job is None or job.interval != interval:
+            self.schedule(key, first_run if first_run is not None else time.time() + interval, key=key, interval=interval)
+
+    def pending(self, kind: Optional[str] = None) -> List[Job]:
+        """Jobs en attente (d'un type), par échéance"""
+        self._db()
+        return sorted((job for job in self._jobs.values() if kind is None or job.kind == kind), key=lambda job: job.due_at)
+
+    # ==================== EXÉCUTION ====================
+
+    def start(self, wait_for: Optional[Callable[[], Awaitable[Any]]] = None):
+        """Démarre la boucle (à appeler depuis la boucle du bot, ex: setup_hook)"""
+        if self._runner and not self._runner.done():
+            return
+        self._db()
+        self._wakeup = asyncio.Event()
+        self._runner = asyncio.get_running_loop().create_task(self._run_forever(wait_for))
+
+    async def stop(self, timeout: float = 5.0):
+        """Arrête la boucle et laisse `timeout` secondes aux jobs en cours"""
+        if self._runner:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+        running = list(self._running.values())
+        if running:
+            _, still_running = await asyncio.wait(running, timeout=timeout)
+            for task in still_running:
+                task.cancel()
+        self._wakeup = None
+
+    async def _run_forever(self, wait_for):
+        if wait_for:
+            await wait_for()
+        while True:
+            self._wakeup.clear()
+            self._dispatch_due()
+            if self._heap and not self._saturated:
+                timeout = max(0.0, self._heap[0][0] - time.time())
+            else:
+                timeout = None  # rien de prévu, ou réveil à la fin d'un job en cours
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeups += 1
+
+    @property
+    def _saturated(self) -> bool:
+        return len(self._running) >= self.max_running
+
+    def _dispatch_due(self):
+        now = time.time()
+        while self._heap and self._heap[0][0] <= now and not self._saturated:
+            due_at, _, job_id = heapq.heappop(self._heap)
+            job = self._jobs.get(job_id)
+            if job is None or job.due_at != due_at or job_id in self._running:
+                continue  # entrée périmée (job annulé ou replanifié)
+            if job.kind not in self._handlers:
+                self._parked.setdefault(job.kind, []).append(job_id)
+                continue
+            metrics.observe("arsenal_scheduler_lag_seconds", now - due_at, "Retard d'exécution des jobs planifiés", kind=job.kind)
+            self._running[job_id] = asyncio.get_running_loop().create_task(self._execute(job, due_at))
+
+    async def _execute(self, job: Job, due_at: float):
+        handler = self._handlers[job.kind]
+        try:
+            try:
+                next_due = await handler(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                metrics.inc("arsenal_scheduler_runs_total", help_text="Exécutions de jobs planifiés", kind=job.kind, status="error")
+                self._retry(job, due_at, e)
+                return
+            metrics.inc("arsenal_scheduler_runs_total", help_text="Exécutions de jobs planifiés", kind=job.kind, status="ok")
+            if self._jobs.get(job.id) is not job or job.due_at != due_at:
+                return  # annulé ou replanifié pendant l'exécution
+            if next_due is None and job.interval:
+                next_due = due_at + job.interval
+                if next_due <= time.time():
+                    next_due = time.time() + job.interval
+            if next_due is None:
+                self.cancel(job.key)
+            else:
+                self.schedule(job.kind, next_due, job.payload, key=job.key, interval=job.interval)
+        finally:
+            saturated = self._saturated
+            self._running.pop(job.id, None)
+            if self._jobs.get(job.id) is job and job.due_at != due_at:
+                self._push(job)  # replanifié pendant l'exécution
+            if saturated and self._wakeup is not None:
+                self._wakeup.set()  # une place se libère pour les jobs en retard
+
+    def _retry(self, job: Job, due_at: float, error: Exception):
+        """Nouvel essai avec délai exponentiel, abandon après MAX_ATTEMPTS"""
+        if self._jobs.get(job.id) is not job or job.due_at != due_at:
+            return
+        job.attempts += 1
+        if job.attempts >= MAX_ATTEMPTS and not job.interval:
+            log.error(f"[SCHEDULER] Job {job.key} abandonné après {job.attempts} échecs: {error}")
+            self.cancel(job.key)
+            return
+        delay = min(60 * 2 ** (job.attempts - 1), MAX_RETRY_DELAY)
+        if job.interval:
+            delay = min(delay, job.interval)
+        log.warning(f"[SCHEDULER] Échec du job {job.key} (essai {job.attempts}), nouvel essai dans {delay}s: {error}")
+        job.due_at = time.time() + delay
+        self._db().run_sync(lambda conn: conn.execute(
+            "UPDATE scheduled_jobs SET due_at = ?, attempts = ?, last_error = ? WHERE id = ?",
+            (job.due_at, job.attempts, str(error)[:500], job.id)
+        ))
+        self._push(job)
+
+    def report(self, limit: int = 15) -> Dict:
+        """Résumé : nombre de jobs, types sans handler, prochaines échéances"""
+        return {
+            "jobs": len(self._jobs),
+            "running": len(self._running),
+            "parked": {kind: len(ids) for kind, ids in self._parked.items() if ids},
+            "wakeups": self.wakeups,
+            "next": [job.to_dict() for job in self.pending()[:limit]],
+        }
+
+
+# Planificateur partagé par tout le bot
+scheduler = JobScheduler(os.environ.get("ARSENAL_SCHEDULER_DB", DEFAULT_DB_PATH))
@@ -1,7 +1,7 @@
 import discord
 from discord.ext import commands, tasks
 from discord import app_commands
-import asyncio, os, sys, json, datetime, threading, traceback
+import asyncio, os, sys, json, datetime, threading, traceback, time
 from dotenv import load_dotenv
 
 print(f"[DEBUG] Python path: {sys.path}")
@@ -53,88 +53,18 @@ except Exception as e:
     def load_config(): return {}
     def save_config(data): pass
 
-def update_bot_status():
-    """Met à jour le fichier de statut du bot pour l'API - Version sécurisée"""
-    try:
-        if hasattr(client, 'user') and client.user and client.is_ready():
-            uptime_seconds = (datetime.datetime.now(datetime.UTC) - client.startup_time).total_seconds()
-            hours = int(uptime_seconds // 3600)
-            minutes = int((uptime_seconds % 3600) // 60)
-            uptime = f"{hours}h {minutes}m"
-            
-            status_data = {
-                "online": True,
-                "uptime": uptime,
-                "latency": round(client.latency * 1000) if client.latency else 0,
-                "servers_connected": len(client.guilds),
-                "users_total": sum(guild.member_count for guild in client.guilds if guild.member_count),
-                "last_update": datetime.datetime.now(datetime.UTC).isoformat(),
-                "bot_name": str(client.user) if client.user else "Arsenal Bot",
-                "commands_loaded": len(client.cogs) if hasattr(client, 'cogs') else 0
-            }
-            
-            # Sauvegarde sécurisée
-            try:
-                os.makedirs("data", exist_ok=True)
-                with open("data/bot_status.json", "w", encoding="utf-8") as f:
-                    json.dump(status_data, f, indent=2, ensure_ascii=False)
-            except Exception as write_error:
-                print(f"⚠️ [STATUS] Erreur écriture fichier: {write_error}")
-        else:
-            # Bot pas prêt
-            offline_status = {
-                "online": False,
-                "uptime": "0h 0m",
-                "latency": 0,
-                "servers_connected": 0,
-                "users_total": 0,
-                "last_update": datetime.datetime.now(datetime.UTC).isoformat(),
-                "bot_name": "Arsenal Bot",
-                "commands_loaded": 0
-            }
-            
-            try:
-                os.makedirs("data", exist_ok=True)
-                with open("data/bot_status.json", "w", encoding="utf-8") as f:
-                    json.dump(offline_status, f, indent=2, ensure_ascii=False)
-            except Exception as write_error:
-                print(f"⚠️ [STATUS] Erreur écriture offline: {write_error}")
-                
-    except Exception as e:
-        print(f"❌ [STATUS] Erreur générale update_bot_status: {e}")
-        # En cas d'erreur, on crée un statut d'urgence
-        try:
-            emergency_status = {
-                "online": False,
-                "error": str(e),
-                "last_update": datetime.datetime.now(datetime.UTC).isoformat()
-            }
-            os.makedirs("data", exist_ok=True)
-            with open("data/bot_status.json", "w", encoding="utf-8") as f:
-                json.dump(emergency_status, f, indent=2)
-        except:
-            pass  # Si même ça échoue, on abandonne silencieusement
-
 # Système de rechargement de modules (RÉACTIVÉ pour complétude)
 try:
-    from core.module_reloader import ReloaderCommands, reload_group
+    from core.module_reloader import reload_group
     RELOADER_AVAILABLE = True
     print("[OK] Système de rechargement de modules chargé")
 except Exception as e:
     RELOADER_AVAILABLE = False
     print(f"[WARNING] Système de rechargement non disponible: {e}")
 
-# Modules Hunt Royal et Suggestions (NOUVEAU)
-try:
-    from modules.hunt_royal_system import HuntRoyalCommands
-    from modules.suggestions_system import SuggestionsCommands
-    HUNT_ROYAL_AVAILABLE = True
-    SUGGESTIONS_AVAILABLE = True
-    print("[OK] Modules Hunt Royal et Suggestions chargés")
-except Exception as e:
-    HUNT_ROYAL_AVAILABLE = False
-    SUGGESTIONS_AVAILABLE = False
-    print(f"[WARNING] Modules Hunt Royal/Suggestions non disponibles: {e}")
+# Chargement des cogs : manifeste déclaratif, les modules sont importés au démarrage du bot
+from core.cog_loader import CogLoader
+from core.cog_manifest import COG_MANIFEST
 
 # Managers système & extension
 from manager.voice_manager import restore_voice_channels
@@ -171,96 +101,6 @@ except ImportError:
     print("[WARNING] Music System non disponible")
     music = None
 
-# WebPanel Integration Commands (NOUVEAU)
-try:
-    from commands.webpanel_integration import WebPanelCommands
-    WEBPANEL_COMMANDS_AVAILABLE = True
-    print("[OK] WebPanel Integration Commands chargé")
-except Exception as e:
-    WEBPANEL_COMMANDS_AVAILABLE = False
-
-# Bot Migration System (RÉVOLUTIONNAIRE)
-try:
-    from commands.bot_migration_system import BotMigrationSystem
-    BOT_MIGRATION_AVAILABLE = True
-    print("🚀 [OK] Bot Migration System chargé - Système révolutionnaire!")
-except Exception as e:
-    BOT_MIGRATION_AVAILABLE = False
-    print(f"❌ [ERREUR] Bot Migration System: {e}")
-    print(f"[ERROR] Erreur import WebPanel Commands: {e}")
-
-# Advanced Bot Features (NOUVEAU)
-try:
-    from commands.advanced_features import AdvancedBotFeatures
-    ADVANCED_FEATURES_AVAILABLE = True
-    print("[OK] Advanced Bot Features chargé")
-except Exception as e:
-    ADVANCED_FEATURES_AVAILABLE = False
-    print(f"[ERROR] Erreur import Advanced Features: {e}")
-
-# Arsenal Features System (RÉVOLUTIONNAIRE - 40 fonctionnalités)
-try:
-    from commands.arsenal_features import ArsenalBotFeatures
-    ARSENAL_FEATURES_AVAILABLE = True
-    print("🚀 [OK] Arsenal Features System chargé - 40 fonctionnalités Discord!")
-except Exception as e:
-    ARSENAL_FEATURES_AVAILABLE = False
-    print(f"❌ [ERREUR] Arsenal Features System: {e}")
-
-# Arsenal Config System V2.0 Modulaire (NOUVEAU - Navigation par boutons)
-try:
-    from commands.config_modular import ArsenalConfigModular
-    ARSENAL_CONFIG_MODULAR_AVAILABLE = True
-    print("🔧 [OK] Arsenal Config System V2.0 Modulaire chargé - Navigation par boutons!")
-except Exception as e:
-    ARSENAL_CONFIG_MODULAR_AVAILABLE = False
-    print(f"❌ [ERREUR] Arsenal Config System V2.0 Modulaire: {e}")
-
-# Arsenal Config Ultimate (RÉVOLUTIONNAIRE V2.0)
-try:
-    from commands.config_revolution import ArsenalConfigRevolution
-    ARSENAL_CONFIG_REVOLUTION_AVAILABLE = True
-    print("🚀 [OK] Arsenal Config Revolution chargé - Configuration révolutionnaire V2.0!")
-except Exception as e:
-    ARSENAL_CONFIG_REVOLUTION_AVAILABLE = False
-    print(f"❌ [ERREUR] Arsenal Config Revolution: {e}")
-
-# Arsenal Config Ultimate (UNIFIÉ DANS /config)
-# try:
-#     from commands.arsenal_config_ultimate import ArsenalConfigUltimate
-#     ARSENAL_CONFIG_ULTIMATE_AVAILABLE = True
-#     print("🔥 [OK] Arsenal Config Ultimate chargé - Configuration révolutionnaire!")
-# except Exception as e:
-ARSENAL_CONFIG_ULTIMATE_AVAILABLE = False
-print("ℹ️ [INFO] Arsenal Config Ultimate unifié dans /config")
-
-# Arsenal Profile Ultimate (RÉVOLUTIONNAIRE - Profil bot le plus impressionnant)
-try:
-    from commands.arsenal_profile_ultimate import ArsenalProfileUltimate  
-    ARSENAL_PROFILE_ULTIMATE_AVAILABLE = True
-    print("💎 [OK] Arsenal Profile Ultimate chargé - Profil révolutionnaire!")
-except Exception as e:
-    ARSENAL_PROFILE_ULTIMATE_AVAILABLE = False
-    print(f"❌ [ERREUR] Arsenal Profile Ultimate: {e}")
-
-# Discord Badges System (NOUVEAU - Pour afficher les capacités à droite du nom)
-try:
-    from core.discord_badges import DiscordBadges
-    DISCORD_BADGES_AVAILABLE = True
-    print("🏆 [OK] Discord Badges System chargé - Badges natifs Discord!")
-except Exception as e:
-    DISCORD_BADGES_AVAILABLE = False
-    print(f"❌ [ERREUR] Discord Badges System: {e}")
-
-# Arsenal Diagnostic System (NOUVEAU - Vérification complète du bot)
-try:
-    from commands.arsenal_diagnostic import ArsenalDiagnostic
-    ARSENAL_DIAGNOSTIC_AVAILABLE = True
-    print("🔧 [OK] Arsenal Diagnostic System chargé - Vérification complète!")
-except Exception as e:
-    ARSENAL_DIAGNOSTIC_AVAILABLE = False
-    print(f"❌ [ERREUR] Arsenal Diagnostic System: {e}")
-
 # Hunt Royal Auth System (NOUVEAU)
 try:
     import commands.hunt_royal_auth as hunt_auth
@@ -270,65 +110,6 @@ except Exception as e:
     HUNT_AUTH_AVAILABLE = False
     print(f"[WARNING] Hunt Royal Auth non disponible: {e}")
 
-# Hunt Royal Profiles System sera chargé via Cog uniquement
-HUNT_PROFILES_AVAILABLE = True
-print("[OK] Hunt Royal Profiles System préparé")
-
-# Hunt Royal Integration System (NOUVEAU V4)
-try:
-    import commands.hunt_royal_integration as hunt_integration
-    HUNT_INTEGRATION_AVAILABLE = True
-    print("[OK] Hunt Royal Integration System chargé")
-except Exception as e:
-    HUNT_INTEGRATION_AVAILABLE = False
-    print(f"[WARNING] Hunt Royal Integration non disponible: {e}")
-
-# Server Management System (NOUVEAU V4.3)
-try:
-    import commands.server_management_system as server_management
-    SERVER_MANAGEMENT_AVAILABLE = True
-    print("[OK] Server Management System chargé")
-except Exception as e:
-    SERVER_MANAGEMENT_AVAILABLE = False
-    print(f"[WARNING] Server Management System non disponible: {e}")
-
-# Gaming API System (NOUVEAU V4.3)
-try:
-    import commands.gaming_api_system as gaming_api
-    GAMING_API_AVAILABLE = True
-    print("[OK] Gaming API System chargé")
-except Exception as e:
-    GAMING_API_AVAILABLE = False
-    print(f"[WARNING] Gaming API System non disponible: {e}")
-
-# Absence Ticket System (NOUVEAU V4.5.2)
-try:
-    from commands.absence_tickets import AbsenceTicketSystem
-    from commands.absence_config import setup_absence_config_db
-    ABSENCE_SYSTEM_AVAILABLE = True
-    print("🎫 [OK] Absence Ticket System chargé - Gestion tickets d'absence!")
-except Exception as e:
-    ABSENCE_SYSTEM_AVAILABLE = False
-    print(f"❌ [ERREUR] Absence Ticket System: {e}")
-
-# Social Fun System (NOUVEAU V4.3)
-try:
-    import commands.social_fun_system as social_fun
-    SOCIAL_FUN_AVAILABLE = True
-    print("[OK] Social Fun System chargé")
-except Exception as e:
-    SOCIAL_FUN_AVAILABLE = False
-    print(f"[WARNING] Social Fun System non disponible: {e}")
-
-# Enhanced Music System (NOUVEAU V4.3)
-try:
-    import commands.music_enhanced_system as music_enhanced
-    MUSIC_ENHANCED_AVAILABLE = True
-    print("[OK] Enhanced Music System chargé")
-except Exception as e:
-    MUSIC_ENHANCED_AVAILABLE = False
-    print(f"[WARNING] Enhanced Music System non disponible: {e}")
-
 # Crypto System Integration (NOUVEAU V4.2)
 try:
     from modules.crypto_bot_integration import setup
@@ -338,61 +119,32 @@ except Exception as e:
     CRYPTO_INTEGRATION_AVAILABLE = False
     print(f"[WARNING] Crypto System Integration non disponible: {e}")
 
-# SQLite Database Manager (NOUVEAU V4.5)
-try:
-    from modules.sqlite_database import database_manager
-    SQLITE_DATABASE_AVAILABLE = True
-    print("[OK] SQLite Database Manager chargé")
-except Exception as e:
-    SQLITE_DATABASE_AVAILABLE = False
-    print(f"⚠️ Module sqlite_database non trouvé: {e}")
-
-# Sanctions System (NOUVEAU V4.5.2) - Sera chargé dans setup_hook
-try:
-    from commands.sanctions_system import SanctionsSystem
-    SANCTIONS_SYSTEM_AVAILABLE = True
-    print("⚖️ [OK] Sanctions System importé - Sera chargé au démarrage!")
-except Exception as e:
-    SANCTIONS_SYSTEM_AVAILABLE = False
-    print(f"❌ [ERREUR] Sanctions System: {e}")
-
-# Help System Complete - Aide interactive (NOUVEAU V4.5.2)
+# Serveur de santé + métriques (remplace bot_status.json et le thread Flask)
 try:
-    HELP_SYSTEM_AVAILABLE = True
-    print("📚 [OK] Help System V2 chargé - Interface révolutionnaire!")
+    from core.metrics import metrics
+    from core.metrics_server import MetricsServer
+    from core.profiler import profiler
+    METRICS_SERVER_AVAILABLE = True
 except Exception as e:
-    HELP_SYSTEM_AVAILABLE = False
-    print(f"❌ [ERREUR] Help System: {e}")
+    METRICS_SERVER_AVAILABLE = False
+    print(f"⚠️ Serveur de métriques non disponible: {e}")
 
-# Complete Commands System - Liste TOUTES les commandes (NOUVEAU V4.5.2)
+# Planificateur central des jobs différés (remplace les boucles de scrutation des cogs)
 try:
-    from commands.complete_commands_system import CompleteCommandsSystem
-    COMPLETE_COMMANDS_SYSTEM_AVAILABLE = True
-    print("📋 [OK] Complete Commands System chargé - Liste toutes les commandes!")
+    from core.scheduler import scheduler
+    SCHEDULER_AVAILABLE = True
 except Exception as e:
-    COMPLETE_COMMANDS_SYSTEM_AVAILABLE = False
-    print(f"❌ [ERREUR] Complete Commands System: {e}")
+    SCHEDULER_AVAILABLE = False
+    print(f"⚠️ Planificateur central non disponible: {e}")
 
-# Communication System - Say et Traduction (NOUVEAU V4.5.2)
-try:
-    from commands.communication_system import CommunicationSystem
-    COMMUNICATION_SYSTEM_AVAILABLE = True
-    print("📢 [OK] Communication System chargé - Say & Traduction IA!")
-except Exception as e:
-    COMMUNICATION_SYSTEM_AVAILABLE = False
-    print(f"❌ [ERREUR] Communication System: {e}")
-
-# Help System V2 (NOUVEAU V4.5.2)
+# SQLite Database Manager (NOUVEAU V4.5)
 try:
-    from commands.help_system_v2 import HelpSystemV2
-    HELP_SYSTEM_V2_AVAILABLE = True
-    print("📚 [OK] Help System V2 chargé - Interface révolutionnaire!")
+    from modules.sqlite_database import database_manager
+    SQLITE_DATABASE_AVAILABLE = True
+    print("[OK] SQLite Database Manager chargé")
 except Exception as e:
-    HELP_SYSTEM_V2_AVAILABLE = False
-    print(f"❌ [ERREUR] Help System V2: {e}")
-    # Log plus détaillé pour debug
-    import traceback
-    print(f"[DEBUG] Help System V2 Traceback: {traceback.format_exc()}")
+    SQLITE_DATABASE_AVAILABLE = False
+    print(f"⚠️ Module sqlite_database non trouvé: {e}")
 
 # SUPPRIMÉ: # Configuration
 load_dotenv()
@@ -413,94 +165,63 @@ if not TOKEN:
 
 intents = discord.Intents.all()
 
-# Tâche de mise à jour du statut bot - Optimisée pour stabilité
-@tasks.loop(minutes=2)  # Réduire à 2 minutes au lieu de 30 secondes
-async def update_bot_status_task():
-    """Met à jour le fichier de statut - Version stable"""
-    try:
-        update_bot_status()
-    except Exception as e:
-        print(f"⚠️ [STATUS] Erreur mise à jour statut: {e}")
-
 class ArsenalBot(commands.Bot):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.status_system = None
+        self.metrics_server = None
+        self.cog_loader = None
+    
+    async def close(self):
+        """Arrêt propre : cogs déchargés, planificateur arrêté puis pools SQLite fermés"""
+        await super().close()
+        if self.metrics_server:
+            await self.metrics_server.stop()
+        if SCHEDULER_AVAILABLE:
+            await scheduler.stop()
+        if SQLITE_DATABASE_AVAILABLE:
+            database_manager.close_all()
+    
+    async def _run_event(self, coro, event_name, *args, **kwargs):
+        """Mesure la durée de chaque handler d'événement, par cog"""
+        if not METRICS_SERVER_AVAILABLE:
+            return await super()._run_event(coro, event_name, *args, **kwargs)
         
-    async def setup_hook(self):
-        # 🔥 SYSTÈMES PRIORITAIRES - Enregistrement et Protection
-        print("🔥 Chargement des systèmes prioritaires Arsenal...")
-        
-        # Arsenal Registration System - OBLIGATOIRE EN PREMIER
-        try:
-            from commands.arsenal_registration_system import ArsenalRegistrationSystem
-            await self.add_cog(ArsenalRegistrationSystem(self))
-            log.info("🔥 [PRIORITÉ] Arsenal Registration System chargé - Système central!")
-        except Exception as e:
-            log.error(f"[CRITIQUE] Erreur Registration System: {e}")
-        
-        # Arsenal Protection Middleware - DEUXIÈME PRIORITÉ
-        try:
-            from commands.arsenal_protection_middleware import ArsenalProtectionSystem
-            await self.add_cog(ArsenalProtectionSystem(self))
-            log.info("🛡️ [PRIORITÉ] Arsenal Protection System chargé - Middleware actif!")
-        except Exception as e:
-            log.error(f"[CRITIQUE] Erreur Protection System: {e}")
-        
-        # Arsenal Utilities Basic - Commandes utilitaires essentielles (NOUVEAU)
+        owner = getattr(coro, "__self__", None)
+        cog = owner.qualified_name if isinstance(owner, commands.Cog) else "bot"
+        start = time.perf_counter()
         try:
-            from commands.arsenal_utilities_basic import ArsenalUtilitiesBasic
-            await self.add_cog(ArsenalUtilitiesBasic(self))
-            log.info("🔧 [NOUVEAU] Arsenal Utilities Basic - Commandes essentielles (ping, uptime, serverinfo)!")
-        except Exception as e:
-            log.error(f"[ERROR] Erreur Arsenal Utilities Basic: {e}")
-        
-        # Charger le système de rechargement de modules (RÉACTIVÉ)
-        if RELOADER_AVAILABLE:
-            try:
-                await self.add_cog(ReloaderCommands(self))
-                log.info("⚡ [RÉACTIVÉ] Système de rechargement de modules chargé!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement reloader: {e}")
-        
-        # Charger Hunt Royal et Suggestions
-        if HUNT_ROYAL_AVAILABLE:
-            try:
-                await self.add_cog(HuntRoyalCommands(self))
-                log.info("[OK] Module Hunt Royal chargé")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Hunt Royal: {e}")
-        
-        if SUGGESTIONS_AVAILABLE:
+            # Profilage opt-in (ARSENAL_PROFILING=1 ou /perf) : latence par handler + blocages
+            with profiler.track("listener", cog, getattr(coro, "__name__", event_name)):
+                await super()._run_event(coro, event_name, *args, **kwargs)
+        finally:
+            metrics.observe(
+                "arsenal_event_handler_seconds", time.perf_counter() - start,
+                "Durée des handlers d'événements Discord", cog=cog, event=event_name
+            )
+    
+    async def setup_hook(self):
+        # 📈 Serveur de santé et de métriques (health checks Render, Prometheus)
+        if METRICS_SERVER_AVAILABLE:
             try:
-                await self.add_cog(SuggestionsCommands(self))
-                log.info("[OK] Module Suggestions chargé")
+                self.metrics_server = MetricsServer(self)
+                await self.metrics_server.start()
+                log.info(f"📈 [HEALTH] Serveur de métriques démarré sur le port {self.metrics_server.port}")
             except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Suggestions: {e}")
-        
-        # Charger Hunt Royal Integration
-        if HUNT_INTEGRATION_AVAILABLE:
+                self.metrics_server = None
+                log.warning(f"[HEALTH] Impossible de démarrer le serveur de métriques: {e}")
+
+        # ⏰ Planificateur central : les cogs y enregistrent leurs jobs pendant leur chargement
+        if SCHEDULER_AVAILABLE:
             try:
-                await self.add_cog(hunt_integration.HuntRoyalIntegrationSystem(self))
-                log.info("[OK] Module Hunt Royal Integration chargé")
+                scheduler.start(wait_for=self.wait_until_ready)
+                log.info(f"⏰ [SCHEDULER] Planificateur démarré ({len(scheduler.pending())} job(s) persisté(s))")
             except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Hunt Royal Integration: {e}")
-        
-        # Hunt Royal Auth System - Système d'authentification
-        try:
-            from commands.hunt_royal_auth import HuntRoyalAuthSystem
-            await self.add_cog(HuntRoyalAuthSystem(self))
-            log.info("🏹 [OK] Hunt Royal Auth System - Authentification avancée!")
-        except Exception as e:
-            log.error(f"[ERROR] Erreur chargement Hunt Royal Auth: {e}")
-        
-        # Hunt Royal Profiles System - Gestion des profils
-        try:
-            from commands.hunt_royal_profiles import HuntRoyalProfilesSystem
-            await self.add_cog(HuntRoyalProfilesSystem(self))
-            log.info("👤 [OK] Hunt Royal Profiles System - Profils joueurs!")
-        except Exception as e:
-            log.error(f"[ERROR] Erreur chargement Hunt Royal Profiles: {e}")
+                log.warning(f"[SCHEDULER] Impossible de démarrer le planificateur: {e}")
+
+        # 🔥 Cogs du manifeste (core/cog_manifest.py) : dépendances, init en parallèle, rapport de démarrage
+        self.cog_loader = CogLoader(self, COG_MANIFEST)
+        await self.cog_loader.load_all()
         
         # Charger Crypto System Integration
         if CRYPTO_INTEGRATION_AVAILABLE:
@@ -509,472 +230,6 @@ class ArsenalBot(commands.Bot):
                 log.info("[OK] Module Crypto System Integration chargé")
             except Exception as e:
                 log.error(f"[ERROR] Erreur chargement Crypto System Integration: {e}")
-        
-        # Charger WebPanel Integration Commands
-        if WEBPANEL_COMMANDS_AVAILABLE:
-            try:
-                await self.add_cog(WebPanelCommands(self))
-                log.info("[OK] Module WebPanel Integration Commands chargé")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement WebPanel Commands: {e}")
-        
-        # Charger Advanced Bot Features
-        if ADVANCED_FEATURES_AVAILABLE:
-            try:
-                await self.add_cog(AdvancedBotFeatures(self))
-                log.info("[OK] Module Advanced Bot Features chargé")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Advanced Features: {e}")
-        
-        # Charger Server Management System
-        if SERVER_MANAGEMENT_AVAILABLE:
-            try:
-                await self.add_cog(server_management.ServerManagementSystem(self))
-                log.info("[OK] Module Server Management System chargé")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Server Management: {e}")
-        
-        # Charger Gaming API System
-        if GAMING_API_AVAILABLE:
-            try:
-                await self.add_cog(gaming_api.GamingAPISystem(self))
-                log.info("[OK] Module Gaming API System chargé")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Gaming API: {e}")
-        
-        # Charger Social Fun System
-        if SOCIAL_FUN_AVAILABLE:
-            try:
-                await self.add_cog(social_fun.SocialFunSystem(self))
-                log.info("[OK] Module Social Fun System chargé")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Social Fun: {e}")
-        
-        # Charger Arsenal Config System V2.0 Modulaire (NOUVEAU - Navigation par boutons)
-        if ARSENAL_CONFIG_MODULAR_AVAILABLE:
-            try:
-                await self.add_cog(ArsenalConfigModular(self))
-                log.info("🔧 [OK] Arsenal Config System V2.0 Modulaire - Navigation par boutons parfaite!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Arsenal Config Modulaire: {e}")
-        
-        # Charger Arsenal Config Revolution (SYSTÈME RÉVOLUTIONNAIRE V2.0)
-        if ARSENAL_CONFIG_REVOLUTION_AVAILABLE:
-            try:
-                await self.add_cog(ArsenalConfigRevolution(self))
-                log.info("🚀 [OK] Arsenal Config Revolution chargé - Configuration révolutionnaire V2.0!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Arsenal Config Revolution: {e}")
-        
-        # Charger Enhanced Music System
-        if MUSIC_ENHANCED_AVAILABLE:
-            try:
-                await self.add_cog(music_enhanced.EnhancedMusicSystem(self))
-                log.info("[OK] Module Enhanced Music System chargé")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Enhanced Music: {e}")
-        
-        # Charger Arsenal Economy System UNIFIÉ (NOUVEAU V4.6) avec Configuration Moderne
-        if ARSENAL_ECONOMY_AVAILABLE:
-            try:
-                await self.add_cog(ArsenalEconomyUnified(self))
-                await self.add_cog(ArsenalShopAdmin(self))
-# SUPPRIMÉ: # Config unifié maintenant dans commands/config.py
-                # from commands.config_modal_system import ArsenalConfigSystemModal
-                # await self.add_cog(ArsenalConfigSystemModal(self))
-                await self.add_cog(ArsenalUpdateNotifier(self))
-                log.info("[OK] Arsenal Economy UNIFIÉ, Shop & Update Notifier System chargé")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Arsenal Economy UNIFIÉ: {e}")
-                
-        # Arsenal AutoMod V5.0.1 CORRIGÉ - Exactement 489 mots (NOUVEAU)
-        try:
-            from commands.arsenal_automod_v5_fixed import ArsenalCommandGroupsFinalFixed
-            # Vérifier si la commande automod existe déjà
-            existing_automod = self.tree.get_command("automod")
-            if not existing_automod:
-                await self.add_cog(ArsenalCommandGroupsFinalFixed(self))
-                log.info("🛡️ [OK] Arsenal AutoMod V5.0.1 CORRIGÉ - Exactement 489 mots chargé!")
-            else:
-                log.info("🛡️ [INFO] Arsenal AutoMod déjà chargé - évité duplication")
-        except Exception as e:
-            log.error(f"[ERROR] Erreur chargement Arsenal AutoMod V5.0.1 CORRIGÉ: {e}")
-            
-        # Arsenal Bug Reporter - Système de signalement (NOUVEAU)
-        try:
-            from commands.arsenal_bug_reporter import ArsenalBugReporter
-            await self.add_cog(ArsenalBugReporter(self))
-            log.info("🐛 [OK] Arsenal Bug Reporter - Système de signalement chargé!")
-        except Exception as e:
-            log.error(f"[ERROR] Erreur chargement Arsenal Bug Reporter: {e}")
-            
-        # Arsenal Test Suite - Tests automatiques (NOUVEAU)
-        try:
-            from commands.arsenal_test_suite import ArsenalTestSuite
-            await self.add_cog(ArsenalTestSuite(self))
-            log.info("🧪 [OK] Arsenal Test Suite - Tests automatiques chargé!")
-        except Exception as e:
-            log.error(f"[ERROR] Erreur chargement Arsenal Test Suite: {e}")
-                
-            # Bot Migration System - Révolutionnaire
-            if BOT_MIGRATION_AVAILABLE:
-                try:
-                    await self.add_cog(BotMigrationSystem(self))
-                    log.info("🚀 [OK] Bot Migration System - Système révolutionnaire de récupération de configs d'autres bots!")
-                except Exception as e:
-                    log.error(f"[ERROR] Erreur chargement Bot Migration System: {e}")
-            else:
-                log.warning("[WARNING] Bot Migration System non disponible")
-                
-            # Migration Help System
-            try:
-                from commands.migration_help import MigrationHelp
-                await self.add_cog(MigrationHelp(self))
-                log.info("📚 [OK] Migration Help System - Guide interactif de migration!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Migration Help: {e}")
-                
-            # Arsenal Features System - Affichage complet des fonctionnalités
-            try:
-                from commands.arsenal_features import ArsenalBotFeatures
-                await self.add_cog(ArsenalBotFeatures(self))
-                log.info("🌟 [OK] Arsenal Features System - Toutes les fonctionnalités Discord natives!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Arsenal Features: {e}")
-                
-            # Arsenal Config Ultimate - Configuration révolutionnaire
-            try:
-                from commands.arsenal_config_ultimate import ArsenalConfigUltimate
-                await self.add_cog(ArsenalConfigUltimate(self))
-                log.info("🔥 [OK] Arsenal Config Ultimate - Configuration la plus avancée Discord!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Arsenal Config Ultimate: {e}")
-                
-            # Arsenal Config System Unified - Système /config unifié (DÉSACTIVÉ - Conflit éliminé)
-            # try:
-            #     from commands.arsenal_config_system_unified import ArsenalConfigSystem
-            #     await self.add_cog(ArsenalConfigSystem(self))
-            #     log.info("🚀 [OK] Arsenal Config System Unified - Commandes /config unifiées!")
-            # except Exception as e:
-            #     log.error(f"[ERROR] Erreur chargement Arsenal Config System Unified: {e}")
-                
-            # Arsenal Custom Commands - Système de commandes personnalisées
-            try:
-                from commands.arsenal_custom_commands import ArsenalCustomCommands
-                await self.add_cog(ArsenalCustomCommands(self))
-                log.info("🛠️ [OK] Arsenal Custom Commands - Système de commandes personnalisées 15/serveur!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Arsenal Custom Commands: {e}")
-                
-            # Level System - Système de niveaux avancé
-            try:
-                from commands.level_system import LevelSystem
-                await self.add_cog(LevelSystem(self))
-                log.info("📈 [OK] Level System - Niveaux et expérience!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Level System: {e}")
-                
-            # Music Enhanced System - Système musical avancé
-            try:
-                from commands.music_enhanced_system import MusicEnhancedSystem
-                await self.add_cog(MusicEnhancedSystem(self))
-                log.info("🎵 [OK] Music Enhanced System - Musique avancée!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Music Enhanced System: {e}")
-                
-            # Gaming API System - API jeux
-            try:
-                from commands.gaming_api_system import GamingAPISystem
-                await self.add_cog(GamingAPISystem(self))
-                log.info("🎮 [OK] Gaming API System - API jeux intégrée!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Gaming API System: {e}")
-                
-            # Social Fun System - Système social
-            try:
-                from commands.social_fun_system import SocialFunSystem
-                await self.add_cog(SocialFunSystem(self))
-                log.info("🎉 [OK] Social Fun System - Interactions sociales!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Social Fun System: {e}")
-                
-            # Server Management System - Gestion serveur
-            try:
-                from commands.server_management_system import ServerManagementSystem
-                await self.add_cog(ServerManagementSystem(self))
-                log.info("🏛️ [OK] Server Management System - Gestion serveur complète!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Server Management System: {e}")
-                
-            # Reaction Roles System - Rôles par réaction
-            try:
-                from commands.reaction_roles_system import ReactionRolesSystem
-                await self.add_cog(ReactionRolesSystem(self))
-                log.info("🎭 [OK] Reaction Roles System - Rôles par réaction!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Reaction Roles System: {e}")
-            
-            # Help System Complete - DÉSACTIVÉ (remplacé par V2)
-            # try:
-            #     await help_system.setup(self)
-            #     log.info("📚 [OK] Help System Complete V4.5.2 - Aide interactive!")
-            # except Exception as e:
-            #     log.error(f"[ERROR] Erreur chargement Help System: {e}")
-                
-            # AutoRoles System - Attribution automatique de rôles
-            try:
-                from commands.autoroles_system import AutoRolesSystem
-                await self.add_cog(AutoRolesSystem(self))
-                log.info("🎪 [OK] AutoRoles System - Attribution automatique!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement AutoRoles System: {e}")
-                
-            # Sanctions System - Système de sanctions complet
-            try:
-                from commands.sanctions_system import SanctionsSystem
-                await self.add_cog(SanctionsSystem(self))
-                log.info("⚖️ [OK] Sanctions System - Système de sanctions complet!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Sanctions System: {e}")
-                
-            # Community System - Commandes communautaires
-            try:
-                from commands.community import CommunitySystem
-                await self.add_cog(CommunitySystem(self))
-                log.info("👥 [OK] Community System - Commandes communautaires avancées!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Community System: {e}")
-                
-            # Notifications System - Système de notifications
-            try:
-                from commands.notifications_system import NotificationsSystem
-                await self.add_cog(NotificationsSystem(self))
-                log.info("🔔 [OK] Notifications System - Notifications avancées!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Notifications System: {e}")
-                
-            # InvCmd System - Commandes invisibles/debug
-            try:
-                from commands.invcmd_system import InvCmdSystem
-                await self.add_cog(InvCmdSystem(self))
-                log.info("�️ [OK] InvCmd System - Terminal de monitoring!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement InvCmd System: {e}")
-                
-            # Arsenal Voice Manager - Gestion vocale avancée
-            try:
-                from commands.arsenal_voice_manager import ArsenalVoiceManager
-                await self.add_cog(ArsenalVoiceManager(self))
-                log.info("🎤 [OK] Arsenal Voice Manager - Gestion vocale avancée!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Arsenal Voice Manager: {e}")
-                
-            # Command Protection System - Protection contre les conflits
-            try:
-                from commands.command_protection import ProtectionCog
-                await self.add_cog(ProtectionCog(self))
-                log.info("🛡️ [OK] Command Protection System - Évite les conflits de commandes!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Command Protection System: {e}")
-                
-            # NPB System - Navigation Par Bouton (RÉVOLUTIONNAIRE !)
-            try:
-                from commands.npb_system import NPBSystem
-                await self.add_cog(NPBSystem(self))
-                log.info("🎮 [OK] NPB System - Interface graphique complète sans erreurs !")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement NPB System: {e}")
-                print(f"[DEBUG] NPB Error details: {e}")  # Debug supplémentaire
-                
-            # Creator Tools - Outils pour créateurs
-            try:
-                from commands.creator_tools import CreatorTools
-                await self.add_cog(CreatorTools(self))
-                log.info("🛠️ [OK] Creator Tools - Outils développeur!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Creator Tools: {e}")
-                
-            # Advanced Logs System - Système de logs avancé
-            try:
-                from commands.advanced_logs import AdvancedLogsSystem
-                await self.add_cog(AdvancedLogsSystem(self))
-                log.info("📊 [OK] Advanced Logs System - Logs intelligents!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Advanced Logs System: {e}")
-            
-            # Règlement Intelligent - Système ultra-complet avec interface moderne
-            try:
-                from commands.reglement import ReglementSystem
-                await self.add_cog(ReglementSystem(self))
-                log.info("📜 [OK] Règlement Intelligent - Interface ultra-complète avec toutes les fonctionnalités !")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Règlement: {e}")
-                
-            # Hub Vocal - Salons temporaires avec panel de contrôle
-            try:
-                from commands.hub_vocal import HubVocal
-                await self.add_cog(HubVocal(self))
-                log.info("🎤 [OK] Hub Vocal - Système complet de salons temporaires avec contrôle !")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Hub Vocal: {e}")
-                
-            # Advanced Ticket System - Système de tickets ultra-avancé avec groupes
-            try:
-                from commands.advanced_ticket_system import AdvancedTicketSystem
-                await self.add_cog(AdvancedTicketSystem(self))
-                log.info("🎫 [OK] Advanced Ticket System - Système de tickets révolutionnaire avec catégories !")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Advanced Ticket System: {e}")
-                
-            # DÉSACTIVÉ - Arsenal Profile Ultimate (ancien, remplacé par 2000%)
-            # try:
-            #     from commands.arsenal_profile_ultimate import ArsenalProfileUltimate
-            #     await self.add_cog(ArsenalProfileUltimate(self))
-            #     log.info("💎 [OK] Arsenal Profile Ultimate - Profil bot révolutionnaire!")
-            # except Exception as e:
-            #     log.error(f"[ERROR] Erreur chargement Arsenal Profile Ultimate: {e}")
-                
-            # Arsenal Profile Ultimate 2000% - Profil révolutionnaire COMPLET (SEUL ACTIF)
-            try:
-                from commands.arsenal_profile_ultimate_2000 import ArsenalProfileUltimate2000
-                await self.add_cog(ArsenalProfileUltimate2000(self))
-                log.info("🔥 [OK] Arsenal Profile Ultimate 2000% - STREAMING + 2000% personnalisation!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Arsenal Profile Ultimate 2000%: {e}")
-                
-            # Arsenal Config 2000% (UNIFIÉ DANS /config)
-            # try:
-            #     from commands.arsenal_config_2000 import ArsenalConfig2000System
-            #     await self.add_cog(ArsenalConfig2000System(self))
-            #     log.info("🚀 [OK] Arsenal Config 2000% - Configuration la plus avancée Discord!")
-            # except Exception as e:
-            log.info("ℹ️ [INFO] Arsenal Config 2000% unifié dans /config")
-                
-            # Discord Badges System - Pour afficher les capacités à droite du nom
-            if DISCORD_BADGES_AVAILABLE:
-                try:
-                    await self.add_cog(DiscordBadges(self))
-                    log.info("🏆 [OK] Discord Badges System - Badges natifs Discord activés!")
-                except Exception as e:
-                    log.error(f"[ERROR] Erreur chargement Discord Badges System: {e}")
-                    
-            # Arsenal Diagnostic System - Vérification complète du bot
-            if ARSENAL_DIAGNOSTIC_AVAILABLE:
-                try:
-                    await self.add_cog(ArsenalDiagnostic(self))
-                    log.info("🔧 [OK] Arsenal Diagnostic System - Vérification complète activée!")
-                except Exception as e:
-                    log.error(f"[ERROR] Erreur chargement Arsenal Diagnostic System: {e}")
-                
-            # DÉSACTIVÉ - Arsenal Profile Updater (conflit avec Profile Ultimate 2000%)
-            # try:
-            #     from commands.arsenal_profile_updater import ArsenalProfileUpdater
-            #     await self.add_cog(ArsenalProfileUpdater(self))
-            #     log.info("🎯 [OK] Arsenal Profile Updater - Profil Discord auto-optimisé!")
-            # except Exception as e:
-            #     log.error(f"[ERROR] Erreur chargement Profile Updater: {e}")
-                
-            # Arsenal Context Menus - Menus contextuels (clic droit)
-            try:
-                from commands.arsenal_context_menus import ArsenalContextMenus
-                await self.add_cog(ArsenalContextMenus(self))
-                log.info("🖱️ [OK] Arsenal Context Menus - Menus contextuels natifs Discord!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Context Menus: {e}")
-                
-            # Discord Integration Forcer - Force Discord à reconnaître TOUTES nos prises en charge
-            try:
-                from commands.discord_integration_forcer import DiscordIntegrationForcer
-                await self.add_cog(DiscordIntegrationForcer(self))
-                log.info("💎 [OK] Discord Integration Forcer - TOUTES les prises en charge forcées!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Discord Integration Forcer: {e}")
-                
-            # Absence Ticket System - Gestion des tickets d'absence
-            if ABSENCE_SYSTEM_AVAILABLE:
-                try:
-                    # Initialiser la base de données
-                    await setup_absence_config_db()
-                    await self.add_cog(AbsenceTicketSystem(self))
-                    log.info("🎫 [OK] Absence Ticket System - Tickets d'absence avec auto-expiry!")
-                except Exception as e:
-                    log.error(f"[ERROR] Erreur chargement Absence Ticket System: {e}")
-                    
-# Sanctions System - Casier judiciaire permanent
-            try:
-                from commands.sanctions_system import SanctionsSystem
-                await self.add_cog(SanctionsSystem(self))
-                log.info("⚖️ [OK] Sanctions System - Casier permanent & Modération avancée!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Sanctions System: {e}")
-                    
-            # Complete Commands System - Liste complète des commandes
-            try:
-                from commands.complete_commands_system import CompleteCommandsSystem
-                await self.add_cog(CompleteCommandsSystem(self))
-                log.info("📋 [OK] Complete Commands System - Liste complète des commandes!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Complete Commands System: {e}")
-                
-            # KeepAlive System - Maintien du bot actif
-            try:
-                from commands.keepalive_system import KeepAliveSystem
-                await self.add_cog(KeepAliveSystem(self))
-                log.info("💚 [OK] KeepAlive System - Maintien du bot actif!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement KeepAlive System: {e}")
-                
-            # Announcements System - Système d'annonces
-            try:
-                from commands.announcements_system import AnnouncementsSystem
-                await self.add_cog(AnnouncementsSystem(self))
-                log.info("📢 [OK] Announcements System - Système d'annonces avancé!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Announcements System: {e}")
-                
-            # Hunt Royal System V2.0 - Système principal avec 15 commandes
-            try:
-                from commands.hunt_royal_system import HuntRoyalSystem
-                await self.add_cog(HuntRoyalSystem(self))
-                log.info("🏹 [OK] Hunt Royal System V2.0 - Système principal avec calculateurs!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Hunt Royal System V2.0: {e}")
-                
-            # Arsenal Bug Report System - Système de rapport de bugs
-            try:
-                from commands.arsenal_bugreport_system import ArsenalBugReport
-                await self.add_cog(ArsenalBugReport(self))
-                log.info("🐛 [OK] Arsenal Bug Report System - Rapports de bugs avancés!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Arsenal Bug Report System: {e}")
-                
-            # Arsenal Profile Updater - Mise à jour automatique des profils
-            try:
-                from commands.arsenal_profile_updater import ArsenalProfileUpdater
-                await self.add_cog(ArsenalProfileUpdater(self))
-                log.info("🔄 [OK] Arsenal Profile Updater - Profils Discord auto-optimisés!")
-            except Exception as e:
-                log.error(f"[ERROR] Erreur chargement Arsenal Profile Updater: {e}")
-                    
-            # Communication System - Say & Traduction avancée
-            if COMMUNICATION_SYSTEM_AVAILABLE:
-                try:
-                    await self.add_cog(CommunicationSystem(self))
-                    log.info("📢 [OK] Communication System - Say & Traduction IA chargés!")
-                except Exception as e:
-                    log.error(f"[ERROR] Erreur chargement Communication System: {e}")
-                    import traceback
-                    log.error(f"[DEBUG] Communication System Traceback: {traceback.format_exc()}")
-                    
-            # Help System V2 - Interface d'aide révolutionnaire
-            if HELP_SYSTEM_V2_AVAILABLE:
-                try:
-                    await self.add_cog(HelpSystemV2(self))
-                    log.info("📚 [OK] Help System V2 - Interface moderne chargée!")
-                except Exception as e:
-                    log.error(f"[ERROR] Erreur chargement Help System V2: {e}")
-                    import traceback
-                    log.error(f"[DEBUG] Help System V2 Detailed Error: {traceback.format_exc()}")
 
 client = ArsenalBot(command_prefix=PREFIX, intents=intents)
 client.startup_time = datetime.datetime.now(datetime.timezone.utc)
@@ -1008,19 +263,21 @@ async def on_ready():
         log.error(f"[DEBUG] Status Error Traceback: {traceback.format_exc()}")
     
     try:
+        # Les cogs différés doivent être chargés sinon leurs commandes seraient retirées par la synchro
+        if client.cog_loader:
+            await client.cog_loader.wait_deferred()
         await client.tree.sync()
         log.info(f"[SYNC] Commandes Slash synchronisées.")
         
+        if METRICS_SERVER_AVAILABLE and os.getenv("ARSENAL_PROFILING", "").lower() in ("1", "true", "on"):
+            profiler.enable()
+            wrapped = profiler.instrument_commands(client.tree)
+            log.info(f"⏱️ [PERF] Profilage actif ({wrapped} commandes instrumentées)")
+        
         # Le système de statut Arsenal démarre automatiquement via setup_hook()
         if hasattr(client, 'status_system') and client.status_system:
             log.info("[STATUS] Système de statut Arsenal actif")
-        
-        # Démarre la mise à jour du statut du bot
-        try:
-            update_bot_status_task.start()
-        except:
-            pass  # Task déjà démarrée
-            
+
     except Exception as e:
         log.error(f"[SYNC ERROR] {e}")
 
@@ -1076,32 +333,9 @@ if RELOADER_AVAILABLE:
     client.tree.add_command(reload_group)
     print("⚡ [RÉACTIVÉ] Commandes reload ajoutées à l'arbre!")
 
-# Arsenal Economy System UNIFIÉ (NOUVEAU V4.6)
-try:
-    from commands.arsenal_economy_unified import ArsenalEconomyUnified
-    from commands.arsenal_shop_admin import ArsenalShopAdmin
-    # SUPPRIMÉ CONFLIT: from commands.arsenal_config_system import ArsenalConfigSystem
-# SUPPRIMÉ: from commands.arsenal_config_complete import ArsenalCompleteConfig
-    from commands.arsenal_update_notifier import ArsenalUpdateNotifier
-    ARSENAL_ECONOMY_AVAILABLE = True
-    print("[OK] Arsenal Economy UNIFIÉ, Shop Admin & Update Notifier System chargé")
-except Exception as e:
-    ARSENAL_ECONOMY_AVAILABLE = False
-    print(f"[WARNING] Arsenal Economy System non disponible: {e}")
-
 # Lancement
 if __name__ == "__main__":
-    import threading
-    
-    # Démarrer serveur Flask health check en parallèle
-    try:
-        from health_server import start_health_server
-        flask_thread = threading.Thread(target=start_health_server, daemon=True)
-        flask_thread.start()
-        log.info("[HEALTH] Serveur Flask démarré pour Render health checks")
-    except Exception as e:
-        log.warning(f"[HEALTH] Impossible de démarrer serveur Flask: {e}")
-    
+    # Le serveur health/métriques démarre avec le bot (setup_hook)
     # Démarrer bot Discord
     try:
         client.run(TOKEN)
@@ -0,0 +1,311 @@
+"""
+🏦 Arsenal Economy - Grand livre en partie double
+Chaque opération est une transaction dont les écritures s'équilibrent (somme = 0),
+ajoutée sans jamais être modifiée. Les soldes sont matérialisés et mis à jour dans
+la même transaction SQLite ; une clé d'idempotence rend un daily ou un achat rejouable
+sans double crédit.
+
+Comptes :
+    "<discord_id>"     compte utilisateur (ne peut pas passer en négatif)
+    "system:mint"      émission / destruction d'ArsenalCoins (daily, admin, récompenses)
+    "system:shop"      encaissement des achats
+    "system:import"    reprise des anciennes données (economie.json, anciennes bases)
+"""
+
+import json
+import os
+import sqlite3
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from modules.sqlite_database import SQLitePool, database_manager
+
+MINT = "system:mint"
+SHOP = "system:shop"
+IMPORT = "system:import"
+SYSTEM_PREFIX = "system:"
+
+# Soldes de l'ancienne table du cog économie, repris avec economie.json
+LEGACY_USERS_QUERY = "SELECT discord_id, balance FROM arsenal_users"
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS ledger_transactions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        idempotency_key TEXT UNIQUE,
+        kind TEXT NOT NULL,
+        description TEXT,
+        created_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS ledger_entries (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        tx_id INTEGER NOT NULL REFERENCES ledger_transactions (id),
+        account TEXT NOT NULL,
+        amount INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_ledger_entries_account ON ledger_entries (account, tx_id);
+    CREATE TABLE IF NOT EXISTS ledger_accounts (
+        account TEXT PRIMARY KEY,
+        balance INTEGER NOT NULL DEFAULT 0,
+        total_in INTEGER NOT NULL DEFAULT 0,
+        total_out INTEGER NOT NULL DEFAULT 0,
+        updated_at REAL
+    );
+    CREATE INDEX IF NOT EXISTS idx_ledger_accounts_balance ON ledger_accounts (balance);
+    CREATE TRIGGER IF NOT EXISTS ledger_entries_no_update BEFORE UPDATE ON ledger_entries
+    BEGIN SELECT RAISE(ABORT, 'ledger_entries est en ajout seul'); END;
+    CREATE TRIGGER IF NOT EXISTS ledger_entries_no_delete BEFORE DELETE ON ledger_entries
+    BEGIN SELECT RAISE(ABORT, 'ledger_entries est en ajout seul'); END;
+"""
+
+
+class InsufficientFunds(Exception):
+    """Le débit ferait passer un compte utilisateur en négatif"""
+
+    def __init__(self, account: str, balance: int, amount: int):
+        super().__init__(f"Solde insuffisant pour {account}: {balance} < {amount}")
+        self.account = account
+        self.balance = balance
+        self.amount = amount
+
+
+class Transfer(NamedTuple):
+    source: str
+    destination: str
+    amount: int
+    kind: str
+    description: str = ""
+    idempotency_key: Optional[str] = None
+
+
+class TransferResult(NamedTuple):
+    tx_id: int
+    replayed: bool               # Clé d'idempotence déjà utilisée : rien n'a été réécrit
+    balances: Dict[str, int]     # Soldes des comptes concernés après la transaction
+
+
+def is_system(account: str) -> bool:
+    return account.startswith(SYSTEM_PREFIX)
+
+
+class EconomyLedger:
+    """Moteur du grand livre, adossé à un pool SQLite (WAL)"""
+
+    def __init__(self, pool: SQLitePool):
+        self.pool = pool
+        self.pool.run_sync(lambda conn: conn.executescript(SCHEMA))
+
+    @classmethod
+    def open(cls, db_path: str) -> "EconomyLedger":
+        return cls(database_manager.pool(db_path))
+
+    # ==================== ÉCRITURE ====================
+
+    def _post(self, conn: sqlite3.Connection, postings: Sequence[Tuple[str, int]], kind: str,
+              description: str, idempotency_key: Optional[str],
+              apply: Optional[Callable[[sqlite3.Connection], None]] = None) -> TransferResult:
+        """Écrit une transaction équilibrée dans la transaction SQLite courante"""
+        if sum(amount for _, amount in postings) != 0:
+            raise ValueError(f"Transaction déséquilibrée: {postings}")
+
+        if idempotency_key is not None:
+            row = conn.execute(
+                "SELECT id FROM ledger_transactions WHERE idempotency_key = ?", (idempotency_key,)
+            ).fetchone()
+            if row is not None:
+                return TransferResult(row[0], True, self._balances(conn, [account for account, _ in postings]))
+
+        now = time.time()
+        tx_id = conn.execute(
+            "INSERT INTO ledger_transactions (idempotency_key, kind, description, created_at) VALUES (?, ?, ?, ?)",
+            (idempotency_key, kind, description, now)
+        ).lastrowid
+        conn.executemany(
+            "INSERT INTO ledger_entries (tx_id, account, amount) VALUES (?, ?, ?)",
+            [(tx_id, account, amount) for account, amount in postings]
+        )
+
+        for account, amount in postings:
+            if amount < 0 and not is_system(account):
+                # Débit gardé : jamais de solde utilisateur négatif
+                updated = conn.execute(
+                    "UPDATE ledger_accounts SET balance = balance + ?, total_out = total_out + ?, updated_at = ? "
+                    "WHERE account = ? AND balance + ? >= 0",
+                    (amount, -amount, now, account, amount)
+                ).rowcount
+                if not updated:
+                    balance = self._balances(conn, [account])[account]
+                    raise InsufficientFunds(account, balance, -amount)
+            else:
+                conn.execute(
+                    "INSERT INTO ledger_accounts (account, balance, total_in, total_out, updated_at) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (account) DO UPDATE SET balance = balance + excluded.balance, "
+                    "total_in = total_in + excluded.total_in, total_out = total_out + excluded.total_out, "
+                    "updated_at = excluded.updated_at",
+                    (account, amount, max(amount, 0), max(-amount, 0), now)
+                )
+
+        if apply is not None:
+            apply(conn)
+        return TransferResult(tx_id, False, self._balances(conn, [account for account, _ in postings]))
+
+    @staticmethod
+    def _postings(transfer: Transfer) -> List[Tuple[str, int]]:
+        if transfer.amount <= 0:
+            raise ValueError("Le montant doit être positif")
+        if transfer.source == transfer.destination:
+            raise ValueError("Source et destination identiques")
+        return [(transfer.source, -transfer.amount), (transfer.destination, transfer.amount)]
+
+    def transfer(self, source: str, destination: str, amount: int, kind: str, description: str = "",
+                 idempotency_key: Optional[str] = None,
+                 apply: Optional[Callable[[sqlite3.Connection], None]] = None) -> TransferResult:
+        """Virement atomique ; `apply(conn)` s'exécute dans la même transaction"""
+        transfer = Transfer(source, destination, amount, kind, description, idempotency_key)
+        return self.pool.run_sync(self._post, self._postings(transfer), kind, description, idempotency_key, apply)
+
+    async def transfer_async(self, source: str, destination: str, amount: int, kind: str, description: str = "",
+                             idempotency_key: Optional[str] = None,
+                             apply: Optional[Callable[[sqlite3.Connection], None]] = None) -> TransferResult:
+        """Comme `transfer`, sur un thread du pool"""
+        transfer = Transfer(source, destination, amount, kind, description, idempotency_key)
+        return await self.pool.run(self._post, self._postings(transfer), kind, description, idempotency_key, apply)
+
+    def transfer_many(self, transfers: Iterable[Transfer]) -> List[TransferResult]:
+        """Plusieurs virements en une seule transaction SQLite (tout ou rien)"""
+        transfers = list(transfers)
+        postings = [self._postings(transfer) for transfer in transfers]
+
+        def _post_all(conn):
+            return [
+                self._post(conn, entries, t.kind, t.description, t.idempotency_key)
+                for t, entries in zip(transfers, postings)
+            ]
+        return self.pool.run_sync(_post_all)
+
+    def credit(self, account: str, amount: int, kind: str, description: str = "", idempotency_key: Optional[str] = None,
+               apply: Optional[Callable[[sqlite3.Connection], None]] = None) -> TransferResult:
+        """Émet des coins vers un compte"""
+        return self.transfer(MINT, account, amount, kind, description, idempotency_key, apply)
+
+    def debit(self, account: str, amount: int, kind: str, description: str = "", idempotency_key: Optional[str] = None,
+              destination: str = MINT, apply: Optional[Callable[[sqlite3.Connection], None]] = None) -> TransferResult:
+        """Retire des coins d'un compte (détruits, ou encaissés par `destination`)"""
+        return self.transfer(account, destination, amount, kind, description, idempotency_key, apply)
+
+    # ==================== LECTURE ====================
+
+    @staticmethod
+    def _balances(conn, accounts: Iterable[str]) -> Dict[str, int]:
+        balances = {}
+        for account in accounts:
+            row = conn.execute("SELECT balance FROM ledger_accounts WHERE account = ?", (account,)).fetchone()
+            balances[account] = row[0] if row else 0
+        return balances
+
+    def balance(self, account: str) -> int:
+        return self.pool.run_sync(self._balances, [account])[account]
+
+    def account(self, account: str) -> Dict[str, int]:
+        """Solde et cumuls d'un compte"""
+        row = self.pool.run_sync(lambda conn: conn.execute(
+            "SELECT balance, total_in, total_out FROM ledger_accounts WHERE account = ?", (account,)
+        ).fetchone())
+        balance, total_in, total_out = row or (0, 0, 0)
+        return {"balance": balance, "total_in": total_in, "total_out": total_out}
+
+    def history(self, account: str, limit: int = 20) -> List[Dict]:
+        """Dernières écritures d'un compte (plus récentes d'abord)"""
+        rows = self.pool.run_sync(lambda conn: conn.execute("""
+            SELECT t.id, t.kind, t.description, t.created_at, e.amount
+            FROM ledger_entries e JOIN ledger_transactions t ON t.id = e.tx_id
+            WHERE e.account = ? ORDER BY e.tx_id DESC LIMIT ?
+        """, (account, limit)).fetchall())
+        return [
+            {"tx_id": tx_id, "kind": kind, "description": description, "created_at": created_at, "amount": amount}
+            for tx_id, kind, description, created_at, amount in rows
+        ]
+
+    def verify(self) -> List[Tuple[str, int, int]]:
+        """Comptes dont le solde matérialisé diffère de la somme des écritures
+
+        Retourne [(compte, solde matérialisé, somme des écritures)] ; une liste vide
+        signifie que le grand livre est cohérent (et la somme globale est nulle).
+        """
+        def _verify(conn):
+            return conn.execute("""
+                SELECT COALESCE(a.account, e.account), COALESCE(a.balance, 0), COALESCE(e.total, 0)
+                FROM (SELECT account, SUM(amount) AS total FROM ledger_entries GROUP BY account) e
+                LEFT JOIN ledger_accounts a ON a.account = e.account
+                WHERE COALESCE(a.balance, 0) != e.total
+                UNION ALL
+                SELECT a.account, a.balance, 0 FROM ledger_accounts a
+                WHERE a.balance != 0 AND a.account NOT IN (SELECT DISTINCT account FROM ledger_entries)
+            """).fetchall()
+        return [tuple(row) for row in self.pool.run_sync(_verify)]
+
+    # ==================== REPRISE DES ANCIENNES DONNÉES ====================
+
+    def import_balances(self, balances: Iterable[Tuple[str, int]], source: str) -> int:
+        """Reprend des soldes existants : une seule transaction de reprise par compte
+
+        Un compte présent plusieurs fois (plusieurs sources) reçoit le plus
+        grand de ses soldes, jamais leur somme. Un compte déjà présent dans le
+        grand livre n'est pas repris, et la clé d'idempotence ne dépend que du
+        compte : relancer l'import, ou importer plus tard une autre source, ne
+        crédite rien deux fois. Retourne le nombre de comptes crédités.
+        """
+        merged: Dict[str, int] = {}
+        for account, amount in balances:
+            if amount and int(amount) > 0:
+                merged[str(account)] = max(merged.get(str(account), 0), int(amount))
+        if not merged:
+            return 0
+
+        def _import(conn):
+            credited = 0
+            for account, amount in merged.items():
+                if conn.execute("SELECT 1 FROM ledger_accounts WHERE account = ?", (account,)).fetchone():
+                    continue
+                transfer = Transfer(IMPORT, account, amount, "import", f"Reprise {source}", f"import:{account}")
+                result = self._post(conn, self._postings(transfer), transfer.kind, transfer.description,
+                                    transfer.idempotency_key)
+                credited += not result.replayed
+            return credited
+        return self.pool.run_sync(_import)
+
+    @staticmethod
+    def read_json(path: str) -> List[Tuple[str, int]]:
+        """Soldes d'un fichier {user_id: solde} (economie.json)"""
+        if not os.path.exists(path):
+            return []
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return [(user_id, value) for user_id, value in data.items() if isinstance(value, int)]
+
+    @staticmethod
+    def read_sqlite(path: str, query: str) -> List[Tuple[str, int]]:
+        """Soldes d'une ancienne base ; `query` retourne (compte, solde)"""
+        if not os.path.exists(path):
+            return []
+        conn = sqlite3.connect(path)
+        try:
+            return [tuple(row) for row in conn.execute(query).fetchall()]
+        except sqlite3.OperationalError:
+            return []  # Table absente : rien à reprendre
+        finally:
+            conn.close()
+
+    def import_json(self, path: str, source: str = "economie.json") -> int:
+        return self.import_balances(self.read_json(path), source)
+
+    def import_sqlite(self, path: str, query: str, source: str) -> int:
+        return self.import_balances(self.read_sqlite(path, query), source)
+
+    def import_legacy(self, json_path: str, db_path: str) -> int:
+        """Reprise unique de economie.json et de arsenal_users.balance (même grand livre)
+
+        Les deux anciennes sources décrivent le même solde : elles sont
+        fusionnées (plus grand solde par compte) avant d'écrire la reprise.
+        """
+        balances = self.read_sqlite(db_path, LEGACY_USERS_QUERY) + self.read_json(json_path)
+        return self.import_balances(balances, "economie.json + arsenal_users")
@@ -1,35 +1,43 @@
-import json
 import os
 from core.logger import log
+from manager.economy_ledger import EconomyLedger, InsufficientFunds
 
 ECONOMY_PATH = "data/economie.json"
-balances = {}
+LEDGER_PATH = "data/arsenal_economy_unified.db"
+ledger = None
 
 def load_economy():
-    global balances
+    """Ouvre le grand livre et y reprend les anciens soldes (une seule fois par compte)"""
+    global ledger
     try:
+        ledger = EconomyLedger.open(LEDGER_PATH)
         if os.path.exists(ECONOMY_PATH):
-            with open(ECONOMY_PATH, "r", encoding="utf-8") as f:
-                balances = json.load(f)
-                log.info("💰 economie.json chargé")
+            # Même reprise que le cog économie : economie.json fusionné avec arsenal_users
+            imported = ledger.import_legacy(ECONOMY_PATH, LEDGER_PATH)
+            log.info(f"💰 economie.json repris dans le grand livre ({imported} nouveau(x) compte(s))")
         else:
-            balances = {}
-            log.warning("⚠️ economie.json absent — initialisation vide")
+            log.warning("⚠️ economie.json absent — rien à reprendre")
     except Exception as e:
-        log.error(f"❌ Erreur lecture economy : {e}")
-        balances = {}
+        log.error(f"❌ Erreur ouverture grand livre : {e}")
+
+def _ledger() -> EconomyLedger:
+    if ledger is None:
+        load_economy()
+    return ledger
 
 def save_economy():
-    try:
-        with open(ECONOMY_PATH, "w", encoding="utf-8") as f:
-            json.dump(balances, f, indent=4)
-            log.info("💾 Données économiques sauvegardées")
-    except Exception as e:
-        log.error(f"⚠️ Erreur sauvegarde économie : {e}")
+    """Conservé pour compatibilité : chaque mouvement est déjà écrit dans le grand livre"""
 
 def get_balance(user_id: int) -> int:
-    return balances.get(str(user_id), 0)
+    return _ledger().balance(str(user_id))
 
 def update_balance(user_id: int, amount: int):
-    balances[str(user_id)] = get_balance(user_id) + amount
-    save_economy()
+    if amount == 0:
+        return
+    try:
+        if amount > 0:
+            _ledger().credit(str(user_id), amount, "legacy", "economy_manager.update_balance")
+        else:
+            _ledger().debit(str(user_id), -amount, "legacy", "economy_manager.update_balance")
+    except InsufficientFunds as e:
+        log.warning(f"⚠️ Débit refusé : {e}")
@@ -20,23 +20,30 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from core.logger import log
 from manager.config_manager import config_data, save_config, load_config
+from utils.word_matcher import WordMatcher
+from utils.rate_tracker import SlidingWindowCounter
+from utils.guild_config_cache import GuildConfigCache
 
 class AutoModSystem:
     def __init__(self, bot):
         self.bot = bot
         self.config_path = "data/automod_config.json"
-        self.user_message_history = {}  # Historique des messages pour détection spam
+        self.user_message_history = SlidingWindowCounter(window=5, max_events=64, idle_ttl=600)  # Détection spam
         self.user_warnings = {}  # Système d'avertissements
-        self.raid_tracker = {}  # Suivi des raids par serveur
+        self.raid_tracker = SlidingWindowCounter(window=30, max_events=1024, idle_ttl=3600)  # Suivi des raids par serveur
         self.competing_bots = {}  # Bots concurrents détectés par serveur
+        self.word_matchers = {}  # (guild_id, avancé): WordMatcher compilé
+        self.exemptions = GuildConfigCache(self._load_exemptions)  # guild_id: (rôles, salons) exempts
         self.load_config()
-        
+
     def load_config(self):
         """Charge la configuration automod"""
         if os.path.exists(self.config_path):
             try:
                 with open(self.config_path, "r", encoding="utf-8") as f:
                     self.config = json.load(f)
+                self.word_matchers.clear()
+                self.exemptions.invalidate()
                 log.info("🛡️ Configuration automod chargée")
             except Exception as e:
                 log.error(f"❌ Erreur chargement automod config: {e}")
@@ -209,6 +216,7 @@ class AutoModSystem:
                 "level_4_action": "timeout",   # Haine raciale/Extrême
                 "level_4_duration": 7200,      # 2 heures
                 "auto_delete": True,
+                "word_boundary": False,  # True = début de mot uniquement ("con" ne bloque plus "second")
                 "words": [
                     "fuck", "shit", "bitch", "ass", "damn", 
                     "putain", "merde", "connard", "salope", "con"
@@ -385,24 +393,48 @@ class AutoModSystem:
         """Met à jour la config d'un serveur"""
         guild_id = str(guild_id)
         self.config["servers"][guild_id] = new_config
+        self.word_matchers.pop((guild_id, True), None)
+        self.word_matchers.pop((guild_id, False), None)
+        self.exemptions.invalidate(guild_id)
         self.save_config()
     
+    def get_word_matcher(self, guild_id: int, config: dict, advanced: bool = True) -> WordMatcher:
+        """Automate de filtrage du serveur, compilé une seule fois par config"""
+        key = (str(guild_id), advanced)
+        matcher = self.word_matchers.get(key)
+        if matcher is None:
+            word_filter = config["word_filter"]
+            if advanced:
+                levels = {level: word_filter.get(f"level_{level}_words", []) for level in (1, 2, 3, 4)}
+            else:
+                levels = {1: word_filter.get("words", [])}
+            matcher = WordMatcher(levels, word_filter.get("word_boundary", False))
+            self.word_matchers[key] = matcher
+        return matcher
+
+    def _load_exemptions(self, guild_id):
+        """Rôles et salons exempts d'un serveur, en frozensets"""
+        config = self.get_server_config(guild_id)
+        return (
+            frozenset(config.get("exempt_roles", [])),
+            frozenset(config.get("exempt_channels", []))
+        )
+    
     async def is_exempt(self, message: discord.Message) -> bool:
         """Vérifie si l'utilisateur/salon est exempt"""
-        config = self.get_server_config(message.guild.id)
+        exempt_roles, exempt_channels = self.exemptions.get(message.guild.id)
         
         # Vérification des rôles exempts
         if message.author.guild_permissions.administrator:
             return True
-            
-        user_role_ids = [role.id for role in message.author.roles]
-        if any(role_id in config["exempt_roles"] for role_id in user_role_ids):
+        
+        if exempt_roles and not exempt_roles.isdisjoint(role.id for role in message.author.roles):
             return True
-            
+        
         # Vérification des salons exempts
-        if message.channel.id in config["exempt_channels"]:
+        if message.channel.id in exempt_channels:
             return True
-            
+        
         return False
     
     async def log_action(self, guild: discord.Guild, action: str, user: discord.Member, reason: str, details: str = ""):
@@ -493,58 +525,37 @@ class AutoModSystem:
         if not config["spam_detection"]["enabled"]:
             return False
         
-        user_id = message.author.id
-        current_time = time.time()
-        
-        # Initialiser l'historique utilisateur
-        if user_id not in self.user_message_history:
-            self.user_message_history[user_id] = []
+        # Empreinte du contenu pour compter les doublons dans la fenêtre
+        content = message.content.lower().strip()
+        fingerprint = hash(content) if content else None
         
-        # Ajouter le message actuel
-        self.user_message_history[user_id].append({
-            "time": current_time,
-            "content": message.content,
-            "channel": message.channel.id
-        })
-        
-        # Nettoyer les anciens messages
         time_window = config["spam_detection"]["time_window"]
-        self.user_message_history[user_id] = [
-            msg for msg in self.user_message_history[user_id]
-            if current_time - msg["time"] <= time_window
-        ]
-        
-        recent_messages = self.user_message_history[user_id]
+        message_count, duplicate_count = self.user_message_history.hit(
+            (message.guild.id, message.author.id), fingerprint, window=time_window
+        )
         
         # Vérifier le nombre de messages
-        if len(recent_messages) > config["spam_detection"]["max_messages"]:
+        if message_count > config["spam_detection"]["max_messages"]:
             await self.apply_sanction(
-                message, 
+                message,
                 config["spam_detection"]["action"],
-                f"Spam détecté ({len(recent_messages)} messages en {time_window}s)",
+                f"Spam détecté ({message_count} messages en {time_window}s)",
                 config["spam_detection"]["duration"]
             )
             return True
         
         # Vérifier les doublons
-        content_count = {}
-        for msg in recent_messages:
-            content = msg["content"].lower().strip()
-            content_count[content] = content_count.get(content, 0) + 1
-        
-        max_duplicates = config["spam_detection"]["max_duplicates"]
-        for content, count in content_count.items():
-            if count > max_duplicates and content:
-                await self.apply_sanction(
-                    message,
-                    config["spam_detection"]["action"],
-                    f"Messages identiques répétés ({count} fois)",
-                    config["spam_detection"]["duration"]
-                )
-                return True
+        if duplicate_count > config["spam_detection"]["max_duplicates"]:
+            await self.apply_sanction(
+                message,
+                config["spam_detection"]["action"],
+                f"Messages identiques répétés ({duplicate_count} fois)",
+                config["spam_detection"]["duration"]
+            )
+            return True
         
         return False
-    
+
     async def check_word_filter(self, message: discord.Message) -> bool:
         """Filtre les mots interdits avec système avancé par niveaux"""
         config = self.get_server_config(message.guild.id)
@@ -558,93 +569,88 @@ class AutoModSystem:
             return await self.check_advanced_word_filter(message, config, content)
         
         # Ancien système basique (fallback)
-        forbidden_words = config["word_filter"]["words"]
+        hit = self.get_word_matcher(message.guild.id, config, advanced=False).find(message.content)
         
-        for word in forbidden_words:
-            if word.lower() in content:
-                if config["word_filter"]["auto_delete"]:
-                    await self.apply_sanction(message, "delete", f"Mot interdit détecté: {word}")
-                
-                await self.apply_sanction(
-                    message,
-                    config["word_filter"]["action"],
-                    f"Utilisation de mot interdit: {word}"
-                )
-                return True
+        if hit:
+            _, word = hit
+            if config["word_filter"]["auto_delete"]:
+                await self.apply_sanction(message, "delete", f"Mot interdit détecté: {word}")
+            
+            await self.apply_sanction(
+                message,
+                config["word_filter"]["action"],
+                f"Utilisation de mot interdit: {word}"
+            )
+            return True
         
         return False
-    
+
     async def check_advanced_word_filter(self, message: discord.Message, config: dict, content: str) -> bool:
         """Système de filtrage avancé par niveaux de gravité"""
         
+        # Une seule passe : le niveau le plus grave l'emporte
+        hit = self.get_word_matcher(message.guild.id, config).find(message.content)
+        if not hit:
+            return False
+        
+        level, word = hit
+        
         # Niveau 4 - Haine raciale/Extrême (priorité maximale)
-        level_4_words = config["word_filter"].get("level_4_words", [])
-        for word in level_4_words:
-            if word.lower() in content:
-                if config["word_filter"]["auto_delete"]:
-                    await self.apply_sanction(message, "delete", f"Contenu haineux détecté")
-                
-                # Timeout 2 heures + log spécial
-                duration = config["word_filter"].get("level_4_duration", 7200)
-                await self.apply_sanction(
-                    message,
-                    config["word_filter"]["level_4_action"],
-                    f"🚨 Contenu haineux/raciste détecté (Niveau 4)",
-                    duration
-                )
-                
-                # Log spécial pour le niveau 4
-                await self.log_hate_speech(message, word, "Niveau 4 - Haine raciale/Extrême")
-                return True
+        if level == 4:
+            if config["word_filter"]["auto_delete"]:
+                await self.apply_sanction(message, "delete", f"Contenu haineux détecté")
+            
+            # Timeout 2 heures + log spécial
+            duration = config["word_filter"].get("level_4_duration", 7200)
+            await self.apply_sanction(
+                message,
+                config["word_filter"]["level_4_action"],
+                f"🚨 Contenu haineux/raciste détecté (Niveau 4)",
+                duration
+            )
+            
+            # Log spécial pour le niveau 4
+            await self.log_hate_speech(message, word, "Niveau 4 - Haine raciale/Extrême")
         
         # Niveau 3 - Vulgarités sexuelles
-        level_3_words = config["word_filter"].get("level_3_words", [])
-        for word in level_3_words:
-            if word.lower() in content:
-                if config["word_filter"]["auto_delete"]:
-                    await self.apply_sanction(message, "delete", f"Contenu sexuel détecté")
-                
-                duration = config["word_filter"].get("level_3_duration", 1800)  # 30 min
-                await self.apply_sanction(
-                    message,
-                    config["word_filter"]["level_3_action"],
-                    f"⚠️ Vulgarité sexuelle détectée (Niveau 3)",
-                    duration
-                )
-                return True
+        elif level == 3:
+            if config["word_filter"]["auto_delete"]:
+                await self.apply_sanction(message, "delete", f"Contenu sexuel détecté")
+            
+            duration = config["word_filter"].get("level_3_duration", 1800)  # 30 min
+            await self.apply_sanction(
+                message,
+                config["word_filter"]["level_3_action"],
+                f"⚠️ Vulgarité sexuelle détectée (Niveau 3)",
+                duration
+            )
         
         # Niveau 2 - Insultes offensantes
-        level_2_words = config["word_filter"].get("level_2_words", [])
-        for word in level_2_words:
-            if word.lower() in content:
-                if config["word_filter"]["auto_delete"]:
-                    await self.apply_sanction(message, "delete", f"Insulte détectée")
-                
-                duration = config["word_filter"].get("level_2_duration", 300)  # 5 min
-                await self.apply_sanction(
-                    message,
-                    config["word_filter"]["level_2_action"],
-                    f"💢 Insulte offensante détectée (Niveau 2)",
-                    duration
-                )
-                return True
+        elif level == 2:
+            if config["word_filter"]["auto_delete"]:
+                await self.apply_sanction(message, "delete", f"Insulte détectée")
+            
+            duration = config["word_filter"].get("level_2_duration", 300)  # 5 min
+            await self.apply_sanction(
+                message,
+                config["word_filter"]["level_2_action"],
+                f"💢 Insulte offensante détectée (Niveau 2)",
+                duration
+            )
         
         # Niveau 1 - Grossièretés légères
-        level_1_words = config["word_filter"].get("level_1_words", [])
-        for word in level_1_words:
-            if word.lower() in content:
-                if config["word_filter"]["auto_delete"]:
-                    await self.apply_sanction(message, "delete", f"Grossièreté détectée")
-                
-                await self.apply_sanction(
-                    message,
-                    config["word_filter"]["level_1_action"],
-                    f"😠 Grossièreté détectée (Niveau 1)"
-                )
-                return True
+        else:
+            if config["word_filter"]["auto_delete"]:
+                await self.apply_sanction(message, "delete", f"Grossièreté détectée")
+            
+            await self.apply_sanction(
+                message,
+                config["word_filter"]["level_1_action"],
+                f"😠 Grossièreté détectée (Niveau 1)"
+            )
         
-        return False
-    
+        return True
+
     async def log_hate_speech(self, message: discord.Message, word: str, level: str):
         """Log spécial pour les contenus haineux (Niveau 4)"""
         config = self.get_server_config(message.guild.id)
@@ -1335,38 +1341,38 @@ async def test_filter(interaction: discord.Interaction, text: str):
         await interaction.response.send_message("❌ Le filtrage est désactivé sur ce serveur", ephemeral=True)
         return
     
-    content = text.lower()
     detected_words = []
     
     # Test des niveaux
     levels = [
-        (4, "level_4_words", "🚨 Haine raciale/Extrême"),
-        (3, "level_3_words", "⚠️ Vulgarités sexuelles"),  
-        (2, "level_2_words", "💢 Insultes offensantes"),
-        (1, "level_1_words", "😠 Grossièretés légères")
+        (4, "🚨 Haine raciale/Extrême"),
+        (3, "⚠️ Vulgarités sexuelles"),
+        (2, "💢 Insultes offensantes"),
+        (1, "😠 Grossièretés légères")
     ]
     
-    for level_num, words_key, level_name in levels:
-        words_list = config["word_filter"].get(words_key, [])
-        for word in words_list:
-            if word.lower() in content:
-                action = config["word_filter"].get(f"level_{level_num}_action", "warn")
-                duration = config["word_filter"].get(f"level_{level_num}_duration", 0)
-                
-                if duration > 0:
-                    if duration >= 3600:
-                        duration_str = f"{duration//3600}h{(duration%3600)//60:02d}min"
-                    elif duration >= 60:
-                        duration_str = f"{duration//60}min{duration%60:02d}s"
-                    else:
-                        duration_str = f"{duration}s"
-                    sanction_str = f"{action} ({duration_str})"
-                else:
-                    sanction_str = action
-                
-                detected_words.append(f"{level_name}: `{word}` → {sanction_str}")
-                break  # Une seule détection par niveau pour éviter le spam
+    # Une seule détection par niveau pour éviter le spam
+    found = automod.get_word_matcher(interaction.guild.id, config).find_by_level(text)
     
+    for level_num, level_name in levels:
+        word = found.get(level_num)
+        if word:
+            action = config["word_filter"].get(f"level_{level_num}_action", "warn")
+            duration = config["word_filter"].get(f"level_{level_num}_duration", 0)
+            
+            if duration > 0:
+                if duration >= 3600:
+                    duration_str = f"{duration//3600}h{(duration%3600)//60:02d}min"
+                elif duration >= 60:
+                    duration_str = f"{duration//60}min{duration%60:02d}s"
+                else:
+                    duration_str = f"{duration}s"
+                sanction_str = f"{action} ({duration_str})"
+            else:
+                sanction_str = action
+            
+            detected_words.append(f"{level_name}: `{word}` → {sanction_str}")
+
     if detected_words:
         embed = discord.Embed(
             title="🔍 Test Filtrage - Détections",
@@ -1416,28 +1422,11 @@ class AutoModCog(commands.Cog):
         if not config["raid_protection"]["enabled"]:
             return
         
-        # Initialiser le compteur de raid
-        current_time = time.time()
-        guild_id = str(member.guild.id)
-        
-        if not hasattr(self.automod, 'raid_tracker'):
-            self.automod.raid_tracker = {}
-        
-        if guild_id not in self.automod.raid_tracker:
-            self.automod.raid_tracker[guild_id] = []
-        
-        # Ajouter la nouvelle arrivée
-        self.automod.raid_tracker[guild_id].append(current_time)
-        
-        # Nettoyer les anciennes entrées
+        # Ajouter la nouvelle arrivée dans la fenêtre glissante du serveur
         time_window = config["raid_protection"]["time_window"]
-        self.automod.raid_tracker[guild_id] = [
-            join_time for join_time in self.automod.raid_tracker[guild_id]
-            if current_time - join_time <= time_window
-        ]
+        recent_joins, _ = self.automod.raid_tracker.hit(member.guild.id, window=time_window)
         
         # Vérifier si seuil de raid atteint
-        recent_joins = len(self.automod.raid_tracker[guild_id])
         max_joins = config["raid_protection"]["max_joins"]
         
         if recent_joins > max_joins:
@@ -8,7 +8,7 @@ Conversion ArsenalCoins vers cryptos, QR codes, transferts instantanés
 import discord
 from discord.ext import commands
 from discord import app_commands
-import sqlite3
+from modules.sqlite_database import database_manager
 import json
 import asyncio
 import qrcode
@@ -40,7 +40,7 @@ class CryptoSystem:
     def init_database(self):
         """Initialise la base de données crypto"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = database_manager.connect(self.db_path)
             cursor = conn.cursor()
             
             # Table des portefeuilles utilisateurs
@@ -215,7 +215,7 @@ class CryptoSystem:
             }
             
             # Enregistrer en DB
-            conn = sqlite3.connect(self.db_path)
+            conn = database_manager.connect(self.db_path)
             cursor = conn.cursor()
             
             expires_at = datetime.now() + timedelta(hours=self.config["qr_code_expiry_hours"])
@@ -249,7 +249,7 @@ class CryptoSystem:
             }
             
             # Enregistrer en DB
-            conn = sqlite3.connect(self.db_path)
+            conn = database_manager.connect(self.db_path)
             cursor = conn.cursor()
             
             expires_at = datetime.now() + timedelta(hours=1)  # Transferts expirent en 1h
@@ -277,7 +277,7 @@ class CryptoSystem:
     def scan_qr_code(self, qr_id: str, user_id: int) -> Dict:
         """Traite un QR code scanné"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = database_manager.connect(self.db_path)
             cursor = conn.cursor()
             
             # Récupérer le QR code
@@ -334,7 +334,7 @@ class CryptoSystem:
     def claim_instant_transfer(self, transfer_id: int, receiver_id: int) -> Dict:
         """Réclame un transfert instantané"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = database_manager.connect(self.db_path)
             cursor = conn.cursor()
             
             # Récupérer le transfert
@@ -386,7 +386,7 @@ class CryptoSystem:
     def get_user_crypto_stats(self, user_id: int) -> Dict:
         """Statistiques crypto d'un utilisateur"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = database_manager.connect(self.db_path)
             cursor = conn.cursor()
             
             # Portefeuilles
@@ -445,13 +445,10 @@ class CryptoSystem:
     def cleanup_expired_qr_codes(self):
         """Nettoie les QR codes expirés"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = database_manager.connect(self.db_path)
             cursor = conn.cursor()
             
-            # Supprimer les QR codes expirés
-            cursor.execute("DELETE FROM qr_codes WHERE expires_at < datetime('now')")
-            
-            # Marquer les transferts expirés comme annulés
+            # Marquer les transferts expirés comme annulés (avant de supprimer leurs QR codes)
             cursor.execute('''
                 UPDATE instant_transfers 
                 SET status = 'expired' 
@@ -460,6 +457,9 @@ class CryptoSystem:
                 ) AND status = 'pending'
             ''')
             
+            # Supprimer les QR codes expirés
+            cursor.execute("DELETE FROM qr_codes WHERE expires_at < datetime('now')")
+            
             conn.commit()
             conn.close()
             
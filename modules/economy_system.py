@@ -206,9 +206,9 @@ class EconomyLevelManager:
     async def auto_save(self):
         """Auto-sauvegarde toutes les minutes"""
         try:
-            # Force la sauvegarde de la base
+            # Checkpoint non bloquant : FULL attendait la fin de toutes les écritures
             conn = sqlite3.connect(self.db.db_path)
-            conn.execute("PRAGMA wal_checkpoint(FULL)")
+            conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
             conn.close()
             logger.debug("💾 Auto-save economy database completed")
         except Exception as e:
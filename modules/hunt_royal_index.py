@@ -0,0 +1,160 @@
+"""
+🏹 HUNT ROYAL - Index en mémoire des données de jeu
+===================================================
+
+Données statiques (chasseurs, donjons, gemmes) chargées une fois depuis
+SQLite dans des dictionnaires indexés :
+- index de trigrammes nom / identifiant pour la recherche floue
+- index secondaires par élément, tier et type d'arme
+- stats détaillées du scraper (table hunters_detailed) rattachées aux chasseurs
+
+Reconstruit à chaque mise à jour du scraper (voir HuntRoyalDatabase.reload_index).
+"""
+
+import re
+from typing import Dict, List, Optional
+
+from utils.trigram_index import TrigramIndex, normalize
+
+# Ordre des tiers, du plus fort au plus faible
+TIER_ORDER = {tier: rank for rank, tier in enumerate(["S+", "S", "A+", "A", "B+", "B", "C+", "C"])}
+
+# Mots-clés (début de mot, anglais et français) -> élément
+ELEMENT_KEYWORDS = {
+    "fire": "Fire", "flame": "Fire", "burn": "Fire", "feu": "Fire", "brul": "Fire",
+    "water": "Water", "tide": "Water", "eau": "Water",
+    "ice": "Ice", "frost": "Ice", "freez": "Ice", "cold": "Ice", "glace": "Ice", "gel": "Ice",
+    "lightning": "Lightning", "thunder": "Lightning", "electr": "Lightning", "foudre": "Lightning",
+    "holy": "Holy", "divine": "Holy",
+    "nature": "Nature", "poison": "Poison",
+    "earth": "Earth", "terre": "Earth",
+    "shadow": "Shadow", "dark": "Shadow",
+}
+
+_ELEMENT_VALUE = re.compile(r"([A-Za-z]+)\s*(\d+)\s*%")
+
+
+def tier_rank(tier: Optional[str]) -> int:
+    return TIER_ORDER.get(tier, len(TIER_ORDER))
+
+
+def detect_elements(*texts: Optional[str]) -> List[str]:
+    """Éléments cités dans des textes libres ("Fire Damage +30%", "Ice Storm"...)"""
+    found = []
+    for text in texts:
+        for word in normalize(text or "").split():
+            for keyword, element in ELEMENT_KEYWORDS.items():
+                if word.startswith(keyword) and element not in found:
+                    found.append(element)
+    return found
+
+
+def parse_element_values(text: Optional[str]) -> Dict[str, int]:
+    """"Ice 150%, Water 120%" -> {"Ice": 150, "Water": 120}"""
+    values = {}
+    for word, value in _ELEMENT_VALUE.findall(text or ""):
+        element = detect_elements(word)
+        values[element[0] if element else word.capitalize()] = int(value)
+    return values
+
+
+class HuntRoyalGameData:
+    """Chasseurs, donjons et gemmes indexés en mémoire"""
+
+    def __init__(self, hunters: List[Dict], dungeons: List[Dict], gems: List[Dict],
+                 detailed: Optional[List[Dict]] = None):
+        self.hunters: Dict[str, Dict] = {hunter["id"]: hunter for hunter in hunters}
+        self.dungeons: Dict[str, Dict] = {dungeon["id"]: dungeon for dungeon in dungeons}
+        self.gems: Dict[str, Dict] = {gem["id"]: gem for gem in gems}
+        self.detailed: Dict[str, Dict] = {}
+
+        self.hunter_names = TrigramIndex((hunter_id, (hunter["name"], hunter_id)) for hunter_id, hunter in self.hunters.items())
+        self.dungeon_names = TrigramIndex(
+            (dungeon_id, (dungeon["name"], dungeon_id, dungeon.get("boss_name")))
+            for dungeon_id, dungeon in self.dungeons.items()
+        )
+        self.gem_names = TrigramIndex((gem_id, (gem["name"], gem_id)) for gem_id, gem in self.gems.items())
+
+        # Stats du scraper, rattachées au chasseur statique du même nom
+        for row in detailed or []:
+            self.detailed[self.hunter_names.best(row["name"], min_score=1.0) or row["id"]] = row
+
+        self.elements: Dict[str, List[str]] = {}
+        self.by_element: Dict[str, List[str]] = {}
+        self.by_tier: Dict[str, List[str]] = {}
+        self.by_weapon: Dict[str, List[str]] = {}
+        for hunter_id, hunter in self.hunters.items():
+            self.elements[hunter_id] = detect_elements(
+                hunter.get("passive_abilities"), hunter.get("skills"), hunter.get("synergies")
+            )
+            for element in self.elements[hunter_id]:
+                self.by_element.setdefault(element, []).append(hunter_id)
+            self.by_tier.setdefault(hunter.get("tier_meta"), []).append(hunter_id)
+            self.by_weapon.setdefault(normalize(hunter.get("weapon_type") or ""), []).append(hunter_id)
+        for ids in (*self.by_element.values(), *self.by_tier.values(), *self.by_weapon.values()):
+            ids.sort(key=self._strength, reverse=True)
+
+    @classmethod
+    def from_connection(cls, conn) -> "HuntRoyalGameData":
+        """Charge toutes les tables utiles en une passe"""
+        def rows(query: str) -> List[Dict]:
+            cursor = conn.execute(query)
+            columns = [column[0] for column in cursor.description]
+            return [
+                {column: value for column, value in zip(columns, row) if column != "created_at"}
+                for row in cursor.fetchall()
+            ]
+
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        return cls(
+            rows("SELECT * FROM hunters"),
+            rows("SELECT * FROM dungeons"),
+            rows("SELECT * FROM gems"),
+            rows("SELECT * FROM hunters_detailed") if "hunters_detailed" in tables else None,
+        )
+
+    def _strength(self, hunter_id: str):
+        hunter = self.hunters[hunter_id]
+        return (-tier_rank(hunter.get("tier_meta")), hunter.get("attack_base") or 0, hunter.get("popularity") or 0)
+
+    # ==================== RECHERCHE ====================
+
+    def hunter(self, name: str) -> Optional[Dict]:
+        hunter_id = self.hunter_names.best(name)
+        return self.hunters.get(hunter_id) if hunter_id else None
+
+    def dungeon(self, name: str) -> Optional[Dict]:
+        dungeon_id = self.dungeon_names.best(name)
+        return self.dungeons.get(dungeon_id) if dungeon_id else None
+
+    def gem(self, name: str) -> Optional[Dict]:
+        gem_id = self.gem_names.best(name)
+        return self.gems.get(gem_id) if gem_id else None
+
+    def suggest_hunters(self, name: str, limit: int = 3) -> List[str]:
+        """Noms proches (pour « vouliez-vous dire... »)"""
+        return [self.hunters[hunter_id]["name"] for hunter_id, _ in self.hunter_names.search(name, limit=limit, min_score=0.2)]
+
+    def avoided_hunters(self, dungeon: Dict) -> set:
+        """Chasseurs à écarter d'après "avoid_hunters" ("Fire units, Low HP hunters" : éléments ou noms)"""
+        avoided_elements = set(detect_elements(dungeon.get("avoid_hunters")))
+        avoided = {hunter_id for hunter_id, elements in self.elements.items() if avoided_elements.intersection(elements)}
+        for name in (dungeon.get("avoid_hunters") or "").split(","):
+            hunter_id = self.hunter_names.best(name, min_score=0.8)
+            if hunter_id:
+                avoided.add(hunter_id)
+        return avoided
+
+    def hunters_where(self, element: str = None, tier: str = None, weapon: str = None) -> List[Dict]:
+        """Chasseurs filtrés par élément / tier / arme, du plus fort au plus faible"""
+        selected = [
+            ids for ids in (
+                self.by_element.get(element, []) if element else None,
+                self.by_tier.get(tier, []) if tier else None,
+                self.by_weapon.get(normalize(weapon), []) if weapon else None,
+            ) if ids is not None
+        ]
+        if not selected:
+            return [self.hunters[hunter_id] for hunter_id in sorted(self.hunters, key=self._strength, reverse=True)]
+        first, others = selected[0], [set(ids) for ids in selected[1:]]
+        return [self.hunters[hunter_id] for hunter_id in first if all(hunter_id in ids for ids in others)]
@@ -0,0 +1,276 @@
+"""
+🧮 HUNT ROYAL - Optimiseur d'équipes et de builds de gemmes (NumPy)
+===================================================================
+
+Stats des chasseurs et bonus des gemmes rangés dans des tableaux NumPy :
+- équipes : score additif par chasseur (attaque pondérée par les faiblesses /
+  résistances du boss, survie) + bonus par faiblesse du boss couverte ;
+  recherche en profondeur avec séparation-évaluation (branch and bound),
+  le dernier membre de l'équipe étant évalué en un seul calcul vectoriel
+- gemmes : les répartitions des gemmes dans les emplacements armure / arme
+  sont évaluées par blocs vectoriels, avec rendements décroissants par gemme ;
+  au-delà d'un plafond de répartitions les gemmes les moins utiles sont écartées
+
+Les deux renvoient les k meilleurs résultats dans un budget de temps (~200 ms).
+"""
+
+import heapq
+import time
+from functools import lru_cache
+from itertools import combinations_with_replacement, islice
+from math import comb
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from modules.hunt_royal_index import HuntRoyalGameData, detect_elements, parse_element_values
+
+# Poids des types d'effets de gemmes selon l'objectif du build
+FOCUS_WEIGHTS = {
+    "damage": {"damage": 1.0, "speed": 0.8, "special": 0.5, "sustain": 0.3, "defense": 0.3, "health": 0.2, "mobility": 0.2},
+    "tank": {"defense": 1.0, "health": 1.0, "resistance": 0.6, "control": 0.5, "sustain": 0.4, "damage": 0.1},
+    "utility": {"utility": 1.0, "mobility": 0.8, "speed": 0.5, "health": 0.3, "sustain": 0.3},
+}
+
+
+def element_factors(dungeon: Dict) -> Dict[str, float]:
+    """Multiplicateur de dégâts par élément contre le boss ("All" = tous les éléments)"""
+    factors = {element: 1 - value / 100 for element, value in parse_element_values(dungeon.get("resistances")).items()}
+    factors.update({element: value / 100 for element, value in parse_element_values(dungeon.get("weaknesses")).items()})
+    return factors
+
+
+class TeamOptimizer:
+    """Meilleures équipes de `size` chasseurs contre un donjon"""
+
+    DEFENSE_WEIGHT = 0.5   # Poids de la survie face aux dégâts
+    COVERAGE_BONUS = 0.25  # Bonus par faiblesse du boss exploitée par l'équipe
+    BUDGET_SECONDS = 0.2
+
+    def __init__(self, data: HuntRoyalGameData):
+        self.data = data
+        self.ids = list(data.hunters)
+        hunters = [data.hunters[hunter_id] for hunter_id in self.ids]
+        self.attack = np.array([hunter.get("attack_base") or 0 for hunter in hunters], dtype=np.float64)
+        self.survival = np.array(
+            [(hunter.get("health_base") or 0) + 10 * (hunter.get("defense_base") or 0) for hunter in hunters],
+            dtype=np.float64,
+        )
+
+    def _scores(self, dungeon: Optional[Dict]) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """(score additif, masque des faiblesses couvertes, faiblesses) par chasseur"""
+        factors = element_factors(dungeon) if dungeon else {}
+        weaknesses = [element for element, factor in factors.items() if factor > 1]
+        neutral = factors.get("All", 1.0)
+        multiplier = np.array([
+            max((factors.get(element, neutral) for element in self.data.elements[hunter_id]), default=neutral)
+            for hunter_id in self.ids
+        ])
+        masks = np.array([
+            sum(1 << bit for bit, element in enumerate(weaknesses) if element in self.data.elements[hunter_id])
+            for hunter_id in self.ids
+        ], dtype=np.int64)
+
+        offense = self.attack * multiplier
+        scores = offense / max(offense.max(initial=0), 1e-9) + self.DEFENSE_WEIGHT * self.survival / max(self.survival.max(initial=0), 1e-9)
+        return scores, masks, weaknesses
+
+    def best_teams(self, dungeon: Optional[Dict] = None, size: int = 3, top_k: int = 5,
+                   budget: float = None) -> Dict:
+        """{"teams": [(score, [ids])], "exhaustive": bool, "evaluated": int, "elapsed_ms": float}"""
+        start = time.perf_counter()
+        deadline = start + (self.BUDGET_SECONDS if budget is None else budget)
+        scores, masks, weaknesses = self._scores(dungeon)
+        excluded = self.data.avoided_hunters(dungeon) if dungeon else set()
+
+        # Candidats triés par score additif décroissant : les bornes se lisent en tête de tableau
+        candidates = np.array([i for i in range(len(self.ids)) if self.ids[i] not in excluded], dtype=np.int64)
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        a = scores[candidates]
+        m = masks[candidates]
+        n = len(candidates)
+        size = min(size, n)
+        result = {"teams": [], "exhaustive": True, "evaluated": 0, "elapsed_ms": 0.0}
+        if size <= 0:
+            return result
+
+        # suffix_or[i] : faiblesses couvrables par les candidats i..n-1
+        suffix_or = np.zeros(n + 1, dtype=np.int64)
+        for i in range(n - 1, -1, -1):
+            suffix_or[i] = suffix_or[i + 1] | m[i]
+        prefix_sum = np.concatenate(([0.0], np.cumsum(a)))
+        popcount = np.array([bin(mask).count("1") for mask in range(1 << len(weaknesses))], dtype=np.float64)
+        bonus = self.COVERAGE_BONUS
+        heap: List[Tuple[float, Tuple[int, ...]]] = []
+
+        def threshold() -> float:
+            return heap[0][0] if len(heap) >= top_k else -np.inf
+
+        def search(chosen: Tuple[int, ...], total: float, mask: int, start_index: int):
+            remaining = size - len(chosen)
+            if remaining == 1:
+                # Dernier membre : toutes les possibilités en une opération vectorielle
+                team_scores = total + a[start_index:] + bonus * popcount[mask | m[start_index:]]
+                result["evaluated"] += len(team_scores)
+                if len(heap) >= top_k:
+                    keep = np.nonzero(team_scores > heap[0][0])[0]
+                else:
+                    keep = np.arange(len(team_scores))
+                if len(keep) > top_k:
+                    keep = keep[np.argpartition(-team_scores[keep], top_k - 1)[:top_k]]
+                for offset in keep:
+                    entry = (float(team_scores[offset]), chosen + (start_index + int(offset),))
+                    if len(heap) < top_k:
+                        heapq.heappush(heap, entry)
+                    elif entry[0] > heap[0][0]:
+                        heapq.heapreplace(heap, entry)
+                return
+            for i in range(start_index, n - remaining + 1):
+                if time.perf_counter() > deadline:
+                    result["exhaustive"] = False
+                    return
+                # Borne : meilleurs scores restants + toutes les faiblesses encore couvrables
+                bound = total + prefix_sum[i + remaining] - prefix_sum[i] + bonus * popcount[mask | suffix_or[i]]
+                if bound <= threshold():
+                    return  # candidats triés : les suivants ne feront pas mieux
+                search(chosen + (i,), total + a[i], mask | int(m[i]), i + 1)
+
+        search((), 0.0, 0, 0)
+        teams = sorted(heap, key=lambda entry: (-entry[0], entry[1]))
+        result["teams"] = [(score, [self.ids[candidates[i]] for i in team]) for score, team in teams]
+        result["elapsed_ms"] = (time.perf_counter() - start) * 1000
+        return result
+
+
+COMPOSITION_CHUNK = 20_000  # Répartitions évaluées par bloc vectoriel
+
+
+def _iter_compositions(kinds: int, slots: int, chunk: int = COMPOSITION_CHUNK):
+    """Répartitions de `slots` emplacements entre `kinds` gemmes (nombre par gemme), par blocs
+
+    Ordre lexicographique : les premiers blocs concentrent les premières gemmes.
+    """
+    picks_iter = combinations_with_replacement(range(kinds), slots)
+    while True:
+        picks = np.array(list(islice(picks_iter, chunk)), dtype=np.int64).reshape(-1, slots)
+        if len(picks) == 0:
+            return
+        counts = np.zeros((len(picks), kinds), dtype=np.int64)
+        for column in range(slots):
+            counts[np.arange(len(picks)), picks[:, column]] += 1
+        yield counts
+
+
+@lru_cache(maxsize=16)
+def _compositions(kinds: int, slots: int) -> np.ndarray:
+    """Toutes les répartitions d'un coup (petites recherches, mises en cache)"""
+    if kinds == 0:
+        return np.zeros((1, 0), dtype=np.int64)
+    return np.concatenate(list(_iter_compositions(kinds, slots)))
+
+
+class GemBuildOptimizer:
+    """Meilleures répartitions de gemmes dans les emplacements armure et arme"""
+
+    DECAY = 0.85  # Chaque gemme identique supplémentaire vaut 85 % de la précédente
+    MAX_COMPOSITIONS = 500_000  # Répartitions évaluées au plus par côté
+    BUDGET_SECONDS = 0.2
+    UNIT_SCALE = {"%": 100.0, "HP": 2500.0, "DMG": 250.0}  # Ramène les unités à une échelle commune
+
+    def __init__(self, gems: Dict[str, Dict]):
+        self.keys = list(gems)
+        self.gems = gems
+        self.power = np.array([gem.get("power", 0) for gem in gems.values()], dtype=np.float64)
+        self.sides = {}
+        for side in ("armor", "weapon"):
+            effects = [gem.get("effects", {}).get(side, {}) for gem in gems.values()]
+            self.sides[side] = {
+                "types": [effect.get("type") for effect in effects],
+                "values": np.array([self._scaled(effect) for effect in effects], dtype=np.float64),
+                "elements": [detect_elements(effect.get("stat"), effect.get("description")) for effect in effects],
+            }
+
+    def _scaled(self, effect: Dict) -> float:
+        value = effect.get("value", 0)
+        if isinstance(value, str):  # "60%/+20" -> 60
+            digits = "".join(char for char in value.split("/")[0] if char.isdigit() or char == ".")
+            value = float(digits or 0)
+        return float(value) / self.UNIT_SCALE.get(effect.get("unit"), 100.0)
+
+    def _side_weights(self, side: str, weights: Dict[str, float], factors: Dict[str, float]) -> np.ndarray:
+        data = self.sides[side]
+        element_factor = np.array([
+            max((factors.get(element, 1.0) for element in elements), default=1.0) for elements in data["elements"]
+        ])
+        return np.array([weights.get(kind, 0.0) for kind in data["types"]]) * data["values"] * element_factor
+
+    def _best_side(self, weights: np.ndarray, slots: int, top_k: int,
+                   deadline: float) -> Tuple[List[Tuple[float, np.ndarray]], bool]:
+        """Les `top_k` meilleures répartitions d'un côté et si la recherche a été complète"""
+        # Élagage : une gemme sans valeur pour cet objectif n'est jamais placée
+        useful = np.nonzero(weights > 0)[0]
+        if len(useful) == 0 or slots == 0:
+            return [(0.0, np.zeros(len(weights), dtype=np.int64))], True
+
+        # Gemmes les plus utiles en premier ; au-delà du plafond, les moins utiles sont écartées
+        useful = useful[np.argsort(-weights[useful], kind="stable")]
+        exhaustive = True
+        while len(useful) > 1 and comb(len(useful) + slots - 1, slots) > self.MAX_COMPOSITIONS:
+            useful = useful[:-1]
+            exhaustive = False
+
+        gain = (1 - self.DECAY ** np.arange(slots + 1)) / (1 - self.DECAY)
+        if comb(len(useful) + slots - 1, slots) <= COMPOSITION_CHUNK:
+            chunks = [_compositions(len(useful), slots)]
+        else:
+            chunks = _iter_compositions(len(useful), slots)
+        best_scores = np.zeros(0)
+        best_counts = np.zeros((0, len(useful)), dtype=np.int64)
+        for counts in chunks:
+            # Meilleurs résultats gardés d'un bloc à l'autre (tri stable : ordre d'énumération)
+            scores = np.concatenate((best_scores, gain[counts] @ weights[useful]))
+            counts = np.concatenate((best_counts, counts))
+            keep = np.argsort(-scores, kind="stable")[:top_k]
+            best_scores, best_counts = scores[keep], counts[keep]
+            if time.perf_counter() > deadline:
+                exhaustive = False
+                break
+
+        results = []
+        for score, row in zip(best_scores, best_counts):
+            full = np.zeros(len(weights), dtype=np.int64)
+            full[useful] = row
+            results.append((float(score), full))
+        return results, exhaustive
+
+    def best_builds(self, focus_weights: Dict[str, float], armor_slots: int = 9, weapon_slots: int = 6,
+                    top_k: int = 3, dungeon: Optional[Dict] = None, budget: float = None) -> List[Dict]:
+        """Les `top_k` meilleurs builds : {"score", "armor": {clé: n}, "weapon": {clé: n}, "total_power", "exhaustive"}
+
+        Hors budget (temps ou plafond de répartitions), les meilleurs builds trouvés sont
+        renvoyés avec "exhaustive" à False.
+        """
+        deadline = time.perf_counter() + (self.BUDGET_SECONDS if budget is None else budget)
+        factors = element_factors(dungeon) if dungeon else {}
+        armor, armor_done = self._best_side(self._side_weights("armor", focus_weights, factors),
+                                            armor_slots, top_k, deadline)
+        weapon, weapon_done = self._best_side(self._side_weights("weapon", focus_weights, factors),
+                                              weapon_slots, top_k, deadline)
+
+        # Armure et arme sont indépendantes : les k meilleurs couples sont parmi les k x k
+        pairs = sorted(
+            ((armor_score + weapon_score, i, j) for i, (armor_score, _) in enumerate(armor)
+             for j, (weapon_score, _) in enumerate(weapon)),
+            key=lambda pair: -pair[0],
+        )[:top_k]
+        builds = []
+        for score, i, j in pairs:
+            armor_counts, weapon_counts = armor[i][1], weapon[j][1]
+            builds.append({
+                "score": round(score, 3),
+                "armor": {self.keys[g]: int(count) for g, count in enumerate(armor_counts) if count},
+                "weapon": {self.keys[g]: int(count) for g, count in enumerate(weapon_counts) if count},
+                "total_power": int(self.power @ (armor_counts + weapon_counts)),
+                "exhaustive": armor_done and weapon_done,
+            })
+        return builds
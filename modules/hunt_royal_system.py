@@ -14,7 +14,7 @@ Créé par Arsenal Bot V4 - Hunt Royal Expert System avec auto-update
 
 import json
 import os
-import sqlite3
+from modules.sqlite_database import database_manager
 import discord
 from discord.ext import commands
 from datetime import datetime, timedelta
@@ -24,6 +24,7 @@ from typing import Dict, List, Optional, Union
 import importlib
 import sys
 from pathlib import Path
+from modules.hunt_royal_index import HuntRoyalGameData, parse_element_values
 
 # Import du scraper Hunt Royal
 try:
@@ -33,17 +34,27 @@ except ImportError:
     SCRAPER_AVAILABLE = False
     print("⚠️ Scraper Hunt Royal non disponible, utilisation des données statiques")
 
+# Optimiseur d'équipes (NumPy)
+try:
+    from modules.hunt_royal_optimizer import TeamOptimizer
+    OPTIMIZER_AVAILABLE = True
+except ImportError:
+    OPTIMIZER_AVAILABLE = False
+    print("⚠️ NumPy non disponible, recommandations d'équipe simplifiées")
+
 class HuntRoyalDatabase:
     """Base de données Hunt Royal avec toutes les informations complètes"""
     
     def __init__(self, db_path: str = "hunt_royal.db"):
         self.db_path = db_path
+        self.data: Optional[HuntRoyalGameData] = None
         self.init_database()
         self.load_complete_data()
+        self.reload_index()
     
     def init_database(self):
         """Initialiser toutes les tables Hunt Royal"""
-        conn = sqlite3.connect(self.db_path)
+        conn = database_manager.connect(self.db_path)
         cursor = conn.cursor()
         
         # Table des chasseurs
@@ -635,7 +646,7 @@ class HuntRoyalDatabase:
         ]
         
         # Insérer toutes les données
-        conn = sqlite3.connect(self.db_path)
+        conn = database_manager.connect(self.db_path)
         cursor = conn.cursor()
         
         # Insérer chasseurs
@@ -693,144 +704,35 @@ class HuntRoyalDatabase:
         conn.close()
         print("✅ Données Hunt Royal chargées")
 
+    def reload_index(self):
+        """Recharger l'index en mémoire (démarrage, reload, mise à jour du scraper)"""
+        conn = database_manager.connect(self.db_path)
+        try:
+            self.data = HuntRoyalGameData.from_connection(conn)
+        finally:
+            conn.close()
+        print(f"✅ Index Hunt Royal : {len(self.data.hunters)} chasseurs, {len(self.data.dungeons)} donjons, "
+              f"{len(self.data.gems)} gemmes, {len(self.data.detailed)} fiches détaillées")
+    
     def get_all_hunters(self):
-        """Récupérer tous les chasseurs de la base de données"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM hunters ORDER BY tier_meta, name')
-        hunters_raw = cursor.fetchall()
-        conn.close()
-        
-        hunters = []
-        for hunter in hunters_raw:
-            hunters.append({
-                'id': hunter[0],
-                'name': hunter[1],
-                'cost_type': hunter[2],
-                'cost_amount': hunter[3],
-                'tier_meta': hunter[4],
-                'weapon_type': hunter[5],
-                'attack_base': hunter[6],
-                'health_base': hunter[7],
-                'defense_base': hunter[8],
-                'speed_base': hunter[9],
-                'description': hunter[10],
-                'skills': hunter[11],
-                'passive_abilities': hunter[12],
-                'awakening_cost': hunter[13],
-                'best_equipment': hunter[14],
-                'counters': hunter[15],
-                'synergies': hunter[16],
-                'popularity': hunter[17]
-            })
-        
-        return hunters
+        """Récupérer tous les chasseurs (triés par tier puis par nom)"""
+        hunters = sorted(self.data.hunters.values(), key=lambda hunter: (hunter['tier_meta'] or '', hunter['name']))
+        return [dict(hunter) for hunter in hunters]
 
     def get_hunter_by_name(self, name: str):
-        """Rechercher un chasseur par nom"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT * FROM hunters 
-            WHERE LOWER(name) LIKE LOWER(?) OR LOWER(id) LIKE LOWER(?)
-        ''', (f'%{name}%', f'%{name}%'))
-        
-        hunter_raw = cursor.fetchone()
-        conn.close()
-        
-        if not hunter_raw:
-            return None
-            
-        return {
-            'id': hunter_raw[0],
-            'name': hunter_raw[1],
-            'cost_type': hunter_raw[2],
-            'cost_amount': hunter_raw[3],
-            'tier_meta': hunter_raw[4],
-            'weapon_type': hunter_raw[5],
-            'attack_base': hunter_raw[6],
-            'health_base': hunter_raw[7],
-            'defense_base': hunter_raw[8],
-            'speed_base': hunter_raw[9],
-            'description': hunter_raw[10],
-            'skills': hunter_raw[11],
-            'passive_abilities': hunter_raw[12],
-            'awakening_cost': hunter_raw[13],
-            'best_equipment': hunter_raw[14],
-            'counters': hunter_raw[15],
-            'synergies': hunter_raw[16],
-            'popularity': hunter_raw[17]
-        }
+        """Rechercher un chasseur par nom (recherche floue)"""
+        hunter = self.data.hunter(name)
+        return dict(hunter) if hunter else None
 
     def get_dungeon_by_name(self, name: str):
-        """Rechercher un donjon par nom"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT * FROM dungeons 
-            WHERE LOWER(name) LIKE LOWER(?) OR LOWER(id) LIKE LOWER(?)
-        ''', (f'%{name}%', f'%{name}%'))
-        
-        dungeon_raw = cursor.fetchone()
-        conn.close()
-        
-        if not dungeon_raw:
-            return None
-            
-        return {
-            'id': dungeon_raw[0],
-            'name': dungeon_raw[1],
-            'type': dungeon_raw[2],
-            'difficulty': dungeon_raw[3],
-            'recommended_level': dungeon_raw[4],
-            'boss_name': dungeon_raw[5],
-            'boss_hp': dungeon_raw[6],
-            'boss_elements': dungeon_raw[7],
-            'resistances': dungeon_raw[8],
-            'weaknesses': dungeon_raw[9],
-            'rewards': dungeon_raw[10],
-            'strategy': dungeon_raw[11],
-            'best_hunters': dungeon_raw[12],
-            'avoid_hunters': dungeon_raw[13],
-            'modifiers': dungeon_raw[14],
-            'energy_cost': dungeon_raw[15],
-            'duration_minutes': dungeon_raw[16]
-        }
+        """Rechercher un donjon par nom (recherche floue)"""
+        dungeon = self.data.dungeon(name)
+        return dict(dungeon) if dungeon else None
 
     def get_gem_by_name(self, name: str):
-        """Rechercher une gemme par nom"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT * FROM gems 
-            WHERE LOWER(name) LIKE LOWER(?) OR LOWER(id) LIKE LOWER(?)
-        ''', (f'%{name}%', f'%{name}%'))
-        
-        gem_raw = cursor.fetchone()
-        conn.close()
-        
-        if not gem_raw:
-            return None
-            
-        return {
-            'id': gem_raw[0],
-            'name': gem_raw[1],
-            'type': gem_raw[2],
-            'rarity': gem_raw[3],
-            'level_max': gem_raw[4],
-            'primary_stat': gem_raw[5],
-            'primary_value': gem_raw[6],
-            'secondary_stats': gem_raw[7],
-            'special_effects': gem_raw[8],
-            'upgrade_cost': gem_raw[9],
-            'drop_sources': gem_raw[10],
-            'tier_rating': gem_raw[11],
-            'best_combinations': gem_raw[12]
-        }
+        """Rechercher une gemme par nom (recherche floue)"""
+        gem = self.data.gem(name)
+        return dict(gem) if gem else None
 
 class HuntRoyalSuggestions:
     """Système de suggestions avancé pour Hunt Royal"""
@@ -840,7 +742,7 @@ class HuntRoyalSuggestions:
         
     async def create_suggestion(self, user_id: str, username: str, title: str, description: str, category: str = "general"):
         """Créer une nouvelle suggestion"""
-        conn = sqlite3.connect(self.db.db_path)
+        conn = database_manager.connect(self.db.db_path)
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -856,7 +758,7 @@ class HuntRoyalSuggestions:
     
     async def vote_suggestion(self, suggestion_id: int, user_id: str, vote_type: str):
         """Voter sur une suggestion"""
-        conn = sqlite3.connect(self.db.db_path)
+        conn = database_manager.connect(self.db.db_path)
         cursor = conn.cursor()
         
         # Vérifier si l'utilisateur a déjà voté
@@ -901,7 +803,7 @@ class HuntRoyalSuggestions:
     
     async def get_suggestions(self, status: str = 'pending', limit: int = 10):
         """Récupérer les suggestions"""
-        conn = sqlite3.connect(self.db.db_path)
+        conn = database_manager.connect(self.db.db_path)
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -921,14 +823,21 @@ class HuntRoyalAnalyzer:
     
     def __init__(self, db: HuntRoyalDatabase):
         self.db = db
+        self._optimizer = None
+    
+    def _team_optimizer(self):
+        """Optimiseur reconstruit quand l'index est rechargé"""
+        if self._optimizer is None or self._optimizer.data is not self.db.data:
+            self._optimizer = TeamOptimizer(self.db.data)
+        return self._optimizer
     
     async def analyze_team_composition(self, hunters: List[str]):
-        """Analyser une composition d'équipe"""
-        conn = sqlite3.connect(self.db.db_path)
-        cursor = conn.cursor()
+        """Analyser une composition d'équipe (noms ou identifiants, recherche floue)"""
+        data = self.db.data
         
         team_analysis = {
             "hunters": [],
+            "unknown": [],
             "elements": {},
             "weapon_types": {},
             "total_stats": {"attack": 0, "health": 0, "defense": 0, "speed": 0},
@@ -937,26 +846,34 @@ class HuntRoyalAnalyzer:
             "recommendations": []
         }
         
-        for hunter_id in hunters:
-            cursor.execute('SELECT * FROM hunters WHERE id = ?', (hunter_id,))
-            hunter = cursor.fetchone()
+        members = []
+        for name in hunters:
+            hunter = data.hunter(name)
+            if not hunter:
+                team_analysis["unknown"].append(name)
+                continue
+            members.append(hunter)
+            team_analysis["hunters"].append(dict(hunter))
             
-            if hunter:
-                team_analysis["hunters"].append(hunter)
-                
-                # Compter éléments
-                element = hunter[3]  # element column
+            # Compter éléments
+            for element in data.elements[hunter["id"]]:
                 team_analysis["elements"][element] = team_analysis["elements"].get(element, 0) + 1
-                
-                # Compter types d'armes
-                weapon = hunter[4]  # weapon_type column
-                team_analysis["weapon_types"][weapon] = team_analysis["weapon_types"].get(weapon, 0) + 1
-                
-                # Additionner stats
-                team_analysis["total_stats"]["attack"] += hunter[5]  # attack_base
-                team_analysis["total_stats"]["health"] += hunter[6]  # health_base
-                team_analysis["total_stats"]["defense"] += hunter[7]  # defense_base
-                team_analysis["total_stats"]["speed"] += hunter[8]  # speed_base
+            
+            # Compter types d'armes
+            weapon = hunter["weapon_type"]
+            team_analysis["weapon_types"][weapon] = team_analysis["weapon_types"].get(weapon, 0) + 1
+            
+            # Additionner stats
+            team_analysis["total_stats"]["attack"] += hunter["attack_base"] or 0
+            team_analysis["total_stats"]["health"] += hunter["health_base"] or 0
+            team_analysis["total_stats"]["defense"] += hunter["defense_base"] or 0
+            team_analysis["total_stats"]["speed"] += hunter["speed_base"] or 0
+        
+        # Synergies élémentaires
+        for element, count in team_analysis["elements"].items():
+            if count >= 2:
+                names = [hunter["name"] for hunter in members if element in data.elements[hunter["id"]]]
+                team_analysis["synergies"].append(f"{element} : {', '.join(names)}")
         
         # Analyser équilibre
         if len(team_analysis["elements"]) < 2:
@@ -968,46 +885,62 @@ class HuntRoyalAnalyzer:
         if team_analysis["total_stats"]["attack"] < 3000:
             team_analysis["recommendations"].append("Augmenter le DPS de l'équipe")
         
-        conn.close()
         return team_analysis
     
-    async def recommend_dungeon_team(self, dungeon_id: str):
-        """Recommander une équipe pour un donjon spécifique"""
-        conn = sqlite3.connect(self.db.db_path)
-        cursor = conn.cursor()
+    async def recommend_dungeon_team(self, dungeon_id: str, size: int = 3, top_k: int = 3):
+        """Recommander une équipe pour un donjon spécifique (identifiant ou nom)"""
+        data = self.db.data
         
         # Récupérer info du donjon
-        cursor.execute('SELECT * FROM dungeons WHERE id = ?', (dungeon_id,))
-        dungeon = cursor.fetchone()
-        
+        dungeon = data.dungeons.get(dungeon_id) or data.dungeon(dungeon_id)
         if not dungeon:
             return None
         
-        boss_elements = dungeon[7].split(', ') if dungeon[7] else []  # boss_elements
-        resistances = dungeon[8]  # resistances
-        weaknesses = dungeon[9]  # weaknesses
-        
-        # Recommander chasseurs selon les faiblesses du boss
+        resistances = parse_element_values(dungeon["resistances"])
         recommendations = {
-            "dungeon": dungeon,
+            "dungeon": dict(dungeon),
             "recommended_hunters": [],
-            "strategy": dungeon[11],  # strategy
+            "alternatives": [],
+            "strategy": dungeon["strategy"],
             "warnings": []
         }
         
-        # Analyser faiblesses pour recommander éléments
-        if "Holy" in weaknesses:
-            cursor.execute("SELECT * FROM hunters WHERE element = 'Holy' ORDER BY tier_rating DESC LIMIT 3")
-            holy_hunters = cursor.fetchall()
-            recommendations["recommended_hunters"].extend(holy_hunters)
-        
-        if "Water" in weaknesses:
-            cursor.execute("SELECT * FROM hunters WHERE element = 'Water' ORDER BY tier_rating DESC LIMIT 3")
-            water_hunters = cursor.fetchall()
-            recommendations["recommended_hunters"].extend(water_hunters)
+        if OPTIMIZER_AVAILABLE:
+            search = self._team_optimizer().best_teams(dungeon, size=size, top_k=top_k)
+            teams = [team for _, team in search["teams"]]
+            picked = teams[0] if teams else []
+            recommendations["alternatives"] = [[dict(data.hunters[hunter_id]) for hunter_id in team] for team in teams[1:]]
+        else:
+            picked = self._greedy_team(dungeon, resistances, size)
+        recommendations["recommended_hunters"] = [dict(data.hunters[hunter_id]) for hunter_id in picked]
+        
+        for hunter_id in picked:
+            resisted = [element for element in data.elements[hunter_id] if element in resistances]
+            if resisted:
+                recommendations["warnings"].append(
+                    f"{data.hunters[hunter_id]['name']} : le boss résiste à {', '.join(resisted)}"
+                )
         
-        conn.close()
         return recommendations
+    
+    def _greedy_team(self, dungeon: Dict, resistances: Dict[str, int], size: int) -> List[str]:
+        """Équipe sans NumPy : éléments efficaces contre le boss, puis les plus forts"""
+        data = self.db.data
+        weaknesses = parse_element_values(dungeon["weaknesses"])
+        avoid = data.avoided_hunters(dungeon)
+        
+        picked = []
+        for element, _ in sorted(weaknesses.items(), key=lambda item: -item[1]):
+            for hunter in data.hunters_where(element=element):
+                if hunter["id"] not in avoid and hunter["id"] not in picked and len(picked) < size:
+                    picked.append(hunter["id"])
+        for hunter in data.hunters_where():
+            if len(picked) >= size:
+                break
+            resisted = any(element in resistances for element in data.elements[hunter["id"]])
+            if hunter["id"] not in avoid and hunter["id"] not in picked and not resisted:
+                picked.append(hunter["id"])
+        return picked
 
 class HuntRoyalCommands(commands.Cog):
     """Commandes Hunt Royal pour Discord Bot avec auto-update"""
@@ -1026,10 +959,14 @@ class HuntRoyalCommands(commands.Cog):
     async def _init_scraper(self):
         """Initialiser le système de scraping de manière asynchrone"""
         try:
-            self.scraper_updater = await setup_hunt_royal_scraper(self.db.db_path)
+            self.scraper_updater = await setup_hunt_royal_scraper(self.db.db_path, on_update=self._on_data_update)
             print("✅ Scraper Hunt Royal initialisé")
         except Exception as e:
             print(f"⚠️ Erreur initialisation scraper : {e}")
+    
+    async def _on_data_update(self, result: Dict[str, int]):
+        """Le scraper a écrit de nouvelles données : reconstruire l'index en mémoire"""
+        await asyncio.to_thread(self.db.reload_index)
 
     @commands.group(name='hunt', invoke_without_command=True)
     async def hunt_royal(self, ctx):
@@ -1142,9 +1079,10 @@ class HuntRoyalCommands(commands.Cog):
         estimated_hp = int(hunter['health_base'] * level_multiplier)
         estimated_attack = int(hunter['attack_base'] * level_multiplier)
         
+        elements = ", ".join(self.db.data.elements[hunter['id']]) or "Neutre"
         embed = discord.Embed(
             title=f"📊 {hunter['name']} - Niveau {level} (Estimé)",
-            description=f"**Élément:** {hunter['element']} | **Arme:** {hunter['weapon_type']}",
+            description=f"**Élément:** {elements} | **Arme:** {hunter['weapon_type']}",
             color=0xffa500
         )
         
@@ -1397,21 +1335,14 @@ class HuntRoyalCommands(commands.Cog):
     @hunt_royal.command(name='hunter')
     async def hunt_hunter_info(self, ctx, *, hunter_name: str):
         """Informations détaillées sur un chasseur"""
-        conn = sqlite3.connect(self.db.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT * FROM hunters 
-            WHERE LOWER(name) LIKE LOWER(?) OR LOWER(id) LIKE LOWER(?)
-        ''', (f'%{hunter_name}%', f'%{hunter_name}%'))
-        
-        hunter = cursor.fetchone()
-        conn.close()
+        hunter = self.db.get_hunter_by_name(hunter_name)
         
         if not hunter:
+            suggestions = self.db.data.suggest_hunters(hunter_name)
             embed = discord.Embed(
                 title="❌ Chasseur non trouvé",
-                description=f"Aucun chasseur trouvé pour : **{hunter_name}**",
+                description=f"Aucun chasseur trouvé pour : **{hunter_name}**"
+                            + (f"\nVouliez-vous dire : {', '.join(suggestions)} ?" if suggestions else ""),
                 color=0xff0000
             )
             await ctx.send(embed=embed)
@@ -1419,41 +1350,41 @@ class HuntRoyalCommands(commands.Cog):
         
         # Créer embed détaillé
         embed = discord.Embed(
-            title=f"🏹 {hunter[1]} ({hunter[2]})",  # name (rarity)
-            description=hunter[9],  # description
-            color=0x00ff00 if hunter[2] == "Legendary" else 0x0099ff
+            title=f"🏹 {hunter['name']} ({hunter['tier_meta']})",
+            description=hunter['description'],
+            color=self._get_cost_color(hunter['cost_type'])
         )
         
         embed.add_field(
             name="⚔️ Stats de Base",
-            value=f"**Attaque:** {hunter[5]}\n"
-                  f"**Santé:** {hunter[6]}\n"
-                  f"**Défense:** {hunter[7]}\n"
-                  f"**Vitesse:** {hunter[8]}",
+            value=f"**Attaque:** {hunter['attack_base']}\n"
+                  f"**Santé:** {hunter['health_base']}\n"
+                  f"**Défense:** {hunter['defense_base']}\n"
+                  f"**Vitesse:** {hunter['speed_base']}",
             inline=True
         )
         
         embed.add_field(
             name="🔮 Capacités",
-            value=f"**Élément:** {hunter[3]}\n"
-                  f"**Arme:** {hunter[4]}\n"
-                  f"**Compétences:** {hunter[10]}\n"
-                  f"**Passif:** {hunter[11]}",
+            value=f"**Élément:** {', '.join(self.db.data.elements[hunter['id']]) or 'Neutre'}\n"
+                  f"**Arme:** {hunter['weapon_type']}\n"
+                  f"**Compétences:** {hunter['skills']}\n"
+                  f"**Passif:** {hunter['passive_abilities']}",
             inline=True
         )
         
         embed.add_field(
             name="⭐ Évaluation",
-            value=f"**Tier:** {hunter[13]}\n"
-                  f"**Éveil:** {hunter[12]}\n"
-                  f"**Meilleur équipement:** {hunter[14]}",
+            value=f"**Tier:** {self._get_tier_emoji(hunter['tier_meta'])} {hunter['tier_meta']}\n"
+                  f"**Éveil:** {hunter['awakening_cost']}\n"
+                  f"**Meilleur équipement:** {hunter['best_equipment']}",
             inline=False
         )
         
         embed.add_field(
             name="🔄 Synergies & Counters",
-            value=f"**Synergies:** {hunter[16]}\n"
-                  f"**Counters:** {hunter[15]}",
+            value=f"**Synergies:** {hunter['synergies']}\n"
+                  f"**Counters:** {hunter['counters']}",
             inline=False
         )
         
@@ -1462,16 +1393,7 @@ class HuntRoyalCommands(commands.Cog):
     @hunt_royal.command(name='dungeon')
     async def hunt_dungeon_info(self, ctx, *, dungeon_name: str):
         """Informations détaillées sur un donjon"""
-        conn = sqlite3.connect(self.db.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT * FROM dungeons 
-            WHERE LOWER(name) LIKE LOWER(?) OR LOWER(id) LIKE LOWER(?)
-        ''', (f'%{dungeon_name}%', f'%{dungeon_name}%'))
-        
-        dungeon = cursor.fetchone()
-        conn.close()
+        dungeon = self.db.get_dungeon_by_name(dungeon_name)
         
         if not dungeon:
             embed = discord.Embed(
@@ -1484,55 +1406,63 @@ class HuntRoyalCommands(commands.Cog):
         
         # Créer embed détaillé
         embed = discord.Embed(
-            title=f"🏰 {dungeon[1]} ({dungeon[3]})",  # name (difficulty)
-            description=f"**Type:** {dungeon[2]} | **Niveau recommandé:** {dungeon[4]}",
-            color=0xff4500 if dungeon[3] == "Hard" else 0xffa500
+            title=f"🏰 {dungeon['name']} ({dungeon['difficulty']})",
+            description=f"**Type:** {dungeon['type']} | **Niveau recommandé:** {dungeon['recommended_level']}",
+            color=0xff4500 if dungeon['difficulty'] == "Hard" else 0xffa500
         )
         
         embed.add_field(
             name="👹 Boss",
-            value=f"**Nom:** {dungeon[5]}\n"
-                  f"**HP:** {dungeon[6]:,}\n"
-                  f"**Éléments:** {dungeon[7]}",
+            value=f"**Nom:** {dungeon['boss_name']}\n"
+                  f"**HP:** {dungeon['boss_hp']:,}\n"
+                  f"**Éléments:** {dungeon['boss_elements']}",
             inline=True
         )
         
         embed.add_field(
             name="🛡️ Résistances/Faiblesses",
-            value=f"**Résistances:** {dungeon[8]}\n"
-                  f"**Faiblesses:** {dungeon[9]}",
+            value=f"**Résistances:** {dungeon['resistances']}\n"
+                  f"**Faiblesses:** {dungeon['weaknesses']}",
             inline=True
         )
         
         embed.add_field(
             name="⚡ Infos Pratiques",
-            value=f"**Énergie:** {dungeon[15]}\n"
-                  f"**Durée:** {dungeon[16]} min\n"
-                  f"**Modificateurs:** {dungeon[14]}",
+            value=f"**Énergie:** {dungeon['energy_cost']}\n"
+                  f"**Durée:** {dungeon['duration_minutes']} min\n"
+                  f"**Modificateurs:** {dungeon['modifiers']}",
             inline=False
         )
         
         embed.add_field(
             name="🎯 Stratégie",
-            value=dungeon[11],
+            value=dungeon['strategy'],
             inline=False
         )
         
         embed.add_field(
             name="✅ Chasseurs Recommandés",
-            value=dungeon[12],
+            value=dungeon['best_hunters'],
             inline=True
         )
         
         embed.add_field(
             name="❌ Chasseurs à Éviter",
-            value=dungeon[13],
+            value=dungeon['avoid_hunters'],
             inline=True
         )
         
+        team = await self.analyzer.recommend_dungeon_team(dungeon['id'])
+        if team and team["recommended_hunters"]:
+            embed.add_field(
+                name="🤖 Équipe Suggérée",
+                value=", ".join(hunter['name'] for hunter in team["recommended_hunters"]),
+                inline=False
+            )
+        
         embed.add_field(
             name="🎁 Récompenses",
-            value=dungeon[10],
+            value=dungeon['rewards'],
             inline=False
         )
         
@@ -1759,6 +1689,7 @@ class HuntRoyalCommands(commands.Cog):
             
             # Recharger la base de données
             self.db.load_complete_data()
+            self.db.reload_index()
             
             embed = discord.Embed(
                 title="✅ Module Hunt Royal rechargé",
@@ -7,12 +7,196 @@ Développé par XeRoX - Arsenal Bot V4.5.0
 import sqlite3
 import os
 import json
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable, Iterable
+import time
 import core.logger as logger
+from core.metrics import metrics
 
 log = logger.log
 
+
+class PooledConnection:
+    """Connexion empruntée au pool - `close()` la rend au pool au lieu de la fermer"""
+
+    def __init__(self, pool: "SQLitePool", conn: sqlite3.Connection):
+        object.__setattr__(self, "_pool", pool)
+        object.__setattr__(self, "_conn", conn)
+        object.__setattr__(self, "_since", time.perf_counter())
+
+    def __getattr__(self, name):
+        conn = object.__getattribute__(self, "_conn")
+        if conn is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        return getattr(conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Même sémantique que sqlite3 : commit/rollback, sans fermeture
+        if exc_type is None:
+            self._conn.commit()
+        else:
+            self._conn.rollback()
+        return False
+
+    def close(self):
+        """Rend la connexion au pool"""
+        conn = object.__getattribute__(self, "_conn")
+        if conn is not None:
+            object.__setattr__(self, "_conn", None)
+            metrics.observe(
+                "arsenal_db_connection_hold_seconds", time.perf_counter() - self._since,
+                "Durée d'emprunt d'une connexion SQLite (requêtes synchrones)", db=self._pool.name
+            )
+            self._pool.release(conn)
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class SQLitePool:
+    """Pool de connexions longue durée (WAL) pour un fichier SQLite"""
+
+    def __init__(self, db_path: str, executor: ThreadPoolExecutor, max_idle: int = 4):
+        self.db_path = db_path
+        self.name = os.path.basename(db_path)
+        self.max_idle = max_idle
+        self._executor = executor
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.statements = 0  # Requêtes exécutées par les connexions du pool
+        metrics.gauge(
+            "arsenal_db_statements_total", lambda: self.statements,
+            "Requêtes SQL exécutées", kind="counter", db=self.name
+        )
+        metrics.gauge("arsenal_db_idle_connections", lambda: len(self._idle), "Connexions SQLite inactives du pool", db=self.name)
+    
+    def _count_statement(self, _statement: str):
+        self.statements += 1
+
+    def _open(self) -> sqlite3.Connection:
+        """Ouvre une nouvelle connexion configurée pour le pool"""
+        # check_same_thread=False : une connexion n'est jamais partagée,
+        # mais elle peut passer du thread de la boucle à un worker
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=30,
+            check_same_thread=False,
+            cached_statements=256
+        )
+        conn.execute("PRAGMA busy_timeout = 5000")
+        if self.db_path != ":memory:":
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+        conn.set_trace_callback(self._count_statement)
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """Emprunte une connexion brute (à rendre avec `release`)"""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._open()
+
+    def release(self, conn: sqlite3.Connection):
+        """Rend une connexion au pool"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = None
+        except sqlite3.Error:
+            conn.close()
+            return
+
+        with self._lock:
+            if not self._closed and len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def connect(self) -> PooledConnection:
+        """Remplaçant direct de `sqlite3.connect(db_path)`"""
+        return PooledConnection(self, self.acquire())
+
+    def close(self):
+        """Ferme toutes les connexions inactives"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+        for conn in idle:
+            conn.close()
+
+    # ==================== API SYNCHRONE ====================
+
+    def run_sync(self, func: Callable, *args):
+        """Exécute `func(conn, *args)` dans une transaction"""
+        conn = self.acquire()
+        start = time.perf_counter()
+        try:
+            result = func(conn, *args)
+            conn.commit()
+            return result
+        except Exception:
+            conn.rollback()
+            metrics.inc("arsenal_db_errors_total", help_text="Transactions SQLite en échec", db=self.name)
+            raise
+        finally:
+            metrics.observe(
+                "arsenal_db_transaction_seconds", time.perf_counter() - start,
+                "Durée des transactions SQLite exécutées via le pool", db=self.name
+            )
+            self.release(conn)
+
+    # ==================== API ASYNCHRONE ====================
+
+    async def run(self, func: Callable, *args):
+        """Exécute `func(conn, *args)` dans une transaction, sur un thread du pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.run_sync, func, *args)
+
+    async def execute(self, query: str, params: Iterable = ()) -> int:
+        """Exécute une écriture et retourne le lastrowid (ou rowcount à défaut)"""
+        def _execute(conn):
+            cursor = conn.execute(query, tuple(params))
+            return cursor.lastrowid or cursor.rowcount
+        return await self.run(_execute)
+
+    async def executemany(self, query: str, seq_of_params: Iterable) -> int:
+        """Exécute une écriture groupée en une seule transaction"""
+        def _executemany(conn):
+            return conn.executemany(query, seq_of_params).rowcount
+        return await self.run(_executemany)
+
+    async def fetchone(self, query: str, params: Iterable = ()) -> Optional[sqlite3.Row]:
+        """Retourne la première ligne (sqlite3.Row) ou None"""
+        def _fetchone(conn):
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            return cursor.execute(query, tuple(params)).fetchone()
+        return await self.run(_fetchone)
+
+    async def fetchall(self, query: str, params: Iterable = ()) -> List[sqlite3.Row]:
+        """Retourne toutes les lignes (sqlite3.Row)"""
+        def _fetchall(conn):
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            return cursor.execute(query, tuple(params)).fetchall()
+        return await self.run(_fetchall)
+
+
 class ArsenalDatabaseManager:
     """Gestionnaire centralisé des bases de données SQLite d'Arsenal"""
     
@@ -28,6 +212,11 @@ class ArsenalDatabaseManager:
         self.coins_db = "arsenal_coins_central.db"
         self.suggestions_db = "suggestions.db"
         
+        # Pools de connexions partagés par fichier de base
+        self._pools: Dict[str, SQLitePool] = {}
+        self._pools_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="arsenal-db")
+        
         self._init_databases()
     
     def _init_databases(self):
@@ -184,13 +373,37 @@ class ArsenalDatabaseManager:
             
             conn.commit()
     
+    def pool(self, db_path: str) -> SQLitePool:
+        """Retourne le pool partagé d'un fichier de base (créé au premier appel)"""
+        key = os.path.abspath(db_path) if db_path != ":memory:" else db_path
+        pool = self._pools.get(key)
+        if pool is None:
+            with self._pools_lock:
+                pool = self._pools.get(key)
+                if pool is None:
+                    pool = SQLitePool(db_path, self._executor)
+                    self._pools[key] = pool
+        return pool
+    
+    def connect(self, db_path: str) -> PooledConnection:
+        """Remplaçant direct de `sqlite3.connect` adossé au pool"""
+        return self.pool(db_path).connect()
+    
+    def close_all(self):
+        """Ferme tous les pools (arrêt du bot)"""
+        with self._pools_lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.close()
+        log.info(f"🗄️ [DATABASE] {len(pools)} pool(s) SQLite fermé(s)")
+    
     def get_connection(self, db_name: str):
         """Obtient une connexion à une base de données"""
         try:
             if not db_name.endswith('.db'):
                 db_name += '.db'
             
-            return sqlite3.connect(db_name)
+            return self.connect(db_name)
         except Exception as e:
             log.error(f"❌ [DATABASE] Erreur connexion {db_name}: {e}")
             return None
@@ -13,13 +13,16 @@ Système complet de gestion des suggestions avec :
 Module rechargeable à chaud
 """
 
-import sqlite3
+from modules.sqlite_database import database_manager
+from core.metrics import metrics
+from utils.rank_index import RankIndex
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 import asyncio
+import math
 from datetime import datetime, timedelta
 import json
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 class SuggestionsDatabase:
     """Base de données pour le système de suggestions"""
@@ -30,7 +33,7 @@ class SuggestionsDatabase:
     
     def init_database(self):
         """Initialiser la base de données des suggestions"""
-        conn = sqlite3.connect(self.db_path)
+        conn = database_manager.connect(self.db_path)
         cursor = conn.cursor()
         
         # Table principale des suggestions
@@ -149,21 +152,177 @@ class SuggestionsDatabase:
                 VALUES (?, ?, ?, ?, ?, ?, ?)
             ''', (cat_id, name, desc, emoji, color, auto_approve, admin_only))
         
+        # Un vote par membre et par suggestion (cible de l'UPSERT des votes)
+        cursor.execute('''
+            DELETE FROM suggestion_votes WHERE id NOT IN (
+                SELECT MAX(id) FROM suggestion_votes GROUP BY suggestion_id, user_id
+            )
+        ''')
+        cursor.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_suggestion_votes_user
+            ON suggestion_votes (suggestion_id, user_id)
+        ''')
+        
         conn.commit()
         conn.close()
         print("✅ Base de données Suggestions initialisée")
 
+def wilson_score(up: int, down: int, z: float = 1.96) -> float:
+    """Borne basse de l'intervalle de Wilson de la part de votes positifs
+    
+    Une suggestion à 40 ⬆️ / 5 ⬇️ passe devant une suggestion à 2 ⬆️ / 0 ⬇️
+    """
+    total = up + down
+    if not total:
+        return 0.0
+    p = up / total
+    z2 = z * z
+    return (p + z2 / (2 * total) - z * math.sqrt((p * (1 - p) + z2 / (4 * total)) / total)) / (1 + z2 / total)
+
+class SuggestionVoteLedger:
+    """Tampon des votes en mémoire (write-behind) et classement maintenu
+    
+    Les votes modifient immédiatement les compteurs en mémoire et le
+    classement (score de Wilson) ; `flush()` écrit le lot en une transaction :
+    un UPSERT par vote modifié et une mise à jour des compteurs par suggestion.
+    L'index des messages permet d'ignorer sans accès disque les réactions
+    qui ne concernent pas une suggestion.
+    """
+    
+    FLUSH_INTERVAL = 5  # secondes
+    SCORE_SCALE = 1_000_000  # RankIndex classe des entiers
+    
+    VOTE_UPSERT = '''
+        INSERT INTO suggestion_votes (suggestion_id, user_id, vote_type)
+        VALUES (?, ?, ?)
+        ON CONFLICT(suggestion_id, user_id) DO UPDATE SET
+            vote_type = excluded.vote_type,
+            created_at = CURRENT_TIMESTAMP
+    '''
+    COUNTERS_UPDATE = '''
+        UPDATE suggestions
+        SET votes_up = votes_up + ?, votes_down = votes_down + ?, updated_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    '''
+    
+    def __init__(self, db: SuggestionsDatabase):
+        self.db = db
+        self.pool = database_manager.pool(db.db_path)
+        self.message_index: Dict[int, int] = {}    # message_id: suggestion_id
+        self.counts: Dict[int, List[int]] = {}     # suggestion_id: [votes_up, votes_down]
+        self.voters: Dict[int, Dict[str, str]] = {}  # suggestion_id: {user_id: vote}, chargé au premier vote
+        self.pending_votes: Dict[Tuple[int, str], str] = {}
+        self.pending_counts: Dict[int, List[int]] = {}
+        self._flush_lock = asyncio.Lock()
+        self.ranking = RankIndex()
+        self.load()
+        metrics.gauge("arsenal_queue_depth", lambda: len(self.pending_votes), "Éléments en attente d'écriture", queue="suggestion_votes")
+    
+    def load(self):
+        """Charge compteurs et messages des suggestions (démarrage)"""
+        conn = database_manager.connect(self.db.db_path)
+        rows = conn.execute("SELECT id, message_id, votes_up, votes_down FROM suggestions").fetchall()
+        conn.close()
+        
+        for suggestion_id, message_id, votes_up, votes_down in rows:
+            self.counts[suggestion_id] = [votes_up or 0, votes_down or 0]
+            if message_id:
+                self.message_index[int(message_id)] = suggestion_id
+        self.ranking = RankIndex((sid, self._score(sid)) for sid in self.counts)
+    
+    def _score(self, suggestion_id: int) -> int:
+        up, down = self.counts[suggestion_id]
+        return int(wilson_score(up, down) * self.SCORE_SCALE)
+    
+    def track(self, suggestion_id: int, message_id: Optional[int] = None):
+        """Ajoute une suggestion (et son message de vote) au classement"""
+        if suggestion_id not in self.counts:
+            self.counts[suggestion_id] = [0, 0]
+            self.voters[suggestion_id] = {}
+            self.ranking.update(suggestion_id, 0)
+        if message_id is not None:
+            self.message_index[int(message_id)] = suggestion_id
+    
+    def suggestion_for_message(self, message_id: int) -> Optional[int]:
+        return self.message_index.get(message_id)
+    
+    async def _voters(self, suggestion_id: int) -> Dict[str, str]:
+        voters = self.voters.get(suggestion_id)
+        if voters is None:
+            rows = await self.pool.fetchall(
+                "SELECT user_id, vote_type FROM suggestion_votes WHERE suggestion_id = ?", (suggestion_id,)
+            )
+            voters = self.voters.setdefault(suggestion_id, {user_id: vote for user_id, vote in rows})
+        return voters
+    
+    async def vote(self, suggestion_id: int, user_id: str, vote_type: str) -> bool:
+        """Enregistre un vote en mémoire ; False si la suggestion est inconnue"""
+        if suggestion_id not in self.counts:
+            return False
+        voters = await self._voters(suggestion_id)
+        old_vote = voters.get(user_id)
+        if old_vote == vote_type:
+            return True
+        
+        voters[user_id] = vote_type
+        self.pending_votes[(suggestion_id, user_id)] = vote_type
+        delta = self.pending_counts.setdefault(suggestion_id, [0, 0])
+        counts = self.counts[suggestion_id]
+        for vote, step in ((old_vote, -1), (vote_type, 1)):
+            if vote is not None:
+                index = 0 if vote == 'up' else 1
+                counts[index] += step
+                delta[index] += step
+        self.ranking.update(suggestion_id, self._score(suggestion_id))
+        return True
+    
+    def top(self, limit: int = 10) -> List[int]:
+        """Identifiants des suggestions les mieux classées"""
+        return [suggestion_id for suggestion_id, _ in self.ranking.page(0, limit)]
+    
+    @staticmethod
+    def _write_batch(conn, votes: Dict[Tuple[int, str], str], counts: Dict[int, List[int]]):
+        conn.executemany(
+            SuggestionVoteLedger.VOTE_UPSERT,
+            [(suggestion_id, user_id, vote) for (suggestion_id, user_id), vote in votes.items()]
+        )
+        conn.executemany(
+            SuggestionVoteLedger.COUNTERS_UPDATE,
+            [(up, down, suggestion_id) for suggestion_id, (up, down) in counts.items() if up or down]
+        )
+    
+    async def flush(self):
+        """Écrit les votes en attente en une seule transaction"""
+        async with self._flush_lock:
+            if not self.pending_votes:
+                return
+            
+            votes, self.pending_votes = self.pending_votes, {}
+            counts, self.pending_counts = self.pending_counts, {}
+            try:
+                await self.pool.run(self._write_batch, votes, counts)
+            except Exception as e:
+                # Le lot repart avec le suivant (un vote plus récent reste prioritaire)
+                for key, vote in votes.items():
+                    self.pending_votes.setdefault(key, vote)
+                for suggestion_id, (up, down) in counts.items():
+                    delta = self.pending_counts.setdefault(suggestion_id, [0, 0])
+                    delta[0] += up
+                    delta[1] += down
+                print(f"[SUGGESTIONS] Erreur écriture des votes: {e}")
+
 class SuggestionManager:
     """Gestionnaire principal des suggestions"""
     
     def __init__(self, db: SuggestionsDatabase):
         self.db = db
         self.active_polls = {}  # Polls en cours
+        self.votes = SuggestionVoteLedger(db)
         
     async def create_suggestion(self, user, title: str, description: str, category: str = 'general', 
                               attachment_url: str = None, guild_id: str = None):
         """Créer une nouvelle suggestion"""
-        conn = sqlite3.connect(self.db.db_path)
+        conn = database_manager.connect(self.db.db_path)
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -179,66 +338,31 @@ class SuggestionManager:
         conn.commit()
         conn.close()
         
+        self.votes.track(suggestion_id)
         return suggestion_id
     
     async def vote_suggestion(self, suggestion_id: int, user_id: str, vote_type: str):
-        """Voter sur une suggestion"""
-        conn = sqlite3.connect(self.db.db_path)
-        cursor = conn.cursor()
-        
-        # Vérifier si l'utilisateur a déjà voté
-        cursor.execute('''
-            SELECT vote_type FROM suggestion_votes 
-            WHERE suggestion_id = ? AND user_id = ?
-        ''', (suggestion_id, user_id))
-        
-        existing_vote = cursor.fetchone()
-        
-        if existing_vote:
-            # Changer le vote existant
-            old_vote = existing_vote[0]
-            cursor.execute('''
-                UPDATE suggestion_votes 
-                SET vote_type = ?, created_at = CURRENT_TIMESTAMP
-                WHERE suggestion_id = ? AND user_id = ?
-            ''', (vote_type, suggestion_id, user_id))
-            
-            # Ajuster les compteurs
-            if old_vote != vote_type:
-                if old_vote == 'up':
-                    cursor.execute('UPDATE suggestions SET votes_up = votes_up - 1 WHERE id = ?', (suggestion_id,))
-                else:
-                    cursor.execute('UPDATE suggestions SET votes_down = votes_down - 1 WHERE id = ?', (suggestion_id,))
-                
-                if vote_type == 'up':
-                    cursor.execute('UPDATE suggestions SET votes_up = votes_up + 1 WHERE id = ?', (suggestion_id,))
-                else:
-                    cursor.execute('UPDATE suggestions SET votes_down = votes_down + 1 WHERE id = ?', (suggestion_id,))
-        else:
-            # Nouveau vote
-            cursor.execute('''
-                INSERT INTO suggestion_votes (suggestion_id, user_id, vote_type)
-                VALUES (?, ?, ?)
-            ''', (suggestion_id, user_id, vote_type))
-            
-            # Mettre à jour les compteurs
-            if vote_type == 'up':
-                cursor.execute('UPDATE suggestions SET votes_up = votes_up + 1 WHERE id = ?', (suggestion_id,))
-            else:
-                cursor.execute('UPDATE suggestions SET votes_down = votes_down + 1 WHERE id = ?', (suggestion_id,))
-        
-        # Mettre à jour le timestamp de modification
-        cursor.execute('UPDATE suggestions SET updated_at = CURRENT_TIMESTAMP WHERE id = ?', (suggestion_id,))
-        
-        conn.commit()
-        conn.close()
-        
-        return True
+        """Voter sur une suggestion (écrit en base par lots)"""
+        return await self.votes.vote(suggestion_id, user_id, vote_type)
+    
+    async def get_top_suggestions(self, limit: int = 10):
+        """Suggestions les mieux classées (score de Wilson), lignes complètes"""
+        top = self.votes.top(limit)
+        if not top:
+            return []
+        await self.votes.flush()
+        
+        rows = await self.votes.pool.fetchall(
+            f"SELECT * FROM suggestions WHERE id IN ({', '.join('?' * len(top))})", top
+        )
+        by_id = {row[0]: row for row in rows}
+        return [by_id[suggestion_id] for suggestion_id in top if suggestion_id in by_id]
     
     async def get_suggestions(self, status: str = None, category: str = None, 
                             user_id: str = None, limit: int = 20, offset: int = 0):
         """Récupérer les suggestions avec filtres"""
-        conn = sqlite3.connect(self.db.db_path)
+        await self.votes.flush()  # compteurs à jour avant la lecture
+        conn = database_manager.connect(self.db.db_path)
         cursor = conn.cursor()
         
         query = "SELECT * FROM suggestions WHERE 1=1"
@@ -268,7 +392,7 @@ class SuggestionManager:
     async def update_suggestion_status(self, suggestion_id: int, status: str, 
                                      admin_response: str = None, admin_user_id: str = None):
         """Mettre à jour le statut d'une suggestion"""
-        conn = sqlite3.connect(self.db.db_path)
+        conn = database_manager.connect(self.db.db_path)
         cursor = conn.cursor()
         
         update_fields = ["status = ?", "updated_at = CURRENT_TIMESTAMP"]
@@ -297,7 +421,7 @@ class SuggestionManager:
     async def add_comment(self, suggestion_id: int, user_id: str, username: str, 
                          comment: str, is_admin: bool = False):
         """Ajouter un commentaire à une suggestion"""
-        conn = sqlite3.connect(self.db.db_path)
+        conn = database_manager.connect(self.db.db_path)
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -314,7 +438,7 @@ class SuggestionManager:
     
     async def get_suggestion_stats(self, user_id: str = None):
         """Statistiques des suggestions"""
-        conn = sqlite3.connect(self.db.db_path)
+        conn = database_manager.connect(self.db.db_path)
         cursor = conn.cursor()
         
         stats = {}
@@ -354,6 +478,16 @@ class SuggestionsCommands(commands.Cog):
         self.bot = bot
         self.db = SuggestionsDatabase()
         self.manager = SuggestionManager(self.db)
+        self.vote_flush_task.start()
+    
+    async def cog_unload(self):
+        self.vote_flush_task.cancel()
+        await self.manager.votes.flush()
+    
+    @tasks.loop(seconds=SuggestionVoteLedger.FLUSH_INTERVAL)
+    async def vote_flush_task(self):
+        """Écrit le tampon des votes en base"""
+        await self.manager.votes.flush()
     
     @commands.group(name='suggest', invoke_without_command=True)
     async def suggest_command(self, ctx, *, suggestion_text: str = None):
@@ -467,7 +601,7 @@ class SuggestionsCommands(commands.Cog):
         await message.add_reaction("💬")  # Pour commenter
         
         # Sauvegarder l'ID du message
-        conn = sqlite3.connect(self.db.db_path)
+        conn = database_manager.connect(self.db.db_path)
         cursor = conn.cursor()
         cursor.execute('''
             UPDATE suggestions 
@@ -476,6 +610,7 @@ class SuggestionsCommands(commands.Cog):
         ''', (str(message.id), str(ctx.channel.id), suggestion_id))
         conn.commit()
         conn.close()
+        self.manager.votes.track(suggestion_id, message.id)
     
     @suggest_command.command(name='list')
     async def suggest_list(self, ctx, category: str = None):
@@ -527,7 +662,7 @@ class SuggestionsCommands(commands.Cog):
     @suggest_command.command(name='top')
     async def suggest_top(self, ctx):
         """Top des suggestions les mieux votées"""
-        suggestions = await self.manager.get_suggestions(limit=10)
+        suggestions = await self.manager.get_top_suggestions(limit=10)
         
         if not suggestions:
             embed = discord.Embed(
@@ -692,18 +827,11 @@ class SuggestionsCommands(commands.Cog):
         if user.bot:
             return
         
-        # Vérifier si c'est une suggestion
-        conn = sqlite3.connect(self.db.db_path)
-        cursor = conn.cursor()
-        cursor.execute('SELECT id FROM suggestions WHERE message_id = ?', (str(reaction.message.id),))
-        result = cursor.fetchone()
-        conn.close()
-        
-        if not result:
+        # Vérifier si c'est une suggestion (index en mémoire, sans accès disque)
+        suggestion_id = self.manager.votes.suggestion_for_message(reaction.message.id)
+        if suggestion_id is None:
             return
         
-        suggestion_id = result[0]
-        
         # Traiter le vote
         if reaction.emoji == "⬆️":
             await self.manager.vote_suggestion(suggestion_id, str(user.id), 'up')
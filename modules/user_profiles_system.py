@@ -6,58 +6,164 @@ Personnalisation complète : styles d'écriture, thèmes, préférences, statist
 """
 
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 import json
 import asyncio
 import os
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from core.logger import log
+from core.metrics import metrics
+from modules.sqlite_database import database_manager
+from utils.text_styles import (
+    BOLD_TABLE, BUBBLE_TABLE, ITALIC_TABLE, LEET_TABLE, compile_writing_style, uwu
+)
 
 class UserProfileSystem:
-    def __init__(self, bot):
+    """Profils utilisateurs : une ligne SQLite par membre, cache de lecture et écritures groupées
+    
+    Les profils sont chargés à la demande dans un cache LRU borné. Une
+    modification marque seulement le profil comme « sale » ; `flush()` écrit
+    les profils modifiés en une transaction (tâche du cog toutes les 5 s).
+    """
+    
+    FLUSH_INTERVAL = 5  # secondes
+    MAX_CACHED = 5000   # profils gardés en mémoire
+    
+    UPSERT_QUERY = '''
+        INSERT INTO user_profiles (user_id, data, updated_at) VALUES (?, ?, ?)
+        ON CONFLICT(user_id) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at
+    '''
+    
+    def __init__(self, bot, db_path: str = "data/user_profiles.db"):
         self.bot = bot
-        self.config_path = "data/user_profiles.json"
-        self.profiles = {}
-        self.load_profiles()
-        
-    def load_profiles(self):
-        """Charge les profils utilisateurs"""
-        if os.path.exists(self.config_path):
-            try:
-                with open(self.config_path, "r", encoding="utf-8") as f:
-                    self.profiles = json.load(f)
-                log.info("👤 Profils utilisateurs chargés")
-            except Exception as e:
-                log.error(f"❌ Erreur chargement profils: {e}")
-                self.profiles = {}
-        else:
-            self.profiles = {}
+        self.db_path = db_path
+        self.config_path = "data/user_profiles.json"  # Ancien stockage, migré une fois
+        self.profiles = OrderedDict()  # user_id: profil (cache LRU)
+        self.dirty = set()             # user_id modifiés depuis la dernière écriture
+        self.writing = set()           # user_id du lot en cours d'écriture (gardés en cache)
+        self._flush_lock = asyncio.Lock()
+        if os.path.dirname(self.db_path):
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.pool = database_manager.pool(self.db_path)
+        self.pool.run_sync(self._create_table)
+        self.migrate_json()
+        metrics.gauge("arsenal_queue_depth", lambda: len(self.dirty) + len(self.writing), "Élémentsen attente d'écriture", queue="user_profiles")
     
-    def save_profiles(self):
-        """Sauvegarde les profils utilisateurs"""
+    @staticmethod
+    def _create_table(conn):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS user_profiles (
+                user_id TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        ''')
+    
+    def migrate_json(self) -> int:
+        """Importe l'ancien fichier JSON (une seule fois, il est ensuite renommé en .migrated)"""
+        if not os.path.exists(self.config_path):
+            return 0
         try:
-            os.makedirs("data", exist_ok=True)
-            with open(self.config_path, "w", encoding="utf-8") as f:
-                json.dump(self.profiles, f, indent=4, ensure_ascii=False)
-            log.info("💾 Profils utilisateurs sauvegardés")
+            with open(self.config_path, "r", encoding="utf-8") as f:
+                profiles = json.load(f)
+            now = datetime.now().isoformat()
+            # Un profil déjà présent en base est plus récent que le fichier
+            self.pool.run_sync(lambda conn: conn.executemany(
+                "INSERT OR IGNORE INTO user_profiles (user_id, data, updated_at) VALUES (?, ?, ?)",
+                [(str(user_id), json.dumps(profile, ensure_ascii=False), now) for user_id, profile in profiles.items()]
+            ))
+            os.replace(self.config_path, f"{self.config_path}.migrated")
+            log.info(f"👤 {len(profiles)} profil(s) migré(s) de {self.config_path} vers SQLite")
+            return len(profiles)
         except Exception as e:
-            log.error(f"❌ Erreur sauvegarde profils: {e}")
+            log.error(f"❌ Erreur migration profils: {e}")
+            return 0
     
     def get_user_profile(self, user_id: int) -> dict:
-        """Récupère le profil d'un utilisateur"""
+        """Récupère le profil d'un utilisateur (créé s'il n'existe pas)"""
         user_id = str(user_id)
-        if user_id not in self.profiles:
-            self.profiles[user_id] = self.get_default_profile()
-            self.save_profiles()
-        return self.profiles[user_id]
+        profile = self.profiles.get(user_id)
+        if profile is not None:
+            self.profiles.move_to_end(user_id)
+            return profile
+        
+        row = self.pool.run_sync(lambda conn: conn.execute(
+            "SELECT data FROM user_profiles WHERE user_id = ?", (user_id,)
+        ).fetchone())
+        if row:
+            profile = json.loads(row[0])
+        else:
+            profile = self.get_default_profile()
+            self.dirty.add(user_id)
+        self.profiles[user_id] = profile
+        self._evict()
+        return profile
     
     def update_user_profile(self, user_id: int, profile_data: dict):
-        """Met à jour le profil d'un utilisateur"""
+        """Met à jour le profil d'un utilisateur (écrit au prochain flush)"""
         user_id = str(user_id)
         self.profiles[user_id] = profile_data
-        self.save_profiles()
+        self.profiles.move_to_end(user_id)
+        self.dirty.add(user_id)
+        self._evict()
+    
+    def reset_user_profile(self, user_id: int):
+        """Remet le profil d'un utilisateur à zéro"""
+        self.update_user_profile(user_id, self.get_default_profile())
+    
+    def _evict(self):
+        """Oublie les profils les moins récemment utilisés (jamais ceux en attente d'écriture)"""
+        excess = len(self.profiles) - self.MAX_CACHED
+        if excess <= 0:
+            return
+        for user_id in list(self.profiles):
+            if excess <= 0:
+                break
+            if user_id not in self.dirty and user_id not in self.writing:
+                del self.profiles[user_id]
+                excess -= 1
+    
+    def _take_batch(self) -> List[tuple]:
+        now = datetime.now().isoformat()
+        batch = [
+            (user_id, json.dumps(self.profiles[user_id], ensure_ascii=False), now)
+            for user_id in self.dirty if user_id in self.profiles
+        ]
+        # Jusqu'à la validation du lot, ces profils restent en cache : une
+        # relecture depuis la base perdrait les modifications pas encore écrites
+        self.writing, self.dirty = self.dirty, set()
+        return batch
+    
+    async def flush(self):
+        """Écrit les profils modifiés en une seule transaction"""
+        async with self._flush_lock:
+            if not self.dirty:
+                return
+            batch = self._take_batch()
+            try:
+                await self.pool.run(lambda conn: conn.executemany(self.UPSERT_QUERY, batch))
+            except Exception as e:
+                # Les profils repartent avec le lot suivant
+                self.dirty.update(self.writing)
+                log.error(f"❌ Erreur sauvegarde profils: {e}")
+            finally:
+                self.writing = set()
+                self._evict()
+    
+    def save_profiles(self):
+        """Écrit immédiatement les profils modifiés (synchrone)"""
+        if self.dirty:
+            batch = self._take_batch()
+            try:
+                self.pool.run_sync(lambda conn: conn.executemany(self.UPSERT_QUERY, batch))
+            except Exception:
+                self.dirty.update(self.writing)
+                raise
+            finally:
+                self.writing = set()
     
     def get_default_profile(self) -> dict:
         """Profil par défaut"""
@@ -277,67 +383,15 @@ class UserProfileSystem:
         }
     
     def apply_writing_style(self, text: str, user_profile: dict) -> str:
-        """Applique le style d'écriture à un texte"""
-        if not user_profile["writing_style"]["enabled"]:
+        """Applique le style d'écriture à un texte (chaîne compilée une fois par style)"""
+        writing_style = user_profile["writing_style"]
+        if not writing_style["enabled"]:
             return text
         
-        transforms = user_profile["writing_style"]["text_transforms"]
-        
-        # Transformations de base
-        if transforms.get("uppercase"):
-            text = text.upper()
-        elif transforms.get("lowercase"):
-            text = text.lower()
-        elif transforms.get("title_case"):
-            text = text.title()
-        elif transforms.get("alternating_case"):
-            text = ''.join(c.upper() if i % 2 == 0 else c.lower() for i, c in enumerate(text))
-        
-        # Transformations spéciales
-        if transforms.get("reverse_text"):
-            text = text[::-1]
-        
-        if transforms.get("leetspeak"):
-            text = self.convert_to_leetspeak(text)
-        
-        if transforms.get("uwu_mode"):
-            text = self.convert_to_uwu(text)
+        text = compile_writing_style(writing_style)(text)
         
-        if transforms.get("bubble_text"):
-            text = self.convert_to_bubble_text(text)
-        
-        if transforms.get("bold_text"):
-            text = self.convert_to_bold_unicode(text)
-        
-        if transforms.get("italic_text"):
-            text = self.convert_to_italic_unicode(text)
-        
-        # Formatage Discord
-        if transforms.get("strikethrough"):
-            text = f"~~{text}~~"
-        
-        if transforms.get("underline"):
-            text = f"__{text}__"
-        
-        if transforms.get("spoiler"):
-            text = f"||{text}||"
-        
-        # Ajout de préfixes/suffixes
-        emoji_formatting = user_profile["writing_style"]["emoji_style"]
-        
-        if emoji_formatting.get("emoji_prefix"):
-            text = emoji_formatting["emoji_prefix"] + text
-        
-        if emoji_formatting.get("emoji_suffix"):
-            text = text + emoji_formatting["emoji_suffix"]
-        
-        # Signature
-        message_formatting = user_profile["writing_style"]["message_formatting"]
-        if message_formatting.get("add_signature") and message_formatting.get("signature_text"):
-            text += f"\n\n{message_formatting['signature_text']}"
-        
-        # Horodatage
-        if message_formatting.get("add_timestamp"):
+        # Horodatage (jamais mis en cache)
+        if writing_style["message_formatting"].get("add_timestamp"):
             timestamp = datetime.now().strftime("%H:%M")
             text += f" `[{timestamp}]`"
         
@@ -345,72 +399,23 @@ class UserProfileSystem:
     
     def convert_to_leetspeak(self, text: str) -> str:
         """Convertit le texte en leet speak"""
-        leet_map = {
-            'a': '4', 'A': '4',
-            'e': '3', 'E': '3', 
-            'i': '1', 'I': '1',
-            'o': '0', 'O': '0',
-            's': '5', 'S': '5',
-            't': '7', 'T': '7',
-            'l': '1', 'L': '1',
-            'g': '9', 'G': '9'
-        }
-        return ''.join(leet_map.get(c, c) for c in text)
+        return text.translate(LEET_TABLE)
     
     def convert_to_uwu(self, text: str) -> str:
         """Convertit le texte en UwU speak"""
-        text = text.replace('r', 'w').replace('R', 'W')
-        text = text.replace('l', 'w').replace('L', 'W')
-        text = text.replace('na', 'nya').replace('Na', 'Nya')
-        text = text.replace('ne', 'nye').replace('Ne', 'Nye')
-        text = text.replace('ni', 'nyi').replace('Ni', 'Nyi')
-        text = text.replace('no', 'nyo').replace('No', 'Nyo')
-        text = text.replace('nu', 'nyu').replace('Nu', 'Nyu')
-        return text
+        return uwu(text)
     
     def convert_to_bubble_text(self, text: str) -> str:
         """Convertit le texte en bubble text"""
-        bubble_map = {
-            'A': 'Ⓐ', 'B': 'Ⓑ', 'C': 'Ⓒ', 'D': 'Ⓓ', 'E': 'Ⓔ', 'F': 'Ⓕ', 'G': 'Ⓖ', 'H': 'Ⓗ',
-            'I': 'Ⓘ', 'J': 'Ⓙ', 'K': 'Ⓚ', 'L': 'Ⓛ', 'M': 'Ⓜ', 'N': 'Ⓝ', 'O': 'Ⓞ', 'P': 'Ⓟ',
-            'Q': 'Ⓠ', 'R': 'Ⓡ', 'S': 'Ⓢ', 'T': 'Ⓣ', 'U': 'Ⓤ', 'V': 'Ⓥ', 'W': 'Ⓦ', 'X': 'Ⓧ',
-            'Y': 'Ⓨ', 'Z': 'Ⓩ',
-            'a': 'ⓐ', 'b': 'ⓑ', 'c': 'ⓒ', 'd': 'ⓓ', 'e': 'ⓔ', 'f': 'ⓕ', 'g': 'ⓖ', 'h': 'ⓗ',
-            'i': 'ⓘ', 'j': 'ⓙ', 'k': 'ⓚ', 'l': 'ⓛ', 'm': 'ⓜ', 'n': 'ⓝ', 'o': 'ⓞ', 'p': 'ⓟ',
-            'q': 'ⓠ', 'r': 'ⓡ', 's': 'ⓢ', 't': 'ⓣ', 'u': 'ⓤ', 'v': 'ⓥ', 'w': 'ⓦ', 'x': 'ⓧ',
-            'y': 'ⓨ', 'z': 'ⓩ',
-            '0': '⓪', '1': '①', '2': '②', '3': '③', '4': '④', '5': '⑤', '6': '⑥', '7': '⑦',
-            '8': '⑧', '9': '⑨'
-        }
-        return ''.join(bubble_map.get(c, c) for c in text)
+        return text.translate(BUBBLE_TABLE)
     
     def convert_to_bold_unicode(self, text: str) -> str:
         """Convertit le texte en gras Unicode"""
-        bold_map = {
-            'A': '𝐀', 'B': '𝐁', 'C': '𝐂', 'D': '𝐃', 'E': '𝐄', 'F': '𝐅', 'G': '𝐆', 'H': '𝐇',
-            'I': '𝐈', 'J': '𝐉', 'K': '𝐊', 'L': '𝐋', 'M': '𝐌', 'N': '𝐍', 'O': '𝐎', 'P': '𝐏',
-            'Q': '𝐐', 'R': '𝐑', 'S': '𝐒', 'T': '𝐓', 'U': '𝐔', 'V': '𝐕', 'W': '𝐖', 'X': '𝐗',
-            'Y': '𝐘', 'Z': '𝐙',
-            'a': '𝐚', 'b': '𝐛', 'c': '𝐜', 'd': '𝐝', 'e': '𝐞', 'f': '𝐟', 'g': '𝐠', 'h': '𝐡',
-            'i': '𝐢', 'j': '𝐣', 'k': '𝐤', 'l': '𝐥', 'm': '𝐦', 'n': '𝐧', 'o': '𝐨', 'p': '𝐩',
-            'q': '𝐪', 'r': '𝐫', 's': '𝐬', 't': '𝐭', 'u': '𝐮', 'v': '𝐯', 'w': '𝐰', 'x': '𝐱',
-            'y': '𝐲', 'z': '𝐳'
-        }
-        return ''.join(bold_map.get(c, c) for c in text)
+        return text.translate(BOLD_TABLE)
     
     def convert_to_italic_unicode(self, text: str) -> str:
         """Convertit le texte en italique Unicode"""
-        italic_map = {
-            'A': '𝐴', 'B': '𝐵', 'C': '𝐶', 'D': '𝐷', 'E': '𝐸', 'F': '𝐹', 'G': '𝐺', 'H': '𝐻',
-            'I': '𝐼', 'J': '𝐽', 'K': '𝐾', 'L': '𝐿', 'M': '𝑀', 'N': '𝑁', 'O': '𝑂', 'P': '𝑃',
-            'Q': '𝑄', 'R': '𝑅', 'S': '𝑆', 'T': '𝑇', 'U': '𝑈', 'V': '𝑉', 'W': '𝑊', 'X': '𝑋',
-            'Y': '𝑌', 'Z': '𝑍',
-            'a': '𝑎', 'b': '𝑏', 'c': '𝑐', 'd': '𝑑', 'e': '𝑒', 'f': '𝑓', 'g': '𝑔', 'h': 'ℎ',
-            'i': '𝑖', 'j': '𝑗', 'k': '𝑘', 'l': '𝑙', 'm': '𝑚', 'n': '𝑛', 'o': '𝑜', 'p': '𝑝',
-            'q': '𝑞', 'r': '𝑟', 's': '𝑠', 't': '𝑡', 'u': '𝑢', 'v': '𝑣', 'w': '𝑤', 'x': '𝑥',
-            'y': '𝑦', 'z': '𝑧'
-        }
-        return ''.join(italic_map.get(c, c) for c in text)
+        return text.translate(ITALIC_TABLE)
     
     async def update_user_statistics(self, user_id: int, stat_type: str, increment: int = 1):
         """Met à jour les statistiques d'un utilisateur"""
@@ -419,6 +424,50 @@ class UserProfileSystem:
         profile["statistics"]["last_activity"] = datetime.now().isoformat()
         self.update_user_profile(user_id, profile)
     
+    # Définition des succès
+    ACHIEVEMENTS = {
+        "first_steps": {
+            "name": "👶 Premiers Pas",
+            "description": "Envoyer votre premier message",
+            "condition": lambda s: s["messages_sent"] >= 1
+        },
+        "chatterbox": {
+            "name": "💬 Bavard",
+            "description": "Envoyer 100 messages",
+            "condition": lambda s: s["messages_sent"] >= 100
+        },
+        "commander": {
+            "name": "⚡ Commandant",
+            "description": "Utiliser 25 commandes",
+            "condition": lambda s: s["commands_used"] >= 25
+        },
+        "social_butterfly": {
+            "name": "🦋 Papillon Social",
+            "description": "Recevoir 50 réactions",
+            "condition": lambda s: s["reactions_received"] >= 50
+        },
+        "voice_lover": {
+            "name": "🎤 Amateur de Vocal",
+            "description": "Passer 1 heure en vocal",
+            "condition": lambda s: s["voice_time"] >= 3600
+        },
+        "night_owl": {
+            "name": "🦉 Oiseau de Nuit",
+            "description": "Être actif après 2h du matin",
+            "condition": lambda s: any(int(hour) >= 2 and int(hour) <= 6 for hour in s.get("activity_hours", {}).keys())
+        },
+        "early_bird": {
+            "name": "🐦 Lève-Tôt",
+            "description": "Être actif avant 6h du matin",
+            "condition": lambda s: any(int(hour) <= 6 for hour in s.get("activity_hours", {}).keys())
+        },
+        "consistent": {
+            "name": "📅 Régulier",
+            "description": "7 jours consécutifs d'activité",
+            "condition": lambda s: s["streak_days"] >= 7
+        }
+    }
+    
     async def check_achievements(self, user_id: int) -> List[str]:
         """Vérifie les nouveaux succès débloqués"""
         profile = self.get_user_profile(user_id)
@@ -426,52 +475,8 @@ class UserProfileSystem:
         achievements = profile["statistics"]["achievements"]
         new_achievements = []
         
-        # Définition des succès
-        achievement_list = {
-            "first_steps": {
-                "name": "👶 Premiers Pas",
-                "description": "Envoyer votre premier message",
-                "condition": lambda s: s["messages_sent"] >= 1
-            },
-            "chatterbox": {
-                "name": "💬 Bavard",
-                "description": "Envoyer 100 messages",
-                "condition": lambda s: s["messages_sent"] >= 100
-            },
-            "commander": {
-                "name": "⚡ Commandant",
-                "description": "Utiliser 25 commandes",
-                "condition": lambda s: s["commands_used"] >= 25
-            },
-            "social_butterfly": {
-                "name": "🦋 Papillon Social",
-                "description": "Recevoir 50 réactions",
-                "condition": lambda s: s["reactions_received"] >= 50
-            },
-            "voice_lover": {
-                "name": "🎤 Amateur de Vocal",
-                "description": "Passer 1 heure en vocal",
-                "condition": lambda s: s["voice_time"] >= 3600
-            },
-            "night_owl": {
-                "name": "🦉 Oiseau de Nuit",
-                "description": "Être actif après 2h du matin",
-                "condition": lambda s: any(int(hour) >= 2 and int(hour) <= 6 for hour in s.get("activity_hours", {}).keys())
-            },
-            "early_bird": {
-                "name": "🐦 Lève-Tôt",
-                "description": "Être actif avant 6h du matin",
-                "condition": lambda s: any(int(hour) <= 6 for hour in s.get("activity_hours", {}).keys())
-            },
-            "consistent": {
-                "name": "📅 Régulier",
-                "description": "7 jours consécutifs d'activité",
-                "condition": lambda s: s["streak_days"] >= 7
-            }
-        }
-        
         # Vérifier chaque succès
-        for achievement_id, achievement in achievement_list.items():
+        for achievement_id, achievement in self.ACHIEVEMENTS.items():
             if achievement_id not in achievements and achievement["condition"](stats):
                 achievements.append(achievement_id)
                 new_achievements.append(achievement["name"])
@@ -952,8 +957,7 @@ async def profile_reset(interaction: discord.Interaction):
                 return
             
             # Réinitialiser le profil
-            profile_system.profiles[str(interaction.user.id)] = profile_system.get_default_profile()
-            profile_system.save_profiles()
+            profile_system.reset_user_profile(interaction.user.id)
             
             embed = discord.Embed(
                 title="✅ Profil remis à zéro",
@@ -979,7 +983,18 @@ class UserProfileCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.profile_system = UserProfileSystem(bot)
+        self.profile_flush_task.start()
+    
+    async def cog_unload(self):
+        """Écrit les profils en attente avant le déchargement"""
+        self.profile_flush_task.cancel()
+        await self.profile_system.flush()
     
+    @tasks.loop(seconds=UserProfileSystem.FLUSH_INTERVAL)
+    async def profile_flush_task(self):
+        """Écrit les profils modifiés en base"""
+        await self.profile_system.flush()
+
     @commands.Cog.listener()
     async def on_message(self, message):
         """Écoute les messages pour appliquer les styles et mettre à jour les stats"""
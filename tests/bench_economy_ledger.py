@@ -0,0 +1,78 @@
+"""
+⏱️ Benchmark du grand livre de l'économie
+Compare la réécriture complète d'economie.json à chaque mouvement (ancien
+economy_manager) aux virements du grand livre, un par transaction puis groupés
+
+Usage: python tests/bench_economy_ledger.py
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from manager.economy_ledger import MINT, EconomyLedger, Transfer
+from modules.sqlite_database import SQLitePool
+
+USERS = 5000
+TRANSFERS = 5000
+BATCH = 500
+
+
+def legacy_update(path: str, balances: dict, user_id: str, amount: int):
+    """Reproduction de l'ancien update_balance : tout le fichier à chaque appel"""
+    balances[user_id] = balances.get(user_id, 0) + amount
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(balances, f, indent=4)
+
+
+def main():
+    rng = random.Random(42)
+    pairs = [(str(rng.randrange(USERS)), str(rng.randrange(USERS))) for _ in range(TRANSFERS)]
+    pairs = [(a, b) for a, b in pairs if a != b]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        balances = {str(i): 1000 for i in range(USERS)}
+        path = os.path.join(tmp, "economie.json")
+        legacy_n = TRANSFERS // 10
+        start = time.perf_counter()
+        for source, destination in pairs[:legacy_n]:
+            legacy_update(path, balances, source, -1)
+            legacy_update(path, balances, destination, 1)
+        legacy = legacy_n / (time.perf_counter() - start)
+
+        executor = ThreadPoolExecutor(max_workers=4)
+        pool = SQLitePool(os.path.join(tmp, "ledger.db"), executor)
+        ledger = EconomyLedger(pool)
+        ledger.import_balances(((str(i), 1000) for i in range(USERS)), "bench")
+
+        start = time.perf_counter()
+        for i, (source, destination) in enumerate(pairs):
+            ledger.transfer(source, destination, 1, "bench", idempotency_key=f"single:{i}")
+        single = len(pairs) / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for offset in range(0, len(pairs), BATCH):
+            ledger.transfer_many(
+                Transfer(source, destination, 1, "bench", idempotency_key=f"batch:{offset + i}")
+                for i, (source, destination) in enumerate(pairs[offset:offset + BATCH])
+            )
+        batched = len(pairs) / (time.perf_counter() - start)
+
+        assert ledger.verify() == []
+        assert ledger.balance(MINT) == 0
+        pool.close()
+        executor.shutdown()
+
+    print(f"economie.json réécrit     : {legacy:>10,.0f} virements/s ({USERS} comptes)")
+    print(f"grand livre, 1 par tx     : {single:>10,.0f} virements/s")
+    print(f"grand livre, lots de {BATCH} : {batched:>10,.0f} virements/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+⏱️ Benchmark du service de données de jeu
+Compare l'ancienne recherche (json.load du fichier puis balayage en
+minuscules à chaque commande) à l'index en mémoire : recherche exacte,
+suggestions et autocomplétion
+
+Usage: python tests/bench_game_data.py [chasseurs]
+"""
+
+import json
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.game_data import GameDataService
+
+HUNTERS = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+QUERIES = 2000
+
+
+def legacy_lookup(path: str, name: str):
+    """Reproduction de l'ancienne commande : lecture complète + balayage"""
+    with open(path, "r", encoding="utf-8") as f:
+        hunters = json.load(f).get("hunters", {})
+    for hunter_name, info in hunters.items():
+        if hunter_name.lower() == name.lower():
+            return info
+    return [h for h in hunters.keys() if name.lower() in h.lower()][:5]
+
+
+def timed(label: str, queries, func) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        func(query)
+    elapsed = (time.perf_counter() - start) / len(queries) * 1e6
+    print(f"{label:<32} {elapsed:9.1f} µs/requête")
+    return elapsed
+
+
+def main():
+    rng = random.Random(3)
+    word = lambda: "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 9))).title()
+    names = sorted({f"{word()} {word()}" for _ in range(HUNTERS)})
+    data = {"hunters": {name: {"hp": rng.randint(80, 250), "style": rng.choice("ABCD"), "awa": "oui"} for name in names}}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "hunters_data.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        service = GameDataService(path, os.path.join(tmp, "mods.json"))
+
+        exact = [rng.choice(names).upper() for _ in range(QUERIES)]
+        typos = [name[:3] + name[4:] for name in (rng.choice(names) for _ in range(QUERIES))]
+        prefixes = [rng.choice(names)[:rng.randint(1, 5)] for _ in range(QUERIES)]
+
+        print(f"{len(names)} chasseurs")
+        legacy = timed("ancien (json.load + balayage)", exact[:200], lambda name: legacy_lookup(path, name))
+        indexed = timed("index : nom exact", exact, lambda name: service.hunters().find(name))
+        timed("index : suggestions (faute)", typos, lambda name: service.hunters().names.suggest(name))
+        complete = timed("index : autocomplétion", prefixes, lambda name: service.hunters().names.complete(name))
+        print(f"nom exact x{legacy / indexed:.0f} ; autocomplétion {'<' if complete < 1000 else '>='} 1 ms")
+
+
+if __name__ == "__main__":
+    main()
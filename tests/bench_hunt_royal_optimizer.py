@@ -0,0 +1,52 @@
+"""
+⏱️ Benchmark de l'optimiseur Hunt Royal
+Meilleures équipes (branch and bound + dernier niveau vectorisé) sur des
+chasseurs synthétiques, et builds de gemmes (toutes les répartitions)
+
+Usage: python tests/bench_hunt_royal_optimizer.py [chasseurs]
+"""
+
+import json
+import os
+import random
+import sys
+import time
+from math import comb
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.hunt_royal_index import HuntRoyalGameData
+from modules.hunt_royal_optimizer import FOCUS_WEIGHTS, GemBuildOptimizer, TeamOptimizer
+
+HUNTERS = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+ELEMENTS = ["Fire", "Ice", "Water", "Lightning", "Holy", "Nature", "Shadow"]
+DUNGEON = {"weaknesses": "Fire 160%, Lightning 130%, Holy 120%", "resistances": "Ice 70%", "avoid_hunters": "Water units"}
+
+
+def main():
+    rng = random.Random(42)
+    hunters = [{
+        "id": f"h{i}", "name": f"Hunter {i}", "tier_meta": rng.choice(["S+", "S", "A", "B"]), "weapon_type": "Sword",
+        "attack_base": rng.randint(50, 300), "health_base": rng.randint(500, 1500), "defense_base": rng.randint(20, 120),
+        "popularity": 50, "passive_abilities": " ".join(rng.sample(ELEMENTS, rng.randint(0, 2))),
+        "skills": "", "synergies": "",
+    } for i in range(HUNTERS)]
+    optimizer = TeamOptimizer(HuntRoyalGameData(hunters, [], []))
+
+    for size in (3, 4, 5):
+        result = optimizer.best_teams(DUNGEON, size=size, top_k=10)
+        print(f"Équipes de {size} parmi {HUNTERS:,} ({comb(HUNTERS, size):,} possibles) : "
+              f"{result['elapsed_ms']:.1f} ms, {result['evaluated']:,} évaluées, exhaustif={result['exhaustive']}")
+
+    with open(os.path.join(os.path.dirname(__file__), "..", "data", "gems_stats.json"), encoding="utf-8") as f:
+        gems = GemBuildOptimizer(json.load(f)["gems_level_7"])
+    for focus, weights in FOCUS_WEIGHTS.items():
+        for armor_slots, weapon_slots in ((9, 6), (12, 8)):
+            start = time.perf_counter()
+            builds = gems.best_builds(weights, armor_slots, weapon_slots, top_k=5)
+            print(f"Builds {focus:<8} {armor_slots}+{weapon_slots} emplacements : "
+                  f"{(time.perf_counter() - start) * 1000:.1f} ms (score {builds[0]['score']})")
+
+
+if __name__ == "__main__":
+    main()
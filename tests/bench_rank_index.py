@@ -0,0 +1,76 @@
+"""
+⏱️ Benchmark de l'index de classement
+Compare les requêtes SQLite (COUNT pour le rang, ORDER BY ... OFFSET pour les
+pages) à RankIndex sur 1 000 000 de membres synthétiques
+
+Usage: python tests/bench_rank_index.py [membres]
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.rank_index import RankIndex
+
+MEMBERS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+QUERIES = 200
+UPDATES = 100_000
+
+
+def timed(label: str, count: int, func):
+    start = time.perf_counter()
+    for i in range(count):
+        func(i)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<38}: {elapsed / count * 1e6:>10,.1f} µs/op")
+
+
+def main():
+    rng = random.Random(42)
+    scores = {str(100_000_000 + i): rng.randint(0, 5_000_000) for i in range(MEMBERS)}
+    members = list(scores)
+
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE user_levels (user_id TEXT PRIMARY KEY, guild_id TEXT, total_xp INTEGER)")
+    conn.executemany("INSERT INTO user_levels VALUES (?, '1', ?)", scores.items())
+    conn.execute("CREATE INDEX idx_user_levels_rank ON user_levels (guild_id, total_xp DESC, user_id)")
+
+    start = time.perf_counter()
+    rows = conn.execute("SELECT user_id, total_xp FROM user_levels WHERE guild_id = '1'").fetchall()
+    index = RankIndex(rows)
+    print(f"{MEMBERS:,} membres - index construit en {time.perf_counter() - start:.2f}s\n")
+
+    probes = [rng.choice(members) for _ in range(QUERIES)]
+    deep_pages = [rng.randrange(MEMBERS // 10) for _ in range(QUERIES)]
+
+    timed("SQLite rang (COUNT)", QUERIES, lambda i: conn.execute(
+        "SELECT COUNT(*) + 1 FROM user_levels WHERE guild_id = '1' AND total_xp > "
+        "(SELECT total_xp FROM user_levels WHERE user_id = ?)", (probes[i],)
+    ).fetchone())
+    timed("RankIndex rang", QUERIES, lambda i: index.rank(probes[i]))
+    timed("SQLite page profonde (OFFSET)", QUERIES, lambda i: conn.execute(
+        "SELECT user_id, total_xp FROM user_levels WHERE guild_id = '1' "
+        "ORDER BY total_xp DESC, user_id LIMIT 10 OFFSET ?", (deep_pages[i] * 10,)
+    ).fetchall())
+    timed("RankIndex page profonde", QUERIES, lambda i: index.page(deep_pages[i] * 10, 10))
+
+    gains = [(rng.choice(members), rng.randint(1, 50)) for _ in range(UPDATES)]
+
+    def gain(i):
+        member, xp = gains[i]
+        scores[member] += xp
+        index.update(member, scores[member])
+
+    timed("RankIndex mise à jour (gain d'XP)", UPDATES, gain)
+
+    expected = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    assert index.page(0, 10) == expected[:10]
+    assert index.rank(expected[MEMBERS // 2][0]) == MEMBERS // 2 + 1
+
+
+if __name__ == "__main__":
+    main()
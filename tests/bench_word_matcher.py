@@ -0,0 +1,67 @@
+"""
+⏱️ Benchmark du filtre de mots AutoMod
+Compare l'ancienne boucle `word.lower() in content` à l'automate WordMatcher
+
+Usage: python tests/bench_word_matcher.py
+"""
+
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.word_matcher import WordMatcher
+
+MESSAGES = 2000
+
+
+def random_word(rng: random.Random) -> str:
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10)))
+
+
+def legacy_filter(levels, content: str):
+    """Reproduction de l'ancienne boucle par niveaux"""
+    content = content.lower()
+    for level in (4, 3, 2, 1):
+        for word in levels[level]:
+            if word.lower() in content:
+                return level, word
+    return None
+
+
+def bench(total_words: int, rng: random.Random):
+    levels = {level: [random_word(rng) for _ in range(total_words // 4)] for level in (1, 2, 3, 4)}
+    vocabulary = [random_word(rng) for _ in range(500)]
+    messages = [
+        " ".join(rng.choice(vocabulary) for _ in range(rng.randint(5, 25)))
+        for _ in range(MESSAGES)
+    ]
+
+    start = time.perf_counter()
+    matcher = WordMatcher(levels)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for content in messages:
+        legacy_filter(levels, content)
+    legacy = (time.perf_counter() - start) / MESSAGES
+
+    start = time.perf_counter()
+    for content in messages:
+        matcher.find(content)
+    compiled = (time.perf_counter() - start) / MESSAGES
+
+    print(
+        f"{total_words:>6} mots | construction {build * 1000:7.1f} ms | "
+        f"boucle {legacy * 1e6:8.1f} µs/msg | automate {compiled * 1e6:6.1f} µs/msg | "
+        f"x{legacy / compiled:.0f}"
+    )
+
+
+if __name__ == "__main__":
+    rng = random.Random(42)
+    for total_words in (1000, 2500, 5000, 10000):
+        bench(total_words, rng)
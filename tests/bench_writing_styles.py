@@ -0,0 +1,80 @@
+"""
+⏱️ Benchmark des styles d'écriture
+Compare l'ancienne application (dictionnaires reconstruits et parcours
+caractère par caractère à chaque appel) aux chaînes compilées str.translate,
+sur des messages uniques puis sur des phrases répétées (cache)
+
+Usage: python tests/bench_writing_styles.py [messages]
+"""
+
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.text_styles import BOLD_TABLE, BUBBLE_TABLE, LEET_TABLE, compile_writing_style
+
+MESSAGES = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+STYLES = {
+    "hacker": ("lowercase", "leetspeak"),
+    "aesthetic": ("bubble_text",),
+    "royal": ("title_case", "bold_text"),
+    "chaos": ("alternating_case", "leetspeak", "uwu_mode", "bubble_text", "spoiler"),
+}
+LEGACY_TABLES = {"leetspeak": LEET_TABLE, "bubble_text": BUBBLE_TABLE, "bold_text": BOLD_TABLE}
+
+
+def legacy_apply(text: str, transforms) -> str:
+    """Reproduction de l'ancienne boucle : un dictionnaire et un join par transformation"""
+    if "lowercase" in transforms:
+        text = text.lower()
+    elif "title_case" in transforms:
+        text = text.title()
+    elif "alternating_case" in transforms:
+        text = "".join(c.upper() if i % 2 == 0 else c.lower() for i, c in enumerate(text))
+    for name in ("leetspeak", "uwu_mode", "bubble_text", "bold_text"):
+        if name not in transforms:
+            continue
+        if name == "uwu_mode":
+            text = text.replace("r", "w").replace("R", "W").replace("l", "w").replace("L", "W")
+            for vowel in "aeiou":
+                text = text.replace("n" + vowel, "ny" + vowel).replace("N" + vowel, "Ny" + vowel)
+            continue
+        mapping = {chr(code): value for code, value in dict(LEGACY_TABLES[name]).items()}
+        text = "".join(mapping.get(c, c) for c in text)
+    if "spoiler" in transforms:
+        text = f"||{text}||"
+    return text
+
+
+def timed(func, messages) -> float:
+    start = time.perf_counter()
+    for message in messages:
+        func(message)
+    return (time.perf_counter() - start) / len(messages) * 1e6
+
+
+def main():
+    rng = random.Random(7)
+    words = ["".join(rng.choice(string.ascii_letters) for _ in range(rng.randint(2, 9))) for _ in range(800)]
+    unique = [" ".join(rng.choice(words) for _ in range(rng.randint(4, 30))) for _ in range(MESSAGES)]
+    phrases = unique[:50]
+    repeated = [rng.choice(phrases) for _ in range(MESSAGES)]
+
+    for name, transforms in STYLES.items():
+        chain = compile_writing_style({"text_transforms": {transform: True for transform in transforms}})
+        assert chain(unique[0]) == legacy_apply(unique[0], transforms)
+        legacy = timed(lambda text: legacy_apply(text, transforms), unique)
+        compiled = timed(chain._apply, unique)
+        cached = timed(chain, repeated)
+        print(
+            f"{name:<10} | ancien {legacy:7.1f} µs/msg | compilé {compiled:6.1f} µs/msg (x{legacy / compiled:.1f}) | "
+            f"phrases répétées {cached:5.2f} µs/msg"
+        )
+
+
+if __name__ == "__main__":
+    main()
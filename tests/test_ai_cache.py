@@ -0,0 +1,89 @@
+"""
+🧪 Tests du cache et de la régulation des appels AI (core/ai_cache.py)
+"""
+
+import asyncio
+
+import pytest
+
+from core.ai_cache import AIRequestBroker, BudgetExceeded, ResponseCache, StubProvider, TokenBudget, prompt_key
+
+
+def _key(message):
+    return prompt_key("stub", "stub", "Traduis", message, 2000, 0.7)
+
+
+def test_identical_inflight_requests_share_one_provider_call():
+    provider = StubProvider(latency=0.05)
+    broker = AIRequestBroker()
+
+    async def scenario():
+        ask = lambda message: broker.run(_key(message), lambda: provider(message, "Traduis", 2000, 0.7))
+        results = await asyncio.gather(*[ask("hello") for _ in range(20)], ask("bye"))
+        again = await ask("hello")
+        return results, again
+
+    results, again = asyncio.run(scenario())
+    assert provider.calls == 2
+    assert {result["response"] for result in results[:20]} == {"[stub] hello"}
+    assert sum(result.get("cached", False) for result in results[:20]) == 19
+    assert again["cached"] and broker.cache.stats["hits"] == 1
+
+
+def test_cache_is_bounded_expires_and_survives_in_sqlite(tmp_path):
+    path = str(tmp_path / "ai_cache.db")
+
+    async def scenario():
+        cache = ResponseCache(max_entries=2, ttl=60, disk_path=path)
+        for message in ("a", "b", "c"):
+            await cache.put(_key(message), {"success": True, "response": message})
+        assert len(cache) == 2  # "a" évincé de la mémoire...
+        assert (await cache.get(_key("a")))["response"] == "a"  # ...mais relu depuis SQLite
+        assert cache.stats["disk_hits"] == 1
+
+        await cache.put(_key("old"), {"success": True, "response": "old"}, ttl=-1)
+        assert await cache.get(_key("old")) is None
+        fresh = ResponseCache(disk_path=path)
+        return await fresh.get(_key("c"))
+
+    assert asyncio.run(scenario())["response"] == "c"
+
+
+def test_guild_budget_and_failures_are_not_cached():
+    budget = TokenBudget(limit=10)
+    broker = AIRequestBroker(budget=budget)
+    failures = []
+
+    async def failing():
+        failures.append(1)
+        return {"success": False, "error": "quota", "tokens_used": 0}
+
+    async def scenario():
+        provider = StubProvider()
+        await broker.run(_key("x"), lambda: provider("un deux trois quatre cinq six", None, 100, 0.7), guild_id=1)
+        with pytest.raises(BudgetExceeded):
+            await broker.run(_key("y"), lambda: provider("encore", None, 100, 0.7), guild_id=1)
+        await broker.run(_key("y"), lambda: provider("encore", None, 100, 0.7), guild_id=2)  # autre serveur
+        for _ in range(2):
+            await broker.run(_key("z"), failing)
+
+    asyncio.run(scenario())
+    assert budget.remaining(1) == 0
+    assert len(failures) == 2
+
+
+def test_callers_joining_an_inflight_request_are_budget_checked():
+    budget = TokenBudget(limit=5)
+    broker = AIRequestBroker(budget=budget)
+    provider = StubProvider(latency=0.05)
+    budget.charge(1, 5)  # serveur 1 déjà à court
+
+    async def scenario():
+        ask = lambda guild_id: broker.run(_key("hello"), lambda: provider("hello", "Traduis", 2000, 0.7),
+                                          guild_id=guild_id)
+        return await asyncio.gather(ask(2), ask(1), ask(2), return_exceptions=True)
+
+    owner, exhausted, joined = asyncio.run(scenario())
+    assert owner["response"] == "[stub] hello" and joined["cached"]
+    assert isinstance(exhausted, BudgetExceeded)
+    assert provider.calls == 1
@@ -0,0 +1,108 @@
+"""
+🧪 Tests des réponses AI en streaming (core/ai_stream.py, AIRequestBroker.stream)
+"""
+
+import asyncio
+import time
+
+from core.ai_cache import AIRequestBroker, StubProvider, prompt_key
+from core.ai_stream import ThrottledEditor, iterate_in_thread, stream_to_message
+
+
+class FakeMessage:
+    """Message Discord minimal : enregistre les éditions"""
+
+    def __init__(self):
+        self.edits = []
+
+    async def edit(self, content):
+        self.edits.append((time.perf_counter(), content))
+
+
+def test_message_is_edited_progressively_with_throttling():
+    provider = StubProvider(latency=0.01, reply=lambda message: " ".join(f"mot{i}" for i in range(40)))
+    message = FakeMessage()
+
+    async def scenario():
+        start = time.perf_counter()
+        text = await stream_to_message(message, provider.stream("salut", None, 2000, 0.7), interval=0.1)
+        return start, text
+
+    start, text = asyncio.run(scenario())
+    assert text == " ".join(f"mot{i}" for i in range(40))
+    assert message.edits[0][0] - start < 0.05  # premier fragment affiché tout de suite
+    assert message.edits[0][1] == "mot0 ▌"
+    assert message.edits[-1][1] == text  # version finale sans curseur
+    assert len(message.edits) <= 8  # ~0.4 s de génération, une édition par 0.1 s au plus
+    gaps = [later - earlier for (earlier, _), (later, _) in zip(message.edits, message.edits[1:-1])]
+    assert all(gap >= 0.09 for gap in gaps)
+
+
+def test_long_answers_are_clipped_to_discord_limit():
+    message = FakeMessage()
+
+    async def scenario():
+        editor = ThrottledEditor(message, interval=0, limit=20)
+        editor.update("x" * 50)
+        await asyncio.sleep(0)
+        await editor.finish()
+
+    asyncio.run(scenario())
+    assert all(len(content) <= 20 for _, content in message.edits)
+    assert message.edits[-1][1] == "x" * 19 + "…"
+
+
+def test_broker_stream_caches_completed_answers():
+    provider = StubProvider()
+    broker = AIRequestBroker()
+    key = prompt_key("stub", "stub", None, "bonjour tout le monde", 2000, 0.7)
+
+    async def collect():
+        return [chunk async for chunk in broker.stream(
+            key, lambda: provider.stream("bonjour tout le monde", None, 2000, 0.7), provider="stub"
+        )]
+
+    async def scenario():
+        return await collect(), await collect()
+
+    first, second = asyncio.run(scenario())
+    assert first == ["[stub]", " bonjour", " tout", " le", " monde"]
+    assert second == ["[stub] bonjour tout le monde"]  # servi par le cache en un fragment
+    assert provider.calls == 1
+
+
+def test_sync_sdk_iterators_are_bridged_and_errors_propagate():
+    def chunks():
+        yield "a"
+        yield "b"
+        raise ValueError("coupure réseau")
+
+    async def scenario():
+        received = []
+        try:
+            async for chunk in iterate_in_thread(chunks):
+                received.append(chunk)
+        except ValueError as e:
+            return received, str(e)
+
+    assert asyncio.run(scenario()) == (["a", "b"], "coupure réseau")
+
+
+def test_abandoned_stream_does_not_hold_a_concurrency_slot():
+    provider = StubProvider()
+    broker = AIRequestBroker(max_concurrency=1)
+
+    def open_stream(message):
+        return lambda: provider.stream(message, None, 2000, 0.7)
+
+    async def scenario():
+        abandoned = broker.stream(prompt_key("stub", "stub", None, "a b c", 2000, 0.7), open_stream("a b c"))
+        first = await abandoned.__anext__()  # l'appelant s'arrête là sans fermer le flux
+        other = [chunk async for chunk in broker.stream(
+            prompt_key("stub", "stub", None, "d e", 2000, 0.7), open_stream("d e")
+        )]
+        return first, other
+
+    first, other = asyncio.run(asyncio.wait_for(scenario(), 1.0))
+    assert first == "[stub]"
+    assert other == ["[stub]", " d", " e"]
@@ -0,0 +1,196 @@
+"""
+🧪 Tests du chargement des cogs depuis le manifeste (core/cog_loader.py)
+"""
+
+import asyncio
+import json
+import sys
+import textwrap
+
+import pytest
+
+from core.cog_loader import CogLoader, CogSpec, resolve_waves
+from core.cog_manifest import COG_MANIFEST
+
+FAKE_COGS = '''
+import asyncio
+import threading
+
+SCHEMA_CALLS = []
+
+
+class Registration:
+    def __init__(self, bot):
+        self.thread = threading.current_thread().name
+
+
+class Levels:
+    def __init__(self, bot):
+        self.thread = threading.current_thread().name
+
+
+class Music:
+    def __init__(self, bot):
+        # Comme un tasks.loop(...).start() dans __init__ : exige la boucle
+        self.task = asyncio.get_running_loop().create_task(asyncio.sleep(0))
+
+
+class Broken:
+    def __init__(self, bot):
+        raise RuntimeError("config manquante")
+
+
+class Shop:
+    def __init__(self, bot):
+        pass
+
+
+class Diagnostic:
+    def __init__(self, bot):
+        pass
+
+
+async def setup_schema():
+    SCHEMA_CALLS.append("absence")
+'''
+
+
+class FakeBot:
+    def __init__(self):
+        self.added = []
+
+    async def add_cog(self, cog):
+        self.added.append(type(cog).__name__)
+
+
+@pytest.fixture
+def fake_cogs(tmp_path, monkeypatch):
+    (tmp_path / "fake_cogs.py").write_text(textwrap.dedent(FAKE_COGS), encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "fake_cogs"
+    sys.modules.pop("fake_cogs", None)
+
+
+def test_waves_follow_dependencies_and_keep_manifest_order():
+    specs = [
+        CogSpec("Shop", "x:Shop", requires=("Economy",)),
+        CogSpec("Economy", "x:Economy"),
+        CogSpec("Help", "x:Help"),
+        CogSpec("Diagnostic", "x:Diagnostic", after=("Shop", "Help")),
+    ]
+
+    waves = resolve_waves(specs)
+
+    assert [[spec.name for spec in wave] for wave in waves] == [["Economy", "Help"], ["Shop"], ["Diagnostic"]]
+
+
+def test_invalid_manifests_are_rejected():
+    with pytest.raises(ValueError, match="circulaire"):
+        resolve_waves([CogSpec("A", "x:A", after=("B",)), CogSpec("B", "x:B", requires=("A",))])
+    with pytest.raises(ValueError, match="absent"):
+        resolve_waves([CogSpec("A", "x:A", requires=("Ghost",))])
+    with pytest.raises(ValueError, match="plusieurs fois"):
+        CogLoader(FakeBot(), [CogSpec("A", "x:A"), CogSpec("A", "x:B")])
+    with pytest.raises(ValueError, match="différé"):
+        CogLoader(FakeBot(), [CogSpec("A", "x:A", deferred=True), CogSpec("B", "x:B", after=("A",))])
+
+
+def test_bot_manifest_is_consistent():
+    loader = CogLoader(FakeBot(), COG_MANIFEST)
+
+    first_wave = [spec.name for spec in loader.eager_waves[0]]
+    assert first_wave[0] == "ArsenalRegistrationSystem"
+    assert all(spec.target.count(":") == 1 for spec in COG_MANIFEST)
+
+
+def test_load_all_threads_schema_fallback_and_report(fake_cogs, tmp_path):
+    module = fake_cogs
+    manifest = [
+        CogSpec("Registration", f"{module}:Registration", threaded=True),
+        CogSpec("Levels", f"{module}:Levels", threaded=True, schema=f"{module}:setup_schema"),
+        CogSpec("Music", f"{module}:Music", threaded=True),
+        CogSpec("Broken", f"{module}:Broken"),
+        CogSpec("Shop", f"{module}:Shop", requires=("Broken",)),
+        CogSpec("Missing", f"{module}:DoesNotExist"),
+        CogSpec("Diagnostic", f"{module}:Diagnostic", after=("Registration",), deferred=True),
+    ]
+    report_path = tmp_path / "startup_report.json"
+    bot = FakeBot()
+    loader = CogLoader(bot, manifest, report_path=str(report_path))
+
+    async def boot():
+        await loader.load_all()
+        eager = list(bot.added)
+        await loader.wait_deferred()
+        return eager
+
+    eager = asyncio.run(boot())
+
+    assert eager == ["Registration", "Levels"]
+    assert bot.added == eager + ["Diagnostic"]
+    assert loader.cogs["Levels"].thread.startswith("arsenal-boot")
+    assert sys.modules[module].SCHEMA_CALLS == ["absence"]
+
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    cogs = {entry["name"]: entry for entry in report["cogs"]}
+    assert cogs["Levels"]["mode"] == "thread"
+    assert cogs["Music"]["status"] == "failed" and "threaded=True" in cogs["Music"]["error"]
+    assert cogs["Broken"]["status"] == "failed" and "config manquante" in cogs["Broken"]["error"]
+    assert cogs["Shop"]["status"] == "skipped"
+    assert cogs["Missing"]["error"].startswith("import:")
+    assert cogs["Diagnostic"]["deferred"] and cogs["Diagnostic"]["wave"] == 2
+    assert report["loaded"] == 3
+    assert sorted(report["failed"]) == ["Broken", "Missing", "Music"]
+
+
+def test_ensure_loaded_pulls_dependencies(fake_cogs, tmp_path):
+    module = fake_cogs
+    manifest = [
+        CogSpec("Registration", f"{module}:Registration"),
+        CogSpec("Shop", f"{module}:Shop", deferred=True),
+        CogSpec("Diagnostic", f"{module}:Diagnostic", after=("Shop",), deferred=True),
+    ]
+    bot = FakeBot()
+    loader = CogLoader(bot, manifest, report_path=str(tmp_path / "report.json"))
+
+    async def boot():
+        await loader.load_all()
+        cog = await loader.ensure_loaded("Diagnostic")
+        await loader.wait_deferred()
+        return cog
+
+    cog = asyncio.run(boot())
+
+    assert type(cog).__name__ == "Diagnostic"
+    assert bot.added == ["Registration", "Shop", "Diagnostic"]
+
+
+def test_disabled_cogs_and_existing_commands_are_skipped(fake_cogs, tmp_path):
+    module = fake_cogs
+
+    class Tree:
+        def get_command(self, name):
+            return object() if name == "automod" else None
+
+    bot = FakeBot()
+    bot.tree = Tree()
+    manifest = [
+        CogSpec("Registration", f"{module}:Registration"),
+        CogSpec("Levels", f"{module}:Levels", skip_if_command="automod"),
+        CogSpec("Broken", f"{module}:Broken", enabled=False),
+        CogSpec("Shop", f"{module}:Shop", requires=("Broken",)),
+        CogSpec("Diagnostic", f"{module}:Diagnostic", after=("Broken",), deferred=True),
+    ]
+    loader = CogLoader(bot, manifest, report_path=str(tmp_path / "report.json"))
+
+    async def boot():
+        await loader.load_all()
+        await loader.wait_deferred()
+
+    asyncio.run(boot())
+
+    assert bot.added == ["Registration", "Diagnostic"]
+    assert loader.timings["Levels"].status == "skipped"
+    assert loader.timings["Shop"].status == "skipped"
+    assert "Broken" not in loader.timings
+    assert loader.report()["disabled"] == ["Broken"]
@@ -0,0 +1,33 @@
+"""
+🧪 Tests des templates de commandes personnalisées (utils/command_template.py)
+"""
+
+from utils.command_template import CommandTemplate
+
+KNOWN = ("user", "server", "member_count")
+
+
+def test_only_referenced_variables_are_evaluated_once():
+    calls = []
+
+    def resolver(name):
+        def resolve(context):
+            calls.append(name)
+            return context[name]
+        return resolve
+
+    resolvers = {name: resolver(name) for name in KNOWN}
+    template = CommandTemplate("Salut {user} ! {user} est sur {server}", KNOWN)
+
+    assert template.variables == {"user", "server"}
+    assert template.render(resolvers, {"user": "Nora", "server": "Arsenal"}) == "Salut Nora ! Nora est sur Arsenal"
+    assert sorted(calls) == ["server", "user"]
+
+
+def test_unknown_placeholders_and_plain_text_are_kept():
+    template = CommandTemplate("{inconnu} {member_count}{", KNOWN)
+    assert template.render({"member_count": lambda context: "12"}, None) == "{inconnu} 12{"
+
+    plain = CommandTemplate("Bienvenue !", KNOWN)
+    assert plain.variables == frozenset()
+    assert plain.render({}, None) == "Bienvenue !"
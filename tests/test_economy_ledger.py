@@ -0,0 +1,126 @@
+"""
+🧪 Tests du grand livre de l'économie (manager/economy_ledger.py)
+"""
+
+import asyncio
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from manager.economy_ledger import IMPORT, MINT, SHOP, EconomyLedger, InsufficientFunds, Transfer
+from modules.sqlite_database import SQLitePool
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    executor = ThreadPoolExecutor(max_workers=4)
+    pool = SQLitePool(str(tmp_path / "economy.db"), executor)
+    yield EconomyLedger(pool)
+    pool.close()
+    executor.shutdown()
+
+
+def test_transfers_are_double_entry_and_materialized(ledger):
+    ledger.credit("1", 500, "daily")
+    result = ledger.transfer("1", "2", 200, "gift")
+
+    assert result.balances == {"1": 300, "2": 200}
+    assert ledger.balance(MINT) == -500
+    assert ledger.account("1") == {"balance": 300, "total_in": 500, "total_out": 200}
+    assert [entry["amount"] for entry in ledger.history("1")] == [-200, 500]
+    assert ledger.verify() == []
+
+
+def test_overdraft_rolls_back_the_whole_transaction(ledger):
+    ledger.credit("1", 100, "daily")
+
+    with pytest.raises(InsufficientFunds) as error:
+        ledger.debit("1", 150, "shop", destination=SHOP, apply=lambda conn: conn.execute("SELECT 1"))
+    assert (error.value.balance, error.value.amount) == (100, 150)
+
+    with pytest.raises(InsufficientFunds):
+        ledger.transfer_many([Transfer(MINT, "2", 50, "daily"), Transfer("1", "2", 500, "gift")])
+
+    assert ledger.balance("1") == 100
+    assert ledger.balance("2") == 0
+    assert len(ledger.history("1")) == 1
+
+
+def test_idempotency_key_replays_without_double_credit(ledger):
+    calls = []
+    first = ledger.credit("1", 1000, "daily", idempotency_key="daily:1:2026-10-18", apply=calls.append)
+    again = ledger.credit("1", 1000, "daily", idempotency_key="daily:1:2026-10-18", apply=calls.append)
+
+    assert not first.replayed and again.replayed
+    assert again.tx_id == first.tx_id
+    assert ledger.balance("1") == 1000
+    assert len(calls) == 1
+
+
+def test_entries_are_append_only(ledger):
+    ledger.credit("1", 10, "daily")
+
+    def tamper(conn):
+        conn.execute("UPDATE ledger_entries SET amount = 9999")
+
+    with pytest.raises(sqlite3.IntegrityError, match="ajout seul"):
+        ledger.pool.run_sync(tamper)
+
+
+def test_concurrent_async_transfers_keep_balances_consistent(ledger):
+    ledger.credit("bank", 10_000, "seed")
+
+    async def run():
+        await asyncio.gather(*(
+            ledger.transfer_async("bank", str(i % 10), 10, "payout", idempotency_key=f"payout:{i}")
+            for i in range(200)
+        ))
+
+    asyncio.run(run())
+
+    assert ledger.balance("bank") == 8000
+    assert sum(ledger.balance(str(i)) for i in range(10)) == 2000
+    assert ledger.verify() == []
+
+
+def test_legacy_json_and_sqlite_are_imported_once(ledger, tmp_path):
+    legacy_json = tmp_path / "economie.json"
+    legacy_json.write_text(json.dumps({"1": 300, "2": 0, "3": 50}), encoding="utf-8")
+    legacy_db = tmp_path / "old.db"
+    conn = sqlite3.connect(legacy_db)
+    conn.execute("CREATE TABLE users (guild_id INTEGER, user_id INTEGER, balance INTEGER, bank INTEGER)")
+    conn.executemany("INSERT INTO users VALUES (?, ?, ?, ?)", [(1, 1, 100, 20), (2, 4, 70, 0)])
+    conn.commit()
+    conn.close()
+    query = "SELECT user_id, SUM(balance + bank) FROM users GROUP BY user_id"
+
+    assert ledger.import_json(str(legacy_json)) == 2
+    assert ledger.import_sqlite(str(legacy_db), query, "economy_complete") == 1
+    assert ledger.import_json(str(legacy_json)) == 0
+    assert ledger.import_sqlite(str(legacy_db), query, "economy_complete") == 0
+    assert ledger.import_sqlite(str(legacy_db), "SELECT * FROM missing", "x") == 0
+
+    # Le compte 1 est dans les deux sources : repris une seule fois
+    assert [ledger.balance(account) for account in "1234"] == [300, 0, 50, 70]
+    assert ledger.balance(IMPORT) == -420
+    assert ledger.verify() == []
+
+
+def test_legacy_sources_are_merged_with_the_largest_balance(ledger, tmp_path):
+    legacy_json = tmp_path / "economie.json"
+    legacy_json.write_text(json.dumps({"1": 300, "2": 40}), encoding="utf-8")
+    legacy_db = tmp_path / "arsenal_economy_unified.db"
+    conn = sqlite3.connect(legacy_db)
+    conn.execute("CREATE TABLE arsenal_users (discord_id TEXT PRIMARY KEY, balance INTEGER)")
+    conn.executemany("INSERT INTO arsenal_users VALUES (?, ?)", [("1", 500), ("2", 10), ("3", 25)])
+    conn.commit()
+    conn.close()
+
+    assert ledger.import_legacy(str(legacy_json), str(legacy_db)) == 3
+    assert ledger.import_legacy(str(legacy_json), str(legacy_db)) == 0
+    assert ledger.import_json(str(legacy_json)) == 0
+
+    assert [ledger.balance(account) for account in "123"] == [500, 40, 25]
+    assert ledger.verify() == []
@@ -0,0 +1,55 @@
+"""
+🧪 Tests du service de données de jeu (utils/game_data.py)
+"""
+
+import json
+import os
+
+from utils.game_data import GameDataService
+
+HUNTERS = {
+    "hunters": {
+        "Night Raider": {"hp": 150, "style": "Furtif", "awa": "oui"},
+        "Storm Archer": {"hp": 120, "style": "Distance", "awa": "oui"},
+        "Blood Warrior": {"hp": 200, "style": "Combat rapproché", "awa": "non"},
+    }
+}
+
+
+def _service(tmp_path, hunters=HUNTERS):
+    hunters_path = tmp_path / "hunters_data.json"
+    hunters_path.write_text(json.dumps(hunters), encoding="utf-8")
+    (tmp_path / "minecraft_mods.json").write_text(json.dumps({"tech": [{"name": "Create"}]}), encoding="utf-8")
+    return GameDataService(str(hunters_path), str(tmp_path / "minecraft_mods.json"), check_interval=0), hunters_path
+
+
+def test_lookup_suggestions_and_autocomplete(tmp_path):
+    service, _ = _service(tmp_path)
+    catalog = service.hunters()
+
+    assert catalog.find("night RAIDER") == ("Night Raider", HUNTERS["hunters"]["Night Raider"])
+    assert catalog.find("Night") is None
+    assert catalog.names.suggest("storm")[0] == "Storm Archer"
+    assert catalog.names.suggest("Blod Warior")[0] == "Blood Warrior"  # faute de frappe
+    assert catalog.names.complete("b") == ["Blood Warrior"]
+    assert catalog.names.complete("") == ["Blood Warrior", "Night Raider", "Storm Archer"]
+    assert (catalog.awakening_count, catalog.style_count) == (2, 3)
+    assert service.mods().category("TECH") == [{"name": "Create"}]
+
+
+def test_file_is_parsed_once_and_reloaded_on_change(tmp_path):
+    service, path = _service(tmp_path)
+    for _ in range(100):
+        service.hunters()
+    assert service.hunters_dataset.loads == 1
+
+    updated = {"hunters": {**HUNTERS["hunters"], "Frost Queen": {"hp": 90, "style": "Magie", "awa": "oui"}}}
+    path.write_text(json.dumps(updated), encoding="utf-8")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert service.hunters().find("frost queen") is not None
+    assert service.hunters_dataset.loads == 2
+
+    path.write_text("{ cassé", encoding="utf-8")  # fichier en cours d'écriture : version précédente gardée
+    assert service.hunters().find("frost queen") is not None
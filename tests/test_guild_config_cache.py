@@ -0,0 +1,52 @@
+"""
+🧪 Tests du cache de configuration par serveur (utils/guild_config_cache.py)
+"""
+
+import pytest
+
+from utils.guild_config_cache import GuildConfigCache
+
+
+def test_loader_called_once_until_invalidated():
+    """Le loader n'est rappelé qu'après invalidation"""
+    calls = []
+
+    def loader(guild_id):
+        calls.append(guild_id)
+        return {"guild_id": guild_id, "version": len(calls)}
+
+    cache = GuildConfigCache(loader)
+
+    assert cache.get(42)["version"] == 1
+    assert cache.get("42")["version"] == 1
+    assert calls == [42]
+
+    cache.invalidate(42)
+    assert cache.get(42)["version"] == 2
+
+    cache.get(7)
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_level_config_is_parsed_once():
+    """Exclusions en frozensets, bonus en dict de floats"""
+    pytest.importorskip("discord")
+    from commands.level_system import LevelGuildConfig
+
+    config = LevelGuildConfig.from_row({
+        "guild_id": "1",
+        "enabled": 1,
+        "xp_cooldown": 30,
+        "no_xp_channels": '["10", "11"]',
+        "no_xp_roles": '["20"]',
+        "bonus_channels": '{"12": 2}',
+        "bonus_roles": '{"21": 1.5}',
+    })
+
+    assert config.no_xp_channels == frozenset({"10", "11"})
+    assert config.is_excluded(10, [])
+    assert config.is_excluded(99, ["20"])
+    assert not config.is_excluded(12, ["21"])
+    assert config.multiplier_for(12, ["21"]) == 3.0
+    assert config.multiplier_for(99, []) == 1.0
@@ -0,0 +1,109 @@
+"""
+🧪 Tests de l'index Hunt Royal en mémoire (utils/trigram_index.py, modules/hunt_royal_index.py)
+"""
+
+import asyncio
+
+import pytest
+
+from modules.hunt_royal_index import HuntRoyalGameData, detect_elements, parse_element_values
+from utils.trigram_index import TrigramIndex
+
+
+def _hunter(hunter_id, name, tier, weapon, attack, passive="", skills=""):
+    return {
+        "id": hunter_id, "name": name, "tier_meta": tier, "weapon_type": weapon,
+        "attack_base": attack, "health_base": 800, "defense_base": 50, "speed_base": 100, "popularity": 50,
+        "passive_abilities": passive, "skills": skills, "synergies": "",
+    }
+
+
+@pytest.fixture
+def data():
+    hunters = [
+        _hunter("dragon_knight", "Dragon Knight", "A+", "Sword", 180, passive="Fire Damage +30%"),
+        _hunter("wizard", "Wizard", "A", "Staff", 200, skills="Fireball, Ice Storm"),
+        _hunter("zeus", "Zeus", "S+", "Staff", 300, passive="Lightning Damage +50%"),
+        _hunter("ninja", "Ninja", "S", "Daggers", 160),
+    ]
+    dungeons = [{
+        "id": "yeti_tundra", "name": "Yeti's Tundra", "boss_name": "Ice Yeti",
+        "resistances": "Ice 70%", "weaknesses": "Fire 160%, Lightning 130%", "avoid_hunters": "Slow tanks",
+        "strategy": "Feu et foudre",
+    }]
+    gems = [{"id": "red_power_stone", "name": "Pierre de Pouvoir Rouge"}]
+    detailed = [{"id": "dragon_knight", "name": "Dragon Knight", "speed": 85}]
+    return HuntRoyalGameData(hunters, dungeons, gems, detailed)
+
+
+def test_trigram_index_fuzzy_and_substring_matches():
+    index = TrigramIndex([("elf_archer", ["Elf Archer", "elf_archer"]), ("dragon_knight", ["Dragon Knight"])])
+
+    assert index.best("ELF-ARCHER") == "elf_archer"
+    assert index.best("knight") == "dragon_knight"
+    assert index.best("dragn knigt") == "dragon_knight"
+    assert index.best("zzz") is None
+    assert [key for key, _ in index.search("archer")] == ["elf_archer"]
+
+
+def test_lookups_and_secondary_indexes(data):
+    assert data.hunter("wizzard")["id"] == "wizard"
+    assert data.dungeon("yeti")["id"] == "yeti_tundra"
+    assert data.gem("pierre rouge")["id"] == "red_power_stone"
+    assert data.detailed["dragon_knight"]["speed"] == 85
+
+    assert data.elements["wizard"] == ["Fire", "Ice"]
+    assert [hunter["id"] for hunter in data.hunters_where(element="Fire")] == ["dragon_knight", "wizard"]
+    assert [hunter["id"] for hunter in data.hunters_where(weapon="staff")] == ["zeus", "wizard"]
+    assert [hunter["id"] for hunter in data.hunters_where(element="Fire", tier="A")] == ["wizard"]
+    assert data.hunters_where()[0]["id"] == "zeus"
+
+
+def test_element_parsing():
+    assert detect_elements("Thunder Strike", "Frost Nova") == ["Lightning", "Ice"]
+    assert parse_element_values("Ice 150%, Water 120%") == {"Ice": 150, "Water": 120}
+
+
+def test_analyzer_runs_in_memory(data):
+    hunt_royal_system = pytest.importorskip("modules.hunt_royal_system")
+
+    class FakeDatabase:
+        pass
+
+    db = FakeDatabase()
+    db.data = data
+    analyzer = hunt_royal_system.HuntRoyalAnalyzer(db)
+
+    team = asyncio.run(analyzer.analyze_team_composition(["wizard", "dragon knight", "nobody"]))
+    assert [hunter["id"] for hunter in team["hunters"]] == ["wizard", "dragon_knight"]
+    assert team["unknown"] == ["nobody"]
+    assert team["synergies"] == ["Fire : Wizard, Dragon Knight"]
+
+    recommendation = asyncio.run(analyzer.recommend_dungeon_team("yeti"))
+    assert sorted(hunter["id"] for hunter in recommendation["recommended_hunters"]) == ["dragon_knight", "wizard", "zeus"]
+    assert recommendation["warnings"] == ["Wizard : le boss résiste à Ice"]
+
+
+def test_updater_notifies_listeners_only_when_rows_change():
+    scraper_module = pytest.importorskip("utils.hunt_royal_scraper")
+
+    class FakeScraper:
+        def __init__(self):
+            self.results = [{"upserted": 2, "unchanged": 0}, {"upserted": 0, "unchanged": 2}]
+
+        async def update_database(self, db_path, force_refresh=False):
+            return self.results.pop(0)
+
+    received = []
+
+    async def on_update(result):
+        received.append(result)
+
+    async def run():
+        updater = scraper_module.HuntRoyalAutoUpdater(FakeScraper(), "unused.db")
+        updater.add_listener(on_update)
+        await updater.force_update()
+        await updater.force_update()
+
+    asyncio.run(run())
+    assert received == [{"upserted": 2, "unchanged": 0}]
@@ -0,0 +1,115 @@
+"""
+🧪 Tests de l'optimiseur d'équipes et de builds (modules/hunt_royal_optimizer.py)
+"""
+
+import random
+import time
+from functools import reduce
+from itertools import combinations, combinations_with_replacement
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from modules.hunt_royal_index import HuntRoyalGameData
+from modules.hunt_royal_optimizer import FOCUS_WEIGHTS, GemBuildOptimizer, TeamOptimizer
+
+ELEMENTS = ["Fire", "Ice", "Water", "Lightning", "Holy", "Nature", "Shadow"]
+DUNGEON = {"weaknesses": "Fire 160%, Lightning 130%, Holy 120%", "resistances": "Ice 70%", "avoid_hunters": "Water units"}
+
+
+def _game_data(count, seed=3):
+    rng = random.Random(seed)
+    hunters = [{
+        "id": f"h{i}", "name": f"Hunter {i}", "tier_meta": rng.choice(["S", "A", "B"]), "weapon_type": "Sword",
+        "attack_base": rng.randint(50, 300), "health_base": rng.randint(500, 1500), "defense_base": rng.randint(20, 120),
+        "popularity": 50, "passive_abilities": " ".join(rng.sample(ELEMENTS, rng.randint(0, 2))),
+        "skills": "", "synergies": "",
+    } for i in range(count)]
+    return HuntRoyalGameData(hunters, [], [])
+
+
+def _brute_force(optimizer, dungeon, size, top_k):
+    scores, masks, _ = optimizer._scores(dungeon)
+    excluded = optimizer.data.avoided_hunters(dungeon)
+    allowed = [i for i, hunter_id in enumerate(optimizer.ids) if hunter_id not in excluded]
+    results = []
+    for team in combinations(allowed, size):
+        coverage = bin(reduce(lambda a, b: a | b, (int(masks[i]) for i in team))).count("1")
+        results.append(float(scores[list(team)].sum()) + optimizer.COVERAGE_BONUS * coverage)
+    return sorted(results, reverse=True)[:top_k]
+
+
+@pytest.mark.parametrize("size", [1, 3, 4])
+def test_branch_and_bound_matches_exhaustive_search(size):
+    optimizer = TeamOptimizer(_game_data(28))
+
+    result = optimizer.best_teams(DUNGEON, size=size, top_k=5, budget=10)
+
+    assert result["exhaustive"]
+    assert [score for score, _ in result["teams"]] == pytest.approx(_brute_force(optimizer, DUNGEON, size, 5))
+    water = {hunter_id for hunter_id, elements in optimizer.data.elements.items() if "Water" in elements}
+    assert all(not water.intersection(team) for _, team in result["teams"])
+
+
+def test_large_search_stays_within_budget():
+    optimizer = TeamOptimizer(_game_data(2000))
+
+    result = optimizer.best_teams(DUNGEON, size=5, top_k=10)
+
+    assert len(result["teams"]) == 10
+    assert result["elapsed_ms"] < 1000
+    assert result["evaluated"] < 2000 ** 2  # l'élagage évite l'énumération des C(2000, 5) équipes
+
+
+def test_gem_builds_match_exhaustive_search():
+    gems = {
+        f"gem_{i}": {
+            "power": 600,
+            "effects": {
+                "armor": {"type": kind, "value": value, "unit": "%"},
+                "weapon": {"type": "damage", "value": value * 2, "unit": "%"},
+            },
+        } for i, (kind, value) in enumerate([("defense", 12), ("health", 30), ("utility", 35), ("defense", 8)])
+    }
+    optimizer = GemBuildOptimizer(gems)
+    weights = FOCUS_WEIGHTS["tank"]
+
+    best = optimizer.best_builds(weights, armor_slots=5, weapon_slots=2, top_k=1)[0]
+
+    def side_score(side, picks):
+        total = 0.0
+        for g in set(picks):
+            effect = gems[f"gem_{g}"]["effects"][side]
+            count = picks.count(g)
+            gain = (1 - optimizer.DECAY ** count) / (1 - optimizer.DECAY)
+            total += weights.get(effect["type"], 0.0) * effect["value"] / 100 * gain
+        return total
+
+    expected = max(side_score("armor", picks) for picks in combinations_with_replacement(range(4), 5)) \
+        + max(side_score("weapon", picks) for picks in combinations_with_replacement(range(4), 2))
+    assert best["score"] == pytest.approx(expected, abs=1e-3)
+    assert "gem_2" not in best["armor"]  # bonus XP inutile pour un tank
+    assert best["total_power"] == 600 * 7
+
+
+def test_large_gem_search_returns_best_found_within_budget():
+    gems = {
+        f"gem_{i}": {
+            "power": 100 + i,
+            "effects": {
+                "armor": {"type": "defense", "value": 5 + i % 17, "unit": "%"},
+                "weapon": {"type": "damage", "value": 3 + i % 11, "unit": "%"},
+            },
+        } for i in range(80)
+    }
+    optimizer = GemBuildOptimizer(gems)
+
+    start = time.perf_counter()
+    builds = optimizer.best_builds(FOCUS_WEIGHTS["tank"], armor_slots=12, weapon_slots=8, top_k=3, budget=0.05)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 2.0  # C(91, 12) répartitions sans plafond
+    assert len(builds) == 3 and not builds[0]["exhaustive"]
+    assert sum(builds[0]["armor"].values()) == 12 and sum(builds[0]["weapon"].values()) == 8
+    assert builds[0]["score"] >= builds[-1]["score"]
@@ -0,0 +1,132 @@
+"""
+🧪 Tests du scraper Hunt Royal (utils/hunt_royal_scraper.py) sur un serveur HTTP local
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("aiohttp")
+pytest.importorskip("bs4")
+
+from utils.hunt_royal_scraper import HuntRoyalScraper
+
+HUNTERS = {
+    "Archer": {"role": "DPS", "hp_stats": [100, 120], "attack_stats": [10, 12], "speed": 5, "perks_count": 3},
+    "Knight": {"role": "Tank", "hp_stats": [300, 330], "attack_stats": [6, 7], "speed": 3, "perks_count": 2},
+    "Mage": {"role": "Support", "hp_stats": [80, 90], "attack_stats": [15, 18], "speed": 4, "perks_count": 4},
+}
+
+
+class FixtureServer:
+    """Sert la liste des chasseurs et /api/hunter/<slug> avec ETag et 304"""
+
+    def __init__(self):
+        self.hunters = json.loads(json.dumps(HUNTERS))
+        self.hits = Counter()
+        self.slow = set()  # slugs dont la réponse ne vient jamais (collecte interrompue)
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                fixture.hits[self.path] += 1
+                if self.path == "/public/hunters.html":
+                    body = "".join(f'<img src="/assets/hunters/{name}.png">' for name in fixture.hunters)
+                elif self.path.startswith("/api/hunter/"):
+                    slug = self.path.rsplit("/", 1)[-1]
+                    name = slug.capitalize()
+                    if name not in fixture.hunters:
+                        self.send_response(404)
+                        self.end_headers()
+                        return
+                    if slug in fixture.slow:
+                        time.sleep(2)
+                    body = json.dumps(fixture.hunters[name])
+                else:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+
+                etag = f'"{hash(body) & 0xffffffff:x}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                payload = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def api_hits(self):
+        return sum(count for path, count in self.hits.items() if path.startswith("/api/"))
+
+
+@pytest.fixture
+def server():
+    fixture = FixtureServer()
+    thread = threading.Thread(target=fixture.server.serve_forever, daemon=True)
+    thread.start()
+    yield fixture
+    fixture.server.shutdown()
+    fixture.server.server_close()
+
+
+def _scraper(server, tmp_path):
+    return HuntRoyalScraper(base_url=server.url, cache_file=str(tmp_path / "cache.json"),
+                            concurrency=3, requests_per_second=200, timeout=5)
+
+
+def test_interrupted_run_resumes_from_checkpoint(server, tmp_path):
+    server.slow.add("mage")
+    scraper = _scraper(server, tmp_path)
+
+    async def interrupted():
+        await asyncio.wait_for(scraper.fetch_all_hunters_data(), timeout=1)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(interrupted())
+    assert (tmp_path / "cache.json.checkpoint").exists()
+
+    server.slow.clear()
+    server.hits.clear()
+    data = asyncio.run(_scraper(server, tmp_path).fetch_all_hunters_data())
+
+    assert sorted(data) == ["Archer", "Knight", "Mage"]
+    assert server.api_hits() == 1 and server.hits["/api/hunter/mage"] == 1
+    assert not (tmp_path / "cache.json.checkpoint").exists()
+
+
+def test_revalidation_diff_and_incremental_upserts(server, tmp_path):
+    db_path = str(tmp_path / "hunt_royal.db")
+    assert asyncio.run(_scraper(server, tmp_path).update_database(db_path)) == {"upserted": 3, "unchanged": 0}
+
+    # Rien n'a changé : uniquement des 304, aucune ligne réécrite
+    scraper = _scraper(server, tmp_path)
+    assert asyncio.run(scraper.update_database(db_path, force_refresh=True)) == {"upserted": 0, "unchanged": 3}
+    assert scraper.stats["not_modified"] == scraper.stats["requests"] == 4
+
+    # Un chasseur modifié : seule sa ligne est écrite
+    server.hunters["Knight"]["speed"] = 9
+    scraper = _scraper(server, tmp_path)
+    assert asyncio.run(scraper.update_database(db_path, force_refresh=True)) == {"upserted": 1, "unchanged": 2}
+    assert scraper.last_diff["updated"] == ["Knight"]
+    assert scraper.last_diff["unchanged"] == ["Archer", "Mage"]
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT speed FROM hunters_detailed WHERE id = 'knight'").fetchone() == (9,)
+        assert conn.execute("SELECT COUNT(*) FROM hunters_detailed").fetchone() == (3,)
@@ -0,0 +1,58 @@
+"""
+🧪 Tests de l'écriture groupée des logs (utils/log_sink.py)
+"""
+
+import asyncio
+import importlib
+
+from utils.log_sink import BatchedLogSink
+
+INSERT = "INSERT INTO events (name) VALUES (?)"
+
+
+def _pool(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    module = importlib.import_module("modules.sqlite_database")
+    manager = module.ArsenalDatabaseManager()
+    with manager.connect("logs.db") as conn:
+        conn.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, name TEXT)")
+    return manager, manager.pool("logs.db")
+
+
+def test_rows_are_written_in_batches(tmp_path, monkeypatch):
+    """Les événements en file sont écrits en quelques transactions"""
+    manager, pool = _pool(tmp_path, monkeypatch)
+
+    async def scenario():
+        sink = BatchedLogSink(pool, INSERT, batch_size=100, flush_interval=60)
+        for i in range(250):
+            await sink.put((f"event-{i}",))
+        await sink.flush()
+        await sink.close()
+        return sink.stats, (await pool.fetchone("SELECT COUNT(*) FROM events"))[0]
+
+    stats, count = asyncio.run(scenario())
+    assert count == 250
+    assert stats["written"] == 250
+    assert stats["batches"] == 3
+    manager.close_all()
+
+
+def test_low_priority_events_are_dropped_under_load(tmp_path, monkeypatch):
+    """Au-delà du seuil, seuls les événements prioritaires entrent dans la file"""
+    manager, pool = _pool(tmp_path, monkeypatch)
+
+    async def scenario():
+        sink = BatchedLogSink(pool, INSERT, max_queue=10, low_priority_watermark=0.5, flush_interval=60)
+        accepted = [sink.offer((f"edit-{i}",), low_priority=True) for i in range(8)]
+        important = [sink.offer((f"ban-{i}",)) for i in range(8)]
+        await sink.close()
+        return sink.stats, accepted, important
+
+    stats, accepted, important = asyncio.run(scenario())
+    assert accepted.count(True) == 5
+    assert important.count(True) == 5
+    assert stats["dropped_low_priority"] == 3
+    assert stats["dropped_overflow"] == 3
+    assert stats["written"] == 10
+    manager.close_all()
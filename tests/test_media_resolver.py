@@ -0,0 +1,68 @@
+"""
+🧪 Tests de la résolution des pistes audio (utils/media_resolver.py)
+"""
+
+import asyncio
+import time
+
+from utils.media_resolver import TrackResolver, stream_expiry
+
+
+class FakeExtractor:
+    """Remplace yt-dlp : une playlist de 3 vidéos, flux expirant dans 1 h"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, options, query):
+        self.calls.append((options.get("extract_flat"), query))
+        time.sleep(0.01)
+        if "playlist" in query:
+            return {
+                "title": "Mix",
+                "entries": [{"id": f"v{i}", "title": f"Piste {i}", "duration": 60} for i in range(3)],
+            }
+        expire = int(time.time()) + 3600
+        return {"title": query, "webpage_url": query, "url": f"https://cdn/{query}?expire={expire}"}
+
+
+def test_playlist_is_flat_and_streams_are_resolved_lazily():
+    """Playlist sans résolution des flux ; un flux résolu est ensuite servi par le cache"""
+    extractor = FakeExtractor()
+    resolver = TrackResolver({}, extractor=extractor)
+
+    async def scenario():
+        tracks = await resolver.search("https://youtube.com/playlist?list=x")
+        assert [t["url"] for t in tracks] == [None, None, None]
+        assert tracks[0]["playlist"] == "Mix"
+
+        await resolver.resolve(tracks[0])
+        again = await resolver.search("https://youtube.com/playlist?list=x")
+        await resolver.resolve(again[0])
+        return tracks, again
+
+    tracks, again = asyncio.run(scenario())
+    assert tracks[0]["url"].startswith("https://cdn/")
+    assert again[0]["url"] == tracks[0]["url"]
+    assert len(extractor.calls) == 2  # playlist + un seul flux
+    resolver.close()
+
+
+def test_concurrent_resolutions_are_coalesced():
+    """Lecture et préchargement de la même piste ne lancent qu'une extraction"""
+    extractor = FakeExtractor()
+    resolver = TrackResolver({}, extractor=extractor)
+
+    async def scenario():
+        track = {"title": "x", "webpage_url": "https://youtube.com/watch?v=a", "url": None}
+        resolver.prefetch(track)
+        await resolver.resolve(dict(track))
+
+    asyncio.run(scenario())
+    assert len(extractor.calls) == 1
+    resolver.close()
+
+
+def test_stream_expiry_reads_expire_parameter():
+    assert stream_expiry("https://cdn/x?expire=1700000000&ip=1") == 1700000000
+    assert stream_expiry("https://cdn/x", now=100) > 100
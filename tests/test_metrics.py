@@ -0,0 +1,80 @@
+"""
+🧪 Tests du registre de métriques et du serveur de santé (core/metrics.py, core/metrics_server.py)
+"""
+
+import asyncio
+
+import pytest
+
+from core.metrics import MetricsRegistry
+
+
+def test_prometheus_text_format():
+    """Compteurs, jauges et histogrammes au format d'exposition Prometheus"""
+    registry = MetricsRegistry()
+    registry.inc("arsenal_db_errors_total", help_text="Erreurs", db="levels.db")
+    registry.gauge("arsenal_queue_depth", lambda: 7, "File", queue="event_logs")
+    for value in (0.002, 0.02, 3.0):
+        registry.observe("arsenal_event_handler_seconds", value, cog="LevelSystem", event="on_message")
+
+    text = registry.render_prometheus()
+
+    assert "# TYPE arsenal_db_errors_total counter" in text
+    assert 'arsenal_db_errors_total{db="levels.db"} 1' in text
+    assert 'arsenal_queue_depth{queue="event_logs"} 7' in text
+    assert 'arsenal_event_handler_seconds_bucket{cog="LevelSystem",event="on_message",le="0.005"} 1' in text
+    assert 'arsenal_event_handler_seconds_bucket{cog="LevelSystem",event="on_message",le="+Inf"} 3' in text
+    assert 'arsenal_event_handler_seconds_count{cog="LevelSystem",event="on_message"} 3' in text
+
+
+def test_json_snapshot_summarises_histograms():
+    registry = MetricsRegistry()
+    for _ in range(99):
+        registry.observe("latency", 0.001)
+    registry.observe("latency", 2.0)
+    registry.gauge("broken", lambda: 1 / 0)
+
+    snapshot = registry.snapshot()
+
+    summary = snapshot["latency"][0]
+    assert summary["count"] == 100
+    assert summary["p50"] == 0.001
+    assert summary["max"] == 2.0
+    assert "broken" not in snapshot
+
+
+def test_server_routes():
+    """/health, /status et /metrics répondent depuis le processus du bot"""
+    pytest.importorskip("discord")
+    aiohttp = pytest.importorskip("aiohttp")
+    from core.metrics_server import MetricsServer
+
+    class FakeBot:
+        user = None
+        latency = 0.042
+        guilds = []
+        cogs = {}
+
+        def is_ready(self):
+            return False
+
+    async def scenario():
+        server = MetricsServer(FakeBot(), host="127.0.0.1", port=0)
+        await server.start()
+        port = server.runner.addresses[0][1]
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"http://127.0.0.1:{port}/health") as response:
+                    health = await response.json()
+                async with session.get(f"http://127.0.0.1:{port}/status") as response:
+                    status = await response.json()
+                async with session.get(f"http://127.0.0.1:{port}/metrics") as response:
+                    text = await response.text()
+        finally:
+            await server.stop()
+        return health, status, text
+
+    health, status, text = asyncio.run(scenario())
+    assert health["status"] == "healthy"
+    assert status["online"] is False
+    assert "arsenal_gateway_latency_seconds 0.042" in text
@@ -0,0 +1,84 @@
+"""
+🧪 Tests du profilage des handlers (core/profiler.py)
+"""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+from core.profiler import HandlerProfiler
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = HandlerProfiler()
+
+    with profiler.track("listener", "LevelSystem", "on_message"):
+        pass
+
+    assert profiler.report()["handlers"] == []
+
+
+def test_handler_latency_and_blocking_sample(tmp_path):
+    """Un time.sleep dans un handler est mesuré et signalé avec sa pile"""
+    profiler = HandlerProfiler(block_threshold=0.05)
+
+    def blocking_call():
+        time.sleep(0.3)
+
+    async def on_message():
+        with profiler.track("listener", "AutoModCog", "on_message"):
+            blocking_call()
+
+    async def scenario():
+        profiler.enable()
+        await asyncio.sleep(0.05)
+        for _ in range(3):
+            with profiler.track("listener", "LevelSystem", "on_message"):
+                await asyncio.sleep(0)
+        await on_message()
+        await asyncio.sleep(0.1)
+        profiler.disable()
+
+    asyncio.run(scenario())
+    report = profiler.report()
+
+    slowest = report["handlers"][0]
+    assert (slowest["cog"], slowest["handler"]) == ("AutoModCog", "on_message")
+    assert slowest["max"] >= 0.3
+    assert report["cogs"]["LevelSystem"] < report["cogs"]["AutoModCog"]
+
+    blocks = [b for b in report["blocks"] if b["handler"] == "AutoModCog.on_message"]
+    assert len(blocks) == 1
+    assert blocks[0]["duration_ms"] >= 250
+    assert any("blocking_call" in line for line in blocks[0]["stack"])
+
+    path = profiler.export(str(tmp_path))
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f)["blocks"][0]["handler"] == "AutoModCog.on_message"
+
+
+def test_instrument_commands_is_idempotent():
+    profiler = HandlerProfiler()
+    calls = []
+
+    async def callback(cog, interaction):
+        calls.append(interaction)
+        return "ok"
+
+    command = SimpleNamespace(name="rank", qualified_name="level rank", binding=SimpleNamespace(qualified_name="LevelSystem"), _callback=callback)
+    tree = SimpleNamespace(walk_commands=lambda: [command], _context_menus={})
+
+    assert profiler.instrument_commands(tree) == 1
+    assert profiler.instrument_commands(tree) == 0
+
+    async def scenario():
+        profiler.enable()
+        result = await command._callback(None, "interaction")
+        profiler.disable()
+        return result
+
+    assert asyncio.run(scenario()) == "ok"
+    assert calls == ["interaction"]
+    handler = profiler.report()["handlers"][0]
+    assert (handler["type"], handler["cog"], handler["handler"]) == ("command", "LevelSystem", "level rank")
@@ -0,0 +1,51 @@
+"""
+🧪 Tests de l'index de classement (utils/rank_index.py)
+"""
+
+import random
+
+from utils.rank_index import RankIndex
+
+
+def _expected(scores):
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+def test_rank_and_pages_match_a_full_sort():
+    rng = random.Random(7)
+    RankIndex.LOAD, load = 8, RankIndex.LOAD  # Petits blocs : découpages et suppressions de blocs
+    try:
+        scores = {f"u{i}": rng.randint(0, 50) for i in range(300)}
+        index = RankIndex(scores.items())
+
+        for _ in range(2000):
+            member = f"u{rng.randrange(400)}"
+            if rng.random() < 0.1:
+                index.remove(member)
+                scores.pop(member, None)
+            else:
+                scores[member] = rng.randint(0, 50)
+                index.update(member, scores[member])
+
+        expected = _expected(scores)
+        assert len(index) == len(expected)
+        assert index.page(0, len(expected)) == expected
+        assert index.page(37, 10) == expected[37:47]
+        assert index.page(len(expected) - 3, 10) == expected[-3:]
+        assert index.page(len(expected), 10) == []
+        for position, (member, _) in enumerate(expected, start=1):
+            assert index.rank(member) == position
+    finally:
+        RankIndex.LOAD = load
+
+
+def test_min_score_excludes_members():
+    index = RankIndex([("a", 10), ("b", 0), ("c", 5)], min_score=1)
+
+    assert index.page(0, 10) == [("a", 10), ("c", 5)]
+    assert index.rank("b") is None
+
+    index.update("a", 0)
+    index.update("b", 7)
+    assert index.page(0, 10) == [("b", 7), ("c", 5)]
+    assert "a" not in index
@@ -0,0 +1,65 @@
+"""
+🧪 Tests des compteurs à fenêtre glissante (utils/rate_tracker.py)
+"""
+
+from utils.rate_tracker import SlidingWindowCounter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_events_expire_with_the_window():
+    """Seuls les événements de la fenêtre sont comptés"""
+    clock = FakeClock()
+    counter = SlidingWindowCounter(window=5, clock=clock)
+
+    for _ in range(3):
+        counter.hit("user")
+        clock.now += 1
+    assert counter.count("user") == 3
+
+    clock.now += 5
+    assert counter.hit("user") == (1, 0)
+
+
+def test_duplicates_are_counted_by_fingerprint():
+    """Les doublons sont comptés par empreinte de contenu"""
+    counter = SlidingWindowCounter(window=5, clock=FakeClock())
+
+    counter.hit("user", "salut")
+    counter.hit("user", "spam")
+    assert counter.hit("user", "spam") == (3, 2)
+
+
+def test_memory_is_bounded():
+    """Événements par clé plafonnés, clés inactives et excédentaires évincées"""
+    clock = FakeClock()
+    counter = SlidingWindowCounter(window=60, max_events=10, idle_ttl=30, max_keys=100, clock=clock)
+
+    for _ in range(1000):
+        counter.hit("guild")
+    assert counter.count("guild") == 10
+
+    for member in range(500):
+        counter.hit(member)
+    assert len(counter) == 100
+
+    clock.now += 120
+    counter.hit("new")
+    assert len(counter) == 1
+
+
+def test_allow_as_cooldown():
+    """allow() sert de cooldown"""
+    clock = FakeClock()
+    cooldowns = SlidingWindowCounter(window=10, max_events=1, clock=clock)
+
+    assert cooldowns.allow("user")
+    assert not cooldowns.allow("user")
+    clock.now += 11
+    assert cooldowns.allow("user")
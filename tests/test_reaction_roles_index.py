@@ -0,0 +1,57 @@
+"""
+🧪 Tests de l'index des panels et du journal groupé (commands/reaction_roles_system.py)
+"""
+
+import asyncio
+import sqlite3
+
+import pytest
+
+pytest.importorskip("discord")
+
+
+def _db(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    from commands.reaction_roles_system import ReactionRolesDB
+    return ReactionRolesDB(str(tmp_path / "reaction_roles.db"))
+
+
+def test_index_follows_panel_writes(tmp_path, monkeypatch):
+    """Création, nouveau message et ajout de rôle sont visibles sans relecture"""
+    db = _db(tmp_path, monkeypatch)
+
+    panel_id = db.create_panel(1, 10, {"panel_name": "Jeux"})
+    assert len(db.index) == 0  # Pas encore de message
+
+    db.update_panel_message_id(panel_id, 555)
+    db.add_role_to_panel(panel_id, "🎮", 42, "Gamer")
+    assert 555 in db.index
+    assert db.get_role_by_reaction(panel_id, "🎮")["role_id"] == 42
+
+    db.update_panel_message_id(panel_id, 777)
+    assert 555 not in db.index and 777 in db.index
+
+    reloaded = type(db)(db.db_path)
+    assert reloaded.get_panel_by_message(777)["panel_name"] == "Jeux"
+    assert reloaded.index.panel_role_ids(panel_id) == [42]
+
+
+def test_assignment_log_is_batched_in_order(tmp_path, monkeypatch):
+    """Attribution puis retrait dans le même lot : le retrait gagne, les stats suivent"""
+    db = _db(tmp_path, monkeypatch)
+    panel_id = db.create_panel(1, 10, {"panel_name": "Jeux", "message_id": 555})
+    db.add_role_to_panel(panel_id, "🎮", 42, "Gamer")
+
+    async def run():
+        await db.log_role_assignment(1, 100, panel_id, 42, "🎮")
+        await db.log_role_assignment(1, 200, panel_id, 42, "🎮")
+        await db.remove_role_assignment(1, 100, panel_id, 42)
+        await db.events.close()
+
+    asyncio.run(run())
+
+    conn = sqlite3.connect(db.db_path)
+    assert conn.execute("SELECT user_id FROM reaction_role_users").fetchall() == [(200,)]
+    assert conn.execute("SELECT total_reactions, unique_users FROM reaction_panel_stats").fetchone() == (2, 2)
+    assert conn.execute("SELECT COUNT(*) FROM reaction_role_events").fetchone() == (0,)
+    assert db.events.stats["batches"] == 1
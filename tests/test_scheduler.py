@@ -0,0 +1,108 @@
+"""
+🧪 Tests du planificateur central (core/scheduler.py)
+"""
+
+import asyncio
+import time
+
+from core.scheduler import JobScheduler
+
+
+def test_jobs_run_in_due_order_without_polling(tmp_path):
+    scheduler = JobScheduler(str(tmp_path / "jobs.db"))
+    ran = []
+
+    async def handler(job):
+        ran.append((job.payload["name"], time.time() >= job.due_at))
+
+    async def run():
+        scheduler.register("test", handler)
+        scheduler.start()
+        now = time.time()
+        scheduler.schedule("test", now + 0.15, {"name": "late"})
+        scheduler.schedule("test", now + 0.05, {"name": "early"})
+        scheduler.schedule("test", now + 0.10, {"name": "cancelled"}, key="cancel-me")
+        assert scheduler.cancel("cancel-me")
+        await asyncio.sleep(0.3)
+        await scheduler.stop()
+
+    asyncio.run(run())
+    assert ran == [("early", True), ("late", True)]
+    assert scheduler.pending() == []
+    assert scheduler.wakeups <= 4  # un réveil par échéance (+ ajouts en tête de tas)
+
+
+def test_jobs_survive_restart_and_wait_for_their_handler(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    first = JobScheduler(path)
+    first.schedule("later", time.time() + 3600, {"n": 1}, key="later:1")
+    first.schedule("orphan", time.time() - 1, {"n": 2}, key="orphan:1")
+
+    restarted = JobScheduler(path)
+    assert [job.key for job in restarted.pending()] == ["orphan:1", "later:1"]
+    ran = []
+
+    async def handler(job):
+        ran.append(job.payload)
+
+    async def run():
+        restarted.start()
+        await asyncio.sleep(0.05)
+        assert restarted.report()["parked"] == {"orphan": 1}  # aucun handler : job mis de côté
+        restarted.register("orphan", handler)
+        await asyncio.sleep(0.05)
+        await restarted.stop()
+
+    asyncio.run(run())
+    assert ran == [{"n": 2}]
+    assert [job.key for job in JobScheduler(path).pending()] == ["later:1"]
+
+
+def test_recurring_and_failing_jobs_are_rescheduled(tmp_path):
+    scheduler = JobScheduler(str(tmp_path / "jobs.db"))
+    calls = []
+
+    async def tick():
+        calls.append(time.time())
+
+    async def broken(job):
+        raise RuntimeError("boom")
+
+    async def run():
+        scheduler.every("cleanup", 0.05, tick, first_run=time.time())
+        scheduler.register("broken", broken)
+        scheduler.schedule("broken", time.time(), key="broken:1")
+        scheduler.start()
+        await asyncio.sleep(0.18)
+        await scheduler.stop()
+
+    asyncio.run(run())
+    assert 3 <= len(calls) <= 5
+    assert scheduler.get("cleanup").interval == 0.05
+    failed = scheduler.get("broken:1")
+    assert failed.attempts == 1 and failed.due_at > time.time() + 30
+
+
+def test_overdue_jobs_run_with_bounded_concurrency(tmp_path):
+    scheduler = JobScheduler(str(tmp_path / "jobs.db"), max_running=3)
+    running, peak, done = set(), [0], []
+
+    async def handler(job):
+        running.add(job.key)
+        peak[0] = max(peak[0], len(running))
+        await asyncio.sleep(0.02)
+        running.discard(job.key)
+        done.append(job.key)
+
+    async def run():
+        scheduler.register("overdue", handler)
+        for i in range(10):
+            scheduler.schedule("overdue", time.time() - 60, key=f"overdue:{i}")
+        scheduler.start()
+        await asyncio.sleep(0.3)
+        await scheduler.stop()
+
+    asyncio.run(run())
+    assert peak[0] == 3
+    assert len(done) == 10
+    assert scheduler.pending() == []
@@ -0,0 +1,65 @@
+"""
+🧪 Tests du pool SQLite partagé (modules/sqlite_database.py)
+"""
+
+import asyncio
+import importlib
+
+
+def _manager(tmp_path, monkeypatch):
+    """Importe le gestionnaire dans un dossier temporaire (il crée ses bases au chargement)"""
+    monkeypatch.chdir(tmp_path)
+    module = importlib.import_module("modules.sqlite_database")
+    return module.ArsenalDatabaseManager()
+
+
+def test_connect_reuses_pooled_connection(tmp_path, monkeypatch):
+    """close() rend la connexion au pool au lieu de la fermer"""
+    manager = _manager(tmp_path, monkeypatch)
+
+    conn = manager.connect("pool.db")
+    raw = conn._conn
+    conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.commit()
+    conn.close()
+
+    conn = manager.connect("pool.db")
+    assert conn._conn is raw
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.close()
+    manager.close_all()
+
+
+def test_uncommitted_work_is_rolled_back_on_release(tmp_path, monkeypatch):
+    """Une transaction non validée ne fuit pas vers l'emprunteur suivant"""
+    manager = _manager(tmp_path, monkeypatch)
+
+    with manager.connect("pool.db") as conn:
+        conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, name TEXT)")
+
+    conn = manager.connect("pool.db")
+    conn.execute("INSERT INTO t (name) VALUES ('perdu')")
+    conn.close()
+
+    conn = manager.connect("pool.db")
+    assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    conn.close()
+    manager.close_all()
+
+
+def test_async_api(tmp_path, monkeypatch):
+    """L'API asynchrone passe par les threads du pool"""
+    manager = _manager(tmp_path, monkeypatch)
+    pool = manager.pool("pool.db")
+
+    async def scenario():
+        await pool.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, name TEXT)")
+        await pool.executemany("INSERT INTO t (name) VALUES (?)", [("a",), ("b",), ("c",)])
+        rows = await asyncio.gather(*(pool.fetchall("SELECT * FROM t ORDER BY id") for _ in range(8)))
+        row = await pool.fetchone("SELECT name FROM t WHERE id = ?", (2,))
+        return rows, row
+
+    rows, row = asyncio.run(scenario())
+    assert all([r["name"] for r in result] == ["a", "b", "c"] for result in rows)
+    assert row["name"] == "b"
+    manager.close_all()
@@ -0,0 +1,65 @@
+"""
+🧪 Tests du tampon des votes et du classement des suggestions (modules/suggestions_system.py)
+"""
+
+import asyncio
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("discord")
+
+from modules.suggestions_system import SuggestionManager, SuggestionsDatabase, wilson_score
+
+AUTHOR = SimpleNamespace(id=1, display_name="Nora", discriminator="0")
+
+
+def _manager(tmp_path):
+    return SuggestionManager(SuggestionsDatabase(str(tmp_path / "suggestions.db")))
+
+
+def _counts(tmp_path):
+    conn = sqlite3.connect(tmp_path / "suggestions.db")
+    rows = dict((row[0], row[1:]) for row in conn.execute("SELECT id, votes_up, votes_down FROM suggestions"))
+    votes = conn.execute("SELECT COUNT(*) FROM suggestion_votes").fetchone()[0]
+    conn.close()
+    return rows, votes
+
+
+def test_wilson_score_prefers_confident_majorities():
+    assert wilson_score(0, 0) == 0.0
+    assert wilson_score(40, 5) > wilson_score(2, 0)
+    assert wilson_score(10, 10) < wilson_score(10, 1)
+
+
+def test_votes_are_buffered_then_written_once_per_suggestion(tmp_path):
+    manager = _manager(tmp_path)
+
+    async def scenario():
+        first = await manager.create_suggestion(AUTHOR, "Casino", "Des jeux")
+        second = await manager.create_suggestion(AUTHOR, "Musique", "Plus de radios")
+        for user in range(30):
+            await manager.vote_suggestion(first, str(user), "up")
+        await manager.vote_suggestion(first, "0", "down")  # changement de vote
+        await manager.vote_suggestion(first, "0", "down")  # doublon ignoré
+        await manager.vote_suggestion(second, "99", "up")
+        assert _counts(tmp_path) == ({first: (0, 0), second: (0, 0)}, 0)  # rien sur disque avant le flush
+        assert manager.votes.top(2) == [first, second]
+        await manager.votes.flush()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert _counts(tmp_path) == ({first: (29, 1), second: (1, 0)}, 31)
+
+    # Redémarrage : compteurs et classement rechargés depuis la base
+    reloaded = _manager(tmp_path)
+    assert reloaded.votes.counts[first] == [29, 1]
+    assert reloaded.votes.top(1) == [first]
+
+
+def test_unrelated_reactions_are_rejected_from_memory(tmp_path):
+    manager = _manager(tmp_path)
+    manager.votes.track(7, message_id=123456)
+    assert manager.votes.suggestion_for_message(123456) == 7
+    assert manager.votes.suggestion_for_message(999) is None
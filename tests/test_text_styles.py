@@ -0,0 +1,46 @@
+"""
+🧪 Tests du moteur de styles d'écriture (utils/text_styles.py)
+"""
+
+from utils.text_styles import (
+    BOLD_TABLE, BUBBLE_TABLE, ITALIC_TABLE, LEET_TABLE, alternating_case, compile_writing_style, compose_tables, uwu
+)
+
+
+def _style(*transforms, prefix="", suffix="", signature=""):
+    return {
+        "enabled": True,
+        "text_transforms": {name: True for name in transforms},
+        "emoji_style": {"emoji_prefix": prefix, "emoji_suffix": suffix},
+        "message_formatting": {"add_signature": bool(signature), "signature_text": signature},
+    }
+
+
+def test_tables_match_reference_characters():
+    assert "Hello 2024".translate(BUBBLE_TABLE) == "Ⓗⓔⓛⓛⓞ ②⓪②④"
+    assert "Az".translate(BOLD_TABLE) == "𝐀𝐳"
+    assert "hi".translate(ITALIC_TABLE) == "ℎ𝑖"
+    assert "Legit".translate(LEET_TABLE) == "13917"
+
+
+def test_composed_table_equals_sequential_translate():
+    text = "Arsenal Bot: leet et bulles 123"
+    composed = compose_tables(LEET_TABLE, BUBBLE_TABLE)
+    assert text.translate(composed) == text.translate(LEET_TABLE).translate(BUBBLE_TABLE)
+
+
+def test_case_helpers():
+    assert alternating_case("arsenal") == "ArSeNaL"
+    assert alternating_case("ßab") == "SSaB"  # repli caractère par caractère (ß -> SS)
+    assert uwu("Nora no Lune") == "Nyowa nyo Wunye"
+
+
+def test_chain_merges_tables_and_memoizes_phrases():
+    style = _style("lowercase", "leetspeak", "bubble_text", "spoiler", prefix="💻 ", signature="GG")
+    chain = compile_writing_style(style)
+
+    assert len(chain) == 5  # casse, tables leet + bulles fusionnées, spoiler, préfixe, signature
+    assert chain("Salut") == "💻 ||⑤④①ⓤ⑦||\n\nGG"
+    chain("Salut")
+    assert chain.apply.cache_info().hits == 1
+    assert compile_writing_style(dict(style)) is chain  # profils identiques : même chaîne
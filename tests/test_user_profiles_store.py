@@ -0,0 +1,98 @@
+"""
+🧪 Tests du stockage SQLite des profils utilisateurs (modules/user_profiles_system.py)
+"""
+
+import asyncio
+import json
+import sqlite3
+
+import pytest
+
+pytest.importorskip("discord")
+
+
+def _system(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    from modules.user_profiles_system import UserProfileSystem
+    return UserProfileSystem(bot=None)
+
+
+def _stored(tmp_path):
+    conn = sqlite3.connect(tmp_path / "data" / "user_profiles.db")
+    rows = dict(conn.execute("SELECT user_id, data FROM user_profiles").fetchall())
+    conn.close()
+    return {user_id: json.loads(data) for user_id, data in rows.items()}
+
+
+def test_json_file_is_migrated_once(tmp_path, monkeypatch):
+    (tmp_path / "data").mkdir()
+    legacy = {"1": {"theme": "dark"}, "2": {"theme": "light"}}
+    (tmp_path / "data" / "user_profiles.json").write_text(json.dumps(legacy), encoding="utf-8")
+
+    system = _system(tmp_path, monkeypatch)
+
+    assert _stored(tmp_path) == legacy
+    assert not (tmp_path / "data" / "user_profiles.json").exists()
+    assert (tmp_path / "data" / "user_profiles.json.migrated").exists()
+    assert system.get_user_profile(2) == {"theme": "light"}
+    assert system.migrate_json() == 0
+
+
+def test_updates_are_coalesced_into_one_flush(tmp_path, monkeypatch):
+    system = _system(tmp_path, monkeypatch)
+
+    async def activity():
+        for _ in range(50):
+            await system.update_user_statistics(42, "messages_sent")
+        assert await system.check_achievements(42) == ["👶 Premiers Pas"]
+        await system.update_user_statistics(7, "commands_used")
+        assert _stored(tmp_path) == {}  # rien n'est écrit avant le flush
+        assert system.dirty == {"42", "7"}
+        await system.flush()
+
+    asyncio.run(activity())
+
+    assert system.dirty == set()
+    stored = _stored(tmp_path)
+    assert stored["42"]["statistics"]["messages_sent"] == 50
+    assert stored["42"]["statistics"]["achievements"] == ["first_steps"]
+    assert stored["7"]["statistics"]["commands_used"] == 1
+
+
+def test_cache_is_bounded_and_never_drops_unwritten_profiles(tmp_path, monkeypatch):
+    system = _system(tmp_path, monkeypatch)
+    system.MAX_CACHED = 3
+
+    for user_id in range(5):
+        system.get_user_profile(user_id)  # profils créés : en attente d'écriture
+    assert len(system.profiles) == 5
+
+    system.save_profiles()
+    system.get_user_profile(99)
+    assert len(system.profiles) == 3
+    assert list(system.profiles)[-1] == "99"
+
+    reloaded = system.get_user_profile(0)  # relu depuis la base
+    assert reloaded["statistics"]["messages_sent"] == 0
+
+
+def test_profiles_being_written_stay_cached(tmp_path, monkeypatch):
+    system = _system(tmp_path, monkeypatch)
+    system.MAX_CACHED = 1
+    system.update_user_profile(1, {"theme": "dark"})
+
+    write = system.pool.run
+
+    async def write_with_traffic(func, *args):
+        # Pendant l'écriture : d'autres profils poussent le premier hors du LRU
+        for user_id in range(2, 6):
+            system.profiles[str(user_id)] = {}
+            system._evict()
+        assert system.get_user_profile(1) == {"theme": "dark"}
+        return await write(func, *args)
+
+    monkeypatch.setattr(system.pool, "run", write_with_traffic)
+    asyncio.run(system.flush())
+
+    assert _stored(tmp_path) == {"1": {"theme": "dark"}}
+    assert system.writing == set()
@@ -0,0 +1,76 @@
+"""
+🧪 Tests de l'envoi des webhooks (utils/webhook_dispatcher.py)
+Un vrai serveur aiohttp local joue le rôle de Discord
+"""
+
+import asyncio
+import time
+
+import pytest
+
+web = pytest.importorskip("aiohttp.web")
+
+from utils.webhook_dispatcher import WebhookDispatcher
+
+
+async def _server(handler):
+    app = web.Application()
+    app.router.add_post("/{hook}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def test_burst_is_coalesced_and_webhooks_are_posted_in_parallel():
+    received = []
+
+    async def handler(request):
+        received.append((request.match_info["hook"], len((await request.json())["embeds"])))
+        await asyncio.sleep(0.2)  # latence de Discord
+        return web.Response(status=204)
+
+    async def scenario():
+        runner, base = await _server(handler)
+        dispatcher = WebhookDispatcher(coalesce_window=0.05)
+        start = time.perf_counter()
+        futures = [dispatcher.send(f"{base}/hook{n}", {"title": "annonce"}, event="announcement") for n in range(8)]
+        futures += [dispatcher.send(f"{base}/hook0", {"title": f"join {i}"}, event="join") for i in range(12)]
+        statuses = await asyncio.gather(*futures)
+        elapsed = time.perf_counter() - start
+        await dispatcher.close()
+        await runner.cleanup()
+        return statuses, elapsed, dispatcher.stats
+
+    statuses, elapsed, stats = asyncio.run(scenario())
+    assert set(statuses) == {"success"}
+    assert sorted(count for hook, count in received if hook == "hook0") == [1, 2, 10]  # 12 joins -> 10 + 2
+    assert stats["posts"] == 10
+    assert elapsed < 1.0  # 8 webhooks en parallèle, pas 8 allers-retours successifs
+
+
+def test_rate_limited_post_is_retried_after_delay():
+    calls = []
+
+    async def handler(request):
+        calls.append(time.perf_counter())
+        if len(calls) == 1:
+            return web.json_response({"retry_after": 0.3, "global": False}, status=429)
+        return web.Response(status=204, headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "0.2"})
+
+    async def scenario():
+        runner, base = await _server(handler)
+        dispatcher = WebhookDispatcher(coalesce_window=0)
+        first = await dispatcher.send(f"{base}/hook", {"title": "a"}, event="a")
+        second = await dispatcher.send(f"{base}/hook", {"title": "b"}, event="b")
+        await dispatcher.close()
+        await runner.cleanup()
+        return first, second, dispatcher.stats
+
+    first, second, stats = asyncio.run(scenario())
+    assert (first, second) == ("success", "success")
+    assert stats["rate_limited"] == 1
+    assert calls[1] - calls[0] >= 0.3  # retry_after respecté
+    assert calls[2] - calls[1] >= 0.15  # bucket épuisé : attente du reset
@@ -0,0 +1,50 @@
+"""
+🧪 Tests du moteur de filtrage de mots (utils/word_matcher.py)
+"""
+
+from utils.word_matcher import WordMatcher, normalize_text
+
+LEVELS = {
+    1: ["con", "idiot"],
+    2: ["connard", "fils de pute"],
+    3: ["n!quer"],
+    4: ["nazi"],
+}
+
+
+def test_normalize_text():
+    """Accents, leetspeak et espaces sont normalisés"""
+    assert normalize_text("Débile  D3B1LE") == "debile debile"
+    assert normalize_text("n!quer") == "niquer"
+    assert normalize_text("idiot!") == "idiot!"
+
+
+def test_highest_severity_wins():
+    """La détection la plus grave est retournée en une passe"""
+    matcher = WordMatcher(LEVELS)
+    assert matcher.find("espèce d'idiot de nazi") == (4, "nazi")
+    assert matcher.find("c0nnard") == (2, "connard")
+    assert matcher.find("je vais te n1quer") == (3, "n!quer")
+    assert matcher.find("Fils   de PUTE") == (2, "fils de pute")
+
+
+def test_substring_by_default():
+    """Comme l'ancien filtre : formes fléchies et mots composés détectés"""
+    matcher = WordMatcher({1: ["connard", "merde"]})
+    assert matcher.find("bande de connards") == (1, "connard")
+    assert matcher.find("petit merdeux") == (1, "merde")
+    assert WordMatcher(LEVELS).find("un second message") == (1, "con")
+
+
+def test_word_boundary():
+    """Option : le mot doit commencer un mot, les suffixes restent détectés"""
+    matcher = WordMatcher(LEVELS, word_boundary=True)
+    assert matcher.find("un second message") is None
+    assert matcher.find("bande de connards") == (2, "connard")
+    assert matcher.find("des nazis") == (4, "nazi")
+    assert WordMatcher({1: ["merde"]}, word_boundary=True).find("petit merdeux") == (1, "merde")
+
+
+def test_find_by_level():
+    """Premier mot de chaque niveau (commande /automod test_filter)"""
+    assert WordMatcher(LEVELS).find_by_level("idiot et nazi") == {1: "idiot", 4: "nazi"}
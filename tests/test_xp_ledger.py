@@ -0,0 +1,128 @@
+"""
+🧪 Tests du tampon d'XP write-behind (commands/level_system.py)
+"""
+
+import asyncio
+import sqlite3
+
+import pytest
+
+pytest.importorskip("discord")
+
+
+def _ledger(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    from commands.level_system import LevelDB, XPLedger
+    db = LevelDB()
+    return db, XPLedger(db)
+
+
+def test_gains_are_aggregated_and_flushed_once(tmp_path, monkeypatch):
+    """Les gains sont agrégés en mémoire puis écrits en un seul lot"""
+    db, ledger = _ledger(tmp_path, monkeypatch)
+
+    level_ups = [ledger.add_xp("42", "1", 10)[0] for _ in range(10)]
+    assert level_ups.count(True) == 1  # 0 -> 1 à 100 XP
+    assert len(ledger.pending) == 1
+
+    asyncio.run(ledger.close())
+
+    row = sqlite3.connect(db.db_path).execute(
+        "SELECT xp, level, messages, total_xp FROM user_levels WHERE user_id = '42'"
+    ).fetchone()
+    assert row == (100, 1, 10, 100)
+
+
+def test_journal_is_replayed_after_crash(tmp_path, monkeypatch):
+    """Un lot journalisé mais jamais écrit est rejoué au redémarrage"""
+    db, ledger = _ledger(tmp_path, monkeypatch)
+
+    ledger.add_xp("42", "1", 250)
+    ledger._journal.close()  # crash : aucun flush
+
+    from commands.level_system import XPLedger
+    recovered = XPLedger(db)
+    assert recovered.get_state("42", "1")["xp"] == 250
+
+    asyncio.run(recovered.close())
+    assert sqlite3.connect(db.db_path).execute(
+        "SELECT xp FROM user_levels WHERE user_id = '42'"
+    ).fetchone()[0] == 250
+
+
+def test_same_member_in_two_guilds(tmp_path, monkeypatch):
+    """Un membre a un état par serveur, les deux sont écrits en base"""
+    db, ledger = _ledger(tmp_path, monkeypatch)
+
+    ledger.add_xp("42", "1", 100)
+    ledger.add_xp("42", "2", 400)
+    asyncio.run(ledger.close())
+
+    rows = sqlite3.connect(db.db_path).execute(
+        "SELECT guild_id, xp, level FROM user_levels WHERE user_id = '42' ORDER BY guild_id"
+    ).fetchall()
+    assert rows == [("1", 100, 1), ("2", 400, 2)]
+
+
+def test_old_primary_key_is_migrated(tmp_path, monkeypatch):
+    """Une base avec la clé user_id seule est migrée sans perte"""
+    monkeypatch.chdir(tmp_path)
+    conn = sqlite3.connect("arsenal_levels.db")
+    conn.execute("CREATE TABLE user_levels (user_id TEXT PRIMARY KEY, guild_id TEXT NOT NULL, xp INTEGER DEFAULT 0, "
+                 "level INTEGER DEFAULT 0, messages INTEGER DEFAULT 0, voice_minutes INTEGER DEFAULT 0, "
+                 "last_xp_gain TEXT, total_xp INTEGER DEFAULT 0, prestige INTEGER DEFAULT 0, "
+                 "boost_multiplier REAL DEFAULT 1.0, boost_expires TEXT, "
+                 "created_at TEXT DEFAULT CURRENT_TIMESTAMP, updated_at TEXT DEFAULT CURRENT_TIMESTAMP)")
+    conn.execute("INSERT INTO user_levels (user_id, guild_id, xp, total_xp) VALUES ('42', '1', 300, 300)")
+    conn.commit()
+    conn.close()
+
+    db, ledger = _ledger(tmp_path, monkeypatch)
+    assert ledger.get_state("42", "1")["xp"] == 300
+    ledger.add_xp("42", "2", 50)
+    asyncio.run(ledger.close())
+
+    assert sqlite3.connect(db.db_path).execute("SELECT COUNT(*) FROM user_levels").fetchone()[0] == 2
+
+
+def test_state_loaded_during_flush_is_not_double_counted(tmp_path, monkeypatch):
+    """Un état chargé entre la validation du lot et la fin de flush() ne recompte pas le lot"""
+    db, ledger = _ledger(tmp_path, monkeypatch)
+    ledger.add_xp("42", "1", 100)
+    ledger.add_xp("7", "1", 30)
+    ledger.invalidate("1")
+
+    seen = []
+    write = ledger.pool.run
+
+    async def write_then_load(func, *args):
+        result = await write(func, *args)
+        if func == ledger._write_batch:
+            # Le lot est validé en base mais encore dans inflight
+            seen.append(ledger.get_state("42", "1")["xp"])
+            seen.append(ledger.get_state("7", "1")["xp"])
+        return result
+
+    monkeypatch.setattr(ledger.pool, "run", write_then_load)
+    asyncio.run(ledger.flush())
+    assert seen == [100, 30]
+    assert ledger.get_state("42", "1")["xp"] == 100
+
+
+def test_leaderboard_reads_idle_members_in_one_batch(tmp_path, monkeypatch):
+    """Les niveaux des membres hors cache viennent d'une lecture groupée"""
+    db, ledger = _ledger(tmp_path, monkeypatch)
+    for user_id, xp in (("1", 100), ("2", 400), ("3", 900)):
+        ledger.add_xp(user_id, "1", xp)
+    asyncio.run(ledger.flush())
+    asyncio.run(ledger.ranking("1"))
+    ledger.add_xp("1", "1", 350)  # gain pas encore écrit
+    ledger.invalidate("1")
+
+    loads = []
+    load_rows = ledger._load_rows
+    monkeypatch.setattr(ledger, "_load_rows", lambda conn, guild_id, user_ids: loads.append(user_ids) or load_rows(conn, guild_id, user_ids))
+    monkeypatch.setattr(ledger, "get_state", None)  # aucune lecture bloquante sur la boucle
+    page = asyncio.run(ledger.leaderboard_page("1", 0, 10))
+    assert [(entry["user_id"], entry["level"]) for entry in page] == [("3", 3), ("1", 2), ("2", 2)]
+    assert loads == [["3", "1", "2"]]
@@ -0,0 +1,38 @@
+"""
+🧩 Arsenal V4 - Templates des commandes personnalisées
+Réponse découpée une fois en segments (texte / variable) : au rendu, seules
+les variables présentes dans le template sont calculées, une seule fois chacune
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+VARIABLE_RE = re.compile(r"\{(\w+)\}")
+
+
+class CommandTemplate:
+    """Template pré-analysé : `{nom}` est remplacé si `nom` fait partie des variables connues"""
+
+    __slots__ = ("source", "segments", "variables")
+
+    def __init__(self, source: str, known: Tuple[str, ...]):
+        self.source = source
+        self.segments: List[Union[str, Tuple[str]]] = []  # texte brut ou (variable,)
+        position = 0
+        for match in VARIABLE_RE.finditer(source):
+            if match.group(1) not in known:
+                continue  # accolades sans variable connue : texte tel quel
+            if match.start() > position:
+                self.segments.append(source[position:match.start()])
+            self.segments.append((match.group(1),))
+            position = match.end()
+        if position < len(source):
+            self.segments.append(source[position:])
+        self.variables = frozenset(segment[0] for segment in self.segments if isinstance(segment, tuple))
+
+    def render(self, resolvers: Dict[str, Callable[[Any], str]], context: Any) -> str:
+        """Assemble le texte ; chaque variable utilisée est calculée une seule fois"""
+        if not self.variables:
+            return self.source
+        values = {name: resolvers[name](context) for name in self.variables}
+        return "".join(values[segment[0]] if isinstance(segment, tuple) else segment for segment in self.segments)
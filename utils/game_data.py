@@ -0,0 +1,156 @@
+"""
+🎮 Arsenal V4 - Données de jeu en mémoire
+Fichiers JSON (chasseurs, mods Minecraft) chargés une fois puis rechargés
+seulement quand leur mtime change ; index des noms en minuscules pour la
+recherche exacte, index de trigrammes pour les suggestions et l'autocomplétion
+"""
+
+import json
+import logging
+import os
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+from utils.trigram_index import TrigramIndex, normalize
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+AUTOCOMPLETE_LIMIT = 25  # choix maximum renvoyés à Discord
+
+
+class JSONDataset(Generic[T]):
+    """Fichier JSON transformé par `build`, rechargé quand le fichier change
+
+    Le fichier n'est consulté (stat) qu'au plus une fois par `check_interval`.
+    Un fichier illisible garde la dernière version valide.
+    """
+
+    def __init__(self, path: str, build: Callable[[Any], T], check_interval: float = 2.0):
+        self.path = path
+        self.build = build
+        self.check_interval = check_interval
+        self.loads = 0
+        self._value: Optional[T] = None
+        self._signature: Optional[Tuple[int, int]] = None
+        self._checked_at = float("-inf")
+
+    def get(self) -> T:
+        now = time.monotonic()
+        if self._value is None or now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            self._refresh()
+        return self._value
+
+    def _refresh(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            if self._value is None:
+                self._value = self.build({})
+            return
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._signature:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                value = self.build(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.error(f"Lecture de {self.path} impossible: {e}")
+            if self._value is None:
+                self._value = self.build({})
+            return
+        self._value, self._signature = value, signature
+        self.loads += 1
+
+    def invalidate(self):
+        """Force la relecture au prochain accès"""
+        self._signature = None
+        self._checked_at = float("-inf")
+
+
+class NameIndex:
+    """Noms affichés : recherche exacte insensible à la casse, préfixes et trigrammes"""
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.by_lower: Dict[str, str] = {}
+        for name in self.names:
+            self.by_lower.setdefault(name.lower(), name)
+        self._prefixes: List[Tuple[str, str]] = sorted((normalize(name), name) for name in self.names)
+        self.fuzzy = TrigramIndex((name, (name,)) for name in self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def find(self, name: str) -> Optional[str]:
+        return self.by_lower.get(name.lower())
+
+    def suggest(self, query: str, limit: int = 5) -> List[str]:
+        """Noms proches ("vouliez-vous dire")"""
+        return [name for name, _ in self.fuzzy.search(query, limit=limit)]
+
+    def complete(self, current: str, limit: int = AUTOCOMPLETE_LIMIT) -> List[str]:
+        """Noms qui commencent par la saisie, complétés par les noms proches"""
+        prefix = normalize(current)
+        if not prefix:
+            return [name for _, name in self._prefixes[:limit]]
+        results = []
+        position = bisect_left(self._prefixes, (prefix, ""))
+        while position < len(self._prefixes) and len(results) < limit:
+            normalized, name = self._prefixes[position]
+            if not normalized.startswith(prefix):
+                break
+            results.append(name)
+            position += 1
+        if len(results) < limit:
+            seen = set(results)
+            for name, _ in self.fuzzy.search(current, limit=limit):
+                if name not in seen:
+                    results.append(name)
+                    if len(results) == limit:
+                        break
+        return results
+
+
+class HunterCatalog:
+    """Chasseurs du fichier `hunters_data.json` et statistiques précalculées"""
+
+    def __init__(self, data: Dict):
+        self.hunters: Dict[str, Dict] = data.get("hunters", {}) if isinstance(data, dict) else {}
+        self.names = NameIndex(self.hunters)
+        self.awakening_count = sum(1 for hunter in self.hunters.values() if hunter.get("awa") == "oui")
+        self.style_count = len({hunter.get("style", "Unknown") for hunter in self.hunters.values()})
+
+    def find(self, name: str) -> Optional[Tuple[str, Dict]]:
+        """(nom exact, infos) sans tenir compte de la casse"""
+        actual = self.names.find(name)
+        return (actual, self.hunters[actual]) if actual is not None else None
+
+
+class ModCatalog:
+    """Mods Minecraft par catégorie (`minecraft_mods.json`)"""
+
+    def __init__(self, data: Dict):
+        self.categories: Dict[str, List[Dict]] = data if isinstance(data, dict) else {}
+        self.names = NameIndex(self.categories)
+
+    def category(self, name: str) -> Optional[List[Dict]]:
+        actual = self.names.find(name)
+        return self.categories[actual] if actual is not None else None
+
+
+class GameDataService:
+    """Point d'accès unique aux données de jeu du cog gaming"""
+
+    def __init__(self, hunters_path: str, mods_path: str, check_interval: float = 2.0):
+        self.hunters_dataset = JSONDataset(hunters_path, HunterCatalog, check_interval)
+        self.mods_dataset = JSONDataset(mods_path, ModCatalog, check_interval)
+
+    def hunters(self) -> HunterCatalog:
+        return self.hunters_dataset.get()
+
+    def mods(self) -> ModCatalog:
+        return self.mods_dataset.get()
@@ -11,6 +11,8 @@ import json
 import os
 from typing import Dict, List, Optional, Any
 
+from utils.trigram_index import TrigramIndex, normalize
+
 class HuntRoyalGemsSystem:
     """Système de gestion des gemmes Hunt Royal"""
     
@@ -19,7 +21,27 @@ class HuntRoyalGemsSystem:
             json_path = os.path.join(os.path.dirname(__file__), "..", "data", "gems_stats.json")
         
         self.json_path = json_path
+        self.reload()
+    
+    def reload(self):
+        """(Re)charger le JSON et reconstruire les index"""
         self.gems_data = self._load_gems_data()
+        gems = self.get_all_gems_level_7()
+        
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._by_color: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_equipment: Dict[str, List[Dict[str, Any]]] = {}
+        self._names = TrigramIndex()
+        self._optimizer = None  # Optimiseur de builds, créé à la première demande
+        for gem_key, gem_data in gems.items():
+            self._by_id.setdefault(gem_data.get("id"), gem_data)
+            # "pierre_rouge" -> couleur "rouge"
+            for token in normalize(gem_key).split():
+                self._by_color.setdefault(token, []).append(gem_data)
+            compatible = gem_data.get("compatible_equipment", {})
+            for equipment_type in {*compatible.get("armor", []), *compatible.get("weapon", [])}:
+                self._by_equipment.setdefault(equipment_type, []).append(gem_data)
+            self._names.add(gem_key, gem_data.get("name", ""), gem_key, gem_data.get("id", ""))
     
     def _load_gems_data(self) -> Dict[str, Any]:
         """Charger les données des gemmes depuis le JSON"""
@@ -39,46 +61,26 @@ class HuntRoyalGemsSystem:
     
     def get_gem_by_id(self, gem_id: str) -> Optional[Dict[str, Any]]:
         """Récupérer une gemme par son ID"""
-        gems = self.get_all_gems_level_7()
-        for gem_key, gem_data in gems.items():
-            if gem_data.get("id") == gem_id:
-                return gem_data
-        return None
+        return self._by_id.get(gem_id)
     
     def get_gem_by_name(self, name: str) -> Optional[Dict[str, Any]]:
-        """Récupérer une gemme par son nom (recherche flexible)"""
-        gems = self.get_all_gems_level_7()
-        name_lower = name.lower()
-        
-        for gem_key, gem_data in gems.items():
-            gem_name = gem_data.get("name", "").lower()
-            if name_lower in gem_name or gem_name in name_lower:
-                return gem_data
-        return None
+        """Récupérer une gemme par son nom (recherche floue, accents et casse ignorés)"""
+        gem_key = self._names.best(name)
+        return self.get_all_gems_level_7().get(gem_key) if gem_key else None
     
     def get_gems_by_color(self, color: str) -> List[Dict[str, Any]]:
         """Récupérer les gemmes par couleur"""
-        gems = self.get_all_gems_level_7()
-        color_lower = color.lower()
-        result = []
-        
-        for gem_key, gem_data in gems.items():
-            if color_lower in gem_key.lower():
-                result.append(gem_data)
+        result = self._by_color.get(normalize(color))
+        if result is not None:
+            return list(result)
         
-        return result
+        # Couleur partielle ("roug") : recherche dans les clés
+        color_lower = color.lower()
+        return [gem_data for gem_key, gem_data in self.get_all_gems_level_7().items() if color_lower in gem_key.lower()]
     
     def get_gems_for_equipment_type(self, equipment_type: str) -> List[Dict[str, Any]]:
         """Récupérer les gemmes compatibles avec un type d'équipement"""
-        gems = self.get_all_gems_level_7()
-        result = []
-        
-        for gem_key, gem_data in gems.items():
-            compatible = gem_data.get("compatible_equipment", {})
-            if equipment_type in compatible.get("armor", []) or equipment_type in compatible.get("weapon", []):
-                result.append(gem_data)
-        
-        return result
+        return list(self._by_equipment.get(equipment_type, []))
     
     def calculate_build_power(self, gem_ids: List[str]) -> Dict[str, Any]:
         """Calculer la puissance totale d'un build"""
@@ -108,10 +110,50 @@ class HuntRoyalGemsSystem:
             "is_max_titan": total_power >= 12000   # 20 gems x 600
         }
     
-    def get_optimal_builds(self, focus: str = "damage") -> List[Dict[str, Any]]:
-        """Suggérer des builds optimaux selon le focus"""
+    def get_optimal_builds(self, focus: str = "damage", titan: bool = False, top_k: int = 3,
+                           dungeon: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Suggérer des builds optimaux selon le focus
+        
+        Avec NumPy, toutes les répartitions de gemmes sont évaluées (voir
+        modules.hunt_royal_optimizer) ; sinon, builds de référence fixes.
+        """
+        try:
+            from modules.hunt_royal_optimizer import FOCUS_WEIGHTS, GemBuildOptimizer
+        except ImportError:
+            return self._reference_builds(focus)
+        if focus not in FOCUS_WEIGHTS:
+            return []
+        
+        if self._optimizer is None:
+            self._optimizer = GemBuildOptimizer(self.get_all_gems_level_7())
+        slots_key = "titan_slots" if titan else "default_slots"
+        equipment = self.get_equipment_info()
+        armor_slots = sum(piece.get(slots_key, 3) for piece in equipment.get("armor", {}).values())
+        weapon_slots = sum(piece.get(slots_key, 3) for piece in equipment.get("weapon", {}).values())
+        
         gems = self.get_all_gems_level_7()
         builds = []
+        for rank, build in enumerate(self._optimizer.best_builds(FOCUS_WEIGHTS[focus], armor_slots, weapon_slots,
+                                                                 top_k=top_k, dungeon=dungeon), start=1):
+            counts = {}
+            parts = []
+            for side, emoji in (("armor", "🛡️"), ("weapon", "⚔️")):
+                for gem_key, count in build[side].items():
+                    counts[gem_key] = counts.get(gem_key, 0) + count
+                if build[side]:
+                    parts.append(f"{emoji} " + ", ".join(f"{count}x {gems[gem_key]['name']}" for gem_key, count in build[side].items()))
+            build.update({
+                "name": f"Build {focus} #{rank}",
+                "focus": focus,
+                "gems": [gems[gem_key]["id"] for gem_key in sorted(counts, key=lambda key: -counts[key])],
+                "description": " | ".join(parts),
+            })
+            builds.append(build)
+        return builds
+    
+    def _reference_builds(self, focus: str) -> List[Dict[str, Any]]:
+        """Builds de référence (sans optimiseur)"""
+        builds = []
         
         if focus == "damage":
             # Build DPS : Rouge, Blanche, Jaune
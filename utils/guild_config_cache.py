@@ -0,0 +1,56 @@
+"""
+🗂️ Arsenal V4 - Cache de configuration par serveur
+Configurations déjà parsées, invalidées explicitement à chaque écriture
+"""
+
+import threading
+from typing import Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class GuildConfigCache(Generic[T]):
+    """Cache `guild_id -> configuration parsée` alimenté par un loader
+
+    Le loader (lecture en base + parsing JSON) n'est appelé qu'au premier
+    accès ou après `invalidate()`. Chaque système qui écrit sa config doit
+    invalider l'entrée du serveur concerné.
+    """
+
+    def __init__(self, loader: Callable[[Hashable], T], max_entries: int = 10_000):
+        self.loader = loader
+        self.max_entries = max_entries
+        self._entries: Dict[str, T] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, guild_id: Hashable) -> T:
+        key = str(guild_id)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        entry = self.loader(guild_id)
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                # Politique simple : on repart de zéro plutôt que de grossir sans fin
+                self._entries.clear()
+            self._entries[key] = entry
+        return entry
+
+    def invalidate(self, guild_id: Optional[Hashable] = None):
+        """Oublie la config d'un serveur (ou de tous si guild_id est None)"""
+        with self._lock:
+            if guild_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(guild_id), None)
+
+    def __contains__(self, guild_id: Hashable) -> bool:
+        return str(guild_id) in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
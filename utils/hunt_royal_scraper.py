@@ -8,29 +8,87 @@ Système de récupération automatique des données Hunt Royal depuis more-huntr
 - Vitesse et nombre de perks
 - Mise à jour automatique de la base de données
 
-Hook intelligent avec cache et détection de changements
+Hook intelligent avec cache et détection de changements :
+- une seule session HTTP, concurrence bornée et débit limité par hôte
+- revalidation ETag / Last-Modified (304 = données précédentes conservées)
+- point de reprise par chasseur : une collecte interrompue repart où elle s'est arrêtée
+- diff avec les données existantes et upserts incrémentaux en base
 """
 
 import requests
 import re
 import json
+import os
 import sqlite3
 from bs4 import BeautifulSoup
-from typing import Dict, List, Optional, Any
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Tuple
 import asyncio
 import aiohttp
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
+from urllib.parse import urlsplit
 import time
 
+HUNTER_COLUMNS = (
+    ["id", "name", "role"]
+    + [f"hp_level_{level}" for level in range(1, 11)]
+    + [f"attack_level_{level}" for level in range(1, 11)]
+    + ["speed", "perks_count", "awaken_1_description", "awaken_2_description",
+       "has_awaken_2", "image_url", "source", "last_updated"]
+)
+
+
+class HostRateLimiter:
+    """Espacement minimal entre deux requêtes vers un même hôte"""
+    
+    def __init__(self, requests_per_second: float):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_slot: Dict[str, float] = {}
+    
+    async def acquire(self, url: str):
+        host = urlsplit(url).netloc
+        now = time.monotonic()
+        # Réservation du créneau avant d'attendre : pas de verrou nécessaire
+        slot = max(now, self._next_slot.get(host, 0.0))
+        self._next_slot[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+def diff_hunters(old: Dict[str, Dict], new: Dict[str, Dict]) -> Dict[str, List[str]]:
+    """Compare deux collectes (sans tenir compte de la date de mise à jour)"""
+    def content(data: Dict) -> Dict:
+        return {key: value for key, value in data.items() if key != "last_updated"}
+    
+    return {
+        "added": sorted(name for name in new if name not in old),
+        "updated": sorted(name for name in new if name in old and content(new[name]) != content(old[name])),
+        "removed": sorted(name for name in old if name not in new),
+        "unchanged": sorted(name for name in new if name in old and content(new[name]) == content(old[name])),
+    }
+
+
 class HuntRoyalScraper:
     """Scraper intelligent pour récupérer les données Hunt Royal"""
     
-    def __init__(self):
-        self.base_url = "https://more-huntroyale.com"
+    CACHE_TTL = timedelta(hours=24)
+    
+    def __init__(self, base_url: str = "https://more-huntroyale.com", cache_file: str = "hunt_royal_cache.json",
+                 concurrency: int = 4, requests_per_second: float = 4.0, timeout: float = 20.0):
+        self.base_url = base_url.rstrip('/')
         self.hunters_url = f"{self.base_url}/public/hunters.html"
-        self.cache_file = "hunt_royal_cache.json"
+        self.cache_file = cache_file
+        self.checkpoint_file = f"{cache_file}.checkpoint"
+        self.concurrency = concurrency
+        self.limiter = HostRateLimiter(requests_per_second)
+        self.timeout = timeout
         self.last_update = None
         self.hunters_data = {}
+        self.validators: Dict[str, Dict[str, str]] = {}  # url: {"etag", "last_modified"}
+        self.last_diff: Dict[str, List[str]] = {}
+        self.stats = {"requests": 0, "not_modified": 0, "errors": 0}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._main_page: Optional[str] = None  # Page principale de la collecte en cours
         
         # Headers pour éviter le blocage
         self.headers = {
@@ -42,55 +100,111 @@ class HuntRoyalScraper:
             'Upgrade-Insecure-Requests': '1',
         }
     
+    # ==================== HTTP ====================
+    
+    @asynccontextmanager
+    async def _session_scope(self):
+        """Réutilise la session de la collecte en cours, ou en ouvre une le temps de l'appel"""
+        if self._session is not None and not self._session.closed:
+            yield self._session
+            return
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        connector = aiohttp.TCPConnector(limit_per_host=self.concurrency)
+        async with aiohttp.ClientSession(headers=self.headers, timeout=timeout, connector=connector) as session:
+            self._session = session
+            try:
+                yield session
+            finally:
+                self._session = None
+    
+    async def _get(self, url: str) -> Tuple[Optional[int], Optional[str]]:
+        """GET conditionnel : (200, corps), (304, None), (statut d'erreur, None) ou (None, None)"""
+        headers = {}
+        validator = self.validators.get(url, {})
+        if validator.get("etag"):
+            headers["If-None-Match"] = validator["etag"]
+        if validator.get("last_modified"):
+            headers["If-Modified-Since"] = validator["last_modified"]
+        
+        await self.limiter.acquire(url)
+        self.stats["requests"] += 1
+        try:
+            async with self._session.get(url, headers=headers) as response:
+                if response.status == 304:
+                    self.stats["not_modified"] += 1
+                    return 304, None
+                if response.status != 200:
+                    return response.status, None
+                body = await response.text()
+                fresh = {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                }
+                if any(fresh.values()):
+                    self.validators[url] = {key: value for key, value in fresh.items() if value}
+                return 200, body
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.stats["errors"] += 1
+            print(f"⚠️ Requête échouée {url} : {e}")
+            return None, None
+    
+    # ==================== LISTE DES CHASSEURS ====================
+    
     async def fetch_hunters_list(self) -> List[str]:
         """Récupérer la liste de tous les chasseurs disponibles depuis more-huntroyale.com"""
         try:
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                async with session.get(self.hunters_url) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        soup = BeautifulSoup(html, 'html.parser')
-                        
-                        hunters = []
-                        
-                        # Méthode 1: Extraire depuis les noms d'images
-                        images = soup.find_all('img')
-                        for img in images:
-                            src = img.get('src', '')
-                            if '/hunters/' in src and src.endswith('.png'):
-                                # Extraire le nom du fichier : "ElfArcher.png" -> "Elf Archer"
-                                filename = src.split('/')[-1].replace('.png', '')
-                                # Convertir CamelCase en nom lisible
-                                hunter_name = self._convert_filename_to_name(filename)
-                                if hunter_name and hunter_name not in hunters:
-                                    hunters.append(hunter_name)
-                        
-                        # Méthode 2: Extraire depuis les titres h3 (backup)
-                        if len(hunters) < 10:  # Si peu de résultats, essayer autre méthode
-                            for h3 in soup.find_all('h3'):
-                                hunter_name = h3.get_text().strip()
-                                if hunter_name and len(hunter_name) > 2 and hunter_name not in hunters:
-                                    # Filtrer les éléments non-chasseurs
-                                    if not any(skip in hunter_name.lower() for skip in ['additional', 'links', 'menu', 'login']):
-                                        hunters.append(hunter_name)
-                        
-                        # Nettoyer la liste
-                        hunters = [h for h in hunters if h and len(h) > 2]
-                        hunters.sort()
-                        
-                        print(f"✅ {len(hunters)} chasseurs trouvés sur more-huntroyale.com")
-                        if len(hunters) > 0:
-                            print(f"   Exemples: {', '.join(hunters[:5])}")
-                        
-                        return hunters
-                    else:
-                        print(f"❌ Erreur HTTP {response.status} lors de la récupération")
-                        return []
-                        
+            async with self._session_scope():
+                status, html = await self._get(self.hunters_url)
         except Exception as e:
             print(f"❌ Erreur lors de la récupération des chasseurs : {e}")
             return []
+        
+        if status == 304 and self.hunters_data:
+            print(f"✅ Liste des chasseurs inchangée ({len(self.hunters_data)} chasseurs)")
+            return sorted(self.hunters_data)
+        if status != 200:
+            print(f"❌ Erreur HTTP {status} lors de la récupération")
+            return []
+        
+        self._main_page = html
+        hunters = self._parse_hunters_list(html)
+        print(f"✅ {len(hunters)} chasseurs trouvés sur more-huntroyale.com")
+        if len(hunters) > 0:
+            print(f"   Exemples: {', '.join(hunters[:5])}")
+        return hunters
     
+    def _parse_hunters_list(self, html: str) -> List[str]:
+        """Noms des chasseurs depuis la page principale"""
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        hunters = []
+        
+        # Méthode 1: Extraire depuis les noms d'images
+        images = soup.find_all('img')
+        for img in images:
+            src = img.get('src', '')
+            if '/hunters/' in src and src.endswith('.png'):
+                # Extraire le nom du fichier : "ElfArcher.png" -> "Elf Archer"
+                filename = src.split('/')[-1].replace('.png', '')
+                # Convertir CamelCase en nom lisible
+                hunter_name = self._convert_filename_to_name(filename)
+                if hunter_name and hunter_name not in hunters:
+                    hunters.append(hunter_name)
+        
+        # Méthode 2: Extraire depuis les titres h3 (backup)
+        if len(hunters) < 10:  # Si peu de résultats, essayer autre méthode
+            for h3 in soup.find_all('h3'):
+                hunter_name = h3.get_text().strip()
+                if hunter_name and len(hunter_name) > 2 and hunter_name not in hunters:
+                    # Filtrer les éléments non-chasseurs
+                    if not any(skip in hunter_name.lower() for skip in ['additional', 'links', 'menu', 'login']):
+                        hunters.append(hunter_name)
+        
+        # Nettoyer la liste
+        hunters = [h for h in hunters if h and len(h) > 2]
+        hunters.sort()
+        return hunters
+
     def _convert_filename_to_name(self, filename: str) -> str:
         """Convertir un nom de fichier CamelCase en nom lisible"""
         # Gérer les cas spéciaux connus
@@ -145,46 +259,45 @@ class HuntRoyalScraper:
     async def fetch_hunter_detailed_data(self, hunter_name: str) -> Optional[Dict]:
         """Récupérer les données détaillées d'un chasseur spécifique
         
-        Cette méthode va essayer de trouver un endpoint API ou une page détaillée
-        pour récupérer les stats niveau 1-10, awaken, etc.
+        Essaie l'API JSON, puis la page du chasseur, puis les données embarquées
+        dans la page principale. Une réponse 304 renvoie les données déjà connues.
         """
+        slug = hunter_name.lower().replace(' ', '-')
+        previous = self.hunters_data.get(hunter_name)
         try:
-            # Essayer différentes approches pour récupérer les données
-            
-            # 1. Chercher une API JSON
-            api_url = f"{self.base_url}/api/hunter/{hunter_name.lower().replace(' ', '-')}"
-            
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                # Essayer l'API JSON d'abord
-                try:
-                    async with session.get(api_url) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            return await self._parse_api_data(data, hunter_name)
-                except:
-                    pass
+            async with self._session_scope():
+                # 1. API JSON
+                status, body = await self._get(f"{self.base_url}/api/hunter/{slug}")
+                if status == 304 and previous:
+                    return previous
+                if status == 200:
+                    try:
+                        return await self._parse_api_data(json.loads(body), hunter_name)
+                    except ValueError:
+                        pass
                 
-                # 2. Chercher une page détaillée pour ce chasseur
-                detail_url = f"{self.base_url}/hunter/{hunter_name.lower().replace(' ', '-')}"
-                try:
-                    async with session.get(detail_url) as response:
-                        if response.status == 200:
-                            html = await response.text()
-                            return await self._parse_hunter_page(html, hunter_name)
-                except:
-                    pass
+                # 2. Page détaillée du chasseur
+                status, body = await self._get(f"{self.base_url}/hunter/{slug}")
+                if status == 304 and previous:
+                    return previous
+                if status == 200:
+                    return await self._parse_hunter_page(body, hunter_name)
                 
-                # 3. Chercher dans le JavaScript de la page principale
-                async with session.get(self.hunters_url) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        return await self._extract_from_main_page(html, hunter_name)
-                        
+                # 3. JavaScript de la page principale (téléchargée une fois par collecte)
+                html = self._main_page
+                if html is None:
+                    status, html = await self._get(self.hunters_url)
+                    if status == 200:
+                        self._main_page = html
+                if html is not None:
+                    return await self._extract_from_main_page(html, hunter_name)
+                return previous
+        
         except Exception as e:
             print(f"❌ Erreur récupération données {hunter_name} : {e}")
-            
+        
         return None
-    
+
     async def _parse_api_data(self, data: Dict, hunter_name: str) -> Dict:
         """Parser les données depuis une API JSON"""
         hunter_data = {
@@ -290,40 +403,109 @@ class HuntRoyalScraper:
         """Récupérer les données de tous les chasseurs avec cache intelligent"""
         
         # Vérifier le cache
-        if not force_refresh and self._load_cache():
+        has_cache = self._load_cache()
+        if has_cache and not force_refresh and self.last_update:
             cache_age = datetime.now() - datetime.fromisoformat(self.last_update)
-            if cache_age < timedelta(hours=24):  # Cache valide 24h
+            if cache_age < self.CACHE_TTL:
                 print(f"✅ Cache valide ({len(self.hunters_data)} chasseurs), utilisé")
                 return self.hunters_data
         
         print("🔄 Récupération des données Hunt Royal depuis more-huntroyale.com...")
+        previous = dict(self.hunters_data)
+        fetched = self._load_checkpoint()
+        if fetched:
+            print(f"♻️ Reprise de la collecte précédente : {len(fetched)} chasseurs déjà récupérés")
         
-        # Récupérer la liste des chasseurs
-        hunters_list = await self.fetch_hunters_list()
-        if not hunters_list:
-            print("❌ Impossible de récupérer la liste des chasseurs")
-            return {}
-        
-        # Récupérer les données détaillées (avec limitation de débit)
-        all_hunters_data = {}
-        for i, hunter_name in enumerate(hunters_list):
-            print(f"📥 Récupération {hunter_name} ({i+1}/{len(hunters_list)})")
+        async with self._session_scope():
+            self._main_page = None
             
-            hunter_data = await self.fetch_hunter_detailed_data(hunter_name)
-            if hunter_data:
-                all_hunters_data[hunter_name] = hunter_data
+            # Récupérer la liste des chasseurs
+            hunters_list = await self.fetch_hunters_list()
+            if not hunters_list:
+                print("❌ Impossible de récupérer la liste des chasseurs")
+                return {}
             
-            # Pause pour éviter la surcharge du serveur
-            await asyncio.sleep(0.5)
+            # Récupérer les données détaillées (concurrence bornée, débit limité par hôte)
+            pending = [name for name in hunters_list if name not in fetched]
+            semaphore = asyncio.Semaphore(self.concurrency)
+            checkpoint = open(self.checkpoint_file, 'a', encoding='utf-8', buffering=1)
+            if not fetched:
+                checkpoint.write(json.dumps({"started_at": datetime.now().isoformat()}) + "\n")
+            
+            async def fetch(hunter_name: str):
+                async with semaphore:
+                    hunter_data = await self.fetch_hunter_detailed_data(hunter_name)
+                if hunter_data:
+                    fetched[hunter_name] = hunter_data
+                    checkpoint.write(json.dumps({
+                        "name": hunter_name,
+                        "data": hunter_data,
+                        "validators": {url: self.validators[url] for url in self._hunter_urls(hunter_name)
+                                       if url in self.validators},
+                    }, ensure_ascii=False) + "\n")
+                    print(f"📥 {hunter_name} ({len(fetched)}/{len(hunters_list)})")
+            
+            try:
+                await asyncio.gather(*(fetch(name) for name in pending))
+            finally:
+                checkpoint.close()
+                self._main_page = None
+        
+        # Un chasseur en échec garde ses données précédentes
+        all_hunters_data = {}
+        for hunter_name in hunters_list:
+            data = fetched.get(hunter_name) or previous.get(hunter_name)
+            if data:
+                all_hunters_data[hunter_name] = data
+        
+        # Les chasseurs inchangés gardent leur date : ils ne seront pas réécrits en base
+        self.last_diff = diff_hunters(previous, all_hunters_data)
+        for hunter_name in self.last_diff["unchanged"]:
+            all_hunters_data[hunter_name] = previous[hunter_name]
         
         # Sauvegarder le cache
         self.hunters_data = all_hunters_data
         self.last_update = datetime.now().isoformat()
         self._save_cache()
+        if os.path.exists(self.checkpoint_file):
+            os.remove(self.checkpoint_file)
         
-        print(f"✅ {len(all_hunters_data)} chasseurs récupérés et mis en cache")
+        diff = self.last_diff
+        print(f"✅ {len(all_hunters_data)} chasseurs récupérés et mis en cache "
+              f"(+{len(diff['added'])} ~{len(diff['updated'])} -{len(diff['removed'])}, "
+              f"{self.stats['not_modified']} réponses 304)")
         return all_hunters_data
     
+    def _hunter_urls(self, hunter_name: str) -> List[str]:
+        slug = hunter_name.lower().replace(' ', '-')
+        return [f"{self.base_url}/api/hunter/{slug}", f"{self.base_url}/hunter/{slug}"]
+    
+    def _load_checkpoint(self) -> Dict[str, Dict]:
+        """Chasseurs déjà récupérés par une collecte interrompue (si elle est récente)"""
+        fetched = {}
+        try:
+            with open(self.checkpoint_file, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except OSError:
+            return fetched
+        
+        try:
+            started_at = datetime.fromisoformat(json.loads(lines[0])["started_at"])
+        except (IndexError, KeyError, ValueError):
+            started_at = None
+        if started_at is None or datetime.now() - started_at > self.CACHE_TTL:
+            os.remove(self.checkpoint_file)
+            return fetched
+        
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # ligne tronquée par l'interruption
+            fetched[entry["name"]] = entry["data"]
+            self.validators.update(entry.get("validators", {}))
+        return fetched
+    
     def _load_cache(self) -> bool:
         """Charger le cache depuis le fichier"""
         try:
@@ -331,29 +513,57 @@ class HuntRoyalScraper:
                 cache_data = json.load(f)
                 self.hunters_data = cache_data.get('hunters_data', {})
                 self.last_update = cache_data.get('last_update')
+                self.validators = cache_data.get('validators', {})
                 return True
         except:
             return False
     
     def _save_cache(self):
-        """Sauvegarder le cache dans un fichier"""
+        """Sauvegarder le cache dans un fichier (remplacement atomique)"""
         try:
             cache_data = {
                 'hunters_data': self.hunters_data,
-                'last_update': self.last_update
+                'last_update': self.last_update,
+                'validators': self.validators
             }
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
+            tmp_path = f"{self.cache_file}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
                 json.dump(cache_data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_file)
         except Exception as e:
             print(f"⚠️ Erreur sauvegarde cache : {e}")
     
-    async def update_database(self, db_path: str = "hunt_royal.db"):
-        """Mettre à jour la base de données avec les nouvelles données"""
-        hunters_data = await self.fetch_all_hunters_data()
+    @staticmethod
+    def _hunter_row(hunter_name: str, data: Dict) -> tuple:
+        """Ligne hunters_detailed d'un chasseur (colonnes HUNTER_COLUMNS)"""
+        # Préparer les stats HP / ATK (10 niveaux)
+        hp_stats = data['stats']['hp'][:10] + [0] * (10 - len(data['stats']['hp'][:10]))
+        attack_stats = data['stats']['attack'][:10] + [0] * (10 - len(data['stats']['attack'][:10]))
+        return (
+            hunter_name.lower().replace(' ', '_'), data['name'], data['role'],
+            *hp_stats,  # HP niveaux 1-10
+            *attack_stats,  # ATK niveaux 1-10
+            data['stats']['speed'],
+            data['perks_count'],
+            (data['awaken_1'] or {}).get('description', ''),
+            data['awaken_2'].get('description', '') if data['awaken_2'] else '',
+            bool(data['awaken_2']),
+            data['image_url'],
+            data.get('source', 'scraped'),
+            data['last_updated']
+        )
+    
+    async def update_database(self, db_path: str = "hunt_royal.db", force_refresh: bool = False) -> Dict[str, int]:
+        """Mettre à jour la base de données avec les nouvelles données
+        
+        Seuls les chasseurs nouveaux ou modifiés (date de mise à jour différente
+        de celle en base) sont écrits, en une seule transaction.
+        """
+        hunters_data = await self.fetch_all_hunters_data(force_refresh)
         
         if not hunters_data:
             print("❌ Aucune donnée à mettre à jour")
-            return
+            return {"upserted": 0, "unchanged": 0}
         
         conn = sqlite3.connect(db_path)
         cursor = conn.cursor()
@@ -395,40 +605,24 @@ class HuntRoyalScraper:
             )
         ''')
         
-        # Insérer/mettre à jour les données
-        updated_count = 0
-        for hunter_name, data in hunters_data.items():
-            hunter_id = hunter_name.lower().replace(' ', '_')
-            
-            # Préparer les stats HP (10 niveaux)
-            hp_stats = data['stats']['hp'][:10] + [0] * (10 - len(data['stats']['hp'][:10]))
-            attack_stats = data['stats']['attack'][:10] + [0] * (10 - len(data['stats']['attack'][:10]))
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO hunters_detailed VALUES (
-                    ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
-                )
-            ''', (
-                hunter_id, data['name'], data['role'],
-                *hp_stats,  # HP niveaux 1-10
-                *attack_stats,  # ATK niveaux 1-10
-                data['stats']['speed'],
-                data['perks_count'],
-                data['awaken_1'].get('description', ''),
-                data['awaken_2'].get('description', '') if data['awaken_2'] else '',
-                bool(data['awaken_2']),
-                data['image_url'],
-                data.get('source', 'scraped'),
-                data['last_updated']
-            ))
-            
-            updated_count += 1
+        # Diff avec la base : seules les lignes nouvelles ou modifiées sont écrites
+        stored = dict(cursor.execute('SELECT id, last_updated FROM hunters_detailed').fetchall())
+        rows = [self._hunter_row(hunter_name, data) for hunter_name, data in hunters_data.items()]
+        changed = [row for row in rows if stored.get(row[0]) != row[-1]]
+        
+        cursor.executemany(f'''
+            INSERT INTO hunters_detailed ({", ".join(HUNTER_COLUMNS)})
+            VALUES ({", ".join("?" * len(HUNTER_COLUMNS))})
+            ON CONFLICT(id) DO UPDATE SET
+                {", ".join(f"{column} = excluded.{column}" for column in HUNTER_COLUMNS[1:])}
+        ''', changed)
         
         conn.commit()
         conn.close()
         
-        print(f"✅ Base de données mise à jour : {updated_count} chasseurs")
-    
+        print(f"✅ Base de données mise à jour : {len(changed)} chasseurs écrits, {len(rows) - len(changed)} inchangés")
+        return {"upserted": len(changed), "unchanged": len(rows) - len(changed)}
+
     def get_hunter_stats_by_level(self, hunter_name: str, level: int) -> Optional[Dict]:
         """Récupérer les stats d'un chasseur à un niveau donné"""
         if hunter_name not in self.hunters_data:
@@ -459,6 +653,20 @@ class HuntRoyalAutoUpdater:
         self.db_path = db_path
         self.auto_update_interval = 24 * 60 * 60  # 24 heures
         self.last_auto_update = None
+        self.listeners: List[Callable[[Dict[str, int]], Awaitable[None]]] = []
+    
+    def add_listener(self, callback: Callable[[Dict[str, int]], Awaitable[None]]):
+        """Appelé après chaque mise à jour de la base qui a écrit au moins un chasseur"""
+        self.listeners.append(callback)
+    
+    async def _notify(self, result: Dict[str, int]):
+        if not result or not result.get("upserted"):
+            return
+        for callback in self.listeners:
+            try:
+                await callback(result)
+            except Exception as e:
+                print(f"⚠️ Erreur notification mise à jour Hunt Royal : {e}")
     
     async def check_and_update(self) -> bool:
         """Vérifier si une mise à jour est nécessaire et l'effectuer"""
@@ -470,23 +678,29 @@ class HuntRoyalAutoUpdater:
                 return False  # Pas encore temps de mettre à jour
         
         print("🔄 Mise à jour automatique Hunt Royal...")
-        await self.scraper.update_database(self.db_path)
+        result = await self.scraper.update_database(self.db_path)
         self.last_auto_update = now
+        await self._notify(result)
         return True
     
     async def force_update(self) -> bool:
         """Forcer une mise à jour immédiate"""
         print("🔄 Mise à jour forcée Hunt Royal...")
-        await self.scraper.update_database(self.db_path)
+        # Revalidation conditionnelle : les pages inchangées répondent 304
+        result = await self.scraper.update_database(self.db_path, force_refresh=True)
         self.last_auto_update = datetime.now()
+        await self._notify(result)
         return True
 
 # ==================== FONCTION D'EXPORTATION ====================
 
-async def setup_hunt_royal_scraper(db_path: str = "hunt_royal.db") -> HuntRoyalAutoUpdater:
+async def setup_hunt_royal_scraper(db_path: str = "hunt_royal.db",
+                                   on_update: Optional[Callable[[Dict[str, int]], Awaitable[None]]] = None) -> HuntRoyalAutoUpdater:
     """Initialiser le système de scraping Hunt Royal"""
     scraper = HuntRoyalScraper()
     updater = HuntRoyalAutoUpdater(scraper, db_path)
+    if on_update:
+        updater.add_listener(on_update)
     
     # Première mise à jour au démarrage
     await updater.check_and_update()
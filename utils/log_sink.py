@@ -0,0 +1,137 @@
+"""
+📥 Arsenal V4 - Écriture groupée des journaux
+File asyncio + executemany : une transaction par lot au lieu d'un INSERT par événement
+"""
+
+import asyncio
+import logging
+from typing import Dict, List, Optional, Sequence
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class BatchedLogSink:
+    """Tampon asynchrone qui écrit les lignes par lots dans un pool SQLite
+
+    - `put()` attend qu'il y ait de la place (backpressure) ;
+    - `offer()` ne bloque jamais : au-delà du seuil `low_priority_watermark`
+      les événements de faible priorité sont abandonnés, et tout est abandonné
+      si la file est pleine. Les abandons sont comptés dans `stats`.
+    """
+
+    def __init__(self, pool, insert_sql: str, batch_size: int = 500, flush_interval: float = 1.0,
+                 max_queue: int = 10_000, low_priority_watermark: float = 0.75, name: Optional[str] = None):
+        self.pool = pool  # SQLitePool (database_manager.pool(...))
+        self.insert_sql = insert_sql
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.low_priority_limit = int(max_queue * low_priority_watermark)
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._held: List = []  # Lignes sorties de la file, pas encore écrites
+        self.stats: Dict[str, int] = {
+            "queued": 0,
+            "written": 0,
+            "batches": 0,
+            "dropped_low_priority": 0,
+            "dropped_overflow": 0,
+            "write_errors": 0,
+        }
+        if name:
+            # Exposé sur /metrics (core/metrics_server.py)
+            metrics.gauge("arsenal_queue_depth", lambda: self.pending, "Éléments en attente d'écriture", queue=name)
+            for reason in ("low_priority", "overflow"):
+                metrics.gauge(
+                    "arsenal_queue_dropped_total", lambda reason=reason: self.stats[f"dropped_{reason}"],
+                    "Éléments abandonnés sous charge", kind="counter", queue=name, reason=reason
+                )
+
+    # ==================== CYCLE DE VIE ====================
+
+    def start(self):
+        """Démarre le worker (appelé automatiquement au premier événement)"""
+        if self._task is not None and not self._task.done():
+            return
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._write_lock = asyncio.Lock()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self):
+        """Arrête le worker puis écrit tout ce qui reste en file"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    # ==================== ENTRÉE ====================
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def put(self, row: Sequence):
+        """Ajoute une ligne, en attendant de la place si la file est pleine"""
+        self.start()
+        await self._queue.put(row)
+        self.stats["queued"] += 1
+
+    def offer(self, row: Sequence, low_priority: bool = False) -> bool:
+        """Ajoute une ligne sans jamais bloquer ; False si elle a été abandonnée"""
+        self.start()
+        if low_priority and self._queue.qsize() >= self.low_priority_limit:
+            self.stats["dropped_low_priority"] += 1
+            return False
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            self.stats["dropped_overflow"] += 1
+            return False
+        self.stats["queued"] += 1
+        return True
+
+    # ==================== ÉCRITURE ====================
+
+    def _take_batch(self) -> List:
+        batch, self._held = self._held, []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    async def _write(self, batch: List):
+        if not batch:
+            return
+        try:
+            await self.pool.executemany(self.insert_sql, batch)
+            self.stats["written"] += len(batch)
+            self.stats["batches"] += 1
+        except Exception as e:
+            self.stats["write_errors"] += 1
+            logger.error(f"Écriture groupée des logs échouée ({len(batch)} lignes): {e}")
+
+    async def _run(self):
+        while True:
+            self._held.append(await self._queue.get())
+            # Laisse le lot se remplir, sauf si la file déborde déjà
+            if self._queue.qsize() < self.batch_size:
+                await asyncio.sleep(self.flush_interval)
+            async with self._write_lock:
+                await self._write(self._take_batch())
+
+    async def flush(self):
+        """Écrit immédiatement tout le contenu de la file (avant une lecture)"""
+        if self._queue is None:
+            return
+        async with self._write_lock:
+            while self._held or not self._queue.empty():
+                await self._write(self._take_batch())
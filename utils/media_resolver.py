@@ -0,0 +1,182 @@
+"""
+🎧 Arsenal V4 - Résolution des pistes audio hors de la boucle asyncio
+Extraction yt-dlp sur un pool borné, playlists "à plat", URLs de flux résolues
+juste avant la lecture et mises en cache jusqu'à leur expiration
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+# Marge avant l'expiration d'une URL de flux (FFmpeg doit pouvoir l'ouvrir)
+STREAM_EXPIRY_MARGIN = 300
+DEFAULT_STREAM_TTL = 3 * 3600
+
+
+def _ytdl_extract(options: Dict, query: str) -> Dict:
+    """Extraction yt-dlp synchrone (exécutée dans un thread du pool)"""
+    import yt_dlp
+    with yt_dlp.YoutubeDL(options) as ydl:
+        return ydl.extract_info(query, download=False)
+
+
+def stream_expiry(stream_url: Optional[str], now: Optional[float] = None) -> float:
+    """Date d'expiration d'une URL de flux (paramètre `expire` de YouTube sinon TTL par défaut)"""
+    now = time.time() if now is None else now
+    if stream_url:
+        expire = parse_qs(urlparse(stream_url).query).get("expire")
+        if expire and expire[0].isdigit():
+            return float(expire[0])
+    return now + DEFAULT_STREAM_TTL
+
+
+class _LRU(OrderedDict):
+    """OrderedDict borné : l'entrée la moins récemment utilisée est évincée"""
+
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def get_fresh(self, key):
+        value = self.get(key)
+        if value is not None:
+            self.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self[key] = value
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+class TrackResolver:
+    """Résolution asynchrone des pistes pour le système musical
+
+    Une piste est un dict `{title, webpage_url, url, duration, thumbnail, ...}`
+    où `url` (le flux audio) reste None tant qu'elle n'a pas été résolue.
+    """
+
+    def __init__(self, ytdl_options: Dict, max_workers: int = 2, cache_size: int = 512,
+                 query_ttl: float = 3600, extractor: Callable[[Dict, str], Dict] = _ytdl_extract,
+                 clock: Callable[[], float] = time.time):
+        self.full_options = dict(ytdl_options, noplaylist=True)
+        self.flat_options = dict(ytdl_options, extract_flat="in_playlist")
+        self.extractor = extractor
+        self.clock = clock
+        self.query_ttl = query_ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="arsenal-ytdl")
+        self._tracks = _LRU(cache_size)  # webpage_url: métadonnées + flux
+        self._queries = _LRU(cache_size)  # requête: (expire, [pistes à plat])
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"extractions": 0, "cache_hits": 0, "prefetches": 0}
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _extract(self, options: Dict, query: str) -> Dict:
+        self.stats["extractions"] += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.extractor, options, query)
+
+    # ==================== CONVERSION ====================
+
+    @staticmethod
+    def _webpage_url(entry: Dict) -> Optional[str]:
+        url = entry.get("webpage_url") or entry.get("url")
+        if url and "://" in url:
+            return url
+        if entry.get("id"):
+            return f"https://www.youtube.com/watch?v={entry['id']}"
+        return url
+
+    def _track_from_entry(self, entry: Dict) -> Dict:
+        """Piste à plat : métadonnées seulement, flux à résoudre plus tard"""
+        return {
+            "title": entry.get("title") or "Titre inconnu",
+            "webpage_url": self._webpage_url(entry),
+            "url": None,
+            "duration": int(entry.get("duration") or 0),
+            "thumbnail": entry.get("thumbnail"),
+        }
+
+    def _store_resolved(self, info: Dict) -> Dict:
+        track = self._track_from_entry(info)
+        track["url"] = info.get("url")
+        track["expires_at"] = stream_expiry(track["url"], self.clock())
+        if track["webpage_url"]:
+            self._tracks.put(track["webpage_url"], dict(track))
+        return track
+
+    def _is_fresh(self, track: Optional[Dict]) -> bool:
+        return bool(track and track.get("url") and track.get("expires_at", 0) - STREAM_EXPIRY_MARGIN > self.clock())
+
+    # ==================== API ====================
+
+    async def search(self, query: str, limit: int = 50) -> List[Dict]:
+        """URL, recherche ou playlist -> pistes (les playlists ne sont pas résolues)"""
+        cached = self._queries.get_fresh(query)
+        if cached and cached[0] > self.clock():
+            self.stats["cache_hits"] += 1
+            return [dict(track) for track in cached[1][:limit]]
+
+        info = await self._extract(self.flat_options, query)
+        if not info:
+            return []
+
+        if "entries" in info:
+            tracks = [self._track_from_entry(entry) for entry in info["entries"] if entry][:limit]
+            for track in tracks:
+                track["playlist"] = info.get("title")
+                cached_track = self._tracks.get(track["webpage_url"])
+                if self._is_fresh(cached_track):
+                    track.update(url=cached_track["url"], expires_at=cached_track["expires_at"])
+        else:
+            # Vidéo unique : l'extraction est déjà complète
+            tracks = [self._store_resolved(info)]
+
+        self._queries.put(query, (self.clock() + self.query_ttl, [dict(track, url=None) for track in tracks]))
+        return tracks
+
+    async def resolve(self, track: Dict) -> Dict:
+        """Complète la piste avec une URL de flux valide (cache, puis extraction)"""
+        if self._is_fresh(track):
+            return track
+
+        key = track.get("webpage_url")
+        if not key:
+            raise ValueError(f"Piste sans URL: {track.get('title')}")
+        cached = self._tracks.get_fresh(key)
+        if self._is_fresh(cached):
+            self.stats["cache_hits"] += 1
+            track.update(url=cached["url"], expires_at=cached["expires_at"])
+            return track
+
+        # Une seule extraction par piste, même si lecture et préchargement se croisent
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._extract(self.full_options, key))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        info = await asyncio.shield(future)
+
+        resolved = self._store_resolved(info)
+        track.update(url=resolved["url"], expires_at=resolved["expires_at"])
+        if track.get("title") in (None, "Titre inconnu"):
+            track["title"] = resolved["title"]
+        if not track.get("duration"):
+            track["duration"] = resolved["duration"]
+        return track
+
+    def prefetch(self, track: Optional[Dict]) -> Optional[asyncio.Task]:
+        """Résout la piste en arrière-plan (la suivante pendant la lecture)"""
+        if not track or self._is_fresh(track) or not track.get("webpage_url"):
+            return None
+        self.stats["prefetches"] += 1
+        task = asyncio.ensure_future(self.resolve(track))
+        # L'erreur éventuelle sera relevée au moment de la lecture
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
@@ -0,0 +1,152 @@
+"""
+🏆 Arsenal V4 - Index de classement incrémental
+Classement trié en mémoire, mis à jour à chaque gain d'XP / de coins :
+rang d'un membre et page N du leaderboard sans ORDER BY ni COUNT en base
+"""
+
+from bisect import bisect_left, insort
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+class RankIndex:
+    """Arbre d'ordre statistique : rang et sélection en O(log n)
+
+    Les clés `(-score, membre)` sont rangées dans des blocs triés de taille
+    bornée ; un arbre de Fenwick sur la taille des blocs donne la position
+    d'un bloc. Rang, page et mise à jour coûtent O(log n) (plus un décalage
+    dans un bloc d'au plus 2 * LOAD éléments). À égalité de score, l'ordre
+    suit l'identifiant du membre pour que rang et pages restent cohérents.
+    """
+
+    LOAD = 512
+
+    def __init__(self, members: Iterable[Tuple[Hashable, int]] = (), min_score: Optional[int] = None):
+        self.min_score = min_score  # Scores inférieurs non classés (ex: solde nul)
+        self.scores: Dict[Hashable, int] = {}
+        for member, score in members:
+            if self._ranked(score):
+                self.scores[member] = score
+        keys = sorted((-score, member) for member, score in self.scores.items())
+        self._blocks: List[List[Tuple[int, Hashable]]] = [
+            keys[i:i + self.LOAD] for i in range(0, len(keys), self.LOAD)
+        ]
+        self._maxes = [block[-1] for block in self._blocks]
+        self._rebuild()
+
+    def _ranked(self, score: int) -> bool:
+        return self.min_score is None or score >= self.min_score
+
+    # ==================== ARBRE DE FENWICK ====================
+
+    def _rebuild(self):
+        n = len(self._blocks)
+        tree = [0] * (n + 1)
+        for i, block in enumerate(self._blocks, start=1):
+            tree[i] += len(block)
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _add(self, block_index: int, delta: int):
+        i = block_index + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, block_index: int) -> int:
+        """Nombre de clés dans les blocs précédant `block_index`"""
+        total, i = 0, block_index
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def _locate(self, position: int) -> Tuple[int, int]:
+        """(bloc, position dans le bloc) de la clé d'index `position`"""
+        block, remaining = 0, position
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            candidate = block + step
+            if candidate < len(self._tree) and self._tree[candidate] <= remaining:
+                block = candidate
+                remaining -= self._tree[candidate]
+            step >>= 1
+        return block, remaining
+
+    # ==================== MISE À JOUR ====================
+
+    def _insert(self, key: Tuple[int, Hashable]):
+        if not self._blocks:
+            self._blocks.append([key])
+            self._maxes.append(key)
+            self._rebuild()
+            return
+        i = min(bisect_left(self._maxes, key), len(self._blocks) - 1)
+        block = self._blocks[i]
+        insort(block, key)
+        self._maxes[i] = block[-1]
+        if len(block) > 2 * self.LOAD:
+            self._blocks[i:i + 1] = [block[:self.LOAD], block[self.LOAD:]]
+            self._maxes[i:i + 1] = [block[self.LOAD - 1], block[-1]]
+            self._rebuild()
+        else:
+            self._add(i, 1)
+
+    def _delete(self, key: Tuple[int, Hashable]):
+        i = bisect_left(self._maxes, key)
+        block = self._blocks[i]
+        del block[bisect_left(block, key)]
+        if block:
+            self._maxes[i] = block[-1]
+            self._add(i, -1)
+        else:
+            del self._blocks[i]
+            del self._maxes[i]
+            self._rebuild()
+
+    def update(self, member: Hashable, score: int):
+        """Enregistre le nouveau score d'un membre"""
+        old = self.scores.get(member)
+        if old == score:
+            return
+        if old is not None:
+            self._delete((-old, member))
+            del self.scores[member]
+        if self._ranked(score):
+            self._insert((-score, member))
+            self.scores[member] = score
+
+    def remove(self, member: Hashable):
+        score = self.scores.pop(member, None)
+        if score is not None:
+            self._delete((-score, member))
+
+    # ==================== LECTURE ====================
+
+    def rank(self, member: Hashable) -> Optional[int]:
+        """Rang (1 = premier) ou None si le membre n'est pas classé"""
+        score = self.scores.get(member)
+        if score is None:
+            return None
+        key = (-score, member)
+        i = bisect_left(self._maxes, key)
+        return self._prefix(i) + bisect_left(self._blocks[i], key) + 1
+
+    def page(self, offset: int, limit: int) -> List[Tuple[Hashable, int]]:
+        """[(membre, score)] aux rangs offset + 1 à offset + limit"""
+        if offset < 0 or offset >= len(self.scores) or limit <= 0:
+            return []
+        block, position = self._locate(offset)
+        results = []
+        while block < len(self._blocks) and len(results) < limit:
+            for score, member in self._blocks[block][position:position + limit - len(results)]:
+                results.append((member, -score))
+            block, position = block + 1, 0
+        return results
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def __contains__(self, member: Hashable) -> bool:
+        return member in self.scores
@@ -0,0 +1,122 @@
+"""
+⏱️ Arsenal V4 - Compteurs à fenêtre glissante
+Anti-spam, anti-raid et cooldowns avec une mémoire bornée
+"""
+
+import time
+from collections import Counter, OrderedDict, deque
+from typing import Callable, Hashable, Optional, Tuple
+
+
+class _Window:
+    """Événements récents d'une clé et décompte de leurs empreintes"""
+
+    __slots__ = ("events", "fingerprints")
+
+    def __init__(self, max_events: int):
+        self.events = deque(maxlen=max_events)  # (timestamp, empreinte)
+        self.fingerprints = Counter()
+
+    def _drop_oldest(self):
+        _, fingerprint = self.events.popleft()
+        if fingerprint is not None:
+            self.fingerprints[fingerprint] -= 1
+            if not self.fingerprints[fingerprint]:
+                del self.fingerprints[fingerprint]
+
+    def expire(self, cutoff: float):
+        while self.events and self.events[0][0] < cutoff:
+            self._drop_oldest()
+
+    def append(self, now: float, fingerprint: Optional[Hashable]):
+        if len(self.events) == self.events.maxlen:
+            self._drop_oldest()
+        self.events.append((now, fingerprint))
+        if fingerprint is not None:
+            self.fingerprints[fingerprint] += 1
+
+
+class SlidingWindowCounter:
+    """Compteur d'événements par clé sur une fenêtre glissante
+
+    Chaque clé garde au plus `max_events` événements (les compteurs saturent
+    donc à cette valeur) et les clés inactives depuis `idle_ttl` secondes sont
+    oubliées. Au-delà de `max_keys`, la clé la moins récemment vue est évincée.
+    """
+
+    def __init__(self, window: float, max_events: int = 64, idle_ttl: Optional[float] = None,
+                 max_keys: int = 100_000, clock: Callable[[], float] = time.monotonic):
+        self.window = window
+        self.max_events = max_events
+        self.idle_ttl = idle_ttl if idle_ttl is not None else max(window * 4, 60)
+        self.max_keys = max_keys
+        self.clock = clock
+        self._windows: "OrderedDict[Hashable, _Window]" = OrderedDict()
+        self._last_seen = {}
+        self._next_eviction = 0.0
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._windows
+
+    def hit(self, key: Hashable, fingerprint: Optional[Hashable] = None,
+            window: Optional[float] = None) -> Tuple[int, int]:
+        """Enregistre un événement et retourne (événements, doublons de l'empreinte) dans la fenêtre"""
+        now = self.clock()
+        state = self._touch(key, now)
+        state.expire(now - (window or self.window))
+        state.append(now, fingerprint)
+        duplicates = state.fingerprints[fingerprint] if fingerprint is not None else 0
+        return len(state.events), duplicates
+
+    def count(self, key: Hashable, window: Optional[float] = None) -> int:
+        """Nombre d'événements de la clé dans la fenêtre, sans en ajouter"""
+        state = self._windows.get(key)
+        if state is None:
+            return 0
+        state.expire(self.clock() - (window or self.window))
+        return len(state.events)
+
+    def allow(self, key: Hashable, limit: int = 1, window: Optional[float] = None) -> bool:
+        """Cooldown : enregistre l'événement seulement s'il reste du quota"""
+        if self.count(key, window) >= limit:
+            return False
+        self.hit(key, window=window)
+        return True
+
+    def reset(self, key: Hashable):
+        """Oublie une clé"""
+        self._windows.pop(key, None)
+        self._last_seen.pop(key, None)
+
+    def _touch(self, key: Hashable, now: float) -> _Window:
+        state = self._windows.get(key)
+        if state is None:
+            state = self._windows[key] = _Window(self.max_events)
+            if len(self._windows) > self.max_keys:
+                oldest, _ = self._windows.popitem(last=False)
+                self._last_seen.pop(oldest, None)
+        else:
+            self._windows.move_to_end(key)
+        self._last_seen[key] = now
+
+        if now >= self._next_eviction:
+            self.evict_idle(now)
+        return state
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Évince les clés inactives (les plus anciennes sont en tête)"""
+        now = self.clock() if now is None else now
+        cutoff = now - self.idle_ttl
+        evicted = 0
+        while self._windows:
+            key = next(iter(self._windows))
+            if self._last_seen[key] >= cutoff:
+                break
+            del self._windows[key]
+            del self._last_seen[key]
+            evicted += 1
+        self._next_eviction = now + min(self.idle_ttl, 60)
+        return evicted
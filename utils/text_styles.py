@@ -0,0 +1,165 @@
+"""
+✍️ Arsenal V4 - Moteur de styles d'écriture
+Tables str.translate construites une fois, chaînes de transformations compilées
+par style (tables consécutives fusionnées en une seule passe) et mémoïsation
+des phrases répétées
+"""
+
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+Table = Dict[int, Optional[str]]
+
+
+def _offset_table(upper: int, lower: int, exceptions: Optional[Dict[str, str]] = None) -> Table:
+    """A-Z et a-z vers deux plages Unicode contiguës"""
+    table = {ord("A") + i: chr(upper + i) for i in range(26)}
+    table.update({ord("a") + i: chr(lower + i) for i in range(26)})
+    table.update(str.maketrans(exceptions or {}))
+    return table
+
+
+LEET_TABLE: Table = str.maketrans({
+    "a": "4", "A": "4", "e": "3", "E": "3", "i": "1", "I": "1", "o": "0", "O": "0",
+    "s": "5", "S": "5", "t": "7", "T": "7", "l": "1", "L": "1", "g": "9", "G": "9",
+})
+BUBBLE_TABLE: Table = _offset_table(0x24B6, 0x24D0, {"0": "⓪", **{str(d): chr(0x2460 + d - 1) for d in range(1, 10)}})
+BOLD_TABLE: Table = _offset_table(0x1D400, 0x1D41A)
+ITALIC_TABLE: Table = _offset_table(0x1D434, 0x1D44E, {"h": "ℎ"})  # U+1D455 n'existe pas
+
+UWU_TABLE: Table = str.maketrans({"r": "w", "R": "W", "l": "w", "L": "W"})
+UWU_NYA = re.compile(r"([nN])([aeiou])")
+
+PHRASE_CACHE = 2048  # phrases mémorisées par style
+
+
+def compose_tables(first: Table, second: Table) -> Table:
+    """Table équivalente à `text.translate(first).translate(second)`"""
+    composed = {}
+    for code, value in first.items():
+        if isinstance(value, int):
+            value = chr(value)
+        composed[code] = value.translate(second) if value else value
+    for code, value in second.items():
+        composed.setdefault(code, value)
+    return composed
+
+
+def alternating_case(text: str) -> str:
+    """mAjUsCuLe / minuscule en alternance (par position)"""
+    upper, lower = text.upper(), text.lower()
+    if len(upper) != len(text) or len(lower) != len(text):
+        # Un caractère change de longueur en capitale (ß -> SS) : caractère par caractère
+        return "".join(c.upper() if i % 2 == 0 else c.lower() for i, c in enumerate(text))
+    chars = list(lower)
+    chars[::2] = upper[::2]
+    return "".join(chars)
+
+
+def _nya(text: str) -> str:
+    return UWU_NYA.sub(r"\1y\2", text)
+
+
+def _reverse(text: str) -> str:
+    return text[::-1]
+
+
+def uwu(text: str) -> str:
+    """r/l -> w, n + voyelle -> ny + voyelle"""
+    return _nya(text.translate(UWU_TABLE))
+
+
+class StyleChain:
+    """Suite de transformations appliquée en une fois, avec cache des phrases déjà stylées"""
+
+    def __init__(self):
+        self.steps: List[Tuple[str, object]] = []
+        self.apply = lru_cache(maxsize=PHRASE_CACHE)(self._apply)
+
+    def translate(self, table: Table) -> "StyleChain":
+        # Deux tables consécutives ne font qu'une passe
+        if self.steps and self.steps[-1][0] == "table":
+            self.steps[-1] = ("table", compose_tables(self.steps[-1][1], table))
+        else:
+            self.steps.append(("table", table))
+        return self
+
+    def then(self, func: Callable[[str], str]) -> "StyleChain":
+        self.steps.append(("func", func))
+        return self
+
+    def wrap(self, prefix: str = "", suffix: str = "") -> "StyleChain":
+        if prefix or suffix:
+            self.steps.append(("wrap", (prefix, suffix)))
+        return self
+
+    def _apply(self, text: str) -> str:
+        for kind, step in self.steps:
+            if kind == "table":
+                text = text.translate(step)
+            elif kind == "func":
+                text = step(text)
+            else:
+                text = f"{step[0]}{text}{step[1]}"
+        return text
+
+    def __call__(self, text: str) -> str:
+        return self.apply(text)
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+
+# Ordre d'application des transformations d'un profil
+CASE_STEPS = (("uppercase", str.upper), ("lowercase", str.lower), ("title_case", str.title), ("alternating_case", alternating_case))
+TABLE_STEPS = (("leetspeak", (LEET_TABLE,)), ("uwu_mode", (UWU_TABLE, _nya)), ("bubble_text", (BUBBLE_TABLE,)),
+               ("bold_text", (BOLD_TABLE,)), ("italic_text", (ITALIC_TABLE,)))
+MARKUP_STEPS = (("strikethrough", "~~"), ("underline", "__"), ("spoiler", "||"))
+
+
+def style_key(writing_style: Dict) -> Tuple:
+    """Clé hashable des réglages qui influencent le texte stylé"""
+    transforms = writing_style.get("text_transforms", {})
+    emoji = writing_style.get("emoji_style", {})
+    formatting = writing_style.get("message_formatting", {})
+    signature = formatting.get("signature_text") if formatting.get("add_signature") else ""
+    return (
+        tuple(sorted(name for name, enabled in transforms.items() if enabled)),
+        emoji.get("emoji_prefix") or "",
+        emoji.get("emoji_suffix") or "",
+        signature or "",
+    )
+
+
+@lru_cache(maxsize=256)
+def compile_style(key: Tuple) -> StyleChain:
+    """Chaîne compilée pour une clé de `style_key` (partagée par les profils identiques)"""
+    transforms, prefix, suffix, signature = key
+    enabled = set(transforms)
+    chain = StyleChain()
+    for name, func in CASE_STEPS:
+        if name in enabled:
+            chain.then(func)
+            break  # une seule transformation de casse, par priorité
+    if "reverse_text" in enabled:
+        chain.then(_reverse)
+    for name, steps in TABLE_STEPS:
+        if name in enabled:
+            for step in steps:
+                if isinstance(step, dict):
+                    chain.translate(step)
+                else:
+                    chain.then(step)
+    for name, marker in MARKUP_STEPS:
+        if name in enabled:
+            chain.wrap(marker, marker)
+    chain.wrap(prefix, suffix)
+    if signature:
+        chain.wrap("", f"\n\n{signature}")
+    return chain
+
+
+def compile_writing_style(writing_style: Dict) -> StyleChain:
+    """Chaîne compilée du bloc `writing_style` d'un profil"""
+    return compile_style(style_key(writing_style))
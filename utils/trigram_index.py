@@ -0,0 +1,93 @@
+"""
+🔎 Arsenal V4 - Index de trigrammes pour la recherche floue
+Noms et alias normalisés (casse, accents, ponctuation) découpés en
+trigrammes : une recherche ne compare la requête qu'aux entrées qui
+partagent au moins un trigramme avec elle, sans balayer toute la liste
+"""
+
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    """Minuscules sans accents, ponctuation et `_` remplacés par des espaces"""
+    text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode("ascii")
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+
+def trigrams(normalized: str) -> Set[str]:
+    """Trigrammes de chaque mot, bordés d'espaces (les débuts de mots pèsent plus)"""
+    grams = set()
+    for word in normalized.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """Recherche floue nom / alias -> clé
+
+    Score d'une entrée : 1.0 si égalité exacte, entre 0.8 et 1.0 si la
+    requête est contenue dans le nom (le `LIKE '%nom%'` historique), sinon
+    coefficient de Dice sur les trigrammes.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[Hashable, Iterable[str]]] = ()):
+        self._names: List[str] = []
+        self._keys: List[Hashable] = []
+        self._grams: List[Set[str]] = []
+        self._exact: Dict[str, Hashable] = {}
+        self._postings: Dict[str, List[int]] = {}
+        for key, names in entries:
+            self.add(key, *names)
+
+    def add(self, key: Hashable, *names: str):
+        """Indexe un ou plusieurs noms (nom affiché, identifiant, alias) pour `key`"""
+        for name in names:
+            normalized = normalize(name) if name else ""
+            if not normalized or self._exact.get(normalized) == key:
+                continue
+            self._exact.setdefault(normalized, key)
+            position = len(self._names)
+            grams = trigrams(normalized)
+            self._names.append(normalized)
+            self._keys.append(key)
+            self._grams.append(grams)
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(position)
+
+    def search(self, query: str, limit: int = 5, min_score: float = 0.3) -> List[Tuple[Hashable, float]]:
+        """[(clé, score)] par score décroissant, une seule fois par clé"""
+        normalized = normalize(query)
+        if not normalized:
+            return []
+        exact = self._exact.get(normalized)
+        query_grams = trigrams(normalized)
+        shared = Counter(position for gram in query_grams for position in self._postings.get(gram, ()))
+
+        best: Dict[Hashable, float] = {}
+        if exact is not None:
+            best[exact] = 1.0
+        for position, count in shared.items():
+            name = self._names[position]
+            if normalized in name:
+                score = 0.8 + 0.2 * len(normalized) / len(name)
+            else:
+                score = 2 * count / (len(query_grams) + len(self._grams[position]))
+            key = self._keys[position]
+            if score >= min_score and score > best.get(key, 0.0):
+                best[key] = score
+        ranked = sorted(best.items(), key=lambda item: (-item[1], str(item[0])))
+        return ranked[:limit]
+
+    def best(self, query: str, min_score: float = 0.3) -> Optional[Hashable]:
+        """Clé la plus proche de `query`, ou None"""
+        results = self.search(query, limit=1, min_score=min_score)
+        return results[0][0] if results else None
+
+    def __len__(self) -> int:
+        return len(self._names)
@@ -0,0 +1,179 @@
+"""
+🔗 Arsenal V4 - Envoi des webhooks Discord
+Session HTTP partagée, envois parallèles bornés par URL, suivi des buckets de
+rate limit (en-têtes X-RateLimit-*, 429 + retry_after) et regroupement des
+embeds d'un même événement arrivés en rafale
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+MAX_EMBEDS = 10  # limite Discord par message
+
+
+class _Bucket:
+    """État de rate limit d'une URL de webhook"""
+
+    __slots__ = ("remaining", "reset_at", "slots")
+
+    def __init__(self, per_url: int):
+        self.remaining: Optional[int] = None  # inconnu tant que Discord n'a pas répondu
+        self.reset_at = 0.0
+        self.slots = asyncio.Semaphore(per_url)
+
+
+class WebhookDispatcher:
+    """File d'envoi des webhooks
+
+    `send()` ne bloque pas : il renvoie un futur résolu avec le statut de
+    l'envoi ("success" ou "error: ..."). Les embeds envoyés vers la même URL
+    pour le même événement pendant `coalesce_window` partent dans un seul
+    message (10 embeds maximum par message).
+    """
+
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None, coalesce_window: float = 0.25,
+                 per_url: int = 1, max_concurrency: int = 20, max_retries: int = 3,
+                 timeout: float = 15.0, name: Optional[str] = None):
+        self._session = session
+        self._owns_session = session is None
+        self.coalesce_window = coalesce_window
+        self.per_url = per_url
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self._limit: Optional[asyncio.Semaphore] = None
+        self._buckets: Dict[str, _Bucket] = {}
+        self._global_reset = 0.0
+        self._pending: Dict[Tuple, List[Tuple[Dict, asyncio.Future]]] = {}
+        self._tasks = set()
+        self.stats: Dict[str, int] = {"queued": 0, "posts": 0, "rate_limited": 0, "errors": 0}
+        if name:
+            # Exposé sur /metrics (core/metrics_server.py)
+            metrics.gauge("arsenal_queue_depth", lambda: self.pending, "Embeds en attente d'envoi", queue=name)
+
+    # ==================== ENTRÉE ====================
+
+    @property
+    def pending(self) -> int:
+        return sum(len(entries) for entries in self._pending.values())
+
+    def send(self, url: str, embed: Dict, event: Optional[str] = None, username: str = "Arsenal V4") -> asyncio.Future:
+        """Met un embed en file pour `url` ; les embeds du même événement sont regroupés"""
+        future = asyncio.get_running_loop().create_future()
+        key = (url, event, username)
+        entries = self._pending.get(key)
+        if entries is None:
+            entries = self._pending[key] = []
+            self._spawn(self._deliver_later(key))
+        entries.append((embed, future))
+        self.stats["queued"] += 1
+        return future
+
+    # ==================== CYCLE DE VIE ====================
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+            self._owns_session = True
+        return self._session
+
+    async def close(self):
+        """Termine les envois en cours puis ferme la session (si elle a été créée ici)"""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _spawn(self, coro):
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    # ==================== ENVOI ====================
+
+    async def _deliver_later(self, key: Tuple):
+        await asyncio.sleep(self.coalesce_window)
+        entries = self._pending.pop(key)
+        url, _, username = key
+        chunks = [entries[i:i + MAX_EMBEDS] for i in range(0, len(entries), MAX_EMBEDS)]
+        for chunk in chunks:
+            try:
+                status = await self._post(url, {"username": username, "embeds": [embed for embed, _ in chunk]})
+            except Exception as e:
+                logger.error(f"Envoi webhook échoué: {e}")
+                status = f"error: {e}"
+            for _, future in chunk:
+                if not future.done():
+                    future.set_result(status)
+
+    def _bucket(self, url: str) -> _Bucket:
+        bucket = self._buckets.get(url)
+        if bucket is None:
+            bucket = self._buckets[url] = _Bucket(self.per_url)
+        return bucket
+
+    async def _wait_for(self, bucket: _Bucket):
+        reset_at = self._global_reset
+        if bucket.remaining == 0:
+            reset_at = max(reset_at, bucket.reset_at)
+        delay = reset_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+            bucket.remaining = None
+
+    @staticmethod
+    def _update(bucket: _Bucket, headers):
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset_after = headers.get("X-RateLimit-Reset-After")
+        if remaining is not None:
+            bucket.remaining = int(remaining)
+        if reset_after is not None:
+            bucket.reset_at = time.monotonic() + float(reset_after)
+
+    @staticmethod
+    async def _retry_after(response) -> float:
+        try:
+            return float((await response.json(content_type=None))["retry_after"])
+        except Exception:
+            return float(response.headers.get("Retry-After", 1.0))
+
+    async def _post(self, url: str, payload: Dict) -> str:
+        bucket = self._bucket(url)
+        if self._limit is None:
+            self._limit = asyncio.Semaphore(self.max_concurrency)
+        async with bucket.slots:
+            for _ in range(self.max_retries + 1):
+                await self._wait_for(bucket)
+                try:
+                    async with self._limit:
+                        async with self.session.post(url, json=payload) as response:
+                            self.stats["posts"] += 1
+                            self._update(bucket, response.headers)
+                            if response.status == 429:
+                                retry_after = await self._retry_after(response)
+                                self.stats["rate_limited"] += 1
+                                if response.headers.get("X-RateLimit-Global"):
+                                    self._global_reset = time.monotonic() + retry_after
+                                else:
+                                    bucket.remaining = 0
+                                    bucket.reset_at = time.monotonic() + retry_after
+                                continue
+                            if response.status >= 400:
+                                self.stats["errors"] += 1
+                                return f"error: HTTP {response.status}"
+                            return "success"
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    self.stats["errors"] += 1
+                    return f"error: {e}"
+        self.stats["errors"] += 1
+        return "error: rate limited"
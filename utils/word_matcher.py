@@ -0,0 +1,127 @@
+"""
+🔍 Arsenal V4 - Moteur de filtrage de mots
+Automate Aho-Corasick multi-niveaux : une seule passe par message
+"""
+
+import re
+import unicodedata
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+# Chiffres leetspeak et lettres sans décomposition Unicode : toujours convertis
+CHAR_MAP = str.maketrans({
+    "0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t", "8": "b",
+    "ø": "o", "ł": "l", "đ": "d", "æ": "ae", "œ": "oe", "ß": "ss"
+})
+
+# Symboles leetspeak : convertis seulement à l'intérieur d'un mot ("n!quer" mais pas "idiot!")
+LEET_SYMBOLS = {"@": "a", "$": "s", "!": "i", "|": "i", "€": "e", "ƒ": "f"}
+LEET_SYMBOLS_RE = re.compile(r"[@$!|€ƒ](?=\w)")
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Minuscules, sans accents, leetspeak décodé, espaces compactés"""
+    text = text.lower()
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(char for char in text if not unicodedata.combining(char))
+    text = text.translate(CHAR_MAP)
+    text = LEET_SYMBOLS_RE.sub(lambda match: LEET_SYMBOLS[match.group(0)], text)
+    return WHITESPACE_RE.sub(" ", text).strip()
+
+
+class WordMatcher:
+    """Automate compilé une fois pour toutes les listes de mots d'un serveur
+
+    `levels` associe un niveau de gravité à sa liste de mots. Un même mot
+    présent dans plusieurs listes garde le niveau le plus élevé.
+    Par défaut un mot est détecté n'importe où dans le texte, comme l'ancien
+    filtre. Avec `word_boundary`, il doit commencer un mot : "con" ne bloque
+    plus "second" mais bloque toujours "connards".
+    """
+
+    def __init__(self, levels: Dict[int, Iterable[str]], word_boundary: bool = False):
+        self.word_boundary = word_boundary
+        self.max_level = max(levels, default=0)
+        self.pattern_count = 0
+
+        # Trie : transitions, lien d'échec et sorties (longueur, niveau, mot) par nœud
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+
+        patterns = {}
+        for level, words in levels.items():
+            for word in words:
+                normalized = normalize_text(word)
+                if not normalized:
+                    continue
+                previous = patterns.get(normalized)
+                if previous is None or level > previous[0]:
+                    patterns[normalized] = (level, word)
+
+        for normalized, (level, word) in patterns.items():
+            self._add(normalized, level, word)
+        self.pattern_count = len(patterns)
+        self._build()
+
+    def _add(self, pattern: str, level: int, word: str):
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            node = next_node
+        self._out[node] = ((len(pattern), level, word),)
+
+    def _build(self):
+        """Calcule les liens d'échec en largeur et fusionne les sorties"""
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def _is_bounded(self, text: str, start: int) -> bool:
+        """Début de mot seulement : pluriels et suffixes restent détectés"""
+        return not self.word_boundary or start == 0 or not text[start - 1].isalnum()
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str]]:
+        """Toutes les occurrences (niveau, mot d'origine) dans l'ordre du texte"""
+        text = normalize_text(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for length, level, word in out[node]:
+                if self._is_bounded(text, index + 1 - length):
+                    yield level, word
+
+    def find(self, text: str) -> Optional[Tuple[int, str]]:
+        """Occurrence la plus grave (niveau, mot d'origine) ou None"""
+        best = None
+        for level, word in self.iter_matches(text):
+            if best is None or level > best[0]:
+                best = (level, word)
+                if level == self.max_level:
+                    break
+        return best
+
+    def find_by_level(self, text: str) -> Dict[int, str]:
+        """Premier mot détecté pour chaque niveau"""
+        found = {}
+        for level, word in self.iter_matches(text):
+            found.setdefault(level, word)
+        return found